@@ -0,0 +1,88 @@
+"""
+Benchmark the IVF approximate index against exact matrix search.
+
+Vectors are drawn around random cluster centres (real embeddings are
+clustered; uniformly random vectors are the worst case for IVF). For each
+nprobe setting the script reports recall@k against exact search and the
+mean query latency of both.
+
+Usage:
+    cd backend
+    python scripts/benchmark_ann_search.py
+    python scripts/benchmark_ann_search.py --sizes 100000 300000 --nprobe 4 8 16 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory.vector_index import IVFIndex, MatrixIndex
+
+
+def clustered(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Random vectors around ``clusters`` centres."""
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    return centres[labels] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def timed_search(index: MatrixIndex, queries: np.ndarray, k: int) -> tuple[list[set[str]], float]:
+    """Run all queries; return result id sets and mean latency in ms."""
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append({entry_id for entry_id, _ in index.search(q, k)})
+    return results, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def bench(size: int, dim: int, queries: int, k: int, nprobes: list[int], nlist: int | None) -> None:
+    rng = np.random.default_rng(42)
+    data = clustered(size, dim, max(16, size // 500), rng)
+    items = [(f"e{i}", v) for i, v in enumerate(data)]
+    query_vectors = data[rng.choice(size, queries, replace=False)] + 0.1 * rng.standard_normal((queries, dim))
+
+    exact = MatrixIndex(dim)
+    exact.build(items)
+    truth, exact_ms = timed_search(exact, query_vectors, k)
+
+    ivf = IVFIndex(dim, nlist=nlist, min_train_size=0)
+    start = time.perf_counter()
+    ivf.build(items)
+    train_s = time.perf_counter() - start
+
+    print(f"{size:>8} entries | exact {exact_ms:7.2f} ms | IVF build+train {train_s:6.1f} s")
+    for nprobe in nprobes:
+        ivf.nprobe = nprobe
+        found, ivf_ms = timed_search(ivf, query_vectors, k)
+        recall = sum(len(t & f) for t, f in zip(truth, found, strict=True)) / (k * queries)
+        print(
+            f"{'':>8}          | nprobe {nprobe:>3} | recall@{k} {recall:6.3f}"
+            f" | IVF {ivf_ms:7.2f} ms | speedup {exact_ms / ivf_ms:6.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--nlist", type=int, default=None, help="Inverted lists (default: about 4 * sqrt(n))")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print(f"ANN benchmark (dim={args.dim}, k={args.k}, queries={args.queries})")
+    print("=" * 50)
+    for size in args.sizes:
+        bench(size, args.dim, args.queries, args.k, args.nprobe, args.nlist)
+
+
+if __name__ == "__main__":
+    main()
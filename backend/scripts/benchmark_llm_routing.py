@@ -0,0 +1,140 @@
+"""
+Benchmark LLM routing policies against simulated providers.
+
+Each simulated provider draws its time to first token from a log-normal
+distribution with an occasional slow tail (queueing, cold starts). The
+same request sequence is replayed against each policy and the script
+reports latency percentiles and how many extra (hedge) requests were made.
+
+Usage:
+    cd backend
+    python scripts/benchmark_llm_routing.py
+    python scripts/benchmark_llm_routing.py --requests 500 --tail-prob 0.1 --scale 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services import stat_service
+from src.services.llm.health_monitor import ProviderHealthMonitor
+from src.services.llm.provider import LLMProvider, LLMResponse
+from src.services.llm.router import LLMRouter
+from src.services.llm.routing_policy import RoutingPolicy
+from src.utils import logger as logger_module
+
+
+class SimulatedProvider(LLMProvider):
+    """Provider whose latency follows a log-normal with a slow tail."""
+
+    def __init__(self, name: str, median_ms: float, tail_prob: float, tail_ms: float, scale: float, seed: int) -> None:
+        super().__init__({"name": name, "model_id": f"sim-{name}"})
+        self.median_ms = median_ms
+        self.tail_prob = tail_prob
+        self.tail_ms = tail_ms
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, str]], stream: bool = False, **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        latency_ms = self.rng.lognormvariate(0, 0.3) * self.median_ms
+        if self.rng.random() < self.tail_prob:
+            latency_ms += self.tail_ms
+        await asyncio.sleep(latency_ms * self.scale / 1000)
+        return LLMResponse(content="ok", model=self.model_id)
+
+    async def health_check(self) -> bool:
+        return True
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+
+class _NullStatService:
+    async def record_request(self, **kwargs: Any) -> None:
+        pass
+
+
+class _NullPromptLogger:
+    def log_interaction(self, **kwargs: Any) -> None:
+        pass
+
+
+def make_router(providers: list[SimulatedProvider], policy: RoutingPolicy) -> LLMRouter:
+    """Router over simulated providers, first one as primary."""
+    router = LLMRouter.__new__(LLMRouter)
+    router._model_configs = None
+    router._primary = providers[0]
+    router._backups = providers[1:]
+    router._providers = {p.name: p for p in providers}
+    router._health_monitor = ProviderHealthMonitor()
+    router._policy = policy
+    return router
+
+
+async def run_policy(label: str, policy: RoutingPolicy, args: argparse.Namespace) -> None:
+    providers = [
+        SimulatedProvider("primary", args.primary_ms, args.tail_prob, args.tail_ms, args.scale, seed=1),
+        SimulatedProvider("backup", args.backup_ms, args.tail_prob, args.tail_ms, args.scale, seed=2),
+    ]
+    router = make_router(providers, policy)
+    loop = asyncio.get_running_loop()
+
+    latencies = []
+    for _ in range(args.requests):
+        start = loop.time()
+        await router.chat([{"role": "user", "content": "hi"}])
+        latencies.append((loop.time() - start) * 1000 / args.scale)
+
+    latencies.sort()
+
+    def pct(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))]
+
+    calls = sum(p.calls for p in providers)
+    print(
+        f"{label:<22} mean {statistics.mean(latencies):7.0f} | p50 {pct(50):7.0f} | p95 {pct(95):7.0f}"
+        f" | p99 {pct(99):7.0f} ms | extra requests {100 * (calls - args.requests) / args.requests:5.1f}%"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--primary-ms", type=float, default=600.0, help="Median primary latency")
+    parser.add_argument("--backup-ms", type=float, default=400.0, help="Median backup latency")
+    parser.add_argument("--tail-prob", type=float, default=0.05, help="Probability of a slow response")
+    parser.add_argument("--tail-ms", type=float, default=4000.0, help="Extra latency of a slow response")
+    parser.add_argument("--scale", type=float, default=0.01, help="Wall-clock time per simulated ms")
+    args = parser.parse_args()
+
+    # Keep the benchmark quiet and off the database and the prompt log
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+    stat_service.get_stat_service = lambda: _NullStatService()
+    logger_module.get_llm_prompt_logger = lambda: _NullPromptLogger()
+
+    print("=" * 50)
+    print(f"Routing benchmark ({args.requests} requests, simulated ms)")
+    print("=" * 50)
+    await run_policy("priority", RoutingPolicy(strategy="priority"), args)
+    await run_policy("fastest", RoutingPolicy(strategy="fastest"), args)
+    await run_policy("priority + hedge", RoutingPolicy(strategy="priority", hedge_enabled=True,
+                                                       hedge_min_delay_ms=0), args)
+    await run_policy("fastest + hedge", RoutingPolicy(strategy="fastest", hedge_enabled=True,
+                                                      hedge_min_delay_ms=0), args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Benchmark VectorStore search: NumPy matrix path vs legacy per-row Python loop.
+
+The legacy path is the pre-matrix fallback: select every row, json.loads each
+embedding and score it with VectorStore._cosine_similarity. Rows are then
+migrated to float32 BLOBs and the matrix is loaded from those.
+
+Usage:
+    cd backend
+    python scripts/benchmark_vector_search.py
+    python scripts/benchmark_vector_search.py --sizes 1000 10000 --queries 20
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory.vector_store import VectorStore
+
+
+def legacy_search(store: VectorStore, query: list[float], limit: int) -> list[tuple[str, float]]:
+    """Pre-matrix fallback: full table scan with pure-Python cosine."""
+    cursor = store._get_connection().cursor()
+    cursor.execute("""
+        SELECT m.id, e.embedding
+        FROM memory_entries m
+        JOIN memory_embeddings e ON m.id = e.entry_id
+    """)
+    results = []
+    for row in cursor.fetchall():
+        score = store._cosine_similarity(query, json.loads(row["embedding"]))
+        if score > 0.0:
+            results.append((row["id"], score))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results[:limit]
+
+
+def populate(store: VectorStore, size: int, dim: int, rng: np.random.Generator) -> None:
+    """Bulk-load random embeddings as legacy JSON rows."""
+    conn = store._get_connection()
+    vectors = rng.standard_normal((size, dim)).astype(np.float32)
+    conn.executemany(
+        "INSERT INTO memory_entries (id, content, content_type, source_file, created_at, updated_at) "
+        "VALUES (?, ?, 'conversation', '', datetime('now'), datetime('now'))",
+        [(f"e{i}", f"entry {i}") for i in range(size)],
+    )
+    conn.executemany(
+        "INSERT INTO memory_embeddings (entry_id, embedding) VALUES (?, ?)",
+        [(f"e{i}", json.dumps(v.tolist())) for i, v in enumerate(vectors)],
+    )
+    conn.commit()
+
+
+def bench(size: int, dim: int, queries: int, limit: int, legacy: bool) -> None:
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(str(Path(tmp) / "bench.db"), embedding_dim=dim)
+        store.initialize()
+        populate(store, size, dim, rng)
+        query_vectors = rng.standard_normal((queries, dim)).astype(np.float32).tolist()
+
+        line = f"{size:>8} entries"
+        legacy_ms = 0.0
+        if legacy:
+            start = time.perf_counter()
+            for q in query_vectors:
+                legacy_search(store, q, limit)
+            legacy_ms = (time.perf_counter() - start) * 1000 / queries
+            line += f" | legacy query {legacy_ms:9.1f} ms"
+
+        # Convert the JSON rows to BLOBs the way an upgraded database would be
+        conn = store._get_connection()
+        conn.execute("DELETE FROM memory_meta WHERE key = 'embedding_storage'")
+        start = time.perf_counter()
+        store._migrate_embeddings_to_binary(conn.cursor())
+        conn.commit()
+        migrate_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        store._get_matrix_index()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for q in query_vectors:
+            store.search(q, limit=limit)
+        matrix_ms = (time.perf_counter() - start) * 1000 / queries
+
+        line += (
+            f" | migrate {migrate_ms:9.1f} ms | matrix load {load_ms:8.1f} ms"
+            f" | matrix query {matrix_ms:8.2f} ms"
+        )
+        if legacy:
+            line += f" | speedup {legacy_ms / matrix_ms:7.1f}x"
+        print(line)
+        store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--legacy-max", type=int, default=100_000,
+        help="Skip the legacy path above this size (it is very slow)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print(f"Vector search benchmark (dim={args.dim}, limit={args.limit})")
+    print("=" * 50)
+    for size in args.sizes:
+        bench(size, args.dim, args.queries, args.limit, legacy=size <= args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Re-sync memory vectors with the daily logs.
+
+Compares each parsed entry against the content hash stored in
+memory_entries and only embeds new or modified entries; entries that
+vanished from a log are deleted.
+
+Usage:
+    python scripts/resync_memory_vectors.py [--config PATH] [--workspace PATH] [--db PATH] [--dry-run]
+
+The vector store and embedder are built from the search and embedding
+sections of the config file, as the server does.
+
+Examples:
+    python scripts/resync_memory_vectors.py --dry-run
+    python scripts/resync_memory_vectors.py --workspace ../workspace --db x-agent.db
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.loader import load_config
+from src.memory.embedder import get_embedder
+from src.memory.md_sync import MarkdownSync
+from src.memory.vector_store import VectorStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="x-agent.yaml", help="Config file")
+    parser.add_argument("--workspace", default="workspace", help="Workspace directory")
+    parser.add_argument("--db", default="x-agent.db", help="SQLite database file")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    parser.add_argument("--verbose", "-v", action="store_true", help="List affected entry IDs")
+    args = parser.parse_args()
+
+    config = load_config(Path(args.config))
+
+    md_sync = MarkdownSync(str(Path(args.workspace).expanduser().resolve()))
+    store = VectorStore(
+        args.db,
+        embedding_format=config.search.embedding_format,
+        index_type=config.search.vector_index,
+        ivf_nlist=config.search.ivf_nlist,
+        ivf_nprobe=config.search.ivf_nprobe,
+    )
+    store.initialize()
+    embedder = get_embedder(
+        backend=config.embedding.backend,
+        model_path=config.embedding.model_path,
+        batch_size=config.embedding.batch_size,
+        intra_op_num_threads=config.embedding.intra_op_num_threads,
+        cache_size=config.embedding.cache_size,
+        cache_path=(
+            str(Path(config.embedding.cache_path).expanduser())
+            if config.embedding.cache_path else None
+        ),
+    )
+
+    report = md_sync.resync_vector_store(store, embedder, dry_run=args.dry_run)
+    store.close()
+
+    mode = "Dry run" if args.dry_run else "Re-sync"
+    print(f"{mode}: {len(report.added)} added, {len(report.modified)} modified, "
+          f"{len(report.removed)} removed, {report.unchanged} unchanged")
+    if args.verbose:
+        for label, ids in (("+", report.added), ("~", report.modified), ("-", report.removed)):
+            for entry_id in ids:
+                print(f"  {label} {entry_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -96,6 +96,7 @@ async def get_config_status() -> ConfigStatusResponse:
     # Get LLM router from app state or create one
     from ...main import get_llm_router
     llm_router = get_llm_router()
+    health_status = llm_router.get_health_status()
     
     # Get persistent stats from stat service
     persistent_stats = {}
@@ -130,22 +131,10 @@ async def get_config_status() -> ConfigStatusResponse:
             stats["success_rate"] = ps["success_rate"]
             stats["avg_latency_ms"] = ps["avg_latency_ms"]
         
-        # Check provider health
+        # Cached provider health (probed in the background, no live calls here)
         is_healthy = True
-        if llm_router:
-            try:
-                health_results = await llm_router.health_check()
-                is_healthy = health_results.get(model.name, False)
-            except Exception as e:
-                logger.warning(
-                    "Health check failed for model",
-                    extra={
-                        "model_name": model.name,
-                        "error": str(e),
-                        "error_type": type(e).__name__,
-                    }
-                )
-                is_healthy = False
+        if model.name in health_status:
+            is_healthy = health_status[model.name]["is_healthy"]
         
         providers.append(ProviderStatus(
             name=model.name,
@@ -455,10 +455,15 @@ async def search_memory(request: SearchRequestModel) -> SearchResponse:
         return SearchResponse(items=[], query=request.query, total=0)
     
     # Initialize hybrid search with dependencies
+    fallback_search = None
     try:
         vector_store = get_vector_store()
         embedder = get_embedder()
-        hybrid_search = get_hybrid_search(vector_store=vector_store, embedder=embedder)
+        hybrid_search = get_hybrid_search(
+            vector_store=vector_store,
+            embedder=embedder,
+            entry_index=md_sync.entry_index,
+        )
     except Exception as e:
         logger.warning(
             "Hybrid search initialization failed, using text-only search",
@@ -466,7 +471,7 @@ async def search_memory(request: SearchRequestModel) -> SearchResponse:
         )
         # Fall back to text-only search
         from ...memory.hybrid_search import HybridSearch
-        hybrid_search = HybridSearch()
+        hybrid_search = fallback_search = HybridSearch(entry_index=md_sync.entry_index)
     
     # Convert content_type string to enum if provided
     content_type_enum = None
@@ -477,14 +482,19 @@ async def search_memory(request: SearchRequestModel) -> SearchResponse:
             pass  # Invalid content type, ignore filter
     
     # Perform search
-    results = hybrid_search.search(
-        query=request.query,
-        entries=entries,
-        limit=limit,
-        offset=request.offset,
-        content_type=content_type_enum,
-        min_score=min_score,
-    )
+    try:
+        results = hybrid_search.search(
+            query=request.query,
+            entries=entries,
+            limit=limit,
+            offset=request.offset,
+            content_type=content_type_enum,
+            min_score=min_score,
+        )
+    finally:
+        # The per-request fallback must not stay subscribed to the shared index
+        if fallback_search is not None:
+            fallback_search.text_search.detach()
     
     # Convert to response format
     items = [
@@ -546,20 +556,29 @@ async def find_similar(entry_id: str, limit: int = 5) -> SearchResponse:
         raise HTTPException(status_code=404, detail=f"Entry {entry_id} not found")
     
     # Initialize hybrid search
+    fallback_search = None
     try:
         vector_store = get_vector_store()
         embedder = get_embedder()
-        hybrid_search = get_hybrid_search(vector_store=vector_store, embedder=embedder)
+        hybrid_search = get_hybrid_search(
+            vector_store=vector_store,
+            embedder=embedder,
+            entry_index=md_sync.entry_index,
+        )
     except Exception:
         from ...memory.hybrid_search import HybridSearch
-        hybrid_search = HybridSearch()
+        hybrid_search = fallback_search = HybridSearch(entry_index=md_sync.entry_index)
     
     # Find similar entries
-    results = hybrid_search.find_similar(
-        entry_id=entry_id,
-        entries=entries,
-        limit=limit,
-    )
+    try:
+        results = hybrid_search.find_similar(
+            entry_id=entry_id,
+            entries=entries,
+            limit=limit,
+        )
+    finally:
+        if fallback_search is not None:
+            fallback_search.text_search.detach()
     
     # Convert to response format
     items = [
@@ -587,6 +606,14 @@ async def find_similar(entry_id: str, limit: int = 5) -> SearchResponse:
     )
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats() -> dict:
+    """Get embedding cache hit/miss metrics."""
+    from ...memory.embedder import get_embedder
+
+    return get_embedder().get_cache_stats()
+
+
 # ============ Maintenance Endpoints ============
 
 from pydantic import BaseModel
@@ -698,6 +725,34 @@ async def run_memory_maintenance(request: MaintenanceRequest) -> MaintenanceResp
         )
 
 
+@router.post("/maintenance/vector-sync")
+async def resync_memory_vectors(dry_run: bool = False) -> dict:
+    """Re-sync the vector store with the daily logs.
+    
+    Only new or modified entries are embedded and vanished ones deleted.
+    
+    Args:
+        dry_run: Only report what would change
+        
+    Returns:
+        Lists of added/modified/removed entry IDs and the unchanged count
+    """
+    import asyncio
+    
+    from ...memory.md_sync import get_md_sync
+    from ...memory.vector_store import get_vector_store
+    from ...memory.embedder import get_embedder
+    
+    md_sync = get_md_sync()
+    report = await asyncio.to_thread(
+        md_sync.resync_vector_store,
+        get_vector_store(),
+        get_embedder(),
+        dry_run=dry_run,
+    )
+    return report.to_dict()
+
+
 @router.get("/maintenance/config", response_model=SchedulerConfigResponse)
 async def get_maintenance_config() -> SchedulerConfigResponse:
     """Get scheduler configuration for memory maintenance.
@@ -107,3 +107,26 @@ async def get_daily_stats(
         days=days,
         provider_name=provider_name,
     )
+
+
+@router.get("/routing")
+async def get_routing_stats() -> dict:
+    """Get LLM routing state.
+    
+    Returns:
+        Routing policy, per-provider latency (EWMA, p50, p95), hedge
+        counters and cached provider health
+    """
+    from ...main import get_llm_router
+    return get_llm_router().get_routing_status()
+
+
+@router.get("/cache")
+async def get_cache_stats() -> dict:
+    """Get LLM response cache metrics.
+    
+    Returns:
+        Hits, misses, hit rate, stores and tier sizes
+    """
+    from ...services.llm.response_cache import get_response_cache
+    return get_response_cache().stats()
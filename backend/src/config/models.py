@@ -31,6 +31,113 @@ class ModelConfig(BaseModel):
         return f"{key[:4]}...{key[-4:]}"
 
 
+class LLMRoutingConfig(BaseModel):
+    """LLM router configuration.
+    
+    Provider health is cached and refreshed by background probes instead of
+    being checked before every request. Provider order and hedged requests
+    are driven by observed latency.
+    """
+    
+    strategy: Literal["priority", "fastest"] = Field(
+        default="priority",
+        description="priority: configured primary/backup order; fastest: lowest EWMA latency among healthy providers"
+    )
+    hedge_enabled: bool = Field(
+        default=False,
+        description="Start a backup request when the first provider misses its p95-derived first-token deadline"
+    )
+    hedge_multiplier: float = Field(
+        default=1.0, ge=0.5, le=10.0,
+        description="Hedge deadline as a multiple of the provider's p95 latency"
+    )
+    hedge_min_delay_ms: float = Field(
+        default=300.0, ge=0.0,
+        description="Lower bound for the hedge deadline in milliseconds"
+    )
+    hedge_max_delay_ms: float = Field(
+        default=10000.0, ge=0.0,
+        description="Upper bound for the hedge deadline in milliseconds"
+    )
+    latency_min_samples: int = Field(
+        default=5, ge=1, le=1000,
+        description="Latency samples needed before a provider is ranked or hedged"
+    )
+    latency_window: int = Field(
+        default=200, ge=10, le=10000,
+        description="Recent latency samples kept per provider for percentiles"
+    )
+    coalesce_requests: bool = Field(
+        default=True,
+        description=(
+            "Share one provider call between concurrent identical non-streaming "
+            "requests that are cache-eligible or opt in"
+        )
+    )
+    
+    health_check_interval: float = Field(
+        default=30.0, ge=1.0, le=3600.0,
+        description="Seconds between background health probes of a healthy provider"
+    )
+    health_check_ttl: float = Field(
+        default=90.0, ge=1.0, le=3600.0,
+        description="Seconds after which a cached health status is treated as unknown"
+    )
+    health_check_max_backoff: float = Field(
+        default=300.0, ge=1.0, le=3600.0,
+        description="Maximum probe interval while a provider keeps failing"
+    )
+    health_check_timeout: float = Field(
+        default=10.0, ge=0.5, le=120.0,
+        description="Seconds before a health probe counts as failed"
+    )
+
+
+class LLMCacheConfig(BaseModel):
+    """LLM response cache configuration.
+    
+    Exact-match cache for deterministic internal calls (skill matching,
+    task analysis, summaries). Calls opt in or out individually.
+    """
+    
+    enabled: bool = Field(default=True, description="Master switch for the response cache")
+    default_enabled: bool = Field(
+        default=False,
+        description="Cache calls that neither opt in nor opt out (chat turns should stay uncached)"
+    )
+    max_entries: int = Field(default=1000, ge=0, description="Responses kept in the in-memory LRU tier")
+    ttl_seconds: float = Field(default=3600.0, ge=1.0, description="Default time to live of a cached response")
+    cache_path: str | None = Field(
+        default=None,
+        description="SQLite file for the persistent response cache (None = memory only)"
+    )
+
+
+class StatsConfig(BaseModel):
+    """LLM request statistics configuration.
+    
+    Request stats are buffered in memory and written in bulk, and rolled
+    up into hourly/daily aggregates for dashboard queries.
+    """
+    
+    flush_size: int = Field(
+        default=50, ge=1, le=10000,
+        description="Buffered stat records that trigger a bulk write (1 = write-through)"
+    )
+    flush_interval: float = Field(
+        default=2.0, ge=0.0, le=300.0,
+        description="Seconds a stat record may stay buffered before it is written"
+    )
+    rolling_window_minutes: int = Field(
+        default=60, ge=0, le=1440,
+        description="Recent window answered from in-memory aggregates (0 = always query the database)"
+    )
+    raw_retention_days: int = Field(
+        default=90, ge=0,
+        description="Days raw request stats are kept; hourly/daily rollups are kept forever (0 = keep all)"
+    )
+
+
 class ServerConfig(BaseModel):
     """Server configuration."""
     
@@ -61,6 +168,18 @@ class LoggingConfig(BaseModel):
     prompt_llm_file: str = Field(default="logs/prompt-llm.log", description="LLM prompt log file path")
     prompt_llm_max_size: str = Field(default="50MB", description="Max LLM prompt log file size")
     prompt_llm_backup_count: int = Field(default=5, ge=0, description="Number of LLM prompt log backups")
+    prompt_llm_async: bool = Field(default=True, description="Write LLM prompt logs from a background thread")
+    prompt_llm_queue_size: int = Field(default=10000, ge=1, description="Max LLM prompt log entries waiting to be written")
+    prompt_llm_batch_size: int = Field(default=100, ge=1, description="Max LLM prompt log entries per file write")
+    prompt_llm_flush_interval: float = Field(default=0.5, ge=0.0, le=60.0, description="Seconds the writer waits to fill a batch")
+    prompt_llm_overflow: Literal["drop_newest", "drop_oldest", "sample"] = Field(
+        default="drop_newest",
+        description="Policy when the LLM prompt log queue backs up: drop_newest, drop_oldest, or sample"
+    )
+    prompt_llm_sample_rate: float = Field(
+        default=0.1, ge=0.0, le=1.0,
+        description="Fraction of successful entries kept by the sample policy once the queue is half full"
+    )
     
     # Server log configuration
     server_log_file: str = Field(default="logs/server.log", description="Server log file path")
@@ -76,6 +195,12 @@ class WorkspaceConfig(BaseModel):
         default="skills",
         description="User skills directory (relative to workspace path)"
     )
+    watch_debounce_ms: int = Field(
+        default=300,
+        ge=0,
+        le=10000,
+        description="Quiet period before a burst of file events is handled (0 = no debouncing)"
+    )
 
 
 class SearchConfig(BaseModel):
@@ -108,6 +233,34 @@ class SearchConfig(BaseModel):
         le=100,
         description="Maximum number of search results to return"
     )
+    fusion: Literal["weighted", "rrf"] = Field(
+        default="weighted",
+        description="Score fusion: 'weighted' sum of scores or 'rrf' reciprocal-rank fusion"
+    )
+    rrf_k: int = Field(
+        default=60,
+        ge=1,
+        le=1000,
+        description="Rank offset k for reciprocal-rank fusion"
+    )
+    vector_index: Literal["exact", "ivf"] = Field(
+        default="exact",
+        description="Vector index: 'exact' brute force or 'ivf' approximate (large corpora)"
+    )
+    ivf_nlist: int | None = Field(
+        default=None,
+        ge=1,
+        description="IVF inverted lists (None = about 4 * sqrt(entries))"
+    )
+    ivf_nprobe: int = Field(
+        default=8,
+        ge=1,
+        description="IVF lists scanned per query (higher = better recall, slower)"
+    )
+    embedding_format: Literal["float32", "float16"] = Field(
+        default="float32",
+        description="Stored embedding precision; float16 halves the vector table (rows are converted on change)"
+    )
     
     @model_validator(mode="after")
     def validate_weights(self) -> "SearchConfig":
@@ -118,6 +271,42 @@ class SearchConfig(BaseModel):
         return self
 
 
+class EmbeddingConfig(BaseModel):
+    """Memory embedding configuration.
+    
+    Controls the embedding backend and ONNX batch inference.
+    """
+    
+    backend: Literal["auto", "onnx", "mock"] = Field(
+        default="auto",
+        description="Embedding backend: 'auto' tries ONNX then falls back to mock"
+    )
+    model_path: str | None = Field(
+        default=None,
+        description="Path to ONNX model file (None = download all-MiniLM-L6-v2)"
+    )
+    batch_size: int = Field(
+        default=32,
+        ge=1,
+        le=1024,
+        description="Maximum texts per ONNX inference run"
+    )
+    intra_op_num_threads: int | None = Field(
+        default=None,
+        ge=1,
+        description="ONNX Runtime intra-op threads (None = runtime default)"
+    )
+    cache_size: int = Field(
+        default=10000,
+        ge=0,
+        description="Maximum embeddings kept in the in-memory cache (0 disables caching)"
+    )
+    cache_path: str | None = Field(
+        default=None,
+        description="SQLite file for the persistent embedding cache (None = memory only)"
+    )
+
+
 class CompressionConfig(BaseModel):
     """Context compression configuration.
     
@@ -142,6 +331,10 @@ class CompressionConfig(BaseModel):
         le=200,
         description="Number of most recent messages to retain after compression"
     )
+    incremental_summary: bool = Field(
+        default=True,
+        description="Keep a rolling summary per session and fold in only newly archived messages"
+    )
 
 
 class PlanConfig(BaseModel):
@@ -218,6 +411,87 @@ class SkillsConfig(BaseModel):
         return sorted(matched, key=lambda s: s.priority)
 
 
+class WebFetchConfig(BaseModel):
+    """Web fetching (fetch_web_content) configuration."""
+    
+    max_connections: int = Field(
+        default=50,
+        ge=1,
+        le=1000,
+        description="Maximum open HTTP connections across all hosts"
+    )
+    max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        le=1000,
+        description="Maximum idle keep-alive connections kept open"
+    )
+    keepalive_expiry: float = Field(
+        default=30.0,
+        ge=0,
+        le=600,
+        description="Seconds an idle keep-alive connection is kept"
+    )
+    max_per_host: int = Field(
+        default=6,
+        ge=1,
+        le=100,
+        description="Maximum concurrent requests to one host"
+    )
+    http2: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 where supported (requires the h2 package)"
+    )
+    extract_workers: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Workers for HTML parsing and content extraction"
+    )
+    extract_mode: Literal["process", "thread"] = Field(
+        default="process",
+        description="Run extraction in worker processes or threads"
+    )
+    extract_timeout: float = Field(
+        default=15.0,
+        gt=0,
+        le=300,
+        description=(
+            "Seconds allowed to extract one page; in thread mode the parse "
+            "keeps running after the caller gives up"
+        )
+    )
+    max_page_bytes: int = Field(
+        default=5 * 1024 * 1024,
+        ge=64 * 1024,
+        description="Response bodies are truncated to this many bytes before extraction"
+    )
+    cache_ttl_hours: int = Field(
+        default=72,
+        ge=1,
+        description="Hours a fetched page is served from cache without revalidation"
+    )
+    stale_while_revalidate: bool = Field(
+        default=True,
+        description="Serve expired pages immediately and revalidate them in the background"
+    )
+    cache_stale_retention_hours: int = Field(
+        default=168,
+        ge=0,
+        description="Hours expired pages are kept for conditional revalidation"
+    )
+    cache_max_entries: int = Field(
+        default=5000,
+        ge=0,
+        description="Maximum cached pages before LRU eviction (0 for no limit)"
+    )
+    cache_max_mb: int = Field(
+        default=500,
+        ge=0,
+        description="Maximum cached page content in MB before LRU eviction (0 for no limit)"
+    )
+
+
 class ToolsConfig(BaseModel):
     """Tools configuration.
     
@@ -285,6 +559,16 @@ class ToolsConfig(BaseModel):
         ],
         description="List of high-risk commands requiring user confirmation"
     )
+    max_parallel_tools: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum parallel-safe tool calls from one LLM response run concurrently (1 = sequential)"
+    )
+    web_fetch: WebFetchConfig = Field(
+        default_factory=WebFetchConfig,
+        description="Web fetching configuration"
+    )
 
 
 class AliyunOpensearchSearchParams(BaseModel):
@@ -326,10 +610,14 @@ class Config(BaseModel):
     """Root configuration model."""
     
     models: list[ModelConfig] = Field(..., min_length=1, description="Model configurations")
+    llm_routing: LLMRoutingConfig = Field(default_factory=LLMRoutingConfig, description="LLM routing config")
+    llm_cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig, description="LLM response cache config")
+    stats: StatsConfig = Field(default_factory=StatsConfig, description="LLM request statistics config")
     server: ServerConfig = Field(default_factory=ServerConfig, description="Server config")
     logging: LoggingConfig = Field(default_factory=LoggingConfig, description="Logging config")
     workspace: WorkspaceConfig = Field(default_factory=WorkspaceConfig, description="Workspace config")
     search: SearchConfig = Field(default_factory=SearchConfig, description="Hybrid search config")
+    embedding: EmbeddingConfig = Field(default_factory=EmbeddingConfig, description="Memory embedding config")
     tools: ToolsConfig = Field(default_factory=ToolsConfig, description="Tools config")
     compression: CompressionConfig = Field(default_factory=CompressionConfig, description="Context compression config")
     plan: PlanConfig = Field(default_factory=PlanConfig, description="Plan mode config")
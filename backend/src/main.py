@@ -14,7 +14,7 @@ from .config.manager import ConfigManager
 from .core.context import context_manager, ContextSource
 from .services.storage import init_storage, close_storage
 from .services.llm.router import LLMRouter
-from .utils.logger import get_logger, setup_logging
+from .utils.logger import get_llm_prompt_logger, get_logger, setup_logging
 
 logger = get_logger(__name__)
 
@@ -107,10 +107,48 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     # 3. Initialize database
     await init_storage()
+    from .services.stat_service import init_stat_service
+    stat_service = init_stat_service(
+        flush_size=config.stats.flush_size,
+        flush_interval=config.stats.flush_interval,
+        rolling_window_minutes=config.stats.rolling_window_minutes,
+        raw_retention_days=config.stats.raw_retention_days,
+    )
+    await stat_service.ensure_rollups()
     logger.info("Database initialized")
     
-    # 4. Initialize LLM router
+    # 4. Initialize LLM router (provider health is probed in the background)
+    from .services.llm.health_monitor import provider_health_monitor
+    provider_health_monitor.configure(
+        interval=config.llm_routing.health_check_interval,
+        ttl=config.llm_routing.health_check_ttl,
+        max_backoff=config.llm_routing.health_check_max_backoff,
+        probe_timeout=config.llm_routing.health_check_timeout,
+    )
+    from .services.llm.routing_policy import routing_policy
+    routing_policy.configure(
+        strategy=config.llm_routing.strategy,
+        hedge_enabled=config.llm_routing.hedge_enabled,
+        hedge_multiplier=config.llm_routing.hedge_multiplier,
+        hedge_min_delay_ms=config.llm_routing.hedge_min_delay_ms,
+        hedge_max_delay_ms=config.llm_routing.hedge_max_delay_ms,
+        min_samples=config.llm_routing.latency_min_samples,
+        latency_window=config.llm_routing.latency_window,
+        coalesce_requests=config.llm_routing.coalesce_requests,
+    )
+    from .services.llm.response_cache import init_response_cache
+    init_response_cache(
+        max_entries=config.llm_cache.max_entries,
+        ttl=config.llm_cache.ttl_seconds,
+        db_path=(
+            str(Path(config.llm_cache.cache_path).expanduser())
+            if config.llm_cache.cache_path else None
+        ),
+        default_enabled=config.llm_cache.default_enabled,
+        enabled=config.llm_cache.enabled,
+    )
     _llm_router = LLMRouter(config.models)
+    provider_health_monitor.ensure_started()
     logger.info(
         "LLM router initialized",
         extra={
@@ -119,6 +157,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         },
     )
     
+    # 4.5 Shared HTTP connection pool for web fetching
+    from .tools.builtin.web_fetch.http_client import init_http_client_pool
+    web_fetch_config = config.tools.web_fetch
+    init_http_client_pool(
+        max_connections=web_fetch_config.max_connections,
+        max_keepalive_connections=web_fetch_config.max_keepalive_connections,
+        keepalive_expiry=web_fetch_config.keepalive_expiry,
+        max_per_host=web_fetch_config.max_per_host,
+        http2=web_fetch_config.http2,
+    )
+    from .tools.builtin.web_fetch.extraction import init_extraction_pool
+    init_extraction_pool(
+        workers=web_fetch_config.extract_workers,
+        mode=web_fetch_config.extract_mode,
+        time_budget=web_fetch_config.extract_timeout,
+        max_document_bytes=web_fetch_config.max_page_bytes,
+    )
+    
     # 5. Start config watcher for hot-reload
     _config_manager.start_watcher()
     logger.info("Configuration watcher started")
@@ -142,12 +198,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         backend_dir = Path(__file__).parent
         workspace_path = str((backend_dir / raw_workspace_path).resolve())
     
-    _file_watcher = get_file_watcher(workspace_path)
+    _file_watcher = get_file_watcher(
+        workspace_path,
+        debounce_seconds=config.workspace.watch_debounce_ms / 1000,
+    )
     
     # Get dependencies for sync
     md_sync = get_md_sync(workspace_path)
-    vector_store = get_vector_store()
-    embedder = get_embedder()
+    vector_store = get_vector_store(
+        embedding_format=config.search.embedding_format,
+        index_type=config.search.vector_index,
+        ivf_nlist=config.search.ivf_nlist,
+        ivf_nprobe=config.search.ivf_nprobe,
+    )
+    embedder = get_embedder(
+        backend=config.embedding.backend,
+        model_path=config.embedding.model_path,
+        batch_size=config.embedding.batch_size,
+        intra_op_num_threads=config.embedding.intra_op_num_threads,
+        cache_size=config.embedding.cache_size,
+        cache_path=(
+            str(Path(config.embedding.cache_path).expanduser())
+            if config.embedding.cache_path else None
+        ),
+    )
     
     # Define sync callback for memory file changes
     def on_memory_file_changed(file_path: str) -> None:
@@ -204,8 +278,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if _llm_router:
         await _llm_router.close()
         logger.info("LLM router closed")
-    
-    # 4. Close database connections
+    from .services.llm.health_monitor import provider_health_monitor
+    from .services.llm.response_cache import get_response_cache
+    await provider_health_monitor.stop()
+    get_response_cache().close()
+    get_llm_prompt_logger().close()
+    from .tools.builtin.web_fetch.http_client import close_http_client_pool
+    await close_http_client_pool()
+    from .tools.builtin.web_fetch.extraction import close_extraction_pool
+    close_extraction_pool()
+    from .tools.builtin.web_fetch.sqlite_index import close_sqlite_index_manager
+    await close_sqlite_index_manager()
+    
+    # 4. Close database connections (saves the IVF vector index snapshot)
+    from .services.stat_service import get_stat_service
+    await get_stat_service().close()
+    vector_store.close()
     await close_storage()
     logger.info("Database connections closed")
     
@@ -3,6 +3,7 @@
 This module provides:
 - ONNXEmbedder: ONNX Runtime based embedding (PyTorch-free)
 - MockEmbedder: Simple embedder for testing (random embeddings)
+- Embedder: Facade with content-hash embedding cache
 
 All embedding functionality is self-contained in this module.
 Only requires: onnxruntime, numpy
@@ -20,6 +21,7 @@ from typing import Any
 import numpy as np
 
 from ._logger import get_memory_logger
+from .embedding_cache import EmbeddingCache
 
 logger = get_memory_logger(__name__)
 
@@ -40,6 +42,7 @@ class MockEmbedder:
             dimension: Embedding dimension (default: 384)
         """
         self.dimension = dimension
+        self.model_id = f"mock:{dimension}"
         self._is_mock = True
         logger.info(
             "MockEmbedder initialized",
@@ -70,22 +73,53 @@ class ONNXEmbedder:
     
     EMBEDDING_DIM = 384
     DEFAULT_MODEL_URL = "https://huggingface.co/sentence-transformers/all-MiniLM-L6-v2/resolve/main/onnx/model.onnx"
+    TOKENIZER_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+    MAX_LENGTH = 256
     
-    def __init__(self, model_path: str | None = None) -> None:
+    def __init__(
+        self,
+        model_path: str | None = None,
+        batch_size: int = 32,
+        intra_op_num_threads: int | None = None,
+    ) -> None:
         """Initialize ONNX embedder.
         
         Args:
             model_path: Path to ONNX model file. If None, downloads default model.
+            batch_size: Maximum texts per ONNX session run
+            intra_op_num_threads: ONNX Runtime intra-op threads (None = runtime default)
         """
         self.model_path = model_path
+        self.batch_size = max(1, batch_size)
+        self.intra_op_num_threads = intra_op_num_threads
         self._session: Any = None
+        self._tokenizer: Any = None
+        self._tokenizer_unavailable = False
         self._initialized = False
+        self.fallback_count = 0
         
         logger.info(
             "ONNXEmbedder created",
-            extra={"model_path": model_path or "default"}
+            extra={
+                "model_path": model_path or "default",
+                "batch_size": self.batch_size,
+                "intra_op_num_threads": intra_op_num_threads,
+            }
         )
     
+    @property
+    def model_id(self) -> str:
+        """Identifier of the model and pooling producing the embeddings."""
+        name = Path(self.model_path).name if self.model_path else "all-MiniLM-L6-v2"
+        return f"onnx:{name}:mean"
+    
+    def _create_session(self, ort: Any, path: str, providers: list[str]) -> Any:
+        """Create an inference session with the configured thread settings."""
+        options = ort.SessionOptions()
+        if self.intra_op_num_threads:
+            options.intra_op_num_threads = self.intra_op_num_threads
+        return ort.InferenceSession(path, sess_options=options, providers=providers)
+    
     def _load_model(self) -> Any:
         """Load the ONNX model."""
         if self._session is not None:
@@ -98,7 +132,7 @@ class ONNXEmbedder:
             
             if self.model_path and Path(self.model_path).exists():
                 logger.info("Loading ONNX model from path", extra={"path": self.model_path})
-                self._session = ort.InferenceSession(self.model_path, providers=providers)
+                self._session = self._create_session(ort, self.model_path, providers)
             else:
                 self._session = self._download_and_load_default_model(ort, providers)
             
@@ -134,14 +168,14 @@ class ONNXEmbedder:
                     # Verify model file size matches (basic integrity check)
                     if config.get('model_size') == model_file.stat().st_size:
                         logger.debug("Using cached ONNX model", extra={"path": str(model_file)})
-                        return ort.InferenceSession(str(model_file), providers=providers)
+                        return self._create_session(ort, str(model_file), providers)
                 except Exception as e:
                     logger.debug("Cache validation failed, re-downloading", extra={"error": str(e)})
             
             # If we get here, cache is invalid but model file exists
             logger.info("Found existing model file, attempting to load without validation")
             try:
-                session = ort.InferenceSession(str(model_file), providers=providers)
+                session = self._create_session(ort, str(model_file), providers)
                 # Cache is valid if we can load the model
                 return session
             except Exception as e:
@@ -163,28 +197,42 @@ class ONNXEmbedder:
                     'downloaded_at': datetime.utcnow().isoformat()
                 }, f)
             
-            return ort.InferenceSession(str(model_file), providers=providers)
+            return self._create_session(ort, str(model_file), providers)
         except Exception as e:
             logger.error("Failed to download model", extra={"error": str(e)})
             return None
     
-    def _tokenize(self, text: str) -> dict[str, np.ndarray]:
-        """Tokenize text for ONNX model.
+    def _get_tokenizer(self) -> Any:
+        """Load the tokenizer once (None if transformers is unavailable)."""
+        if self._tokenizer is None and not self._tokenizer_unavailable:
+            try:
+                from transformers import AutoTokenizer
+                
+                self._tokenizer = AutoTokenizer.from_pretrained(self.TOKENIZER_NAME)
+            except ImportError:
+                logger.warning("transformers not installed, using fallback tokenization")
+                self._tokenizer_unavailable = True
+            except Exception as e:
+                logger.error(f"Tokenizer load failed: {e}, using fallback")
+                self._tokenizer_unavailable = True
+        return self._tokenizer
+    
+    def _tokenize(self, texts: list[str]) -> dict[str, np.ndarray]:
+        """Tokenize a batch of texts for the ONNX model.
         
-        Uses bert-base-uncased tokenizer which is compatible with all-MiniLM-L6-v2.
+        Uses the all-MiniLM-L6-v2 tokenizer, padding to the longest text
+        in the batch.
         """
+        tokenizer = self._get_tokenizer()
+        if tokenizer is None:
+            return self._fallback_tokenize(texts)
+        
         try:
-            from transformers import AutoTokenizer
-            
-            # Load tokenizer (cached after first download)
-            tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
-            
-            # Tokenize with padding and truncation
             encoded = tokenizer(
-                text,
+                texts,
                 padding=True,
                 truncation=True,
-                max_length=256,
+                max_length=self.MAX_LENGTH,
                 return_tensors="np"
             )
             
@@ -193,28 +241,24 @@ class ONNXEmbedder:
                 "attention_mask": encoded["attention_mask"].astype(np.int64),
                 "token_type_ids": encoded.get("token_type_ids", np.zeros_like(encoded["input_ids"])).astype(np.int64),
             }
-        except ImportError:
-            logger.warning("transformers not installed, using fallback tokenization")
-            return self._fallback_tokenize(text)
         except Exception as e:
             logger.error(f"Tokenization failed: {e}, using fallback")
-            return self._fallback_tokenize(text)
+            return self._fallback_tokenize(texts)
     
-    def _fallback_tokenize(self, text: str) -> dict[str, np.ndarray]:
+    def _fallback_tokenize(self, texts: list[str]) -> dict[str, np.ndarray]:
         """Fallback character-based tokenization."""
         # Use character-level encoding as fallback
-        chars = list(text.lower())[:256]
-        
         # Simple char-to-id mapping (not ideal but better than hash)
-        char_ids = [ord(c) % 30000 for c in chars]
+        rows = [[ord(c) % 30000 for c in text.lower()[:self.MAX_LENGTH]] for text in texts]
         
-        # Pad to reasonable length
-        while len(char_ids) < 16:
-            char_ids.append(0)
-        
-        input_ids = np.array([char_ids], dtype=np.int64)
-        attention_mask = np.ones_like(input_ids, dtype=np.int64)
-        token_type_ids = np.zeros_like(input_ids, dtype=np.int64)
+        # Pad to the longest text (at least a reasonable length)
+        width = max(16, max((len(r) for r in rows), default=0))
+        input_ids = np.zeros((len(rows), width), dtype=np.int64)
+        attention_mask = np.zeros_like(input_ids)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :max(len(row), 1)] = 1
+        token_type_ids = np.zeros_like(input_ids)
         
         return {
             "input_ids": input_ids,
@@ -222,6 +266,49 @@ class ONNXEmbedder:
             "token_type_ids": token_type_ids,
         }
     
+    def _run_batch(self, session: Any, texts: list[str]) -> np.ndarray:
+        """Embed one batch with a single session run.
+        
+        Token embeddings are mean-pooled over the attention mask, then
+        L2-normalised.
+        
+        Returns:
+            Array of shape (len(texts), EMBEDDING_DIM)
+        """
+        inputs = self._tokenize(texts)
+        
+        # Only feed the inputs the model declares
+        try:
+            input_names = {i.name for i in session.get_inputs()}
+            inputs = {k: v for k, v in inputs.items() if k in input_names}
+        except Exception:
+            pass
+        
+        output = np.asarray(session.run(None, inputs)[0], dtype=np.float32)
+        
+        if output.ndim == 3:
+            # (batch, seq, dim): mean pooling with attention mask
+            mask = inputs.get("attention_mask")
+            if mask is None:
+                mask = np.ones(output.shape[:2], dtype=np.float32)
+            mask = mask[:, :output.shape[1], None].astype(np.float32)
+            summed = (output * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings = summed / counts
+        elif output.ndim == 2:
+            embeddings = output
+        else:
+            embeddings = output.reshape(len(texts), -1)
+        
+        if embeddings.shape[1] > self.EMBEDDING_DIM:
+            embeddings = embeddings[:, :self.EMBEDDING_DIM]
+        elif embeddings.shape[1] < self.EMBEDDING_DIM:
+            embeddings = np.pad(embeddings, ((0, 0), (0, self.EMBEDDING_DIM - embeddings.shape[1])))
+        
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+    
     def embed(self, text: str) -> list[float]:
         """Generate embedding for text.
         
@@ -231,47 +318,53 @@ class ONNXEmbedder:
         Returns:
             Embedding vector (384 dimensions)
         """
+        return self.embed_batch([text])[0]
+    
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for multiple texts.
+        
+        Texts are bucketed by length so short memories are batched
+        together instead of being padded to the longest text, and each
+        bucket of up to ``batch_size`` texts is one session run.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Embedding vectors in input order
+        """
+        if not texts:
+            return []
+        
         session = self._load_model()
         
         if session is None:
             logger.warning("ONNX session not available, using mock fallback")
+            self.fallback_count += len(texts)
             mock = MockEmbedder(self.EMBEDDING_DIM)
-            return mock.embed(text)
+            return mock.embed_batch(texts)
         
-        try:
-            inputs = self._tokenize(text)
-            outputs = session.run(None, inputs)
-            
-            output = outputs[0]
-            if len(output.shape) == 3:
-                embedding = output[0, 0, :]
-            elif len(output.shape) == 2:
-                if output.shape[0] == 1:
-                    embedding = output[0]
-                else:
-                    embedding = output[0, :]
-            else:
-                embedding = output.flatten()[:self.EMBEDDING_DIM]
-            
-            if len(embedding) > self.EMBEDDING_DIM:
-                embedding = embedding[:self.EMBEDDING_DIM]
-            elif len(embedding) < self.EMBEDDING_DIM:
-                embedding = np.pad(embedding, (0, self.EMBEDDING_DIM - len(embedding)))
-            
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
-            
-            return embedding.tolist()
-            
-        except Exception as e:
-            logger.error("Failed to generate embedding", extra={"error": str(e)})
-            mock = MockEmbedder(self.EMBEDDING_DIM)
-            return mock.embed(text)
-    
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
-        return [self.embed(text) for text in texts]
+        results: list[list[float] | None] = [None] * len(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        
+        for start in range(0, len(order), self.batch_size):
+            bucket = order[start:start + self.batch_size]
+            bucket_texts = [texts[i] for i in bucket]
+            try:
+                embeddings = self._run_batch(session, bucket_texts)
+                for i, embedding in zip(bucket, embeddings, strict=True):
+                    results[i] = embedding.tolist()
+            except Exception as e:
+                logger.error(
+                    "Failed to generate embeddings",
+                    extra={"error": str(e), "batch_size": len(bucket_texts)}
+                )
+                self.fallback_count += len(bucket_texts)
+                mock = MockEmbedder(self.EMBEDDING_DIM)
+                for i, text in zip(bucket, bucket_texts, strict=True):
+                    results[i] = mock.embed(text)
+        
+        return results  # type: ignore[return-value]
 
 
 class Embedder:
@@ -279,6 +372,9 @@ class Embedder:
     
     Uses ONNX Runtime by default, with Mock fallback.
     PyTorch-free implementation.
+    
+    Embeddings are cached by (model id, hash of normalised text), so
+    repeated queries and unchanged entries are not re-embedded.
     """
     
     EMBEDDING_DIM = 384
@@ -288,6 +384,10 @@ class Embedder:
         backend: str = "auto",
         model_path: str | None = None,
         dimension: int = 384,
+        batch_size: int = 32,
+        intra_op_num_threads: int | None = None,
+        cache_size: int = 10000,
+        cache_path: str | None = None,
     ) -> None:
         """Initialize embedder.
         
@@ -295,10 +395,16 @@ class Embedder:
             backend: Backend type ('onnx', 'mock')
             model_path: Path to ONNX model (optional)
             dimension: Embedding dimension
+            batch_size: Maximum texts per ONNX session run
+            intra_op_num_threads: ONNX Runtime intra-op threads (None = runtime default)
+            cache_size: Maximum embeddings in the in-memory cache (0 disables caching)
+            cache_path: SQLite file for the persistent cache tier (None = memory only)
         """
         self.backend = backend
         self.model_path = model_path
         self.dimension = dimension
+        self.batch_size = batch_size
+        self.intra_op_num_threads = intra_op_num_threads
         self._impl: Any = None
         
         if backend == "mock":
@@ -309,15 +415,24 @@ class Embedder:
             logger.warning(f"Unknown backend '{backend}', using ONNX")
             self._impl = self._init_onnx(model_path, dimension)
         
+        self.model_id: str = getattr(self._impl, "model_id", type(self._impl).__name__)
+        self._cache: EmbeddingCache | None = None
+        if cache_size > 0 or cache_path:
+            self._cache = EmbeddingCache(self.model_id, max_entries=cache_size, db_path=cache_path)
+        
         logger.info(
             "Embedder initialized",
-            extra={"backend": backend, "dimension": dimension}
+            extra={"backend": backend, "dimension": dimension, "model_id": self.model_id}
         )
     
     def _init_onnx(self, model_path: str | None, dimension: int) -> Any:
         """Initialize ONNX embedder."""
         try:
-            embedder = ONNXEmbedder(model_path)
+            embedder = ONNXEmbedder(
+                model_path,
+                batch_size=self.batch_size,
+                intra_op_num_threads=self.intra_op_num_threads,
+            )
             # Test if it works
             test_embedding = embedder.embed("test")
             if len(test_embedding) == dimension:
@@ -334,11 +449,59 @@ class Embedder:
     
     def embed(self, text: str) -> list[float]:
         """Generate embedding for text."""
-        return self._impl.embed(text)
+        return self.embed_batch([text])[0]
     
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
-        return self._impl.embed_batch(texts)
+        """Generate embeddings for multiple texts.
+        
+        Only cache misses are sent to the backend, in a single batch.
+        """
+        if self._cache is None or not texts:
+            return self._impl.embed_batch(texts)
+        
+        results = self._cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(results) if embedding is None]
+        if not missing:
+            return results  # type: ignore[return-value]
+        
+        # Deduplicate misses so repeated texts are embedded once
+        unique: dict[str, list[int]] = {}
+        for i in missing:
+            unique.setdefault(self._cache.key(texts[i]), []).append(i)
+        miss_texts = [texts[idx[0]] for idx in unique.values()]
+        
+        fallbacks_before = self.fallback_count
+        embeddings = self._impl.embed_batch(miss_texts)
+        
+        for indices, embedding in zip(unique.values(), embeddings, strict=True):
+            for i in indices:
+                results[i] = embedding
+        
+        # Never cache mock vectors produced by a failed ONNX run
+        if self.fallback_count == fallbacks_before:
+            self._cache.put_many(miss_texts, embeddings)
+        
+        return results  # type: ignore[return-value]
+    
+    @property
+    def fallback_count(self) -> int:
+        """Texts the backend embedded with the mock fallback so far."""
+        return getattr(self._impl, "fallback_count", 0)
+    
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get embedding cache metrics.
+        
+        Returns:
+            Dictionary with hit/miss counts (``enabled`` False if caching is off)
+        """
+        if self._cache is None:
+            return {"enabled": False, "model_id": self.model_id}
+        return {"enabled": True, **self._cache.stats()}
+    
+    def clear_cache(self) -> None:
+        """Drop cached embeddings for the current model."""
+        if self._cache is not None:
+            self._cache.clear()
 
 
 # Global embedder instance
@@ -349,6 +512,10 @@ def get_embedder(
     backend: str = "auto",
     model_path: str | None = None,
     dimension: int = 384,
+    batch_size: int = 32,
+    intra_op_num_threads: int | None = None,
+    cache_size: int = 10000,
+    cache_path: str | None = None,
 ) -> Embedder:
     """Get or create global embedder instance.
     
@@ -359,13 +526,25 @@ def get_embedder(
             - mock: Use mock embedder
         model_path: Path to ONNX model file
         dimension: Embedding dimension
+        batch_size: Maximum texts per ONNX session run
+        intra_op_num_threads: ONNX Runtime intra-op threads
+        cache_size: Maximum embeddings in the in-memory cache
+        cache_path: SQLite file for the persistent cache tier
         
     Returns:
         Embedder instance
     """
     global _embedder
     if _embedder is None:
-        _embedder = Embedder(backend=backend, model_path=model_path, dimension=dimension)
+        _embedder = Embedder(
+            backend=backend,
+            model_path=model_path,
+            dimension=dimension,
+            batch_size=batch_size,
+            intra_op_num_threads=intra_op_num_threads,
+            cache_size=cache_size,
+            cache_path=cache_path,
+        )
     return _embedder
 
 
@@ -373,6 +552,10 @@ def init_embedder(
     backend: str = "auto",
     model_path: str | None = None,
     dimension: int = 384,
+    batch_size: int = 32,
+    intra_op_num_threads: int | None = None,
+    cache_size: int = 10000,
+    cache_path: str | None = None,
 ) -> Embedder:
     """Initialize global embedder instance.
     
@@ -380,10 +563,22 @@ def init_embedder(
         backend: Backend type ('auto', 'onnx', 'mock')
         model_path: Path to ONNX model
         dimension: Embedding dimension
+        batch_size: Maximum texts per ONNX session run
+        intra_op_num_threads: ONNX Runtime intra-op threads
+        cache_size: Maximum embeddings in the in-memory cache
+        cache_path: SQLite file for the persistent cache tier
         
     Returns:
         Embedder instance
     """
     global _embedder
-    _embedder = Embedder(backend=backend, model_path=model_path, dimension=dimension)
+    _embedder = Embedder(
+        backend=backend,
+        model_path=model_path,
+        dimension=dimension,
+        batch_size=batch_size,
+        intra_op_num_threads=intra_op_num_threads,
+        cache_size=cache_size,
+        cache_path=cache_path,
+    )
     return _embedder
@@ -0,0 +1,241 @@
+"""Content-hash embedding cache.
+
+This module provides:
+- Cache keys from (model id, SHA-256 of normalised text)
+- Bounded in-memory LRU tier
+- Optional SQLite tier that survives restarts
+- Hit/miss metrics
+"""
+
+import contextlib
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ._logger import get_memory_logger
+
+logger = get_memory_logger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Normalise text before hashing.
+
+    Applies NFC normalisation and collapses runs of whitespace, which the
+    embedding tokenizer ignores anyway.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by model and text content.
+
+    Lookups go to the in-memory LRU first, then to the SQLite tier (if
+    configured); disk hits are promoted into memory. Embeddings are
+    copied in and out, so callers may mutate what they pass or receive.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        max_entries: int = 10000,
+        db_path: str | None = None,
+    ) -> None:
+        """Initialize embedding cache.
+
+        Args:
+            model_id: Identifier of the model producing the embeddings
+            max_entries: Maximum embeddings kept in memory
+            db_path: SQLite file for the persistent tier (None = memory only)
+        """
+        self.model_id = model_id
+        self.max_entries = max(0, max_entries)
+        self.db_path = db_path
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str) -> None:
+        """Open the persistent tier, disabling it on failure."""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    key TEXT PRIMARY KEY,
+                    model_id TEXT NOT NULL,
+                    embedding BLOB NOT NULL
+                )
+            """)
+            # stats() and clear() filter by model
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_model_id ON embedding_cache (model_id)"
+            )
+            conn.commit()
+            self._conn = conn
+            logger.info("Embedding cache disk tier opened", extra={"db_path": db_path})
+        except Exception as e:
+            logger.warning(
+                "Embedding cache disk tier unavailable, using memory only",
+                extra={"db_path": db_path, "error": str(e)}
+            )
+            self._conn = None
+
+    def key(self, text: str) -> str:
+        """Cache key for a text under this cache's model."""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model_id}:{digest}"
+
+    def get(self, text: str) -> list[float] | None:
+        """Look up a single text."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up several texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Cached embeddings in input order (None for misses), each a
+            fresh list
+        """
+        keys = [self.key(text) for text in texts]
+        results: list[list[float] | None] = [None] * len(texts)
+        pending: dict[str, list[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = list(embedding)
+                    self.hits += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+
+            if pending and self._conn is not None:
+                for key, embedding in self._load(list(pending)).items():
+                    self._remember(key, embedding)
+                    for i in pending.pop(key):
+                        results[i] = list(embedding)
+                        self.hits += 1
+                        self.disk_hits += 1
+
+            self.misses += sum(len(idx) for idx in pending.values())
+
+        return results
+
+    def put(self, text: str, embedding: list[float]) -> None:
+        """Store a single embedding."""
+        self.put_many([text], [embedding])
+
+    def put_many(self, texts: list[str], embeddings: list[list[float]]) -> None:
+        """Store several embeddings in both tiers.
+
+        Args:
+            texts: Source texts
+            embeddings: Embeddings in the same order
+        """
+        items = {self.key(text): list(embedding) for text, embedding in zip(texts, embeddings, strict=True)}
+        if not items:
+            return
+
+        with self._lock:
+            for key, embedding in items.items():
+                self._remember(key, embedding)
+
+            if self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embedding_cache (key, model_id, embedding) VALUES (?, ?, ?)",
+                        [
+                            (key, self.model_id, np.asarray(embedding, dtype=np.float32).tobytes())
+                            for key, embedding in items.items()
+                        ],
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logger.warning("Embedding cache write failed", extra={"error": str(e)})
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        """Insert into the LRU tier (lock held)."""
+        if self.max_entries == 0:
+            return
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: list[str]) -> dict[str, list[float]]:
+        """Fetch keys from the SQLite tier (lock held)."""
+        found: dict[str, list[float]] = {}
+        try:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(  # type: ignore[union-attr]
+                    f"SELECT key, embedding FROM embedding_cache WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        except Exception as e:
+            logger.warning("Embedding cache read failed", extra={"error": str(e)})
+        return found
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache metrics.
+
+        Returns:
+            Dictionary with hits, misses, hit rate and tier sizes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats: dict[str, Any] = {
+                "model_id": self.model_id,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._conn is not None,
+            }
+            if self._conn is not None:
+                with contextlib.suppress(Exception):
+                    stats["disk_entries"] = self._conn.execute(
+                        "SELECT COUNT(*) FROM embedding_cache WHERE model_id = ?",
+                        (self.model_id,),
+                    ).fetchone()[0]
+            return stats
+
+    def clear(self) -> None:
+        """Drop all cached embeddings for this model and reset metrics."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embedding_cache WHERE model_id = ?", (self.model_id,))
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
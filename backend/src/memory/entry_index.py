@@ -0,0 +1,318 @@
+"""Incremental index of parsed daily log entries.
+
+This module provides:
+- Per-file cache of parsed memory entries keyed by (mtime, size)
+- Incremental refresh that only re-parses changed daily logs
+- Constant-time entry lookup by ID
+- Invalidation hooks for the file watcher and local writes
+- Change listeners notified of added/updated and removed entries
+- Lookups return copies, so callers cannot alter the cached entries
+"""
+
+import os
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..utils.logger import get_logger
+from .models import MemoryEntry
+
+logger = get_logger(__name__)
+
+# Called with (added_or_updated_entries, removed_entry_ids)
+EntryListener = Callable[[list[MemoryEntry], list[str]], None]
+
+
+def _copy(entry: MemoryEntry) -> MemoryEntry:
+    """Copy of a cached entry, safe for the caller to modify."""
+    return entry.model_copy(deep=True)
+
+
+@dataclass
+class IndexedLog:
+    """Parsed state of a single daily log file.
+
+    Attributes:
+        date: Log date (file stem)
+        file_path: Path to the log file
+        mtime_ns: File modification time when parsed
+        size: File size when parsed
+        entries: Parsed entries in file order
+        by_id: Entry ID to entry mapping
+    """
+    date: str
+    file_path: str
+    mtime_ns: int
+    size: int
+    entries: list[MemoryEntry] = field(default_factory=list)
+    by_id: dict[str, MemoryEntry] = field(default_factory=dict)
+
+
+class EntryIndex:
+    """In-process index of memory entries parsed from daily logs.
+
+    Each log file is parsed at most once per (mtime, size) change.
+    Lookups stat the memory directory but never re-read unchanged files,
+    so the per-turn cost stays flat as daily logs accumulate.
+
+    Thread-safe: the file watcher feeds invalidations from its own thread.
+    Refreshes hold the lock while parsing, so an invalidation arriving
+    mid-parse applies to the freshly parsed log instead of being lost.
+    Entries handed out are copies; listeners receive the cached entries
+    and must not modify them.
+    """
+
+    def __init__(
+        self,
+        memory_path: Path,
+        parser: Callable[[str, Path], list[MemoryEntry]],
+    ) -> None:
+        """Initialize entry index.
+
+        Args:
+            memory_path: Directory containing daily log files
+            parser: Callable parsing (date, file_path) into entries
+        """
+        self.memory_path = memory_path
+        self._parser = parser
+        self._logs: dict[str, IndexedLog] = {}
+        self._by_id: dict[str, MemoryEntry] = {}
+        self._lock = threading.RLock()
+        self._parse_count = 0
+        self._listeners: list[EntryListener] = []
+
+    @property
+    def parse_count(self) -> int:
+        """Number of file parses performed since creation."""
+        return self._parse_count
+
+    def add_listener(self, listener: EntryListener) -> None:
+        """Subscribe to entry changes.
+
+        The listener is first called with every entry already indexed,
+        then with the entries of each re-parsed log and the IDs that
+        disappeared from it. Calls happen on whichever thread refreshes
+        the index.
+
+        Args:
+            listener: Callable receiving (added_or_updated, removed_ids)
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            current = list(self._by_id.values())
+            if current:
+                self._call(listener, current, [])
+
+    def remove_listener(self, listener: EntryListener) -> None:
+        """Unsubscribe a listener added with add_listener().
+
+        Args:
+            listener: Listener to remove (ignored if not subscribed)
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the memory directory.
+
+        Stats every ``*.md`` file, re-parses only those whose mtime or
+        size changed, and drops logs that no longer exist.
+        """
+        seen: set[str] = set()
+
+        with self._lock:
+            if self.memory_path.exists():
+                try:
+                    with os.scandir(self.memory_path) as it:
+                        for dirent in it:
+                            if not dirent.name.endswith(".md") or not dirent.is_file():
+                                continue
+                            date = dirent.name[:-3]
+                            seen.add(date)
+                            self._ensure_current(date, Path(dirent.path), dirent.stat())
+                except OSError as e:
+                    logger.warning(
+                        "Failed to scan memory directory",
+                        extra={"memory_path": str(self.memory_path), "error": str(e)}
+                    )
+                    return
+
+            for date in [d for d in self._logs if d not in seen]:
+                self._drop(date)
+
+    def refresh_date(self, date: str) -> IndexedLog | None:
+        """Bring a single daily log up to date.
+
+        Args:
+            date: Log date (file stem)
+
+        Returns:
+            Indexed log if the file exists, None otherwise
+        """
+        file_path = self.memory_path / f"{date}.md"
+        with self._lock:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                self._drop(date)
+                return None
+            return self._ensure_current(date, file_path, stat)
+
+    def invalidate(self, file_path: str | Path) -> None:
+        """Force a re-parse of a log file on next access.
+
+        Called by the file watcher and after local writes, so edits that
+        keep the same mtime and size are still picked up.
+
+        Args:
+            file_path: Path to the changed log file
+        """
+        date = Path(file_path).stem
+        with self._lock:
+            log = self._logs.get(date)
+            if log is not None:
+                log.mtime_ns = -1
+
+    def get_entries(self, date: str) -> list[MemoryEntry]:
+        """Get entries for one daily log.
+
+        Args:
+            date: Log date (file stem)
+
+        Returns:
+            Copies of the entries in file order (empty if the log doesn't exist)
+        """
+        with self._lock:
+            log = self.refresh_date(date)
+            return [_copy(e) for e in log.entries] if log else []
+
+    def get(self, entry_id: str) -> MemoryEntry | None:
+        """Look up an entry by ID.
+
+        Only the log the ID's date prefix points at is checked for changes.
+
+        Args:
+            entry_id: Entry ID (format: YYYY-MM-DD-HH:MM[:SS]-seq)
+
+        Returns:
+            Copy of the MemoryEntry if found, None otherwise
+        """
+        with self._lock:
+            entry = None
+            parts = entry_id.split("-")
+            if len(parts) >= 3:
+                log = self.refresh_date("-".join(parts[:3]))
+                if log is not None:
+                    entry = log.by_id.get(entry_id)
+            if entry is None:
+                entry = self._by_id.get(entry_id)
+            return _copy(entry) if entry is not None else None
+
+    def dates(self) -> list[str]:
+        """Get indexed log dates, newest first.
+
+        Returns:
+            List of file stems sorted descending
+        """
+        with self._lock:
+            return sorted(self._logs, reverse=True)
+
+    def logs_newest_first(self) -> Iterator[IndexedLog]:
+        """Get indexed logs sorted by date, newest first.
+
+        The set of logs is taken when iteration starts; each log is copied
+        only when reached, so callers that stop early copy little.
+
+        Yields:
+            Copies of the indexed logs
+        """
+        with self._lock:
+            logs = [self._logs[d] for d in sorted(self._logs, reverse=True)]
+        for log in logs:
+            entries = [_copy(e) for e in log.entries]
+            yield IndexedLog(
+                date=log.date,
+                file_path=log.file_path,
+                mtime_ns=log.mtime_ns,
+                size=log.size,
+                entries=entries,
+                by_id={e.id: e for e in entries},
+            )
+
+    def clear(self) -> None:
+        """Drop all cached state."""
+        with self._lock:
+            self._logs.clear()
+            self._by_id.clear()
+
+    def _ensure_current(
+        self,
+        date: str,
+        file_path: Path,
+        stat: os.stat_result,
+    ) -> IndexedLog:
+        """Re-parse a log if its (mtime, size) differs from the cached one (lock held)."""
+        cached = self._logs.get(date)
+        if (
+            cached is not None
+            and cached.mtime_ns == stat.st_mtime_ns
+            and cached.size == stat.st_size
+        ):
+            return cached
+
+        entries = self._parser(date, file_path)
+        log = IndexedLog(
+            date=date,
+            file_path=str(file_path),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            entries=entries,
+            by_id={e.id: e for e in entries},
+        )
+
+        previous = self._logs.pop(date, None)
+        removed: list[str] = []
+        if previous is not None:
+            for entry_id in previous.by_id:
+                if entry_id not in log.by_id:
+                    self._by_id.pop(entry_id, None)
+                    removed.append(entry_id)
+        self._logs[date] = log
+        self._by_id.update(log.by_id)
+        self._parse_count += 1
+        self._notify(entries, removed)
+
+        logger.debug(
+            "Daily log indexed",
+            extra={"date": date, "entries_count": len(entries)}
+        )
+        return log
+
+    def _drop(self, date: str) -> None:
+        """Remove a log and its entries from the index (lock held)."""
+        log = self._logs.pop(date, None)
+        if log is None:
+            return
+        for entry_id in log.by_id:
+            self._by_id.pop(entry_id, None)
+        self._notify([], list(log.by_id))
+
+    def _notify(self, added: list[MemoryEntry], removed: list[str]) -> None:
+        """Fan a change out to listeners (lock held)."""
+        if not added and not removed:
+            return
+        for listener in self._listeners:
+            self._call(listener, added, removed)
+
+    @staticmethod
+    def _call(listener: EntryListener, added: list[MemoryEntry], removed: list[str]) -> None:
+        """Invoke one listener, logging instead of propagating failures."""
+        try:
+            listener(added, removed)
+        except Exception as e:
+            logger.warning(
+                "Entry index listener failed",
+                extra={"error": str(e)}
+            )
@@ -4,10 +4,15 @@ This module provides:
 - File system monitoring using watchdog
 - Hot-reload of identity files (SPIRIT.md, OWNER.md)
 - Event handlers for .md file changes
+- Debounced, per-path coalescing dispatch of change events
 """
 
+import os
+import threading
+import time
+from collections.abc import Callable
 from pathlib import Path
-from typing import Callable
+from typing import Any
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
@@ -17,6 +22,195 @@ from ..utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# Files written by this process: path -> (mtime_ns, size) right after the write
+_self_writes: dict[str, tuple[int, int]] = {}
+_self_writes_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> tuple[int, int] | None:
+    """Get (mtime_ns, size) of a file, None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def mark_self_write(path: str | Path) -> None:
+    """Record that this process just wrote a file.
+    
+    Watch events for the file are ignored while its content still matches
+    what was written, so in-process writers that already hold the new state
+    do not trigger a reload of their own change.
+    
+    Args:
+        path: Path of the file that was written
+    """
+    key = os.path.abspath(path)
+    signature = _file_signature(key)
+    if signature is None:
+        return
+    with _self_writes_lock:
+        _self_writes[key] = signature
+
+
+def is_self_write(path: str | Path) -> bool:
+    """Check whether a file still holds content written by this process."""
+    key = os.path.abspath(path)
+    with _self_writes_lock:
+        recorded = _self_writes.get(key)
+        if recorded is None:
+            return False
+        if _file_signature(key) == recorded:
+            return True
+        # Changed by someone else since; stop ignoring it
+        del _self_writes[key]
+        return False
+
+
+class EventDebouncer:
+    """Collapses bursts of events per key and runs them on one worker thread.
+    
+    Each key's callback runs once the key has been quiet for ``window``
+    seconds (or ``max_delay`` after its first event, whichever is first),
+    with the arguments of the latest event. Callbacks never run on the
+    watchdog thread and never run concurrently.
+    """
+    
+    def __init__(self, window: float = 0.3, max_delay: float | None = None) -> None:
+        """Initialize debouncer.
+        
+        Args:
+            window: Quiet period in seconds before a key is dispatched
+            max_delay: Upper bound on how long a key can be postponed
+                (default: 10 x window)
+        """
+        self.window = window
+        self.max_delay = max_delay if max_delay is not None else window * 10
+        # key -> [deadline, first_seen, callback, args, event_count]
+        self._pending: dict[str, list[Any]] = {}
+        self._cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+        self._stopped = False
+        
+        self.events = 0
+        self.dispatched = 0
+        self.coalesced = 0
+    
+    def submit(self, key: str, callback: Callable[..., None], *args: Any) -> None:
+        """Schedule a callback for a key, replacing any pending one.
+        
+        Args:
+            key: Coalescing key (usually the file path)
+            callback: Function to call
+            *args: Arguments for the callback
+        """
+        now = time.monotonic()
+        with self._cond:
+            if self._stopped:
+                return
+            self.events += 1
+            item = self._pending.get(key)
+            if item is None:
+                self._pending[key] = [now + self.window, now, callback, args, 1]
+            else:
+                item[0] = min(now + self.window, item[1] + self.max_delay)
+                item[2] = callback
+                item[3] = args
+                item[4] += 1
+                self.coalesced += 1
+            self._ensure_worker()
+            self._cond.notify()
+    
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use (lock held)."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="file-event-debouncer", daemon=True
+            )
+            self._worker.start()
+    
+    def _run(self) -> None:
+        """Worker loop: wait for due keys and dispatch them."""
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped and not self._pending:
+                        return
+                    now = time.monotonic()
+                    due = [k for k, item in self._pending.items() if item[0] <= now or self._stopped]
+                    if due:
+                        break
+                    next_deadline = min(item[0] for item in self._pending.values()) if self._pending else None
+                    self._cond.wait(None if next_deadline is None else next_deadline - now)
+                batch = [(key, self._pending.pop(key)) for key in due]
+            
+            for key, (_, _, callback, args, count) in batch:
+                self._dispatch(key, callback, args, count)
+    
+    def _dispatch(self, key: str, callback: Callable[..., None], args: tuple, count: int) -> None:
+        """Run one coalesced callback."""
+        if count > 1:
+            logger.info(
+                "Coalesced file events",
+                extra={"key": key, "events": count}
+            )
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(
+                "Debounced file event callback failed",
+                extra={"key": key, "error": str(e)}
+            )
+        finally:
+            with self._cond:
+                self.dispatched += 1
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Make all pending keys due now and wait until they have run.
+        
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        with self._cond:
+            for item in self._pending.values():
+                item[0] = 0.0
+            self._cond.notify()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                if not self._pending and self.dispatched + self.coalesced >= self.events:
+                    return
+            time.sleep(0.01)
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Run pending callbacks and stop the worker.
+        
+        Args:
+            timeout: Maximum seconds to wait for the worker
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+    
+    def get_stats(self) -> dict[str, int]:
+        """Get event counters.
+        
+        Returns:
+            Dictionary with received, dispatched, coalesced and pending counts
+        """
+        with self._cond:
+            return {
+                "events": self.events,
+                "dispatched": self.dispatched,
+                "coalesced": self.coalesced,
+                "pending": len(self._pending),
+            }
+
+
 class MemoryFileHandler(FileSystemEventHandler):
     """Handler for memory file system events.
     
@@ -32,6 +226,7 @@ class MemoryFileHandler(FileSystemEventHandler):
         on_memory_changed: Callable[[str], None] | None = None,
         on_agents_changed: Callable[[], None] | None = None,
         on_identity_changed: Callable[[], None] | None = None,
+        debouncer: EventDebouncer | None = None,
     ) -> None:
         """Initialize file handler.
         
@@ -42,8 +237,12 @@ class MemoryFileHandler(FileSystemEventHandler):
             on_memory_changed: Callback for memory/*.md changes (receives file path)
             on_agents_changed: Callback for AGENTS.md changes (hot-reload)
             on_identity_changed: Callback for IDENTITY.md changes (AI name changes)
+            debouncer: Coalesce events per path and run callbacks on its
+                worker thread (None = call synchronously)
         """
         super().__init__()
+        self.debouncer = debouncer
+        self.ignored_self_writes = 0
         self.on_spirit_changed = on_spirit_changed
         self.on_owner_changed = on_owner_changed
         self.on_tools_changed = on_tools_changed
@@ -53,6 +252,13 @@ class MemoryFileHandler(FileSystemEventHandler):
         
         logger.debug("MemoryFileHandler initialized")
     
+    def _dispatch(self, path: Path, callback: Callable[..., None], *args: Any) -> None:
+        """Run a callback now, or hand it to the debouncer keyed by path."""
+        if self.debouncer is None:
+            callback(*args)
+        else:
+            self.debouncer.submit(str(path), callback, *args)
+    
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification event."""
         if event.is_directory:
@@ -64,6 +270,11 @@ class MemoryFileHandler(FileSystemEventHandler):
         if path.suffix != ".md":
             return
         
+        if is_self_write(path):
+            self.ignored_self_writes += 1
+            logger.debug("Ignoring self-originated write", extra={"file_path": str(path)})
+            return
+        
         logger.info(
             "File modified detected",
             extra={
@@ -75,22 +286,22 @@ class MemoryFileHandler(FileSystemEventHandler):
         # Trigger appropriate callback
         if path.name == "SPIRIT.md" and self.on_spirit_changed:
             logger.info("SPIRIT.md changed, triggering reload")
-            self.on_spirit_changed()
+            self._dispatch(path, self.on_spirit_changed)
         elif path.name == "OWNER.md" and self.on_owner_changed:
             logger.info("OWNER.md changed, triggering reload")
-            self.on_owner_changed()
+            self._dispatch(path, self.on_owner_changed)
         elif path.name == "IDENTITY.md" and self.on_identity_changed:
             logger.info("IDENTITY.md changed, triggering reload")
-            self.on_identity_changed()
+            self._dispatch(path, self.on_identity_changed)
         elif path.name == "TOOLS.md" and self.on_tools_changed:
             logger.info("TOOLS.md changed, triggering reload")
-            self.on_tools_changed()
+            self._dispatch(path, self.on_tools_changed)
         elif path.name == "AGENTS.md" and self.on_agents_changed:
             logger.info("AGENTS.md changed, triggering hot-reload")
-            self.on_agents_changed()
+            self._dispatch(path, self.on_agents_changed)
         elif path.parent.name == "memory" and self.on_memory_changed:
             logger.info("Memory file changed, triggering sync", extra={"file_path": str(path)})
-            self.on_memory_changed(str(path))
+            self._dispatch(path, self.on_memory_changed, str(path))
     
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation event."""
@@ -121,6 +332,10 @@ class MemoryFileHandler(FileSystemEventHandler):
             "File deleted detected",
             extra={"file_path": str(path)}
         )
+        
+        # Let memory sync drop the log from its entry index
+        if path.suffix == ".md" and path.parent.name == "memory" and self.on_memory_changed:
+            self._dispatch(path, self.on_memory_changed, str(path))
 
 
 class FileWatcher:
@@ -130,20 +345,27 @@ class FileWatcher:
     triggers appropriate callbacks for hot-reload.
     """
     
-    def __init__(self, workspace_path: str) -> None:
+    def __init__(self, workspace_path: str, debounce_seconds: float = 0.3) -> None:
         """Initialize file watcher.
         
         Args:
             workspace_path: Path to workspace directory
+            debounce_seconds: Quiet period before a burst of events for one
+                file is handled (0 = handle every event immediately)
         """
         self.workspace_path = Path(workspace_path)
+        self.debounce_seconds = debounce_seconds
         self._observer: Observer | None = None
         self._handler: MemoryFileHandler | None = None
+        self._debouncer: EventDebouncer | None = None
         self._running = False
         
         logger.info(
             "FileWatcher created",
-            extra={"workspace_path": str(self.workspace_path)}
+            extra={
+                "workspace_path": str(self.workspace_path),
+                "debounce_seconds": debounce_seconds,
+            }
         )
     
     def start(
@@ -169,6 +391,7 @@ class FileWatcher:
             logger.warning("FileWatcher already running")
             return
         
+        self._debouncer = EventDebouncer(self.debounce_seconds) if self.debounce_seconds > 0 else None
         self._handler = MemoryFileHandler(
             on_spirit_changed=on_spirit_changed,
             on_owner_changed=on_owner_changed,
@@ -176,6 +399,7 @@ class FileWatcher:
             on_memory_changed=on_memory_changed,
             on_agents_changed=on_agents_changed,
             on_identity_changed=on_identity_changed,
+            debouncer=self._debouncer,
         )
         
         self._observer = Observer()
@@ -199,24 +423,41 @@ class FileWatcher:
         
         self._observer.stop()
         self._observer.join()
+        if self._debouncer is not None:
+            self._debouncer.stop()
         self._running = False
         
-        logger.info("FileWatcher stopped")
+        logger.info("FileWatcher stopped", extra=self.get_stats())
     
     def is_running(self) -> bool:
         """Check if watcher is running."""
         return self._running
+    
+    def get_stats(self) -> dict[str, int]:
+        """Get event counters.
+        
+        Returns:
+            Dictionary with received/dispatched/coalesced event counts and
+            the number of ignored self-originated writes
+        """
+        stats = self._debouncer.get_stats() if self._debouncer else {}
+        stats["ignored_self_writes"] = self._handler.ignored_self_writes if self._handler else 0
+        return stats
 
 
 # Global file watcher instance
 _file_watcher: FileWatcher | None = None
 
 
-def get_file_watcher(workspace_path: str | None = None) -> FileWatcher:
+def get_file_watcher(
+    workspace_path: str | None = None,
+    debounce_seconds: float = 0.3,
+) -> FileWatcher:
     """Get or create global file watcher instance.
     
     Args:
         workspace_path: Path to workspace directory
+        debounce_seconds: Quiet period before a burst of events is handled
         
     Returns:
         FileWatcher instance
@@ -225,5 +466,5 @@ def get_file_watcher(workspace_path: str | None = None) -> FileWatcher:
     if _file_watcher is None:
         if workspace_path is None:
             workspace_path = "workspace"
-        _file_watcher = FileWatcher(workspace_path)
+        _file_watcher = FileWatcher(workspace_path, debounce_seconds=debounce_seconds)
     return _file_watcher
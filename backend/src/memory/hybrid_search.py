@@ -7,6 +7,7 @@ This module provides:
 - Result ranking and pagination
 """
 
+import heapq
 import math
 import re
 from collections import Counter
@@ -15,6 +16,7 @@ from typing import Any
 
 from ..utils.logger import get_logger
 from .models import MemoryContentType, MemoryEntry
+from .text_index import InvertedIndex
 
 logger = get_logger(__name__)
 
@@ -61,10 +63,14 @@ class SearchResult:
 
 
 class TextSimilaritySearch:
-    """Text-based similarity search using TF-IDF.
+    """Text-based similarity search using BM25.
     
-    Implements text similarity using term frequency-inverse document
-    frequency (TF-IDF) scoring for keyword matching.
+    Entries are kept in an inverted index that is updated incrementally
+    from EntryIndex change events as entries are appended, edited or
+    removed. Queries are scored with BM25 over the postings of the
+    candidate entries only; candidates the index doesn't hold are
+    tokenised for that query without being added. The TF-IDF helpers
+    remain for ad-hoc comparisons.
     """
     
     # Chinese and English stop words
@@ -84,8 +90,34 @@ class TextSimilaritySearch:
     
     def __init__(self) -> None:
         """Initialize text search."""
-        self._idf_cache: dict[str, float] = {}
-        self._doc_count = 0
+        self.index = InvertedIndex(self.tokenize)
+        self._sources: list[Any] = []
+    
+    def attach(self, entry_index: Any) -> None:
+        """Keep the inverted index in sync with an entry index.
+        
+        Idempotent per entry index.
+        
+        Args:
+            entry_index: EntryIndex whose change events feed the index
+        """
+        if any(source is entry_index for source in self._sources):
+            return
+        self._sources.append(entry_index)
+        entry_index.add_listener(self._on_entries_changed)
+    
+    def detach(self) -> None:
+        """Stop following the entry indexes passed to attach()."""
+        for source in self._sources:
+            source.remove_listener(self._on_entries_changed)
+        self._sources.clear()
+    
+    def _on_entries_changed(self, added: list[MemoryEntry], removed: list[str]) -> None:
+        """Apply an EntryIndex change event to the inverted index."""
+        for entry_id in removed:
+            self.index.remove(entry_id)
+        for entry in added:
+            self.index.upsert(entry.id, entry.content)
         
     def tokenize(self, text: str) -> list[str]:
         """Tokenize text into terms.
@@ -218,23 +250,16 @@ class TextSimilaritySearch:
             return []
         
         options = options or SearchOptions()
-        
-        # Compute query TF-IDF
-        query_tfidf = self.compute_tf_idf(query)
+        entries_by_id = {entry.id: entry for entry in entries}
         
         results: list[SearchResult] = []
-        
-        for entry in entries:
+        for entry_id, score in self.score(query, entries_by_id).items():
+            entry = entries_by_id[entry_id]
+            
             # Apply content type filter
             if options.content_type and entry.content_type != options.content_type:
                 continue
             
-            # Compute entry TF-IDF
-            entry_tfidf = self.compute_tf_idf(entry.content)
-            
-            # Compute similarity
-            score = self.cosine_similarity(query_tfidf, entry_tfidf)
-            
             # Apply minimum score filter
             if score < options.min_score:
                 continue
@@ -246,11 +271,34 @@ class TextSimilaritySearch:
                 text_score=score,
             ))
         
-        # Sort by score descending
-        results.sort(key=lambda r: r.score, reverse=True)
+        # Top results by score, then apply pagination
+        top = heapq.nlargest(options.offset + options.limit, results, key=lambda r: r.score)
+        return top[options.offset:options.offset + options.limit]
+    
+    def score(
+        self,
+        query: str,
+        entries_by_id: dict[str, MemoryEntry],
+    ) -> dict[str, float]:
+        """Score entries matching the query.
         
-        # Apply pagination
-        return results[options.offset:options.offset + options.limit]
+        Args:
+            query: Search query
+            entries_by_id: Candidate entries keyed by ID
+            
+        Returns:
+            Mapping of entry ID to normalised BM25 score (0-1) for entries
+            sharing at least one term with the query
+        """
+        indexed: set[str] = set()
+        extra: dict[str, str] = {}
+        for entry_id, entry in entries_by_id.items():
+            if self.index.is_current(entry_id, entry.content):
+                indexed.add(entry_id)
+            else:
+                extra[entry_id] = entry.content
+        
+        return self.index.score_normalised(query, doc_ids=indexed, extra=extra)
 
 
 class HybridSearch:
@@ -261,14 +309,23 @@ class HybridSearch:
     
     Note: When using MockEmbedder (no semantic meaning), automatically
     adjusts weights to 100% text search.
+    
+    Fusion modes:
+    - weighted: vector_weight * vector_score + text_weight * text_score
+    - rrf: weighted reciprocal-rank fusion, normalised to 0-1
     """
     
+    FUSION_MODES = ("weighted", "rrf")
+    
     def __init__(
         self,
         vector_store: Any = None,
         embedder: Any = None,
         vector_weight: float = 0.7,
         text_weight: float = 0.3,
+        fusion: str = "weighted",
+        rrf_k: int = 60,
+        entry_index: Any = None,
     ) -> None:
         """Initialize hybrid search.
         
@@ -277,10 +334,19 @@ class HybridSearch:
             embedder: Embedder instance for query embedding
             vector_weight: Weight for vector score (default: 0.7)
             text_weight: Weight for text score (default: 0.3)
+            fusion: Score fusion mode ('weighted' or 'rrf')
+            rrf_k: Rank offset for reciprocal-rank fusion (default: 60)
+            entry_index: Optional EntryIndex keeping the text index current
         """
+        if fusion not in self.FUSION_MODES:
+            raise ValueError(f"Unknown fusion mode: {fusion}")
         self.vector_store = vector_store
         self.embedder = embedder
         self.text_search = TextSimilaritySearch()
+        if entry_index is not None:
+            self.text_search.attach(entry_index)
+        self.fusion = fusion
+        self.rrf_k = rrf_k
         
         # Detect if using MockEmbedder and adjust weights accordingly
         self._using_mock_embedder = self._is_mock_embedder(embedder)
@@ -306,6 +372,7 @@ class HybridSearch:
             extra={
                 "vector_weight": self.vector_weight,
                 "text_weight": self.text_weight,
+                "fusion": self.fusion,
                 "embedder_type": "MockEmbedder" if self._using_mock_embedder else "Real",
             }
         )
@@ -401,72 +468,102 @@ class HybridSearch:
         Returns:
             List of search results sorted by combined score
         """
-        if not query:
+        if not query or not entries:
             return []
         
-        # Get vector search results
-        vector_results = self._get_vector_results(query, limit)
+        window = offset + limit
+        entries_by_id = {entry.id: entry for entry in entries}
+        
+        # Get vector search results (ordered by vector score)
+        vector_scores = {
+            entry_id: info["vector_score"]
+            for entry_id, info in self._get_vector_results(query, window).items()
+            if entry_id in entries_by_id
+        }
         
         # Get text search results
-        options = SearchOptions(
-            limit=limit * 2,
-            content_type=content_type,
-            min_score=0.0,  # Don't filter at text level
-        )
-        text_results = self.text_search.search(query, entries, options)
+        text_scores = self.text_search.score(query, entries_by_id)
         
-        # Combine results
-        combined: dict[str, SearchResult] = {}
+        if self.fusion == "rrf":
+            fused = self._fuse_rrf(vector_scores, text_scores)
+        else:
+            fused = self._fuse_weighted(vector_scores, text_scores)
         
-        # Add vector results
-        for entry_id, info in vector_results.items():
-            # Find matching entry
-            matching_entries = [e for e in entries if e.id == entry_id]
-            if matching_entries:
-                entry = matching_entries[0]
+        def _candidates() -> Any:
+            for entry_id, score in fused.items():
+                entry = entries_by_id[entry_id]
                 
                 # Apply content type filter
                 if content_type and entry.content_type != content_type:
                     continue
                 
-                combined[entry_id] = SearchResult(
+                # Apply minimum score filter
+                if min_score > 0 and score < min_score:
+                    continue
+                
+                yield SearchResult(
                     entry=entry,
-                    vector_score=info["vector_score"],
-                    text_score=0.0,
+                    score=score,
+                    vector_score=vector_scores.get(entry_id, 0.0),
+                    text_score=text_scores.get(entry_id, 0.0),
                 )
         
-        # Add/update with text scores
-        for result in text_results:
-            entry_id = result.entry.id
-            
-            if entry_id in combined:
-                # Update text score
-                combined[entry_id].text_score = result.text_score
-            else:
-                # New entry from text search
-                combined[entry_id] = SearchResult(
-                    entry=result.entry,
-                    vector_score=0.0,
-                    text_score=result.text_score,
-                )
+        # Heap-based top-k, then apply pagination
+        top = heapq.nlargest(window, _candidates(), key=lambda r: r.score)
+        return top[offset:window]
+    
+    def _fuse_weighted(
+        self,
+        vector_scores: dict[str, float],
+        text_scores: dict[str, float],
+    ) -> dict[str, float]:
+        """Combine scores as a fixed weighted sum.
         
-        # Calculate combined scores
-        for result in combined.values():
-            result.calculate_combined_score(
-                vector_weight=self.vector_weight,
-                text_weight=self.text_weight,
+        Args:
+            vector_scores: Entry ID to vector score
+            text_scores: Entry ID to text score
+            
+        Returns:
+            Entry ID to combined score
+        """
+        fused: dict[str, float] = {}
+        for entry_id in vector_scores.keys() | text_scores.keys():
+            fused[entry_id] = (
+                self.vector_weight * vector_scores.get(entry_id, 0.0)
+                + self.text_weight * text_scores.get(entry_id, 0.0)
             )
+        return fused
+    
+    def _fuse_rrf(
+        self,
+        vector_scores: dict[str, float],
+        text_scores: dict[str, float],
+    ) -> dict[str, float]:
+        """Combine result lists with weighted reciprocal-rank fusion.
         
-        # Convert to list and sort
-        results = list(combined.values())
-        results.sort(key=lambda r: r.score, reverse=True)
+        Each list contributes weight / (rrf_k + rank). The sum is divided by
+        the best achievable value so scores stay in 0-1 like weighted mode.
         
-        # Apply minimum score filter
-        if min_score > 0:
-            results = [r for r in results if r.score >= min_score]
+        Args:
+            vector_scores: Entry ID to vector score
+            text_scores: Entry ID to text score
+            
+        Returns:
+            Entry ID to fused score
+        """
+        fused: dict[str, float] = {}
+        best = 0.0
+        for weight, scores in ((self.vector_weight, vector_scores), (self.text_weight, text_scores)):
+            if weight <= 0 or not scores:
+                continue
+            best += weight / (self.rrf_k + 1)
+            ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+            for rank, entry_id in enumerate(ranked, start=1):
+                fused[entry_id] = fused.get(entry_id, 0.0) + weight / (self.rrf_k + rank)
         
-        # Apply pagination
-        return results[offset:offset + limit]
+        if best <= 0:
+            return {}
+        return {entry_id: score / best for entry_id, score in fused.items()}
     
     def find_similar(
         self,
@@ -494,23 +591,49 @@ class HybridSearch:
         if target_entry is None:
             return []
         
-        # Use the entry's content as query
-        return self.search(
+        # Use the entry's content as query, then exclude self
+        results = self.search(
             query=target_entry.content,
-            entries=[e for e in entries if e.id != entry_id],  # Exclude self
-            limit=limit,
+            entries=entries,
+            limit=limit + 1,
         )
+        return [r for r in results if r.entry.id != entry_id][:limit]
 
 
 # Global hybrid search instance
 _hybrid_search: HybridSearch | None = None
 
 
+def _resolve_search_settings(
+    vector_weight: float | None,
+    text_weight: float | None,
+) -> dict[str, Any]:
+    """Fill unset search settings from config, falling back to defaults."""
+    settings: dict[str, Any] = {"fusion": "weighted", "rrf_k": 60}
+    try:
+        from ..config import get_config
+        config = get_config()
+        if vector_weight is None:
+            vector_weight = config.search.vector_weight
+        if text_weight is None:
+            text_weight = config.search.text_weight
+        settings["fusion"] = config.search.fusion
+        settings["rrf_k"] = config.search.rrf_k
+    except Exception:
+        # Fallback to defaults
+        vector_weight = vector_weight or 0.7
+        text_weight = text_weight or 0.3
+    settings["vector_weight"] = vector_weight
+    settings["text_weight"] = text_weight
+    return settings
+
+
 def get_hybrid_search(
     vector_store: Any = None,
     embedder: Any = None,
     vector_weight: float | None = None,
     text_weight: float | None = None,
+    entry_index: Any = None,
 ) -> HybridSearch:
     """Get or create global hybrid search instance.
     
@@ -519,32 +642,20 @@ def get_hybrid_search(
         embedder: Optional embedder instance
         vector_weight: Optional weight for vector score (overrides config)
         text_weight: Optional weight for text score (overrides config)
+        entry_index: Optional EntryIndex to keep the text index current
         
     Returns:
         HybridSearch instance
     """
     global _hybrid_search
     if _hybrid_search is None:
-        # Try to load weights from config
-        if vector_weight is None or text_weight is None:
-            try:
-                from ..config import get_config
-                config = get_config()
-                if vector_weight is None:
-                    vector_weight = config.search.vector_weight
-                if text_weight is None:
-                    text_weight = config.search.text_weight
-            except Exception:
-                # Fallback to defaults
-                vector_weight = vector_weight or 0.7
-                text_weight = text_weight or 0.3
-        
         _hybrid_search = HybridSearch(
             vector_store=vector_store,
             embedder=embedder,
-            vector_weight=vector_weight,
-            text_weight=text_weight,
+            **_resolve_search_settings(vector_weight, text_weight),
         )
+    if entry_index is not None:
+        _hybrid_search.text_search.attach(entry_index)
     return _hybrid_search
 
 
@@ -553,6 +664,7 @@ def init_hybrid_search(
     embedder: Any,
     vector_weight: float | None = None,
     text_weight: float | None = None,
+    entry_index: Any = None,
 ) -> HybridSearch:
     """Initialize hybrid search with dependencies.
     
@@ -561,30 +673,16 @@ def init_hybrid_search(
         embedder: Embedder instance
         vector_weight: Optional weight for vector score (overrides config)
         text_weight: Optional weight for text score (overrides config)
+        entry_index: Optional EntryIndex to keep the text index current
         
     Returns:
         Initialized HybridSearch instance
     """
     global _hybrid_search
-    
-    # Try to load weights from config
-    if vector_weight is None or text_weight is None:
-        try:
-            from ..config import get_config
-            config = get_config()
-            if vector_weight is None:
-                vector_weight = config.search.vector_weight
-            if text_weight is None:
-                text_weight = config.search.text_weight
-        except Exception:
-            # Fallback to defaults
-            vector_weight = vector_weight or 0.7
-            text_weight = text_weight or 0.3
-    
     _hybrid_search = HybridSearch(
         vector_store=vector_store,
         embedder=embedder,
-        vector_weight=vector_weight,
-        text_weight=text_weight,
+        entry_index=entry_index,
+        **_resolve_search_settings(vector_weight, text_weight),
     )
     return _hybrid_search
@@ -4,15 +4,20 @@ This module provides:
 - Frontmatter parsing and generation
 - Markdown file reading and writing
 - Bidirectional sync between .md files and memory structures
+- Incremental vector re-sync driven by per-entry content hashes
 """
 
+import hashlib
 import re
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import frontmatter
 
+from .entry_index import EntryIndex
+from .file_watcher import mark_self_write
 from .models import (
     DailyLog,
     MemoryContentType,
@@ -26,6 +31,42 @@ from ..utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def entry_content_hash(entry: MemoryEntry, model_id: str = "") -> str:
+    """Hash identifying what a stored vector was computed from.
+    
+    Includes the embedding model id so switching models re-embeds entries.
+    """
+    content_type = entry.content_type.value if hasattr(entry.content_type, 'value') else str(entry.content_type)
+    payload = "\0".join((model_id, content_type, entry.content))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class VectorSyncReport:
+    """Outcome (or preview, for dry runs) of an incremental vector sync."""
+    
+    added: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    dry_run: bool = False
+    
+    @property
+    def changed(self) -> int:
+        """Number of entries written or deleted."""
+        return len(self.added) + len(self.modified) + len(self.removed)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "added": self.added,
+            "modified": self.modified,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "dry_run": self.dry_run,
+        }
+
+
 class MarkdownSync:
     """Synchronization between Markdown files and memory structures.
     
@@ -47,6 +88,7 @@ class MarkdownSync:
         self.owner_path = self.workspace_path / "OWNER.md"
         self.tools_path = self.workspace_path / "TOOLS.md"
         self.memory_path = self.workspace_path / "memory"
+        self.entry_index = EntryIndex(self.memory_path, self._parse_log_file)
         
         logger.info(
             "MarkdownSync initialized",
@@ -159,6 +201,7 @@ class MarkdownSync:
             
             with open(self.spirit_path, "w", encoding="utf-8") as f:
                 f.write(content)
+            mark_self_write(self.spirit_path)
             
             logger.info(
                 "SPIRIT.md saved",
@@ -269,6 +312,7 @@ class MarkdownSync:
             
             with open(self.owner_path, "w", encoding="utf-8") as f:
                 f.write(content)
+            mark_self_write(self.owner_path)
             
             logger.info(
                 "OWNER.md saved",
@@ -412,6 +456,7 @@ class MarkdownSync:
             
             with open(file_path, "a", encoding="utf-8") as f:
                 f.write(entry_text)
+            self.entry_index.invalidate(file_path)
             
             logger.info(
                 "Memory entry appended",
@@ -510,13 +555,27 @@ class MarkdownSync:
     def load_entries_from_log(self, date: str) -> list[MemoryEntry]:
         """Load all entries from a daily log file.
         
+        Served from the entry index; the file is only re-parsed when it
+        changed since the last call.
+        
         Args:
             date: Date string (YYYY-MM-DD)
             
         Returns:
             List of MemoryEntry objects
         """
-        file_path = self.memory_path / f"{date}.md"
+        return self.entry_index.get_entries(date)
+    
+    def _parse_log_file(self, date: str, file_path: Path) -> list[MemoryEntry]:
+        """Parse all entries from a daily log file.
+        
+        Args:
+            date: Date string (YYYY-MM-DD)
+            file_path: Path to the daily log file
+            
+        Returns:
+            List of MemoryEntry objects
+        """
         entries: list[MemoryEntry] = []
         
         if not file_path.exists():
@@ -600,19 +659,11 @@ class MarkdownSync:
         """
         all_entries: list[MemoryEntry] = []
         
-        if not self.memory_path.exists():
-            return all_entries
+        self.entry_index.refresh()
         
-        # Get all log files sorted by date (newest first)
-        log_files = sorted(
-            self.memory_path.glob("*.md"),
-            key=lambda p: p.stem,
-            reverse=True
-        )
-        
-        for log_file in log_files:
-            date = log_file.stem
-            entries = self.load_entries_from_log(date)
+        # Logs are sorted by date (newest first)
+        for log in self.entry_index.logs_newest_first():
+            entries = log.entries
             
             # Filter by content type if specified
             if content_type:
@@ -636,18 +687,7 @@ class MarkdownSync:
         Returns:
             MemoryEntry if found, None otherwise
         """
-        # Parse date from entry_id
-        if "-" in entry_id and len(entry_id) >= 10:
-            # Try to extract date from ID
-            parts = entry_id.split("-")
-            if len(parts) >= 3:
-                date = "-".join(parts[:3])
-                entries = self.load_entries_from_log(date)
-                for entry in entries:
-                    if entry.id == entry_id:
-                        return entry
-        
-        return None
+        return self.entry_index.get(entry_id)
     
     def delete_entry(self, entry_id: str) -> bool:
         """Delete a memory entry from daily log.
@@ -679,6 +719,7 @@ class MarkdownSync:
             
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(new_content)
+            self.entry_index.invalidate(file_path)
             
             logger.info(
                 "Memory entry deleted",
@@ -699,20 +740,18 @@ class MarkdownSync:
         Returns:
             List of date strings (YYYY-MM-DD)
         """
-        if not self.memory_path.exists():
-            return []
+        self.entry_index.refresh()
         
         dates: list[str] = []
-        for log_file in self.memory_path.glob("*.md"):
+        for date_str in self.entry_index.dates():
             # Check if filename is a valid date
-            date_str = log_file.stem
             try:
                 datetime.strptime(date_str, "%Y-%m-%d")
                 dates.append(date_str)
             except ValueError:
                 continue
         
-        return sorted(dates, reverse=True)
+        return dates
 
     # ============ Bidirectional Sync (Phase 7) ============
 
@@ -721,6 +760,7 @@ class MarkdownSync:
         entry: MemoryEntry,
         vector_store: Any,
         embedder: Any,
+        embedding: list[float] | None = None,
     ) -> bool:
         """Sync a memory entry to vector store.
         
@@ -728,13 +768,20 @@ class MarkdownSync:
             entry: Memory entry to sync
             vector_store: VectorStore instance
             embedder: Embedder instance
+            embedding: Precomputed embedding (generated if None)
             
         Returns:
             True if sync successful
         """
         try:
-            # Generate embedding
-            embedding = embedder.embed(entry.content)
+            # Generate embedding; mock fallback vectors get no hash so
+            # the next sync re-embeds them
+            content_hash: str | None = entry_content_hash(entry, getattr(embedder, "model_id", ""))
+            if embedding is None:
+                fallbacks_before = getattr(embedder, "fallback_count", 0)
+                embedding = embedder.embed(entry.content)
+                if getattr(embedder, "fallback_count", 0) != fallbacks_before:
+                    content_hash = None
             
             # Get content type string
             content_type = entry.content_type.value if hasattr(entry.content_type, 'value') else str(entry.content_type)
@@ -748,7 +795,9 @@ class MarkdownSync:
                 metadata={
                     "source_file": entry.source_file,
                     "created_at": entry.created_at.isoformat() if entry.created_at else None,
-                }
+                },
+                source_file=entry.source_file,
+                content_hash=content_hash,
             )
             
             logger.info(
@@ -769,32 +818,153 @@ class MarkdownSync:
         vector_store: Any,
         embedder: Any,
         limit: int = 1000,
+        dry_run: bool = False,
     ) -> int:
         """Sync all markdown entries to vector store.
         
-        Useful for initial sync on startup.
+        Useful for initial sync on startup. Only new or modified entries
+        are embedded; see resync_vector_store().
         
         Args:
             vector_store: VectorStore instance
             embedder: Embedder instance
             limit: Maximum entries to sync
+            dry_run: Only report what would change
             
         Returns:
-            Number of entries synced
+            Number of entries added or updated
         """
-        entries = self.list_all_entries(limit=limit)
-        synced = 0
+        report = self.resync_vector_store(vector_store, embedder, limit=limit, dry_run=dry_run)
+        return len(report.added) + len(report.modified)
+
+    def resync_vector_store(
+        self,
+        vector_store: Any,
+        embedder: Any,
+        limit: int | None = None,
+        dry_run: bool = False,
+    ) -> VectorSyncReport:
+        """Bring the vector store in line with the daily logs.
         
-        for entry in entries:
-            if self.sync_entry_to_vector_store(entry, vector_store, embedder):
-                synced += 1
+        Whole logs are taken newest first until ``limit`` entries are
+        reached; entries that vanished from those logs are deleted.
+        Vectors of logs that no longer exist are kept so they can still be
+        recovered with recover_entries_from_vector_store().
+        
+        Args:
+            vector_store: VectorStore instance
+            embedder: Embedder instance
+            limit: Maximum entries to consider (None = all)
+            dry_run: Only report what would change
+            
+        Returns:
+            VectorSyncReport
+        """
+        self.entry_index.refresh()
+        
+        entries: list[MemoryEntry] = []
+        source_files: list[str] = []
+        for log in self.entry_index.logs_newest_first():
+            if limit is not None and len(entries) >= limit:
+                break
+            entries.extend(log.entries)
+            source_files.append(str(log.file_path))
+        
+        report = self.sync_entries_incremental(
+            entries, vector_store, embedder, source_files=source_files, dry_run=dry_run
+        )
         
         logger.info(
             "Bulk sync completed",
-            extra={"total_entries": len(entries), "synced": synced}
+            extra={
+                "total_entries": len(entries),
+                "added": len(report.added),
+                "modified": len(report.modified),
+                "removed": len(report.removed),
+                "unchanged": report.unchanged,
+                "dry_run": dry_run,
+            }
         )
         
-        return synced
+        return report
+
+    def sync_entries_incremental(
+        self,
+        entries: list[MemoryEntry],
+        vector_store: Any,
+        embedder: Any,
+        source_files: list[str] | None = None,
+        dry_run: bool = False,
+    ) -> VectorSyncReport:
+        """Diff entries against stored content hashes and apply the changes.
+        
+        New and modified entries are embedded in one batch; upserts and
+        deletions are written in a single transaction.
+        
+        Args:
+            entries: Current entries parsed from the logs
+            vector_store: VectorStore instance
+            embedder: Embedder instance
+            source_files: Files the entries were read from in full; stored
+                entries of these files missing from ``entries`` are deleted.
+                None compares against the whole store and deletes nothing.
+            dry_run: Only report what would change
+            
+        Returns:
+            VectorSyncReport
+        """
+        report = VectorSyncReport(dry_run=dry_run)
+        model_id = getattr(embedder, "model_id", "")
+        
+        if source_files is None:
+            stored = vector_store.get_content_hashes()
+        else:
+            stored = {}
+            for source_file in source_files:
+                stored.update(vector_store.get_content_hashes(source_file))
+        
+        changed: list[tuple[MemoryEntry, str]] = []
+        seen: set[str] = set()
+        for entry in entries:
+            seen.add(entry.id)
+            content_hash = entry_content_hash(entry, model_id)
+            if entry.id not in stored:
+                report.added.append(entry.id)
+            elif stored[entry.id] != content_hash:
+                report.modified.append(entry.id)
+            else:
+                report.unchanged += 1
+                continue
+            changed.append((entry, content_hash))
+        
+        if source_files is not None:
+            report.removed = [entry_id for entry_id in stored if entry_id not in seen]
+        
+        if dry_run or (not changed and not report.removed):
+            return report
+        
+        fallbacks_before = getattr(embedder, "fallback_count", 0)
+        embeddings = embedder.embed_batch([entry.content for entry, _ in changed]) if changed else []
+        # Mock vectors from a failed ONNX run are stored without a hash so
+        # the next sync re-embeds them once the model works again
+        fell_back = getattr(embedder, "fallback_count", 0) != fallbacks_before
+        upserts = []
+        for (entry, content_hash), embedding in zip(changed, embeddings, strict=True):
+            upserts.append({
+                "entry_id": entry.id,
+                "embedding": embedding,
+                "content": entry.content,
+                "content_type": entry.content_type.value if hasattr(entry.content_type, 'value') else str(entry.content_type),
+                "metadata": {
+                    "source_file": entry.source_file,
+                    "created_at": entry.created_at.isoformat() if entry.created_at else None,
+                },
+                "source_file": entry.source_file,
+                "content_hash": None if fell_back else content_hash,
+            })
+        vector_store.apply_changes(upserts, report.removed)
+        
+        return report
 
     def delete_entry_from_vector_store(
         self,
@@ -911,17 +1081,26 @@ class MarkdownSync:
             if path.parent.name != "memory" or path.suffix != ".md":
                 return False
             
-            # Load entries from the file
+            # Load entries from the file (watcher event feeds the index)
+            self.entry_index.invalidate(path)
             date_str = path.stem
             entries = self.load_entries_from_log(date_str)
             
-            # Sync each entry
-            for entry in entries:
-                self.sync_entry_to_vector_store(entry, vector_store, embedder)
+            # A deleted log keeps its vectors (see recover_entries_from_vector_store)
+            source_files = [str(self.memory_path / f"{date_str}.md")] if path.exists() else None
+            report = self.sync_entries_incremental(
+                entries, vector_store, embedder, source_files=source_files
+            )
             
             logger.info(
                 "File change synced to vector store",
-                extra={"file_path": file_path, "entries_count": len(entries)}
+                extra={
+                    "file_path": file_path,
+                    "entries_count": len(entries),
+                    "added": len(report.added),
+                    "modified": len(report.modified),
+                    "removed": len(report.removed),
+                }
             )
             
             return True
@@ -0,0 +1,278 @@
+"""Inverted index with BM25 scoring for memory text search.
+
+This module provides:
+- Term -> postings (document ID -> term frequency) index
+- Incremental add/remove/sync of documents
+- BM25 scoring with document-frequency IDF, optionally restricted to a
+  candidate set and normalised against the query's best achievable score
+"""
+
+import math
+import threading
+from collections import Counter
+from collections.abc import Callable, Collection, Iterable, Mapping
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class InvertedIndex:
+    """In-memory inverted index scored with Okapi BM25.
+
+    Documents are tokenised once when added; queries only touch the
+    postings of their own terms, so query cost no longer grows with the
+    total corpus text.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Callable[[str], list[str]],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        """Initialize inverted index.
+
+        Args:
+            tokenizer: Callable splitting text into terms
+            k1: BM25 term-frequency saturation parameter
+            b: BM25 length normalisation parameter
+        """
+        self._tokenize = tokenizer
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._doc_terms: dict[str, Counter[str]] = {}
+        self._doc_len: dict[str, int] = {}
+        self._doc_fingerprint: dict[str, int] = {}
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._doc_len
+
+    def document_frequency(self, term: str) -> int:
+        """Number of documents containing a term."""
+        return len(self._postings.get(term, ()))
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Add or replace a document.
+
+        Args:
+            doc_id: Document identifier
+            text: Document text
+        """
+        terms = Counter(self._tokenize(text))
+        with self._lock:
+            self._remove_locked(doc_id)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            length = sum(terms.values())
+            self._doc_terms[doc_id] = terms
+            self._doc_len[doc_id] = length
+            self._doc_fingerprint[doc_id] = hash(text)
+            self._total_len += length
+
+    def upsert(self, doc_id: str, text: str) -> bool:
+        """Add a document unless it is already indexed with the same text.
+
+        Args:
+            doc_id: Document identifier
+            text: Document text
+
+        Returns:
+            True if the document was (re-)tokenised
+        """
+        with self._lock:
+            if self._doc_fingerprint.get(doc_id) == hash(text):
+                return False
+            self.add(doc_id, text)
+            return True
+
+    def is_current(self, doc_id: str, text: str) -> bool:
+        """Check whether a document is indexed with exactly this text."""
+        return self._doc_fingerprint.get(doc_id) == hash(text)
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document.
+
+        Args:
+            doc_id: Document identifier
+
+        Returns:
+            True if the document was indexed
+        """
+        with self._lock:
+            return self._remove_locked(doc_id)
+
+    def sync(self, documents: Iterable[tuple[str, str]]) -> tuple[int, int]:
+        """Make the index contain exactly the given documents.
+
+        Only documents that are new or whose text changed are tokenised;
+        documents missing from the input are removed.
+
+        Args:
+            documents: Iterable of (doc_id, text) pairs
+
+        Returns:
+            Tuple of (added_or_updated, removed) counts
+        """
+        updated = 0
+        seen: set[str] = set()
+        with self._lock:
+            for doc_id, text in documents:
+                seen.add(doc_id)
+                if self.upsert(doc_id, text):
+                    updated += 1
+            stale = [doc_id for doc_id in self._doc_len if doc_id not in seen]
+            for doc_id in stale:
+                self._remove_locked(doc_id)
+
+        if updated or stale:
+            logger.debug(
+                "Inverted index synced",
+                extra={"updated": updated, "removed": len(stale), "documents": len(self)}
+            )
+        return updated, len(stale)
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency of a term.
+
+        Args:
+            term: The term
+
+        Returns:
+            IDF score (0.0 if the term is unknown)
+        """
+        df = self.document_frequency(term)
+        if df == 0:
+            return 0.0
+        return self._idf(df, len(self._doc_len))
+
+    def score(
+        self,
+        query: str,
+        doc_ids: Collection[str] | None = None,
+        extra: Mapping[str, str] | None = None,
+    ) -> dict[str, float]:
+        """Score documents sharing at least one term with the query.
+
+        Args:
+            query: Query text
+            doc_ids: Restrict scoring to these indexed documents (all if None)
+            extra: Unindexed (doc_id, text) documents to score alongside the
+                index; they are tokenised for this call only and count
+                towards corpus statistics without being added
+
+        Returns:
+            Mapping of document ID to raw BM25 score
+        """
+        return self._score(query, doc_ids, extra)[0]
+
+    def score_normalised(
+        self,
+        query: str,
+        doc_ids: Collection[str] | None = None,
+        extra: Mapping[str, str] | None = None,
+    ) -> dict[str, float]:
+        """Score documents on an absolute 0-1 scale.
+
+        Raw BM25 is divided by the query's maximum achievable score,
+        sum(qtf * idf * (k1 + 1)) over the query terms, so a weak match
+        stays low even when it is the best one in the candidate set.
+        Query terms absent from the corpus count with the IDF of an
+        unseen term.
+
+        Args:
+            query: Query text
+            doc_ids: Restrict scoring to these indexed documents (all if None)
+            extra: Unindexed (doc_id, text) documents, see score()
+
+        Returns:
+            Mapping of document ID to normalised score (0-1)
+        """
+        scores, bound = self._score(query, doc_ids, extra)
+        if bound <= 0:
+            return {}
+        return {doc_id: raw / bound for doc_id, raw in scores.items()}
+
+    def _score(
+        self,
+        query: str,
+        doc_ids: Collection[str] | None,
+        extra: Mapping[str, str] | None,
+    ) -> tuple[dict[str, float], float]:
+        """Compute raw BM25 scores and the query's upper bound."""
+        query_terms = Counter(self._tokenize(query))
+        extra_terms = {doc_id: Counter(self._tokenize(text)) for doc_id, text in (extra or {}).items()}
+        extra_len = {doc_id: sum(terms.values()) for doc_id, terms in extra_terms.items()}
+        scores: dict[str, float] = {}
+        bound = 0.0
+
+        with self._lock:
+            n = len(self._doc_len) + len(extra_terms)
+            if n == 0 or not query_terms:
+                return scores, bound
+            avg_len = (self._total_len + sum(extra_len.values())) / n or 1.0
+
+            for term, qtf in query_terms.items():
+                postings = self._postings.get(term, {})
+                extra_hits = {
+                    doc_id: terms[term] for doc_id, terms in extra_terms.items() if term in terms
+                }
+                weight = qtf * self._idf(len(postings) + len(extra_hits), n)
+                bound += weight * (self.k1 + 1)
+
+                if doc_ids is None:
+                    hits = postings.items()
+                elif len(doc_ids) < len(postings):
+                    hits = ((doc_id, postings[doc_id]) for doc_id in doc_ids if doc_id in postings)
+                else:
+                    hits = ((doc_id, tf) for doc_id, tf in postings.items() if doc_id in doc_ids)
+                for doc_id, tf in hits:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * self._tf_part(
+                        tf, self._doc_len[doc_id], avg_len
+                    )
+                for doc_id, tf in extra_hits.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * self._tf_part(
+                        tf, extra_len[doc_id], avg_len
+                    )
+
+        return scores, bound
+
+    def _tf_part(self, tf: int, doc_len: int, avg_len: float) -> float:
+        """BM25 saturated term-frequency component."""
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+        return tf * (self.k1 + 1) / (tf + norm)
+
+    @staticmethod
+    def _idf(df: int, n: int) -> float:
+        """BM25 IDF for a document frequency in a corpus of n documents."""
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_len.clear()
+            self._doc_fingerprint.clear()
+            self._total_len = 0
+
+    def _remove_locked(self, doc_id: str) -> bool:
+        """Remove a document (lock held)."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        self._doc_fingerprint.pop(doc_id, None)
+        return True
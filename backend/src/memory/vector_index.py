@@ -0,0 +1,435 @@
+"""In-memory vector indexes for similarity search.
+
+This module provides:
+- MatrixIndex: Exact cosine search over a pre-normalised float32 matrix
+- IVFIndex: Approximate search with k-means inverted lists (IVF-flat)
+
+Used by VectorStore when the sqlite-vss extension is unavailable.
+"""
+
+import math
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MatrixIndex:
+    """Exact (brute-force) cosine similarity index backed by NumPy.
+
+    Rows are L2-normalised on insert, so a query is answered with a single
+    matrix-vector product followed by an ``argpartition`` top-k.
+
+    Storage grows by doubling and deletes swap the last row into the hole,
+    keeping both operations amortised O(dim).
+    """
+
+    _INITIAL_CAPACITY = 256
+
+    def __init__(self, dimension: int) -> None:
+        """Initialize matrix index.
+
+        Args:
+            dimension: Embedding dimension
+        """
+        self.dimension = dimension
+        self._matrix = np.zeros((0, dimension), dtype=np.float32)
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entry_id: object) -> bool:
+        return entry_id in self._rows
+
+    @staticmethod
+    def normalize(vector: Iterable[float] | np.ndarray) -> np.ndarray | None:
+        """Convert a vector to a unit-length float32 array.
+
+        Args:
+            vector: Input vector
+
+        Returns:
+            Normalised array, or None for a zero vector
+        """
+        arr = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(arr))
+        if norm == 0.0 or not np.isfinite(norm):
+            return None
+        return arr / norm
+
+    def build(self, items: Iterable[tuple[str, Iterable[float] | np.ndarray]]) -> None:
+        """Replace index contents with the given (id, embedding) pairs.
+
+        Embeddings with the wrong dimension or zero norm are skipped.
+
+        Args:
+            items: Iterable of (entry_id, embedding) pairs
+        """
+        ids: list[str] = []
+        vectors: list[np.ndarray] = []
+        skipped = 0
+
+        for entry_id, embedding in items:
+            vec = self.normalize(embedding)
+            if vec is None or vec.shape[0] != self.dimension:
+                skipped += 1
+                continue
+            ids.append(entry_id)
+            vectors.append(vec)
+
+        with self._lock:
+            capacity = max(self._INITIAL_CAPACITY, len(vectors))
+            self._matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+            if vectors:
+                self._matrix[:len(vectors)] = np.stack(vectors)
+            self._ids = ids
+            self._rows = {entry_id: i for i, entry_id in enumerate(ids)}
+
+        logger.debug(
+            "Matrix index built",
+            extra={"entries": len(ids), "skipped": skipped, "dimension": self.dimension}
+        )
+
+    def upsert(self, entry_id: str, embedding: Iterable[float] | np.ndarray) -> bool:
+        """Insert or replace an embedding.
+
+        Args:
+            entry_id: Entry identifier
+            embedding: Embedding vector
+
+        Returns:
+            True if stored, False if the vector was rejected
+        """
+        vec = self.normalize(embedding)
+        if vec is None or vec.shape[0] != self.dimension:
+            self.remove(entry_id)
+            return False
+
+        with self._lock:
+            row = self._rows.get(entry_id)
+            if row is None:
+                row = len(self._ids)
+                if row >= self._matrix.shape[0]:
+                    self._grow()
+                self._ids.append(entry_id)
+                self._rows[entry_id] = row
+            self._matrix[row] = vec
+        return True
+
+    def remove(self, entry_id: str) -> bool:
+        """Remove an embedding.
+
+        Args:
+            entry_id: Entry identifier
+
+        Returns:
+            True if removed, False if not present
+        """
+        with self._lock:
+            row = self._rows.pop(entry_id, None)
+            if row is None:
+                return False
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            return True
+
+    def clear(self) -> None:
+        """Remove all embeddings."""
+        self.build([])
+
+    def search(
+        self,
+        query: Iterable[float] | np.ndarray,
+        limit: int,
+    ) -> list[tuple[str, float]]:
+        """Find the most similar embeddings to a query.
+
+        Args:
+            query: Query vector
+            limit: Maximum number of results
+
+        Returns:
+            List of (entry_id, cosine similarity) sorted by similarity descending
+        """
+        q = self.normalize(query)
+        if q is None or q.shape[0] != self.dimension or limit <= 0:
+            return []
+
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return []
+            scores = self._matrix[:n] @ q
+
+            k = min(limit, n)
+            top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+    def _grow(self) -> None:
+        """Double matrix capacity (lock held)."""
+        capacity = max(self._INITIAL_CAPACITY, self._matrix.shape[0] * 2)
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
+
+
+class IVFIndex(MatrixIndex):
+    """Approximate cosine index using inverted lists (IVF-flat).
+
+    Rows are assigned to the nearest of ``nlist`` spherical k-means
+    centroids; a query scores the centroids and then only the rows of the
+    ``nprobe`` closest lists. Below ``min_train_size`` rows (or before
+    training) it answers exactly like MatrixIndex.
+
+    The index retrains itself once it has grown to twice the size it was
+    trained on.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        nlist: int | None = None,
+        nprobe: int = 8,
+        min_train_size: int = 10000,
+        kmeans_iterations: int = 15,
+        seed: int = 0,
+    ) -> None:
+        """Initialize IVF index.
+
+        Args:
+            dimension: Embedding dimension
+            nlist: Number of inverted lists (None = about 4 * sqrt(n))
+            nprobe: Lists scanned per query
+            min_train_size: Rows needed before clustering is used
+            kmeans_iterations: Lloyd iterations when training
+            seed: Random seed for centroid initialisation
+        """
+        super().__init__(dimension)
+        self.nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self.min_train_size = min_train_size
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self._centroids: np.ndarray | None = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_on = 0
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether centroids are available."""
+        return self._centroids is not None
+
+    def build(self, items: Iterable[tuple[str, Iterable[float] | np.ndarray]]) -> None:
+        """Replace index contents, training centroids if large enough."""
+        super().build(items)
+        with self._lock:
+            self._assign = np.zeros(self._matrix.shape[0], dtype=np.int32)
+            if self._centroids is not None:
+                self._assign_rows(0, len(self._ids))
+            elif len(self._ids) >= self.min_train_size:
+                self.train()
+
+    def train(self, sample_size: int = 50000) -> None:
+        """Cluster the current rows and reassign every row.
+
+        Args:
+            sample_size: Maximum rows used to fit the centroids
+        """
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return
+            nlist = self.nlist or int(4 * math.sqrt(n))
+            nlist = max(1, min(nlist, n))
+
+            rng = np.random.default_rng(self.seed)
+            data = self._matrix[:n]
+            if n > sample_size:
+                data = data[rng.choice(n, sample_size, replace=False)]
+
+            centroids = data[rng.choice(data.shape[0], nlist, replace=False)].copy()
+            for _ in range(self.kmeans_iterations):
+                labels = self._nearest(data, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, data)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                empty = norms[:, 0] == 0
+                # Keep the previous centroid for empty clusters
+                sums[empty] = centroids[empty]
+                norms[empty] = 1.0
+                centroids = (sums / norms).astype(np.float32)
+
+            self._centroids = centroids
+            self._trained_on = n
+            self._assign_rows(0, n)
+
+        logger.info(
+            "IVF index trained",
+            extra={"entries": n, "nlist": nlist, "sample": int(data.shape[0])}
+        )
+
+    def upsert(self, entry_id: str, embedding: Iterable[float] | np.ndarray) -> bool:
+        """Insert or replace an embedding, assigning it to its list."""
+        with self._lock:
+            stored = super().upsert(entry_id, embedding)
+            if stored:
+                row = self._rows[entry_id]
+                if row >= self._assign.shape[0]:
+                    grown = np.zeros(self._matrix.shape[0], dtype=np.int32)
+                    grown[:self._assign.shape[0]] = self._assign
+                    self._assign = grown
+                if self._centroids is not None:
+                    self._assign_rows(row, row + 1)
+            return stored
+
+    def remove(self, entry_id: str) -> bool:
+        """Remove an embedding, keeping list assignments aligned."""
+        with self._lock:
+            row = self._rows.get(entry_id)
+            if row is None:
+                return False
+            last = len(self._ids) - 1
+            self._assign[row] = self._assign[last]
+            return super().remove(entry_id)
+
+    def search(
+        self,
+        query: Iterable[float] | np.ndarray,
+        limit: int,
+    ) -> list[tuple[str, float]]:
+        """Find approximately the most similar embeddings to a query."""
+        q = self.normalize(query)
+        if q is None or q.shape[0] != self.dimension or limit <= 0:
+            return []
+
+        with self._lock:
+            n = len(self._ids)
+            # First training, or retraining once the index has doubled
+            untrained = self._centroids is None and n >= self.min_train_size
+            outgrown = self._centroids is not None and n >= max(2 * self._trained_on, self.min_train_size)
+            if untrained or outgrown:
+                self.train()
+
+            if self._centroids is None or self.nprobe >= self._centroids.shape[0]:
+                return super().search(q, limit)
+
+            probes = np.argpartition(-(self._centroids @ q), self.nprobe - 1)[:self.nprobe]
+            candidates = np.flatnonzero(np.isin(self._assign[:n], probes))
+            if candidates.size == 0:
+                return []
+            scores = self._matrix[candidates] @ q
+
+            k = min(limit, candidates.size)
+            if k < candidates.size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(candidates.size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [(self._ids[candidates[i]], float(scores[i])) for i in top]
+
+    def save(self, path: str | Path, generation: int = 0) -> None:
+        """Persist the index to an ``.npz`` file.
+
+        Args:
+            path: Target file
+            generation: Store generation the snapshot corresponds to
+        """
+        with self._lock:
+            n = len(self._ids)
+            arrays: dict[str, Any] = {
+                "ids": np.array(self._ids, dtype=str),
+                "matrix": self._matrix[:n],
+                "assign": self._assign[:n],
+                "meta": np.array([self.dimension, generation, self._trained_on], dtype=np.int64),
+            }
+            if self._centroids is not None:
+                arrays["centroids"] = self._centroids
+
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        tmp.replace(path)
+
+        logger.debug("IVF index saved", extra={"path": str(path), "entries": n})
+
+    def load(self, path: str | Path, generation: int | None = None) -> bool:
+        """Load a persisted index.
+
+        If the snapshot's generation differs from ``generation`` only the
+        centroids are restored; the caller then rebuilds the rows.
+
+        Args:
+            path: Source file
+            generation: Current store generation (None = accept any)
+
+        Returns:
+            True if rows were restored, False if only centroids (or nothing)
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                dimension, saved_generation, trained_on = (int(x) for x in data["meta"])
+                if dimension != self.dimension:
+                    return False
+                centroids = data["centroids"] if "centroids" in data.files else None
+                if generation is not None and saved_generation != generation:
+                    with self._lock:
+                        self._centroids = centroids
+                        self._trained_on = trained_on
+                    return False
+                ids = [str(x) for x in data["ids"]]
+                matrix = np.array(data["matrix"], dtype=np.float32)
+                assign = np.array(data["assign"], dtype=np.int32)
+        except Exception as e:
+            logger.warning("Failed to load IVF index", extra={"path": str(path), "error": str(e)})
+            return False
+
+        with self._lock:
+            capacity = max(self._INITIAL_CAPACITY, len(ids))
+            self._matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+            self._matrix[:len(ids)] = matrix
+            self._assign = np.zeros(capacity, dtype=np.int32)
+            self._assign[:len(ids)] = assign
+            self._ids = ids
+            self._rows = {entry_id: i for i, entry_id in enumerate(ids)}
+            self._centroids = centroids
+            self._trained_on = trained_on
+        return True
+
+    def _assign_rows(self, start: int, stop: int, chunk: int = 8192) -> None:
+        """Assign rows [start, stop) to their nearest centroid (lock held)."""
+        for lo in range(start, stop, chunk):
+            hi = min(stop, lo + chunk)
+            self._assign[lo:hi] = self._nearest(self._matrix[lo:hi], self._centroids)
+
+    @staticmethod
+    def _nearest(data: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        """Index of the most similar centroid for each row."""
+        labels = np.empty(data.shape[0], dtype=np.int32)
+        for lo in range(0, data.shape[0], chunk):
+            labels[lo:lo + chunk] = np.argmax(data[lo:lo + chunk] @ centroids.T, axis=1)
+        return labels
+
+    def _grow(self) -> None:
+        """Double capacity, keeping the assignment array aligned (lock held)."""
+        super()._grow()
+        grown = np.zeros(self._matrix.shape[0], dtype=np.int32)
+        grown[:self._assign.shape[0]] = self._assign
+        self._assign = grown
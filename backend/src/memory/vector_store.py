@@ -2,7 +2,9 @@
 
 This module provides:
 - Vector embedding storage and retrieval
-- Cosine similarity search
+- Cosine similarity search (sqlite-vss, or an in-memory NumPy matrix)
+- Per-entry content hashes for incremental re-sync
+- Optional IVF approximate index persisted next to the database
 - Integration with SQLite database
 """
 
@@ -10,6 +12,9 @@ import json
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from .vector_index import IVFIndex, MatrixIndex
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,27 +25,66 @@ class VectorStore:
     
     Provides vector storage and similarity search capabilities
     using SQLite with the vss extension.
+    
+    Embeddings are stored as raw float32 (or float16) BLOBs. The format
+    is recorded in memory_meta and rows are converted on initialization
+    when the configured format changes. Legacy rows holding JSON text are
+    still readable and are converted once on initialization.
     """
     
-    def __init__(self, db_path: str, embedding_dim: int = 384) -> None:
+    EMBEDDING_FORMATS = {"float32": np.float32, "float16": np.float16}
+    INDEX_TYPES = ("exact", "ivf")
+    
+    def __init__(
+        self,
+        db_path: str,
+        embedding_dim: int = 384,
+        embedding_format: str = "float32",
+        index_type: str = "exact",
+        ivf_nlist: int | None = None,
+        ivf_nprobe: int = 8,
+        ivf_min_train_size: int = 10000,
+    ) -> None:
         """Initialize vector store.
         
         Args:
             db_path: Path to SQLite database file
             embedding_dim: Dimension of embedding vectors (default: 384 for all-MiniLM-L6-v2)
+            embedding_format: BLOB storage format for new rows ('float32' or 'float16')
+            index_type: In-memory search index ('exact' or 'ivf')
+            ivf_nlist: IVF inverted lists (None = about 4 * sqrt(n))
+            ivf_nprobe: IVF lists scanned per query
+            ivf_min_train_size: Entries needed before IVF clustering is used
         """
+        if embedding_format not in self.EMBEDDING_FORMATS:
+            raise ValueError(f"Unsupported embedding format: {embedding_format}")
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}")
         self.db_path = Path(db_path)
         self.embedding_dim = embedding_dim
+        self.embedding_format = embedding_format
+        self.index_type = index_type
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.ivf_min_train_size = ivf_min_train_size
+        # IVF snapshot lives next to the database
+        self.index_path = self.db_path.with_name(self.db_path.name + ".ivf.npz")
+        self._embedding_dtype = self.EMBEDDING_FORMATS[embedding_format]
         self._connection: Any = None
         self._initialized = False
         self._vss_available = False
         self._vss_table_exists = False
+        # In-memory search matrix, loaded lazily on first fallback search
+        self._matrix_index: MatrixIndex | None = None
+        self._ann_saved_generation: int | None = None
         
         logger.info(
             "VectorStore initialized",
             extra={
                 "db_path": str(db_path),
                 "embedding_dim": embedding_dim,
+                "embedding_format": embedding_format,
+                "index_type": index_type,
             }
         )
 
@@ -132,9 +176,11 @@ class VectorStore:
                     source_file TEXT,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
-                    metadata TEXT
+                    metadata TEXT,
+                    content_hash TEXT
                 )
             """)
+            self._migrate_entry_columns(cursor)
             
             # Create indexes
             cursor.execute("""
@@ -145,16 +191,31 @@ class VectorStore:
                 CREATE INDEX IF NOT EXISTS idx_memory_entries_content_type 
                 ON memory_entries(content_type)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_memory_entries_source_file 
+                ON memory_entries(source_file)
+            """)
             
             # Create embeddings table (used when vss is not available)
+            # Older databases declare the column TEXT; SQLite keeps BLOBs as-is there
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS memory_embeddings (
                     entry_id TEXT PRIMARY KEY,
-                    embedding TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
                     FOREIGN KEY (entry_id) REFERENCES memory_entries(id)
                 )
             """)
             
+            # Key-value table for store-level state (migrations etc.)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS memory_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            self._migrate_embedding_format(cursor)
+            self._migrate_embeddings_to_binary(cursor)
+            
             # Try to create virtual table for vector search
             # Only attempt if vss extension was loaded successfully
             if self._vss_available:
@@ -193,7 +254,8 @@ class VectorStore:
             raise
     
     def insert(self, entry_id: str, embedding: list[float], content: str, 
-               content_type: str, metadata: dict[str, Any] | None = None) -> None:
+               content_type: str, metadata: dict[str, Any] | None = None,
+               source_file: str | None = None, content_hash: str | None = None) -> None:
         """Insert a vector embedding into the store.
         
         Args:
@@ -202,6 +264,8 @@ class VectorStore:
             content: Text content
             content_type: Type of content
             metadata: Optional metadata
+            source_file: Markdown file the entry was parsed from
+            content_hash: Hash of the entry content for incremental sync
         """
         if not self._initialized:
             self.initialize()
@@ -210,49 +274,16 @@ class VectorStore:
         cursor = conn.cursor()
         
         try:
-            # Insert into main table
-            cursor.execute("""
-                INSERT OR REPLACE INTO memory_entries 
-                (id, content, content_type, source_file, created_at, updated_at, metadata)
-                VALUES (?, ?, ?, ?, datetime('now'), datetime('now'), ?)
-            """, (
-                entry_id,
-                content,
-                content_type,
-                "",
-                json.dumps(metadata) if metadata else None
-            ))
-            
-            # Insert into vector table (regular table, always available)
-            try:
-                embedding_json = json.dumps(embedding)
-                cursor.execute("""
-                    INSERT OR REPLACE INTO memory_embeddings (entry_id, embedding)
-                    VALUES (?, ?)
-                """, (entry_id, embedding_json))
-            except Exception as e:
-                logger.debug(
-                    "Could not insert vector embedding",
-                    extra={"entry_id": entry_id, "error": str(e)}
-                )
+            self._write_entry(
+                cursor, entry_id, embedding, content, content_type,
+                metadata, source_file, content_hash,
+            )
+            self._bump_generation(cursor)
+            conn.commit()
             
-            # Also insert into vss table if available
-            if self._vss_available and self._vss_table_exists:
-                try:
-                    import struct
-                    # Convert embedding to bytes for vss
-                    embedding_bytes = struct.pack(f'{len(embedding)}f', *embedding)
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO memory_embeddings_vss (rowid, embedding)
-                        VALUES (?, ?)
-                    """, (abs(hash(entry_id)) % (2**31), embedding_bytes))
-                except Exception as e:
-                    logger.debug(
-                        "Could not insert into vss table",
-                        extra={"entry_id": entry_id, "error": str(e)}
-                    )
+            if self._matrix_index is not None:
+                self._matrix_index.upsert(entry_id, embedding)
             
-            conn.commit()
             logger.debug(
                 "Vector entry inserted",
                 extra={"entry_id": entry_id, "content_type": content_type}
@@ -263,7 +294,142 @@ class VectorStore:
                 "Failed to insert vector",
                 extra={"entry_id": entry_id, "error": str(e)}
             )
+    
+    def _write_entry(
+        self,
+        cursor: Any,
+        entry_id: str,
+        embedding: list[float],
+        content: str,
+        content_type: str,
+        metadata: dict[str, Any] | None,
+        source_file: str | None,
+        content_hash: str | None,
+    ) -> None:
+        """Write an entry and its embedding (caller commits)."""
+        if source_file is None and metadata:
+            source_file = metadata.get("source_file")
+        
+        # Insert into main table
+        cursor.execute("""
+            INSERT OR REPLACE INTO memory_entries 
+            (id, content, content_type, source_file, created_at, updated_at, metadata, content_hash)
+            VALUES (?, ?, ?, ?, datetime('now'), datetime('now'), ?, ?)
+        """, (
+            entry_id,
+            content,
+            content_type,
+            source_file or "",
+            json.dumps(metadata) if metadata else None,
+            content_hash,
+        ))
+        
+        # Insert into vector table (regular table, always available)
+        try:
+            cursor.execute("""
+                INSERT OR REPLACE INTO memory_embeddings (entry_id, embedding)
+                VALUES (?, ?)
+            """, (entry_id, self._encode_embedding(embedding)))
+        except Exception as e:
+            logger.debug(
+                "Could not insert vector embedding",
+                extra={"entry_id": entry_id, "error": str(e)}
+            )
+        
+        # Also insert into vss table if available
+        if self._vss_available and self._vss_table_exists:
+            try:
+                import struct
+                # Convert embedding to bytes for vss
+                embedding_bytes = struct.pack(f'{len(embedding)}f', *embedding)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO memory_embeddings_vss (rowid, embedding)
+                    VALUES (?, ?)
+                """, (abs(hash(entry_id)) % (2**31), embedding_bytes))
+            except Exception as e:
+                logger.debug(
+                    "Could not insert into vss table",
+                    extra={"entry_id": entry_id, "error": str(e)}
+                )
+    
+    def get_content_hashes(self, source_file: str | None = None) -> dict[str, str | None]:
+        """Get stored content hashes.
+        
+        Args:
+            source_file: Only entries parsed from this file (None = all entries)
+            
+        Returns:
+            Mapping of entry ID to content hash (None for rows written
+            before hashes were tracked)
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        cursor = self._get_connection().cursor()
+        if source_file is None:
+            cursor.execute("SELECT id, content_hash FROM memory_entries")
+        else:
+            cursor.execute(
+                "SELECT id, content_hash FROM memory_entries WHERE source_file = ?",
+                (source_file,),
+            )
+        return {row["id"]: row["content_hash"] for row in cursor.fetchall()}
+    
+    def apply_changes(
+        self,
+        upserts: list[dict[str, Any]],
+        delete_ids: list[str],
+    ) -> None:
+        """Upsert and delete entries in a single transaction.
+        
+        Args:
+            upserts: Entries to write; each dict has the keyword arguments
+                of insert() (entry_id, embedding, content, content_type and
+                optionally metadata, source_file, content_hash)
+            delete_ids: Entry IDs to delete
+        
+        Raises:
+            Exception: If the transaction fails (it is rolled back)
+        """
+        if not upserts and not delete_ids:
+            return
+        if not self._initialized:
+            self.initialize()
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            for item in upserts:
+                self._write_entry(
+                    cursor,
+                    item["entry_id"],
+                    item["embedding"],
+                    item["content"],
+                    item["content_type"],
+                    item.get("metadata"),
+                    item.get("source_file"),
+                    item.get("content_hash"),
+                )
+            if delete_ids:
+                cursor.executemany("DELETE FROM memory_entries WHERE id = ?", [(i,) for i in delete_ids])
+                cursor.executemany("DELETE FROM memory_embeddings WHERE entry_id = ?", [(i,) for i in delete_ids])
+            self._bump_generation(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
             raise
+        
+        if self._matrix_index is not None:
+            for item in upserts:
+                self._matrix_index.upsert(item["entry_id"], item["embedding"])
+            for entry_id in delete_ids:
+                self._matrix_index.remove(entry_id)
+        
+        logger.debug(
+            "Vector store changes applied",
+            extra={"upserted": len(upserts), "deleted": len(delete_ids)}
+        )
     
     def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
         """Calculate cosine similarity between two vectors.
@@ -334,37 +500,39 @@ class VectorStore:
                 except Exception as e:
                     logger.debug(f"VSS search failed: {e}, falling back to Python")
             
-            # Fallback: Use Python to calculate cosine similarity
-            logger.debug("Using Python cosine similarity (vss not available)")
+            # Fallback: cosine search over the in-memory matrix (exact or IVF)
+            logger.debug("Using NumPy matrix search (vss not available)")
             
-            # Get all entries with embeddings using proper join
-            cursor.execute("""
-                SELECT m.id, m.content, m.content_type, m.metadata, e.embedding
-                FROM memory_entries m
-                JOIN memory_embeddings e ON m.id = e.entry_id
-            """)
+            hits = [
+                (entry_id, score)
+                for entry_id, score in self._get_matrix_index().search(query_embedding, limit)
+                if score > 0.0  # Only include if there's some similarity
+            ]
+            if not hits:
+                return []
+            
+            placeholders = ",".join("?" * len(hits))
+            cursor.execute(f"""
+                SELECT id, content, content_type, metadata
+                FROM memory_entries
+                WHERE id IN ({placeholders})
+            """, [entry_id for entry_id, _ in hits])
+            rows = {row["id"]: row for row in cursor.fetchall()}
             
             results = []
-            for row in cursor.fetchall():
-                entry_embedding_json = row["embedding"]
-                if entry_embedding_json:
-                    try:
-                        entry_embedding = json.loads(entry_embedding_json)
-                        similarity = self._cosine_similarity(query_embedding, entry_embedding)
-                        if similarity > 0.0:  # Only include if there's some similarity
-                            results.append({
-                                "id": row["id"],
-                                "content": row["content"],
-                                "content_type": row["content_type"],
-                                "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-                                "score": similarity
-                            })
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-            
-            # Sort by similarity and limit results
-            results.sort(key=lambda x: x["score"], reverse=True)
-            return results[:limit]
+            for entry_id, score in hits:
+                row = rows.get(entry_id)
+                if row is None:
+                    continue
+                results.append({
+                    "id": row["id"],
+                    "content": row["content"],
+                    "content_type": row["content_type"],
+                    "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
+                    "score": score
+                })
+            
+            return results
                 
         except Exception as e:
             logger.error(
@@ -390,9 +558,14 @@ class VectorStore:
         
         try:
             cursor.execute("DELETE FROM memory_entries WHERE id = ?", (entry_id,))
+            deleted = cursor.rowcount > 0
+            cursor.execute("DELETE FROM memory_embeddings WHERE entry_id = ?", (entry_id,))
+            self._bump_generation(cursor)
             conn.commit()
             
-            deleted = cursor.rowcount > 0
+            if self._matrix_index is not None:
+                self._matrix_index.remove(entry_id)
+            
             if deleted:
                 logger.debug("Vector entry deleted", extra={"entry_id": entry_id})
             return deleted
@@ -405,11 +578,281 @@ class VectorStore:
             return False
     
     def close(self) -> None:
-        """Close database connection."""
+        """Close database connection, saving the IVF index if it changed."""
+        if isinstance(self._matrix_index, IVFIndex) and self._connection:
+            self._save_ann_index(self._matrix_index)
         if self._connection:
             self._connection.close()
             self._connection = None
             logger.debug("VectorStore connection closed")
+        self._matrix_index = None
+
+    def _encode_embedding(self, embedding: list[float] | np.ndarray) -> bytes:
+        """Encode an embedding as a BLOB in the configured format.
+        
+        Args:
+            embedding: Embedding vector
+            
+        Returns:
+            Raw little-endian float bytes
+        """
+        return np.asarray(embedding, dtype=self._embedding_dtype).tobytes()
+
+    def _decode_embedding(self, value: Any, dtype: Any = None) -> np.ndarray | None:
+        """Decode a stored embedding without copying when possible.
+        
+        BLOBs are viewed with np.frombuffer in the store's format (all
+        rows share it, see _migrate_embedding_format). Legacy JSON text
+        rows are parsed as before.
+        
+        Args:
+            value: Raw column value
+            dtype: BLOB element type (default: the configured format)
+            
+        Returns:
+            Embedding array, or None if the value can't be decoded
+        """
+        if isinstance(value, (bytes, memoryview)):
+            dtype = np.dtype(dtype or self._embedding_dtype)
+            if len(value) % dtype.itemsize:
+                return None
+            return np.frombuffer(value, dtype=dtype)
+        
+        try:
+            return np.asarray(json.loads(value), dtype=np.float32)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return None
+
+    def _migrate_embedding_format(self, cursor: Any) -> None:
+        """Convert BLOB rows to the configured format if it changed.
+        
+        Databases written before the format was recorded may mix float32
+        and float16 rows; their type is taken from the byte length once,
+        here, and never guessed again.
+        
+        Args:
+            cursor: Cursor inside the initialization transaction
+        """
+        cursor.execute("SELECT value FROM memory_meta WHERE key = 'embedding_format'")
+        row = cursor.fetchone()
+        stored_format = row[0] if row else None
+        if stored_format == self.embedding_format:
+            return
+        
+        cursor.execute("""
+            SELECT entry_id, embedding FROM memory_embeddings
+            WHERE typeof(embedding) = 'blob'
+        """)
+        converted = []
+        for row in cursor.fetchall():
+            value = row["embedding"]
+            if stored_format in self.EMBEDDING_FORMATS:
+                dtype = self.EMBEDDING_FORMATS[stored_format]
+            elif len(value) == self.embedding_dim * 2:
+                dtype = np.float16
+            else:
+                dtype = np.float32
+            if dtype is self._embedding_dtype:
+                continue
+            embedding = self._decode_embedding(value, dtype)
+            if embedding is not None:
+                converted.append((self._encode_embedding(embedding), row["entry_id"]))
+        
+        cursor.executemany(
+            "UPDATE memory_embeddings SET embedding = ? WHERE entry_id = ?",
+            converted,
+        )
+        cursor.execute(
+            "INSERT OR REPLACE INTO memory_meta (key, value) VALUES ('embedding_format', ?)",
+            (self.embedding_format,),
+        )
+        if converted:
+            self._bump_generation(cursor)
+            logger.info(
+                "Converted embeddings to new storage format",
+                extra={
+                    "converted": len(converted),
+                    "from_format": stored_format,
+                    "embedding_format": self.embedding_format,
+                }
+            )
+
+    def _migrate_embeddings_to_binary(self, cursor: Any) -> None:
+        """Convert legacy JSON text embeddings to BLOBs (runs once per database).
+        
+        Args:
+            cursor: Cursor inside the initialization transaction
+        """
+        cursor.execute("SELECT value FROM memory_meta WHERE key = 'embedding_storage'")
+        if cursor.fetchone() is not None:
+            return
+        
+        cursor.execute("""
+            SELECT entry_id, embedding FROM memory_embeddings
+            WHERE typeof(embedding) = 'text'
+        """)
+        converted = []
+        skipped = 0
+        for row in cursor.fetchall():
+            embedding = self._decode_embedding(row["embedding"])
+            if embedding is None:
+                skipped += 1
+                continue
+            converted.append((self._encode_embedding(embedding), row["entry_id"]))
+        
+        cursor.executemany(
+            "UPDATE memory_embeddings SET embedding = ? WHERE entry_id = ?",
+            converted,
+        )
+        cursor.execute(
+            "INSERT OR REPLACE INTO memory_meta (key, value) VALUES ('embedding_storage', 'binary')"
+        )
+        
+        if converted or skipped:
+            logger.info(
+                "Migrated embeddings to binary storage",
+                extra={
+                    "converted": len(converted),
+                    "skipped": skipped,
+                    "embedding_format": self.embedding_format,
+                }
+            )
+
+    def _migrate_entry_columns(self, cursor: Any) -> None:
+        """Add the content_hash column to older databases.
+        
+        Also backfills source_file from metadata, where earlier versions
+        kept it, so file-scoped diffs see those rows.
+        """
+        cursor.execute("PRAGMA table_info(memory_entries)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if "content_hash" in columns:
+            return
+        
+        cursor.execute("ALTER TABLE memory_entries ADD COLUMN content_hash TEXT")
+        try:
+            cursor.execute("""
+                UPDATE memory_entries
+                SET source_file = json_extract(metadata, '$.source_file')
+                WHERE (source_file IS NULL OR source_file = '')
+                  AND metadata IS NOT NULL
+                  AND json_extract(metadata, '$.source_file') IS NOT NULL
+            """)
+        except Exception as e:
+            logger.debug("Could not backfill source_file", extra={"error": str(e)})
+        logger.info("Added content_hash column to memory_entries")
+
+    def _get_matrix_index(self) -> MatrixIndex:
+        """Get the in-memory search index, loading it once.
+        
+        Kept in sync by insert/delete/clear afterwards, so the table is
+        only scanned on the first search. With index_type 'ivf' a snapshot
+        matching the current store generation is loaded from index_path
+        instead of the table.
+        
+        Returns:
+            MatrixIndex (or IVFIndex) instance
+        """
+        if self._matrix_index is not None:
+            return self._matrix_index
+        
+        if self.index_type == "ivf":
+            index: MatrixIndex = IVFIndex(
+                self.embedding_dim,
+                nlist=self.ivf_nlist,
+                nprobe=self.ivf_nprobe,
+                min_train_size=self.ivf_min_train_size,
+            )
+            if self.index_path.exists() and index.load(self.index_path, self._get_generation()):
+                self._matrix_index = index
+                self._ann_saved_generation = self._get_generation()
+                logger.info(
+                    "IVF index loaded from snapshot",
+                    extra={"entries": len(index), "path": str(self.index_path)}
+                )
+                return index
+        else:
+            index = MatrixIndex(self.embedding_dim)
+        
+        index.build(self._iter_embeddings())
+        self._matrix_index = index
+        
+        logger.info(
+            "Vector search matrix loaded",
+            extra={
+                "entries": len(index),
+                "embedding_dim": self.embedding_dim,
+                "index_type": self.index_type,
+            }
+        )
+        if isinstance(index, IVFIndex) and index.is_trained:
+            self._save_ann_index(index)
+        return index
+
+    def _iter_embeddings(self) -> Any:
+        """Yield (entry_id, embedding) for every stored entry."""
+        cursor = self._get_connection().cursor()
+        cursor.execute("""
+            SELECT e.entry_id, e.embedding
+            FROM memory_embeddings e
+            JOIN memory_entries m ON m.id = e.entry_id
+        """)
+        for row in cursor:
+            embedding = self._decode_embedding(row["embedding"])
+            if embedding is not None:
+                yield row["entry_id"], embedding
+
+    def rebuild_ann_index(self) -> int:
+        """Rebuild and retrain the IVF index from memory_embeddings.
+        
+        Returns:
+            Number of indexed entries
+        """
+        if not self._initialized:
+            self.initialize()
+        if self.index_type != "ivf":
+            raise ValueError("rebuild_ann_index requires index_type='ivf'")
+        
+        index = IVFIndex(
+            self.embedding_dim,
+            nlist=self.ivf_nlist,
+            nprobe=self.ivf_nprobe,
+            min_train_size=self.ivf_min_train_size,
+        )
+        index.build(self._iter_embeddings())
+        if not index.is_trained and len(index):
+            index.train()
+        self._matrix_index = index
+        self._save_ann_index(index)
+        return len(index)
+
+    def _get_generation(self) -> int:
+        """Current write generation of the store."""
+        row = self._get_connection().execute(
+            "SELECT value FROM memory_meta WHERE key = 'vector_generation'"
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _bump_generation(self, cursor: Any) -> None:
+        """Advance the write generation (inside the caller's transaction)."""
+        cursor.execute("""
+            INSERT INTO memory_meta (key, value) VALUES ('vector_generation', '1')
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        """)
+
+    def _save_ann_index(self, index: IVFIndex) -> None:
+        """Write the IVF snapshot if the store changed since the last save."""
+        try:
+            generation = self._get_generation()
+            if self._ann_saved_generation == generation and self.index_path.exists():
+                return
+            index.save(self.index_path, generation)
+            self._ann_saved_generation = generation
+        except Exception as e:
+            logger.warning(
+                "Failed to save IVF index",
+                extra={"path": str(self.index_path), "error": str(e)}
+            )
 
     def get_embedding(self, entry_id: str) -> list[float] | None:
         """Get embedding for an entry.
@@ -427,19 +870,15 @@ class VectorStore:
         cursor = conn.cursor()
         
         try:
-            # Try to get from vector table
-            try:
-                row_id = hash(entry_id) % (2**31)
-                cursor.execute("""
-                    SELECT embedding FROM memory_embeddings WHERE rowid = ?
-                """, (row_id,))
-                row = cursor.fetchone()
-                if row:
-                    return json.loads(row[0])
-            except Exception:
-                pass
+            cursor.execute("""
+                SELECT embedding FROM memory_embeddings WHERE entry_id = ?
+            """, (entry_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
             
-            return None
+            embedding = self._decode_embedding(row["embedding"])
+            return embedding.tolist() if embedding is not None else None
             
         except Exception as e:
             logger.error(
@@ -528,8 +967,12 @@ class VectorStore:
                 cursor.execute("DELETE FROM memory_embeddings")
             except Exception:
                 pass  # vss table may not exist
+            self._bump_generation(cursor)
             
             conn.commit()
+            
+            if self._matrix_index is not None:
+                self._matrix_index.clear()
             logger.info("VectorStore cleared")
             
         except Exception as e:
@@ -589,11 +1032,21 @@ class VectorStore:
 _vector_store: VectorStore | None = None
 
 
-def get_vector_store(db_path: str | None = None) -> VectorStore:
+def get_vector_store(
+    db_path: str | None = None,
+    embedding_format: str = "float32",
+    index_type: str = "exact",
+    ivf_nlist: int | None = None,
+    ivf_nprobe: int = 8,
+) -> VectorStore:
     """Get or create global vector store instance.
     
     Args:
         db_path: Path to database file (optional if already initialized)
+        embedding_format: BLOB storage format ('float32' or 'float16')
+        index_type: In-memory search index ('exact' or 'ivf')
+        ivf_nlist: IVF inverted lists (None = automatic)
+        ivf_nprobe: IVF lists scanned per query
         
     Returns:
         VectorStore instance
@@ -602,6 +1055,12 @@ def get_vector_store(db_path: str | None = None) -> VectorStore:
     if _vector_store is None:
         if db_path is None:
             db_path = "x-agent.db"
-        _vector_store = VectorStore(db_path)
+        _vector_store = VectorStore(
+            db_path,
+            embedding_format=embedding_format,
+            index_type=index_type,
+            ivf_nlist=ivf_nlist,
+            ivf_nprobe=ivf_nprobe,
+        )
         _vector_store.initialize()
     return _vector_store
@@ -2,8 +2,8 @@
 
 from .message import Message
 from .session import Session
-from .stat import LLMRequestStat
-from .compression import CompressionEvent
+from .stat import LLMRequestStat, LLMStatRollup
+from .compression import CompressionEvent, ConversationSummary
 from .skill import SkillMetadata
 
-__all__ = ["Message", "Session", "LLMRequestStat", "CompressionEvent", "SkillMetadata"]
+__all__ = ["Message", "Session", "LLMRequestStat", "LLMStatRollup", "CompressionEvent", "ConversationSummary", "SkillMetadata"]
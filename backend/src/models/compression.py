@@ -22,4 +22,19 @@ class CompressionEvent(Base):
     original_messages = Column(Text)  # JSON string of original messages (before compression)
     compressed_messages = Column(Text)  # JSON string of compressed messages (after compression)
     archived_message_count = Column(Integer)  # Number of archived messages
-    retained_message_count = Column(Integer)  # Number of retained messages
\ No newline at end of file
+    retained_message_count = Column(Integer)  # Number of retained messages
+
+
+class ConversationSummary(Base):
+    """Rolling summary of a session's archived messages.
+
+    Reused across turns so only newly archived messages are summarised.
+    """
+
+    __tablename__ = "conversation_summaries"
+
+    session_id = Column(String, primary_key=True)  # Session identifier
+    summary = Column(Text)  # Summary of the first summarized_count messages
+    summarized_count = Column(Integer)  # Watermark: archived conversation messages covered
+    archive_hash = Column(String)  # Fingerprint of the covered messages
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
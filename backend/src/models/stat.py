@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import DateTime, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -62,3 +62,45 @@ class LLMRequestStat(Base):
             "latency_ms": self.latency_ms,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class LLMStatRollup(Base):
+    """Pre-aggregated LLM request statistics for one hour or one day.
+    
+    Maintained incrementally as request stats are written, so dashboard
+    queries over closed periods read one row per provider/model/period
+    instead of scanning llm_request_stats.
+    """
+    
+    __tablename__ = "llm_stat_rollups"
+    __table_args__ = (
+        UniqueConstraint("granularity", "period_start", "provider_name", "model_id"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Period: "hour" or "day", starting at period_start (local time)
+    granularity: Mapped[str] = mapped_column(String(8), index=True)
+    period_start: Mapped[datetime] = mapped_column(DateTime, index=True)
+    
+    provider_name: Mapped[str] = mapped_column(String(100), index=True)
+    model_id: Mapped[str] = mapped_column(String(100), index=True)
+    
+    # Counters
+    total_requests: Mapped[int] = mapped_column(Integer, default=0)
+    successful_requests: Mapped[int] = mapped_column(Integer, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    total_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    
+    # Latency: sum (for the mean), extremes and a JSON list of bucket counts
+    latency_sum_ms: Mapped[int] = mapped_column(Integer, default=0)
+    min_latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    max_latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    latency_histogram: Mapped[str] = mapped_column(Text, default="[]")
+    
+    def __repr__(self) -> str:
+        return (
+            f"<LLMStatRollup({self.granularity} {self.period_start}, "
+            f"provider={self.provider_name}, requests={self.total_requests})>"
+        )
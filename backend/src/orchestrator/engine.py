@@ -128,9 +128,14 @@ class Orchestrator:
         self._register_builtin_tools()
         
         # ReAct loop
+        try:
+            max_parallel_tools = ConfigManager().config.tools.max_parallel_tools
+        except Exception:
+            max_parallel_tools = 4
         self._react_loop = ReActLoop(
             llm_router=self._llm_router,
             tool_manager=self._tool_manager,
+            max_parallel_tools=max_parallel_tools,
         )
         
         # 🔥 FIX: Plan state cache for tool confirmation inheritance
@@ -253,6 +258,7 @@ class Orchestrator:
                 self._hybrid_search = get_hybrid_search(
                     vector_store=vector_store,
                     embedder=embedder,
+                    entry_index=get_md_sync(str(self.workspace_path)).entry_index,
                 )
             except Exception as e:
                 logger.warning(
@@ -211,6 +211,7 @@ class LLMSkillMatcher:
                     {"role": "user", "content": user_prompt}
                 ],
                 stream=False,
+                cache=True,
             )
             
             # 解析响应
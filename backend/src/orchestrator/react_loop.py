@@ -11,6 +11,7 @@ The ReAct (Reasoning + Acting) loop enables the agent to:
 This creates an iterative problem-solving capability with self-reflection.
 """
 
+import asyncio
 import json
 import re
 from collections.abc import AsyncGenerator
@@ -231,6 +232,7 @@ class ReActLoop:
         tool_manager: ToolManager,
         max_iterations: int = 5,  # ✅ OPTIMIZE: Reduced from 8 to 5 for faster failure detection
         enable_reflection: bool = True,  # NEW: Enable/disable reflection
+        max_parallel_tools: int = 4,
     ) -> None:
         """Initialize the ReAct loop.
         
@@ -239,11 +241,14 @@ class ReActLoop:
             tool_manager: Tool manager for executing tools
             max_iterations: Maximum number of iterations
             enable_reflection: Whether to enable self-reflection capabilities
+            max_parallel_tools: Maximum parallel-safe tool calls run concurrently
+                (1 = always sequential)
         """
         self.llm_router = llm_router
         self.tool_manager = tool_manager
         self.max_iterations = max_iterations
         self.enable_reflection = enable_reflection
+        self.max_parallel_tools = max(1, max_parallel_tools)
         
         # 🔥 NEW: SKILL.md content cache (avoid repeated file reads)
         self._skill_md_cache: dict[str, str] = {}
@@ -253,6 +258,7 @@ class ReActLoop:
             extra={
                 "max_iterations": max_iterations,
                 "enable_reflection": enable_reflection,
+                "max_parallel_tools": self.max_parallel_tools,
             }
         )
     
@@ -606,6 +612,9 @@ class ReActLoop:
                 f"ReAct iteration {iteration + 1}/{self.max_iterations}"
             )
             
+            # Parallel-safe tool calls started ahead of the loop below (index -> task)
+            pending_tools = {}
+            
             try:
                 # Call LLM with tools for function calling
                 response = await self.llm_router.chat(
@@ -626,8 +635,9 @@ class ReActLoop:
                         "tool_calls": [tc.name for tc in tool_calls],
                     }
                     
-                    # Process each tool call
-                    for tool_call in tool_calls:
+                    # Process each tool call (results are handled in call order,
+                    # even when consecutive parallel-safe calls run concurrently)
+                    for index, tool_call in enumerate(tool_calls):
                         # 🔥 CRITICAL: Check if this tool call violates plan metadata constraints
                         if tool_call.name == "web_search" and web_search_count >= web_search_max_allowed:
                             logger.warning(
@@ -810,11 +820,23 @@ class ReActLoop:
                         # Execute tool - constraint checking is done in ToolManager
                         # to avoid duplication and centralize validation logic
                         try:
-                            result = await self.tool_manager.execute(
-                                tool_call.name,
-                                tool_call.arguments,
-                                skill_context=skill_context,  # Phase 2 - Pass skill context for tool restrictions
-                            )
+                            if index not in pending_tools and self._is_parallel_safe(tool_call):
+                                pending_tools.update(self._start_parallel_tools(
+                                    tool_calls,
+                                    index,
+                                    skill_context,
+                                    plan_state,
+                                    web_search_max_allowed - web_search_count,
+                                ))
+                            pending = pending_tools.pop(index, None)
+                            if pending is not None:
+                                result = await pending
+                            else:
+                                result = await self.tool_manager.execute(
+                                    tool_call.name,
+                                    tool_call.arguments,
+                                    skill_context=skill_context,  # Phase 2 - Pass skill context for tool restrictions
+                                )
                         except Exception as e:
                             # Handle ToolNotAllowedError from ToolManager
                             from ..tools.manager import ToolNotAllowedError
@@ -867,7 +889,6 @@ class ReActLoop:
                                     error_learning_service = get_error_learning_service(self.llm_router)
                                     
                                     # ✅ OPTIMIZE: Add timeout control to prevent blocking
-                                    import asyncio
                                     retrieved_memories = await asyncio.wait_for(
                                         error_learning_service.retrieve_relevant_memories_for_error(
                                             error_type=reflection_type.value,
@@ -1372,6 +1393,10 @@ class ReActLoop:
                         )
                 
                 return
+            
+            finally:
+                # Parallel calls whose results were never used (loop stopped early)
+                self._cancel_parallel_tools(pending_tools)
         
         # Max iterations reached
         utilization_rate = (actual_iterations / self.max_iterations * 100) if self.max_iterations > 0 else 0
@@ -1410,6 +1435,98 @@ class ReActLoop:
             "strategy_summary": self.get_strategy_summary(strategy_state),
         }
     
+    def _is_parallel_safe(self, tool_call: ToolCallRequest) -> bool:
+        """Whether a tool call may run concurrently with its neighbours."""
+        if self.max_parallel_tools <= 1:
+            return False
+        tool = self.tool_manager.get_tool(tool_call.name)
+        if tool is None or not tool.is_parallel_safe:
+            return False
+        is_risky, _ = self._is_high_risk_action(tool_call.name, tool_call.arguments)
+        return not is_risky
+    
+    def _start_parallel_tools(
+        self,
+        tool_calls: list[ToolCallRequest],
+        start: int,
+        skill_context: Any,
+        plan_state: PlanState | None,
+        web_search_remaining: float,
+    ) -> dict[int, asyncio.Task]:
+        """Start the run of consecutive parallel-safe calls beginning at ``start``.
+        
+        The run ends at the first call that is not parallel-safe, so a
+        read never overtakes an earlier write. Later calls in the run that
+        run_streaming() would block (plan constraints, web_search budget)
+        are left out. At most max_parallel_tools calls execute at once.
+        
+        Args:
+            tool_calls: All tool calls of the LLM response
+            start: Index of the call about to be executed (already checked)
+            skill_context: Skill context passed to ToolManager.execute
+            plan_state: Plan state with tool constraints
+            web_search_remaining: web_search calls still allowed after ``start``
+            
+        Returns:
+            Tasks by call index, or an empty dict if there is nothing to overlap
+        """
+        batch = [start]
+        for index in range(start + 1, len(tool_calls)):
+            tool_call = tool_calls[index]
+            if not self._is_parallel_safe(tool_call):
+                break
+            if self._violates_plan_constraints(tool_call.name, plan_state):
+                continue
+            if tool_call.name == "web_search":
+                if web_search_remaining <= 0:
+                    continue
+                web_search_remaining -= 1
+            batch.append(index)
+        
+        if len(batch) < 2:
+            return {}
+        
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        
+        async def run(tool_call: ToolCallRequest) -> ToolResult:
+            async with semaphore:
+                return await self.tool_manager.execute(
+                    tool_call.name,
+                    tool_call.arguments,
+                    skill_context=skill_context,
+                )
+        
+        logger.info(
+            "Executing tool calls concurrently",
+            extra={
+                "tools": [tool_calls[i].name for i in batch],
+                "max_parallel_tools": self.max_parallel_tools,
+            }
+        )
+        return {index: asyncio.create_task(run(tool_calls[index])) for index in batch}
+    
+    @staticmethod
+    def _cancel_parallel_tools(pending_tools: dict[int, asyncio.Task]) -> None:
+        """Cancel started tool calls whose results will not be used."""
+        for task in pending_tools.values():
+            if task.done():
+                if not task.cancelled():
+                    task.exception()  # Mark retrieved to avoid "never retrieved" warnings
+            else:
+                task.cancel()
+        pending_tools.clear()
+    
+    @staticmethod
+    def _violates_plan_constraints(tool_name: str, plan_state: PlanState | None) -> bool:
+        """Whether the structured plan's forbidden/allowed lists reject a tool."""
+        plan = getattr(plan_state, 'structured_plan', None) if plan_state else None
+        tool_constraints = getattr(plan, 'tool_constraints', None) if plan else None
+        if not tool_constraints:
+            return False
+        if tool_constraints.forbidden and tool_name in tool_constraints.forbidden:
+            return True
+        return bool(tool_constraints.allowed) and tool_name not in tool_constraints.allowed
+    
     def _extract_tool_calls(self, response: Any) -> list[ToolCallRequest]:
         """Extract tool calls from LLM response.
         
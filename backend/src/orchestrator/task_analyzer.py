@@ -182,6 +182,7 @@ class TaskAnalyzer:
                     {"role": "user", "content": user_prompt}
                 ],
                 stream=False,
+                cache=True,
             )
             
             # 解析响应
@@ -1,13 +1,14 @@
 """Compression service for context management."""
 
 from .token_counter import TokenCounter
-from .compressor import ContextCompressor, CompressionResult
+from .compressor import ContextCompressor, CompressionResult, RollingSummary
 from .manager import ContextCompressionManager, PreparedContext
 
 __all__ = [
     "TokenCounter",
     "ContextCompressor",
     "CompressionResult",
+    "RollingSummary",
     "ContextCompressionManager",
     "PreparedContext",
 ]
@@ -1,5 +1,7 @@
 """Context compressor for conversation history compression."""
 
+import hashlib
+import json
 from dataclasses import dataclass
 
 from ...utils.logger import get_logger
@@ -8,6 +10,30 @@ from .token_counter import TokenCounter
 logger = get_logger(__name__)
 
 
+def archive_hash(messages: list[dict]) -> str:
+    """Fingerprint of archived messages (role and content only)."""
+    digest = hashlib.sha256()
+    for msg in messages:
+        digest.update(json.dumps(
+            [msg.get("role"), msg.get("content")], ensure_ascii=False, default=str
+        ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class RollingSummary:
+    """A session's summary and the archived messages it covers.
+    
+    ``summarized_count`` is the watermark: the first N conversation
+    messages (system prompt excluded) are folded into ``summary``, and
+    ``archive_hash`` fingerprints them so an edited history is detected.
+    """
+    
+    summary: str
+    summarized_count: int
+    archive_hash: str
+
+
 @dataclass
 class CompressionResult:
     """Result of context compression."""
@@ -18,6 +44,8 @@ class CompressionResult:
     summary: str                      # Generated summary
     original_token_count: int         # Original token count
     compressed_token_count: int       # Compressed token count
+    rolling_summary: RollingSummary | None = None  # Summary state to keep for the next turn
+    summary_llm_calls: int = 0        # LLM calls made for the summary (0 = reused)
 
 
 class ContextCompressor:
@@ -28,6 +56,9 @@ class ContextCompressor:
     2. Generate summary for archived messages (for LLM context only)
     3. Build final message list with original system prompt + summary + retained messages
     
+    Given the previous turn's RollingSummary, only messages archived since
+    then are folded into it; if none were, the summary is reused as is.
+    
     Note: Summary is NOT stored to memory files. SmartMemoryService handles
     real-time memory storage independently.
     """
@@ -45,13 +76,15 @@ class ContextCompressor:
     async def compress(
         self,
         messages: list[dict],
-        retention_count: int
+        retention_count: int,
+        previous: RollingSummary | None = None,
     ) -> CompressionResult:
         """Compress conversation context.
         
         Args:
             messages: Full conversation history
             retention_count: Number of recent messages to retain
+            previous: Summary from an earlier turn of the same conversation
             
         Returns:
             Compression result with summary and retained messages
@@ -81,8 +114,51 @@ class ContextCompressor:
         archive_messages = conversation_messages[:-actual_retention] if actual_retention > 0 else conversation_messages
         recent_messages = conversation_messages[-actual_retention:] if actual_retention > 0 else []
         
-        # 2. Generate summary for archived messages (for LLM context only)
-        summary = await self._generate_summary(archive_messages) if archive_messages else ""
+        # 2. Generate summary for archived messages (for LLM context only),
+        # folding only newly archived messages into a still-valid previous one
+        rolling = None
+        llm_calls = 0
+        if previous is not None and self._extends(previous, archive_messages):
+            new_messages = archive_messages[previous.summarized_count:]
+            if new_messages:
+                summary = await self._request_summary(
+                    self._update_prompt(previous.summary, new_messages), len(new_messages)
+                )
+                llm_calls = 1
+                if summary is None:
+                    # Keep the older summary and leave the messages it lacks
+                    # in the window; the next turn folds them again
+                    summary = previous.summary
+                    rolling = previous
+                    archive_messages = archive_messages[:previous.summarized_count]
+                    recent_messages = new_messages + recent_messages
+            else:
+                summary = previous.summary
+                rolling = previous
+            logger.debug(
+                "Reusing rolling summary",
+                extra={
+                    "summarized_count": previous.summarized_count,
+                    "new_archived_count": len(new_messages),
+                }
+            )
+        elif archive_messages:
+            summary = await self._request_summary(
+                self._summary_prompt(archive_messages), len(archive_messages)
+            )
+            llm_calls = 1
+        else:
+            summary = ""
+        
+        if summary is None:
+            # Fallback placeholder; not kept, so the next turn tries again
+            summary = f"[对话历史摘要] 共{len(archive_messages)}轮对话"
+        elif rolling is None and summary:
+            rolling = RollingSummary(
+                summary=summary,
+                summarized_count=len(archive_messages),
+                archive_hash=archive_hash(archive_messages),
+            )
         
         # 3. Build compressed message list (preserving original system prompt)
         compressed_messages = self._build_compressed_messages(
@@ -95,28 +171,34 @@ class ContextCompressor:
             archived_messages=archive_messages,
             summary=summary,
             original_token_count=self.token_counter.count_messages(messages),
-            compressed_token_count=self.token_counter.count_messages(compressed_messages)
+            compressed_token_count=self.token_counter.count_messages(compressed_messages),
+            rolling_summary=rolling,
+            summary_llm_calls=llm_calls,
         )
     
-    async def _generate_summary(self, messages: list[dict]) -> str:
-        """Generate summary for archived messages using LLM.
-        
-        Args:
-            messages: Messages to summarize
-            
-        Returns:
-            Generated summary text
-        """
-        # Build conversation text
-        conversation_text = "\n".join([
+    @staticmethod
+    def _extends(previous: RollingSummary, archive_messages: list[dict]) -> bool:
+        """Whether the archive starts with the messages ``previous`` covers."""
+        count = previous.summarized_count
+        return (
+            0 < count <= len(archive_messages)
+            and archive_hash(archive_messages[:count]) == previous.archive_hash
+        )
+    
+    @staticmethod
+    def _conversation_text(messages: list[dict]) -> str:
+        """Render messages as "role: content" lines."""
+        return "\n".join([
             f"{msg.get('role', 'user')}: {msg.get('content', '')}"
             for msg in messages
         ])
-        
-        prompt = f"""请对以下对话历史生成简洁的摘要：
+    
+    def _summary_prompt(self, messages: list[dict]) -> str:
+        """Prompt summarising archived messages from scratch."""
+        return f"""请对以下对话历史生成简洁的摘要：
 
 对话历史：
-{conversation_text}
+{self._conversation_text(messages)}
 
 要求：
 1. 用3-5句话概括主要内容
@@ -125,15 +207,43 @@ class ContextCompressor:
 4. 使用第三人称客观描述
 
 摘要："""
+    
+    def _update_prompt(self, summary: str, messages: list[dict]) -> str:
+        """Prompt folding newly archived messages into an existing summary."""
+        return f"""请将以下新增的对话内容合并到已有的对话摘要中，生成更新后的简洁摘要：
+
+已有摘要：
+{summary}
+
+新增对话：
+{self._conversation_text(messages)}
+
+要求：
+1. 用3-5句话概括主要内容
+2. 保留重要的决策、约定和待办事项
+3. 保留用户的关键需求和偏好
+4. 使用第三人称客观描述
+
+更新后的摘要："""
+    
+    async def _request_summary(self, prompt: str, message_count: int) -> str | None:
+        """Ask the LLM for a summary.
         
+        Args:
+            prompt: Summary prompt
+            message_count: Number of messages being summarized (for logging)
+            
+        Returns:
+            Summary text, or None if the LLM call failed
+        """
         try:
-            response = await self.llm.complete(prompt)
+            response = await self.llm.complete(prompt, cache=True)
             summary = response.content.strip()
             logger.info(
                 "Summary generated successfully",
                 extra={
                     "summary_length": len(summary),
-                    "archived_message_count": len(messages),
+                    "archived_message_count": message_count,
                 }
             )
             return summary
@@ -143,11 +253,10 @@ class ContextCompressor:
                 extra={
                     "error": str(e),
                     "error_type": type(e).__name__,
-                    "archived_message_count": len(messages),
+                    "archived_message_count": message_count,
                 }
             )
-            # Fallback: return a simple placeholder summary
-            return f"[对话历史摘要] 共{len(messages)}轮对话"
+            return None
     
     def _build_compressed_messages(
         self,
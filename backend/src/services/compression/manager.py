@@ -1,6 +1,7 @@
 """Context compression manager - main entry point."""
 
 import json
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
@@ -8,13 +9,16 @@ from uuid import uuid4
 
 from ...config.models import CompressionConfig
 from ...utils.logger import get_logger
-from .compressor import CompressionResult, ContextCompressor
-from .token_counter import TokenCounter
-from ...models.compression import CompressionEvent
+from .compressor import CompressionResult, ContextCompressor, RollingSummary
+from .token_counter import get_token_counter
+from ...models.compression import CompressionEvent, ConversationSummary
 from ...services.storage import get_storage_service
 
 logger = get_logger(__name__)
 
+# Rolling summaries kept in memory (older sessions are reloaded from the database)
+MAX_CACHED_SUMMARIES = 256
+
 
 @dataclass
 class PreparedContext:
@@ -22,7 +26,7 @@ class PreparedContext:
     
     messages: list[dict]              # Final message list
     summary: str | None = None        # Summary if compression occurred
-    total_tokens: int = 0             # Total token count
+    total_tokens: int = 0             # Total token count (approximate far from the threshold)
 
 
 class ContextCompressionManager:
@@ -32,6 +36,8 @@ class ContextCompressionManager:
     - Token counting and budget management
     - Compression triggering logic
     - Context preparation for LLM
+    - Rolling per-session summaries, so a turn only summarises messages
+      archived since the previous one (persisted in conversation_summaries)
     
     Note: 
     - Configuration is read dynamically from ConfigManager to support hot-reload.
@@ -50,8 +56,9 @@ class ContextCompressionManager:
         # Store reference to read config dynamically for hot-reload support
         self._initial_config = config
         self.workspace_path = Path(workspace_path)
-        self.token_counter = TokenCounter()
+        self.token_counter = get_token_counter()
         self.llm_service = llm_service
+        self._summaries: OrderedDict[str, RollingSummary] = OrderedDict()
         
         # Initialize compressor if LLM service is available
         if llm_service:
@@ -94,10 +101,12 @@ class ContextCompressionManager:
         Returns:
             Prepared context with optional compression
         """
-        # 1. Calculate current token usage
-        total_tokens = self.token_counter.count_messages(current_messages)
-        if system_prompt:
-            total_tokens += self.token_counter.count_text(system_prompt)
+        # 1. Calculate current token usage (encoded unless clearly decided)
+        _, total_tokens = self.token_counter.exceeds(
+            current_messages,
+            self.config.threshold_tokens,
+            extra_text=system_prompt,
+        )
         
         # 2. Check if compression is needed
         needs_compression = self._check_compression_needed(
@@ -163,10 +172,28 @@ class ContextCompressionManager:
                 total_tokens=self.token_counter.count_messages(messages)
             )
 
-        # 1. Compress
+        # 1. Compress, reusing the session's rolling summary
+        previous = await self._load_summary(session_id) if self.config.incremental_summary else None
         result = await self.compressor.compress(
             messages,
-            self.config.retention_count
+            self.config.retention_count,
+            previous=previous,
+        )
+        if (
+            self.config.incremental_summary
+            and result.rolling_summary is not None
+            and result.rolling_summary is not previous
+        ):
+            await self._save_summary(session_id, result.rolling_summary)
+        
+        logger.info(
+            "Summary prepared",
+            extra={
+                "session_id": session_id,
+                "incremental": previous is not None,
+                "summary_llm_calls": result.summary_llm_calls,
+                "archived_count": len(result.archived_messages),
+            }
         )
 
         # 2. Store compression event to track history
@@ -183,6 +210,60 @@ class ContextCompressionManager:
             total_tokens=result.compressed_token_count
         )
 
+    async def _load_summary(self, session_id: str) -> RollingSummary | None:
+        """Get a session's rolling summary from memory or the database."""
+        cached = self._summaries.get(session_id)
+        if cached is not None:
+            self._summaries.move_to_end(session_id)
+            return cached
+        
+        try:
+            storage = get_storage_service()
+            async with storage.session() as db:
+                row = await db.get(ConversationSummary, session_id)
+        except Exception as e:
+            logger.warning(
+                "Failed to load rolling summary",
+                extra={"session_id": session_id, "error": str(e)}
+            )
+            return None
+        
+        if row is None or not row.summary:
+            return None
+        summary = RollingSummary(
+            summary=row.summary,
+            summarized_count=row.summarized_count or 0,
+            archive_hash=row.archive_hash or "",
+        )
+        self._remember_summary(session_id, summary)
+        return summary
+    
+    async def _save_summary(self, session_id: str, summary: RollingSummary) -> None:
+        """Keep a session's rolling summary in memory and persist it."""
+        self._remember_summary(session_id, summary)
+        try:
+            storage = get_storage_service()
+            async with storage.session() as db:
+                await db.merge(ConversationSummary(
+                    session_id=session_id,
+                    summary=summary.summary,
+                    summarized_count=summary.summarized_count,
+                    archive_hash=summary.archive_hash,
+                ))
+                await db.commit()
+        except Exception as e:
+            logger.warning(
+                "Failed to persist rolling summary",
+                extra={"session_id": session_id, "error": str(e)}
+            )
+    
+    def _remember_summary(self, session_id: str, summary: RollingSummary) -> None:
+        """Insert into the in-memory LRU of rolling summaries."""
+        self._summaries[session_id] = summary
+        self._summaries.move_to_end(session_id)
+        while len(self._summaries) > MAX_CACHED_SUMMARIES:
+            self._summaries.popitem(last=False)
+    
     async def _store_compression_event(
         self,
         session_id: str,
@@ -1,53 +1,255 @@
-"""Token counter for precise token counting."""
+"""Token counter for precise token counting.
+
+This module provides:
+- TokenCounter: tiktoken counts memoised per text in a bounded LRU
+- Threshold checks that skip encoding only when the limit is clearly
+  out of reach
+- A shared counter instance for compression and LLM statistics
+"""
+
+import hashlib
+from collections import OrderedDict
 
 import tiktoken
 
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per-message overhead and per-list format overhead (OpenAI chat format)
+MESSAGE_OVERHEAD = 4
+FORMAT_OVERHEAD = 2
+
+# Texts up to this length are cache keys themselves; longer ones are hashed
+INLINE_KEY_CHARS = 64
+
+# exceeds() trusts the heuristic estimate only this far above the limit
+APPROX_MARGIN = 0.25
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Heuristic token count without encoding.
+
+    CJK characters count as roughly 1.5 tokens each, other text as
+    about 4 characters per token.
+    """
+    if not text:
+        return 0
+    cjk = sum(1 for c in text if '一' <= c <= '鿿')
+    return (cjk * 3 + 1) // 2 + (len(text) - cjk + 3) // 4
+
 
 class TokenCounter:
-    """Precise token counter using tiktoken."""
-    
-    def __init__(self, encoding_name: str = "cl100k_base"):
+    """Precise token counter using tiktoken.
+
+    Counts are memoised per text (keyed by a content hash) in a bounded
+    LRU, so a conversation history re-counted every turn only encodes
+    messages it has not seen. The memo holds no per-caller state, so the
+    shared instance serves concurrent sessions equally well.
+
+    If the tiktoken encoding cannot be loaded (e.g. offline without a
+    cached vocabulary) counts fall back to estimate_text_tokens().
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base", cache_size: int = 4096):
         """Initialize token counter.
-        
+
         Args:
             encoding_name: The encoding to use (default: cl100k_base for GPT-4)
+            cache_size: Maximum memoised text counts (0 disables the cache)
         """
-        self.encoding = tiktoken.get_encoding(encoding_name)
-    
+        try:
+            self.encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            logger.warning(
+                "tiktoken encoding unavailable, using estimated token counts",
+                extra={"encoding": encoding_name, "error": str(e)}
+            )
+            self.encoding = None
+        self.cache_size = max(0, cache_size)
+        self._cache: OrderedDict[str | bytes, int] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether counts come from the tokenizer rather than an estimate."""
+        return self.encoding is not None
+
+    @staticmethod
+    def _key(text: str) -> str | bytes:
+        """Memo key of a text."""
+        return text if len(text) <= INLINE_KEY_CHARS else hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    def _encoded_length(self, text: str) -> int:
+        """Exact token count of a text, memoised."""
+        if not text:
+            return 0
+        key = self._key(text)
+        count = self._cache.get(key)
+        if count is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return count
+
+        self.misses += 1
+        if self.encoding is not None:
+            count = len(self.encoding.encode(text))
+        else:
+            count = estimate_text_tokens(text)
+        if self.cache_size:
+            self._cache[key] = count
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def _message_tokens(self, msg: dict) -> int:
+        """Tokens of one message including its overhead."""
+        total = MESSAGE_OVERHEAD
+        # Content tokens
+        content = msg.get("content", "")
+        if content:
+            total += self._encoded_length(content if isinstance(content, str) else str(content))
+        # Role tokens
+        role = msg.get("role", "")
+        if role:
+            total += self._encoded_length(role)
+        return total
+
     def count_messages(self, messages: list[dict]) -> int:
         """Count tokens in a list of messages (OpenAI format).
-        
+
         Args:
             messages: List of message dicts with 'role' and 'content' keys
-            
+
         Returns:
             Total token count
         """
-        total = 0
+        total = FORMAT_OVERHEAD
         for msg in messages:
-            # Base overhead per message
-            total += 4
-            # Content tokens
-            content = msg.get("content", "")
-            if content:
-                total += len(self.encoding.encode(content))
-            # Role tokens
-            role = msg.get("role", "")
-            if role:
-                total += len(self.encoding.encode(role))
-        # Format overhead
-        total += 2
+            total += self._message_tokens(msg)
         return total
-    
+
     def count_text(self, text: str) -> int:
         """Count tokens in a text string.
-        
+
         Args:
             text: Text to count
-            
+
         Returns:
             Token count
         """
         if not text:
             return 0
-        return len(self.encoding.encode(text))
+        return self._encoded_length(text)
+
+    def estimate_messages(self, messages: list[dict]) -> int:
+        """Approximate token count of messages without encoding.
+
+        Memoised exact counts are used where available; only texts that
+        were never counted are estimated.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+
+        Returns:
+            Approximate total token count
+        """
+        total = FORMAT_OVERHEAD
+        for msg in messages:
+            total += MESSAGE_OVERHEAD
+            for text in (msg.get("content", ""), msg.get("role", "")):
+                if text:
+                    total += self._peek(text if isinstance(text, str) else str(text))
+        return total
+
+    def _peek(self, text: str) -> int:
+        """Memoised exact count if known, else a heuristic estimate."""
+        count = self._cache.get(self._key(text))
+        return count if count is not None else estimate_text_tokens(text)
+
+    def _upper_bound(self, text: str) -> int:
+        """Memoised exact count if known, else the UTF-8 length.
+
+        Byte-level BPE never emits a token covering less than one byte,
+        so this never undercounts, whatever the text looks like.
+        """
+        count = self._cache.get(self._key(text))
+        return count if count is not None else len(text.encode("utf-8", "surrogatepass"))
+
+    def _texts(self, messages: list[dict], extra_text: str) -> list[str]:
+        """Non-empty texts counted for messages plus extra text."""
+        texts = [
+            text if isinstance(text, str) else str(text)
+            for msg in messages
+            for text in (msg.get("content", ""), msg.get("role", ""))
+            if text
+        ]
+        if extra_text:
+            texts.append(extra_text)
+        return texts
+
+    def exceeds(
+        self,
+        messages: list[dict],
+        limit: int,
+        extra_text: str = "",
+        margin: float = APPROX_MARGIN,
+    ) -> tuple[bool, int]:
+        """Check a token limit, encoding only when the answer is unclear.
+
+        Texts are counted from the memo where possible. The limit is
+        reported as not exceeded without encoding only if an upper bound
+        (uncounted texts at one token per byte) stays within it, and as
+        exceeded only if the heuristic estimate is more than ``margin``
+        above it. Anything in between is counted exactly, so code, JSON
+        or hex with few characters per token cannot skip a compression.
+
+        Args:
+            messages: List of message dicts
+            limit: Token limit
+            extra_text: Additional text counted with the messages (e.g. system prompt)
+            margin: Relative distance above the limit beyond which the estimate decides
+
+        Returns:
+            (whether the count exceeds the limit, the count used); the
+            count is approximate when encoding was skipped
+        """
+        texts = self._texts(messages, extra_text)
+        overhead = FORMAT_OVERHEAD + MESSAGE_OVERHEAD * len(messages)
+        estimate = overhead + sum(self._peek(text) for text in texts)
+
+        if estimate > limit * (1 + margin):
+            return True, estimate
+        if overhead + sum(self._upper_bound(text) for text in texts) <= limit:
+            return False, estimate
+
+        total = self.count_messages(messages)
+        if extra_text:
+            total += self.count_text(extra_text)
+        return total > limit, total
+
+    def get_stats(self) -> dict[str, int | bool]:
+        """Get cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached_texts": len(self._cache),
+            "cache_size": self.cache_size,
+            "exact": self.is_exact,
+        }
+
+
+# Global token counter instance
+_token_counter: TokenCounter | None = None
+
+
+def get_token_counter() -> TokenCounter:
+    """Get or create the shared token counter."""
+    global _token_counter
+    if _token_counter is None:
+        _token_counter = TokenCounter()
+    return _token_counter
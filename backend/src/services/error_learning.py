@@ -424,7 +424,11 @@ class ErrorLearningService:
             
             vector_store = get_vector_store()
             embedder = get_embedder()
-            hybrid_search = get_hybrid_search(vector_store=vector_store, embedder=embedder)
+            hybrid_search = get_hybrid_search(
+                vector_store=vector_store,
+                embedder=embedder,
+                entry_index=self.md_sync.entry_index,
+            )
             
             # Search for similar content
             query = f"{lesson.error_pattern.error_type} {lesson.error_pattern.tool_name}"
@@ -505,7 +509,11 @@ class ErrorLearningService:
                         # Initialize hybrid search
                         vector_store = get_vector_store()
                         embedder = get_embedder()
-                        hybrid_search = get_hybrid_search(vector_store=vector_store, embedder=embedder)
+                        hybrid_search = get_hybrid_search(
+                            vector_store=vector_store,
+                            embedder=embedder,
+                            entry_index=self.md_sync.entry_index,
+                        )
                         
                         # Perform search
                         results = hybrid_search.search(
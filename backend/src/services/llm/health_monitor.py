@@ -0,0 +1,273 @@
+"""Background health monitoring for LLM providers.
+
+Replaces a health-check round-trip before every chat request with a
+cached status that is:
+- Refreshed by background probes on a jittered interval
+- Backed off exponentially while a provider keeps failing probes
+- Fed passively by the outcome of real requests
+- Treated as unknown (and therefore usable) once older than a TTL
+"""
+
+import asyncio
+import contextlib
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ...utils.logger import get_logger
+from .provider import LLMProvider
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProviderHealthState:
+    """Cached health of one provider."""
+    provider_name: str
+    is_healthy: bool = True
+    checked_at: float | None = None       # monotonic time of last observation
+    source: str = "unknown"               # "probe" or "request"
+    consecutive_failures: int = 0
+    next_probe_at: float = 0.0            # monotonic
+    last_success_time: float | None = None  # wall clock
+    last_failure_time: float | None = None  # wall clock
+    last_error: str | None = None
+    probes: int = 0
+
+
+class ProviderHealthMonitor:
+    """Caches provider health and probes it in the background.
+
+    One monitor is shared by all LLMRouter instances (see
+    ``provider_health_monitor``) so each provider is probed by a single
+    task no matter how many routers exist.
+    """
+
+    def __init__(
+        self,
+        interval: float = 30.0,
+        ttl: float = 90.0,
+        max_backoff: float = 300.0,
+        jitter: float = 0.2,
+        probe_timeout: float = 10.0,
+    ) -> None:
+        """Initialize health monitor.
+
+        Args:
+            interval: Seconds between probes of a healthy provider
+            ttl: Seconds after which a cached status is considered unknown
+            max_backoff: Upper bound for the probe interval of a failing provider
+            jitter: Relative random spread applied to every probe delay
+            probe_timeout: Seconds before a probe counts as failed
+        """
+        self.interval = interval
+        self.ttl = ttl
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.probe_timeout = probe_timeout
+        self._providers: dict[str, LLMProvider] = {}
+        self._states: dict[str, ProviderHealthState] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def configure(self, **settings: Any) -> None:
+        """Update monitor settings (interval, ttl, max_backoff, jitter, probe_timeout)."""
+        for key, value in settings.items():
+            if value is not None and hasattr(self, key):
+                setattr(self, key, value)
+
+    def register(self, provider: LLMProvider) -> None:
+        """Start tracking a provider (the latest instance per name is probed).
+
+        The first probe is due one interval after registration; until then
+        real requests report the provider's health.
+        """
+        self._providers[provider.name] = provider
+        if provider.name not in self._states:
+            self._states[provider.name] = ProviderHealthState(
+                provider_name=provider.name,
+                next_probe_at=time.monotonic() + self._jittered(self.interval),
+            )
+
+    def unregister(self, provider: LLMProvider) -> None:
+        """Stop probing a provider instance (e.g. when its router closes)."""
+        if self._providers.get(provider.name) is provider:
+            del self._providers[provider.name]
+
+    def ensure_started(self) -> None:
+        """Start the background probe task if an event loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run(), name="llm-health-monitor")
+        logger.info(
+            "Provider health monitor started",
+            extra={"interval": self.interval, "ttl": self.ttl, "providers": list(self._providers)}
+        )
+
+    async def stop(self) -> None:
+        """Stop the background probe task."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+    def is_healthy(self, provider_name: str) -> bool:
+        """Get cached health without blocking.
+
+        Unknown or expired statuses count as healthy; an expired status
+        also brings the provider's next probe forward.
+
+        Args:
+            provider_name: Provider name
+
+        Returns:
+            False only if the provider was recently observed failing
+        """
+        state = self._states.get(provider_name)
+        if state is None or state.checked_at is None:
+            return True
+        if time.monotonic() - state.checked_at > self.ttl:
+            self._probe_soon(state)
+            return True
+        return state.is_healthy
+
+    def record_success(self, provider_name: str, source: str = "request") -> None:
+        """Record a successful request or probe."""
+        state = self._states.setdefault(provider_name, ProviderHealthState(provider_name=provider_name))
+        now = time.monotonic()
+        if not state.is_healthy:
+            logger.info(
+                "Provider recovered",
+                extra={"provider_name": provider_name, "source": source}
+            )
+        state.is_healthy = True
+        state.checked_at = now
+        state.source = source
+        state.consecutive_failures = 0
+        state.last_success_time = time.time()
+        state.last_error = None
+        # Real traffic is as good as a probe; don't probe an active provider
+        state.next_probe_at = max(state.next_probe_at, now + self._jittered(self.interval))
+
+    def record_failure(self, provider_name: str, error: Exception | str | None = None, source: str = "request") -> None:
+        """Record a failed request or probe."""
+        state = self._states.setdefault(provider_name, ProviderHealthState(provider_name=provider_name))
+        now = time.monotonic()
+        state.consecutive_failures += 1
+        if state.is_healthy:
+            logger.warning(
+                "Provider marked unhealthy",
+                extra={"provider_name": provider_name, "source": source, "error": str(error) if error else None}
+            )
+        state.is_healthy = False
+        state.checked_at = now
+        state.source = source
+        state.last_failure_time = time.time()
+        state.last_error = str(error) if error else None
+        backoff = min(self.interval * 2 ** (state.consecutive_failures - 1), self.max_backoff)
+        state.next_probe_at = now + self._jittered(backoff)
+
+    async def probe(self, provider_name: str, provider: LLMProvider | None = None) -> bool:
+        """Probe one provider now and cache the result.
+
+        Args:
+            provider_name: Provider name
+            provider: Instance to probe (defaults to the registered one)
+
+        Returns:
+            Probe result
+        """
+        provider = provider or self._providers.get(provider_name)
+        if provider is None:
+            return self.is_healthy(provider_name)
+
+        state = self._states.setdefault(provider_name, ProviderHealthState(provider_name=provider_name))
+        state.probes += 1
+        try:
+            healthy = await asyncio.wait_for(provider.health_check(), timeout=self.probe_timeout)
+            error: Exception | None = None if healthy else RuntimeError("Health check failed")
+        except Exception as e:
+            healthy, error = False, e
+
+        if healthy:
+            self.record_success(provider_name, source="probe")
+            state.next_probe_at = time.monotonic() + self._jittered(self.interval)
+        else:
+            self.record_failure(provider_name, error, source="probe")
+        return healthy
+
+    async def probe_all(self) -> dict[str, bool]:
+        """Probe every registered provider concurrently."""
+        names = list(self._providers)
+        results = await asyncio.gather(*(self.probe(name) for name in names))
+        return dict(zip(names, results, strict=True))
+
+    def get_health_status(self) -> dict[str, dict[str, Any]]:
+        """Get cached health status for all providers.
+
+        Returns:
+            Dict mapping provider name to status details
+        """
+        now = time.monotonic()
+        return {
+            name: {
+                "is_healthy": self.is_healthy(name),
+                "source": s.source,
+                "age_seconds": round(now - s.checked_at, 1) if s.checked_at is not None else None,
+                "stale": s.checked_at is None or now - s.checked_at > self.ttl,
+                "consecutive_failures": s.consecutive_failures,
+                "next_probe_in_seconds": round(max(0.0, s.next_probe_at - now), 1),
+                "last_success_time": s.last_success_time,
+                "last_failure_time": s.last_failure_time,
+                "last_error": s.last_error,
+                "probes": s.probes,
+            }
+            for name, s in self._states.items()
+        }
+
+    def _jittered(self, delay: float) -> float:
+        """Spread a delay by +/- jitter so providers are not probed in lockstep."""
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _probe_soon(self, state: ProviderHealthState) -> None:
+        """Bring a provider's next probe forward to now."""
+        state.next_probe_at = min(state.next_probe_at, time.monotonic())
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Probe providers as they become due."""
+        while True:
+            try:
+                now = time.monotonic()
+                due = [
+                    name for name in self._providers
+                    if self._states[name].next_probe_at <= now
+                ]
+                if due:
+                    await asyncio.gather(*(self.probe(name) for name in due))
+                    continue
+
+                next_at = min(
+                    (self._states[name].next_probe_at for name in self._providers),
+                    default=now + self.interval,
+                )
+                self._wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.05, next_at - now))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Health monitor loop error", extra={"error": str(e)})
+                await asyncio.sleep(self.interval)
+
+
+# Global health monitor shared by all routers
+provider_health_monitor = ProviderHealthMonitor()
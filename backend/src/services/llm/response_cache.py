@@ -0,0 +1,351 @@
+"""Exact-match response cache for deterministic LLM calls.
+
+This module provides:
+- Canonical request keys from (model, messages, tools, temperature, ...)
+- Bounded in-memory LRU tier
+- Optional SQLite tier that survives restarts
+- Per-entry TTLs
+- Streaming replay of cached responses
+- Hit/miss metrics
+"""
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, AsyncIterable
+from pathlib import Path
+from typing import Any
+
+from ...utils.logger import get_logger
+from .provider import LLMResponse, StreamingLLMResponse
+
+logger = get_logger(__name__)
+
+# Size of replayed chunks when a cached response is streamed
+REPLAY_CHUNK_CHARS = 64
+
+
+def request_key(model: str, messages: list[dict[str, Any]], **params: Any) -> str:
+    """Canonical cache key for an LLM request.
+
+    Messages, tools and sampling parameters are serialised as JSON with
+    sorted keys, so dict ordering does not change the key. Parameters
+    that are None are dropped.
+
+    Args:
+        model: Model the request is routed to
+        messages: Chat messages
+        **params: Other request parameters (tools, temperature, ...)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "params": {k: v for k, v in params.items() if v is not None},
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of LLM responses keyed by request hash.
+
+    Lookups go to the in-memory LRU first, then to the SQLite tier (if
+    configured); disk hits are promoted into memory. Expired entries are
+    dropped when they are read.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: float = 3600.0,
+        db_path: str | None = None,
+        default_enabled: bool = False,
+        enabled: bool = True,
+    ) -> None:
+        """Initialize response cache.
+
+        Args:
+            max_entries: Maximum responses kept in memory
+            ttl: Default time to live in seconds
+            db_path: SQLite file for the persistent tier (None = memory only)
+            default_enabled: Whether calls that neither opt in nor out are cached
+            enabled: Master switch; when False no call is cached
+        """
+        self.enabled = enabled
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.db_path = db_path
+        self.default_enabled = default_enabled
+        self._memory: OrderedDict[str, tuple[float, LLMResponse]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str) -> None:
+        """Open the persistent tier, disabling it on failure."""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("DELETE FROM llm_response_cache WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            self._conn = conn
+            logger.info("LLM response cache disk tier opened", extra={"db_path": db_path})
+        except Exception as e:
+            logger.warning(
+                "LLM response cache disk tier unavailable, using memory only",
+                extra={"db_path": db_path, "error": str(e)}
+            )
+            self._conn = None
+
+    def should_cache(self, opt: bool | None) -> bool:
+        """Resolve a per-call opt-in/opt-out against the default."""
+        if not self.enabled:
+            return False
+        return self.default_enabled if opt is None else opt
+
+    def get(self, key: str) -> LLMResponse | None:
+        """Look up a response.
+
+        Args:
+            key: Request key from request_key()
+
+        Returns:
+            Cached response (metadata marked ``cached``), or None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] < now:
+                del self._memory[key]
+                self.expired += 1
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._mark_cached(entry[1])
+
+            if self._conn is not None:
+                entry = self._load(key, now)
+                if entry is not None:
+                    self._remember(key, *entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return self._mark_cached(entry[1])
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: LLMResponse, ttl: float | None = None) -> None:
+        """Store a response in both tiers.
+
+        Args:
+            key: Request key from request_key()
+            response: Response to cache
+            ttl: Time to live in seconds (default: cache TTL)
+        """
+        if not response.content and not response.tool_calls:
+            return
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires_at, response)
+            self.stores += 1
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_response_cache (key, response, created_at, expires_at)"
+                        " VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(dataclasses.asdict(response), ensure_ascii=False), now, expires_at),
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logger.warning("LLM response cache write failed", extra={"error": str(e)})
+
+    async def replay(self, response: LLMResponse) -> AsyncGenerator[StreamingLLMResponse, None]:
+        """Stream a cached response in chunks.
+
+        Args:
+            response: Cached response
+
+        Yields:
+            Content chunks, the last one marked finished
+        """
+        content = response.content or ""
+        for start in range(0, len(content), REPLAY_CHUNK_CHARS):
+            yield StreamingLLMResponse(content=content[start:start + REPLAY_CHUNK_CHARS], model=response.model)
+        yield StreamingLLMResponse(content="", is_finished=True, model=response.model, usage=response.usage)
+
+    async def record_stream(
+        self,
+        key: str,
+        stream: AsyncIterable[StreamingLLMResponse],
+        ttl: float | None = None,
+    ) -> AsyncGenerator[StreamingLLMResponse, None]:
+        """Pass a provider stream through and cache it once it completes.
+
+        Streams that fail or are abandoned by the consumer are not cached.
+
+        Args:
+            key: Request key from request_key()
+            stream: Provider stream
+            ttl: Time to live in seconds (default: cache TTL)
+
+        Yields:
+            The provider's chunks unchanged
+        """
+        parts: list[str] = []
+        model = ""
+        usage = None
+        async for chunk in stream:
+            parts.append(chunk.content)
+            model = chunk.model or model
+            usage = chunk.usage or usage
+            yield chunk
+        self.put(key, LLMResponse(content="".join(parts), model=model, usage=usage, finish_reason="stop"), ttl)
+
+    def _remember(self, key: str, expires_at: float, response: LLMResponse) -> None:
+        """Insert into the LRU tier (lock held)."""
+        if self.max_entries == 0:
+            return
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str, now: float) -> tuple[float, LLMResponse] | None:
+        """Fetch an unexpired entry from the SQLite tier (lock held)."""
+        try:
+            row = self._conn.execute(  # type: ignore[union-attr]
+                "SELECT response, expires_at FROM llm_response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))  # type: ignore[union-attr]
+                self._conn.commit()  # type: ignore[union-attr]
+                self.expired += 1
+                return None
+            return row[1], LLMResponse(**json.loads(row[0]))
+        except Exception as e:
+            logger.warning("LLM response cache read failed", extra={"error": str(e)})
+            return None
+
+    @staticmethod
+    def _mark_cached(response: LLMResponse) -> LLMResponse:
+        """Copy of a cached response with ``metadata["cached"]`` set."""
+        return dataclasses.replace(response, metadata={**(response.metadata or {}), "cached": True})
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache metrics.
+
+        Returns:
+            Dictionary with hits, misses, hit rate and tier sizes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats: dict[str, Any] = {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "expired": self.expired,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "enabled": self.enabled,
+                "default_enabled": self.default_enabled,
+                "disk_enabled": self._conn is not None,
+            }
+            if self._conn is not None:
+                with contextlib.suppress(Exception):
+                    stats["disk_entries"] = self._conn.execute(
+                        "SELECT COUNT(*) FROM llm_response_cache"
+                    ).fetchone()[0]
+            return stats
+
+    def clear(self) -> None:
+        """Drop all cached responses and reset metrics."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = self.stores = self.expired = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_response_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global response cache instance
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create global response cache (memory only until initialised)."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def init_response_cache(
+    max_entries: int = 1000,
+    ttl: float = 3600.0,
+    db_path: str | None = None,
+    default_enabled: bool = False,
+    enabled: bool = True,
+) -> ResponseCache:
+    """Initialize global response cache.
+
+    Args:
+        max_entries: Maximum responses kept in memory
+        ttl: Default time to live in seconds
+        db_path: SQLite file for the persistent tier (None = memory only)
+        default_enabled: Whether calls that neither opt in nor out are cached
+        enabled: Master switch; when False no call is cached
+
+    Returns:
+        ResponseCache instance
+    """
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = ResponseCache(
+        max_entries=max_entries,
+        ttl=ttl,
+        db_path=db_path,
+        default_enabled=default_enabled,
+        enabled=enabled,
+    )
+    return _response_cache
@@ -1,18 +1,50 @@
 """LLM Router for primary/backup model routing with failover."""
 
+import asyncio
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from typing import Any
 
 from ...config.manager import ConfigManager
 from ...utils.logger import get_logger, log_execution
+from ...utils.single_flight import SingleFlight
+from ..compression.token_counter import get_token_counter
 from .bailian_provider import BailianProvider
 from .circuit_breaker import circuit_breaker_manager
+from .health_monitor import provider_health_monitor
 from .openai_provider import OpenAIProvider
 from .provider import LLMProvider, LLMResponse, StreamingLLMResponse
+from .response_cache import get_response_cache, request_key
+from .routing_policy import routing_policy
 
 logger = get_logger(__name__)
 
+# Non-streaming requests in flight, shared by all routers
+_inflight_requests = SingleFlight()
+
+
+class _PrefetchedStream:
+    """Provider stream whose first chunk has already been received."""
+    
+    def __init__(
+        self,
+        first: StreamingLLMResponse | None,
+        rest: AsyncGenerator[StreamingLLMResponse, None],
+    ) -> None:
+        self._first = first
+        self._rest = rest
+    
+    async def __aiter__(self) -> AsyncIterator[StreamingLLMResponse]:
+        if self._first is not None:
+            first, self._first = self._first, None
+            yield first
+        async for chunk in self._rest:
+            yield chunk
+    
+    async def aclose(self) -> None:
+        """Close the underlying provider stream."""
+        await self._rest.aclose()
+
 
 class LLMRouter:
     """Routes LLM requests to available providers with failover support.
@@ -21,6 +53,10 @@ class LLMRouter:
     1. Try primary provider first
     2. On failure, fallback to backup providers by priority
     3. Track provider health and avoid unhealthy providers
+    
+    Provider health is cached by the shared ``provider_health_monitor``,
+    which probes in the background and is fed by real request outcomes,
+    so requests never wait on a health check.
     """
     
     def __init__(self, model_configs: list[Any] | None = None) -> None:
@@ -34,7 +70,12 @@ class LLMRouter:
         self._primary: LLMProvider | None = None
         self._backups: list[LLMProvider] = []
         self._model_configs = model_configs
+        self._health_monitor = provider_health_monitor
+        self._policy = routing_policy
+        self._inflight = _inflight_requests
         self._load_providers()
+        for provider in self._providers.values():
+            self._health_monitor.register(provider)
     
     def _load_providers(self) -> None:
         """Load providers from configuration."""
@@ -162,6 +203,7 @@ class LLMRouter:
     async def close(self) -> None:
         """Close all provider connections."""
         for provider in self._providers.values():
+            self._health_monitor.unregister(provider)
             if hasattr(provider, 'close'):
                 try:
                     await provider.close()
@@ -187,14 +229,35 @@ class LLMRouter:
         messages: list[dict[str, str]],
         stream: bool = False,
         session_id: str | None = None,
+        cache: bool | None = None,
+        cache_ttl: float | None = None,
+        coalesce: bool | None = None,
         **kwargs: Any
     ) -> LLMResponse | AsyncGenerator[StreamingLLMResponse, None]:
         """Send chat request with automatic failover and circuit breaker.
         
+        Providers are ordered by the routing policy. With hedging enabled, a
+        backup request is started when the first provider has not produced a
+        first result within its p95-derived deadline; the slower one is
+        cancelled.
+        
+        Deterministic calls can opt into the response cache, keyed by model,
+        messages and request parameters; cached responses are replayed as a
+        stream when ``stream`` is set. Concurrent identical non-streaming
+        requests that are cache-eligible (or opt in with ``coalesce``) are
+        coalesced into one provider call; statistics and the prompt log are
+        still recorded for every caller under its own session.
+        
         Args:
             messages: List of messages in OpenAI format
             stream: Whether to stream the response
             session_id: Optional session ID for statistics correlation
+            cache: Opt into (True) or out of (False) the response cache;
+                None uses the configured default
+            cache_ttl: Time to live for a cached response in seconds
+            coalesce: Share one provider call with concurrent identical
+                requests (True) or never (False); None coalesces only
+                cache-eligible calls
             **kwargs: Additional parameters
             
         Returns:
@@ -209,9 +272,87 @@ class LLMRouter:
         if not providers_to_try:
             raise RuntimeError("No LLM providers available")
         
+        response_cache = get_response_cache()
+        cache_key = None
+        if response_cache.should_cache(cache):
+            cache_key = request_key(providers_to_try[0].model_id, messages, **kwargs)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    "LLM response cache hit",
+                    extra={
+                        "session_id": session_id,
+                        "stream": stream,
+                    }
+                )
+                return response_cache.replay(cached) if stream else cached
+        
+        if coalesce is None:
+            coalesce = cache_key is not None
+        if stream or not coalesce or not self._policy.coalesce_requests:
+            provider, result, latency_ms = await self._route(
+                providers_to_try, messages, stream, session_id, cache_key, cache_ttl, kwargs,
+            )
+        else:
+            # Identical concurrent requests share one provider call
+            flight_key = cache_key or request_key(providers_to_try[0].model_id, messages, **kwargs)
+            provider, result, latency_ms = await self._inflight.do(
+                flight_key,
+                lambda: self._route(providers_to_try, messages, stream, session_id, cache_key, cache_ttl, kwargs),
+            )
+        
+        if not stream:
+            await self._record_success(provider, messages, result, session_id, latency_ms)
+        return result
+    
+    async def _route(
+        self,
+        providers_to_try: list[LLMProvider],
+        messages: list[dict[str, str]],
+        stream: bool,
+        session_id: str | None,
+        cache_key: str | None,
+        cache_ttl: float | None,
+        kwargs: dict[str, Any],
+    ) -> tuple[LLMProvider, LLMResponse | AsyncGenerator[StreamingLLMResponse, None], int]:
+        """Try providers in policy order until one succeeds.
+        
+        Streams are wrapped to record statistics and the prompt log when
+        they end; a non-streaming success is recorded by the caller, once
+        per (possibly coalesced) request.
+        
+        Args:
+            providers_to_try: Available providers in configured order
+            messages: List of messages in OpenAI format
+            stream: Whether to stream the response
+            session_id: Optional session ID for statistics correlation
+            cache_key: Response cache key, None if the call is not cached;
+                only responses from the first provider's model are stored
+            cache_ttl: Time to live for a cached response in seconds
+            kwargs: Additional parameters
+            
+        Returns:
+            Tuple of (provider that answered, LLM response, latency in ms)
+            
+        Raises:
+            RuntimeError: If all providers failed
+        """
+        response_cache = get_response_cache()
+        # chat() keys the cache on the first configured provider's model
+        cache_model = providers_to_try[0].model_id
+        
+        # Known-unhealthy providers go last rather than being skipped, so a
+        # stale status can never leave the router with nothing to try
+        self._health_monitor.ensure_started()
+        providers_to_try = self._policy.order(providers_to_try, self._health_monitor.is_healthy, stream=stream)
+        
         last_error = None
+        attempted: set[str] = set()
         
-        for provider in providers_to_try:
+        for index, provider in enumerate(providers_to_try):
+            if provider.name in attempted:
+                continue
+            
             # Get circuit breaker for this provider
             breaker = circuit_breaker_manager.get_breaker(provider.name)
             
@@ -236,23 +377,30 @@ class LLMRouter:
                     }
                 )
                 
-                # Check provider health before using
-                if not await provider.health_check():
-                    logger.warning(
-                        "Provider health check failed, skipping",
-                        extra={
-                            "provider_name": provider.name,
-                        }
-                    )
-                    await breaker.record_failure(Exception("Health check failed"))
-                    continue
-                
                 start_time = time.time()
-                result = await provider.chat(messages, stream=stream, **kwargs)
+                hedge_delay = self._policy.hedge_delay(provider.name, stream)
+                hedge = None
+                if hedge_delay is not None:
+                    hedge = await self._next_available(providers_to_try[index + 1:], attempted)
+                if hedge is not None:
+                    provider, result = await self._hedged_call(
+                        provider, hedge, hedge_delay, messages, stream, kwargs, attempted,
+                    )
+                    breaker = circuit_breaker_manager.get_breaker(provider.name)
+                else:
+                    result = await self._call_provider(provider, messages, stream, kwargs)
                 latency_ms = int((time.time() - start_time) * 1000)
                 
-                # Record success
+                # Record success (streams are re-checked when they end)
                 await breaker.record_success()
+                self._health_monitor.record_success(provider.name)
+                # A backup's or hedge winner's answer must not be replayed
+                # as the keyed model's
+                if cache_key is not None and provider.model_id == cache_model:
+                    if stream:
+                        result = response_cache.record_stream(cache_key, result, cache_ttl)
+                    else:
+                        response_cache.put(cache_key, result, cache_ttl)
                 logger.info(
                     "Successfully used provider",
                     extra={
@@ -262,75 +410,10 @@ class LLMRouter:
                     }
                 )
                 
-                # Log LLM interaction to dedicated prompt log
-                try:
-                    from ...core.context import get_current_context
-                    from ...utils.logger import get_llm_prompt_logger
-                    
-                    ctx = get_current_context()
-                    prompt_logger = get_llm_prompt_logger()
-                    
-                    if stream:
-                        # For streaming, wrap to capture response
-                        return self._wrap_streaming_with_prompt_log(
-                            result, provider, session_id, messages, latency_ms,
-                            ctx.trace_id if ctx else None, prompt_logger,
-                        )
-                    else:
-                        # For non-streaming, log immediately
-                        prompt_logger.log_interaction(
-                            session_id=session_id,
-                            trace_id=ctx.trace_id if ctx else None,
-                            provider=provider.name,
-                            model=provider.model_id,
-                            messages=messages,
-                            response=result.content,
-                            latency_ms=latency_ms,
-                            token_usage=result.usage,
-                            success=True,
-                        )
-                except Exception as prompt_log_error:
-                    logger.warning(
-                        "Failed to log prompt interaction",
-                        extra={
-                            "provider_name": provider.name,
-                            "error": str(prompt_log_error),
-                        }
-                    )
+                if stream:
+                    result = self._wrap_stream_recording(provider, messages, result, session_id, latency_ms)
                 
-                # Record statistics
-                try:
-                    from ..stat_service import get_stat_service
-                    stat_service = get_stat_service()
-                    
-                    if stream:
-                        # For streaming, wrap the generator to capture stats
-                        return self._wrap_streaming_response(
-                            result, provider, session_id, latency_ms, stat_service,
-                            prompt_messages=messages,
-                        )
-                    else:
-                        # For non-streaming, record immediately
-                        await stat_service.record_request(
-                            provider_name=provider.name,
-                            model_id=provider.model_id,
-                            success=True,
-                            session_id=session_id,
-                            prompt_tokens=result.usage.get("prompt_tokens", 0) if result.usage else 0,
-                            completion_tokens=result.usage.get("completion_tokens", 0) if result.usage else 0,
-                            latency_ms=latency_ms,
-                        )
-                except Exception as stat_error:
-                    logger.warning(
-                        "Failed to record stats",
-                        extra={
-                            "provider_name": provider.name,
-                            "error": str(stat_error),
-                            "error_type": type(stat_error).__name__,
-                        }
-                    )
-                
-                return result
+                return provider, result, latency_ms
                 
             except Exception as e:
                 logger.warning(
@@ -372,6 +455,7 @@ class LLMRouter:
                 
                 # Record failure
                 await breaker.record_failure(e)
+                self._health_monitor.record_failure(provider.name, e)
                 
                 # Record failed request stat
                 try:
@@ -400,25 +484,275 @@ class LLMRouter:
         # All providers failed
         raise RuntimeError(f"All providers failed. Last error: {last_error}")
     
+    async def _record_success(
+        self,
+        provider: LLMProvider,
+        messages: list[dict[str, str]],
+        result: LLMResponse,
+        session_id: str | None,
+        latency_ms: int,
+    ) -> None:
+        """Write the prompt log entry and request stats of a non-streaming call."""
+        # Log LLM interaction to dedicated prompt log
+        try:
+            from ...core.context import get_current_context
+            from ...utils.logger import get_llm_prompt_logger
+            
+            ctx = get_current_context()
+            get_llm_prompt_logger().log_interaction(
+                session_id=session_id,
+                trace_id=ctx.trace_id if ctx else None,
+                provider=provider.name,
+                model=provider.model_id,
+                messages=messages,
+                response=result.content,
+                latency_ms=latency_ms,
+                token_usage=result.usage,
+                success=True,
+            )
+        except Exception as prompt_log_error:
+            logger.warning(
+                "Failed to log prompt interaction",
+                extra={
+                    "provider_name": provider.name,
+                    "error": str(prompt_log_error),
+                }
+            )
+        
+        # Record statistics
+        try:
+            from ..stat_service import get_stat_service
+            await get_stat_service().record_request(
+                provider_name=provider.name,
+                model_id=provider.model_id,
+                success=True,
+                session_id=session_id,
+                prompt_tokens=result.usage.get("prompt_tokens", 0) if result.usage else 0,
+                completion_tokens=result.usage.get("completion_tokens", 0) if result.usage else 0,
+                latency_ms=latency_ms,
+            )
+        except Exception as stat_error:
+            logger.warning(
+                "Failed to record stats",
+                extra={
+                    "provider_name": provider.name,
+                    "error": str(stat_error),
+                    "error_type": type(stat_error).__name__,
+                }
+            )
+    
+    def _wrap_stream_recording(
+        self,
+        provider: LLMProvider,
+        messages: list[dict[str, str]],
+        result: AsyncIterator[StreamingLLMResponse],
+        session_id: str | None,
+        latency_ms: int,
+    ) -> AsyncIterator[StreamingLLMResponse]:
+        """Wrap a stream to capture stats and the prompt log once it completes."""
+        try:
+            from ..stat_service import get_stat_service
+            result = self._wrap_streaming_response(
+                result, provider, session_id, latency_ms, get_stat_service(),
+                prompt_messages=messages,
+            )
+        except Exception as stat_error:
+            logger.warning(
+                "Failed to record stats",
+                extra={
+                    "provider_name": provider.name,
+                    "error": str(stat_error),
+                    "error_type": type(stat_error).__name__,
+                }
+            )
+        
+        try:
+            from ...core.context import get_current_context
+            from ...utils.logger import get_llm_prompt_logger
+            
+            ctx = get_current_context()
+            result = self._wrap_streaming_with_prompt_log(
+                result, provider, session_id, messages, latency_ms,
+                ctx.trace_id if ctx else None, get_llm_prompt_logger(),
+            )
+        except Exception as prompt_log_error:
+            logger.warning(
+                "Failed to log prompt interaction",
+                extra={
+                    "provider_name": provider.name,
+                    "error": str(prompt_log_error),
+                }
+            )
+        return result
+    
+    async def _next_available(
+        self,
+        candidates: list[LLMProvider],
+        attempted: set[str],
+    ) -> LLMProvider | None:
+        """Get the first candidate that may be used as a hedge."""
+        for candidate in candidates:
+            if candidate.name in attempted:
+                continue
+            if await circuit_breaker_manager.get_breaker(candidate.name).can_execute():
+                return candidate
+        return None
+    
+    async def _call_provider(
+        self,
+        provider: LLMProvider,
+        messages: list[dict[str, str]],
+        stream: bool,
+        kwargs: dict[str, Any],
+    ) -> LLMResponse | AsyncIterator[StreamingLLMResponse]:
+        """Call a provider and wait for its first result.
+        
+        Streams are read up to their first chunk, so connection errors fail
+        over like non-streaming errors and time to first token is measured.
+        
+        Returns:
+            LLM response, or a stream replaying the prefetched first chunk
+        """
+        start = time.perf_counter()
+        try:
+            result = await provider.chat(messages, stream=stream, **kwargs)
+            if stream and hasattr(result, "__anext__"):
+                try:
+                    first = await result.__anext__()
+                except StopAsyncIteration:
+                    first = None
+                result = _PrefetchedStream(first, result)
+        except asyncio.CancelledError:
+            # Lost a hedge race: elapsed time is a lower bound on its latency
+            self._policy.record_latency(provider.name, stream, (time.perf_counter() - start) * 1000)
+            raise
+        self._policy.record_latency(provider.name, stream, (time.perf_counter() - start) * 1000)
+        return result
+    
+    async def _hedged_call(
+        self,
+        primary: LLMProvider,
+        hedge: LLMProvider,
+        delay: float,
+        messages: list[dict[str, str]],
+        stream: bool,
+        kwargs: dict[str, Any],
+        attempted: set[str],
+    ) -> tuple[LLMProvider, LLMResponse | AsyncIterator[StreamingLLMResponse]]:
+        """Call primary, racing hedge against it once ``delay`` has passed.
+        
+        The first successful result wins and the other request is cancelled.
+        Failures of the provider that did not win are recorded here.
+        
+        Args:
+            primary: Provider tried first
+            hedge: Provider started if primary is slow
+            delay: Seconds to wait for primary before hedging
+            messages: Chat messages
+            stream: Whether to stream the response
+            kwargs: Additional chat parameters
+            attempted: Names of providers already tried (hedge is added)
+            
+        Returns:
+            Tuple of (winning provider, its result)
+            
+        Raises:
+            Exception: Primary's error if no request succeeded
+        """
+        tasks = {
+            asyncio.create_task(self._call_provider(primary, messages, stream, kwargs)): primary,
+        }
+        winner: asyncio.Task | None = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                winner = next(iter(done))
+                return primary, winner.result()
+            
+            self._policy.hedges_started += 1
+            attempted.add(hedge.name)
+            logger.info(
+                "Primary provider slow, starting hedge request",
+                extra={
+                    "provider_name": primary.name,
+                    "hedge_provider": hedge.name,
+                    "hedge_delay_ms": int(delay * 1000),
+                }
+            )
+            tasks[asyncio.create_task(self._call_provider(hedge, messages, stream, kwargs))] = hedge
+            
+            pending = set(tasks)
+            errors: dict[str, BaseException] = {}
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and winner is None:
+                        winner = task
+                    elif task.exception() is not None:
+                        errors[tasks[task].name] = task.exception()
+            
+            # Record failures of providers that are not reported by the caller
+            for provider in (primary, hedge):
+                error = errors.get(provider.name)
+                if error is not None and (winner is not None or provider is hedge):
+                    await circuit_breaker_manager.get_breaker(provider.name).record_failure(error)
+                    self._health_monitor.record_failure(provider.name, error)
+            
+            if winner is None:
+                raise errors[primary.name]
+            
+            provider = tasks[winner]
+            if provider is hedge:
+                self._policy.hedges_won += 1
+            logger.info(
+                "Hedged request finished",
+                extra={"winner": provider.name, "loser": (hedge if provider is primary else primary).name}
+            )
+            return provider, winner.result()
+        finally:
+            losers = [task for task in tasks if task is not winner]
+            for task in losers:
+                task.cancel()
+            # Wait for cancelled losers and close streams that finished in a tie
+            for task in losers:
+                try:
+                    result = await task
+                except BaseException:
+                    continue
+                if isinstance(result, _PrefetchedStream):
+                    await result.aclose()
+    
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count from text.
+        """Count tokens of a text for statistics.
         
-        Uses a simple heuristic: ~4 characters per token for mixed Chinese/English.
-        This is a rough estimate but sufficient for statistics.
+        Uses the shared memoised TokenCounter, so streamed completions are
+        counted the same way as the context compression threshold.
         
         Args:
-            text: Text to estimate tokens for
+            text: Text to count tokens for
             
         Returns:
-            Estimated token count
+            Token count
         """
         if not text:
             return 0
-        # Count Chinese characters (each is roughly 1-2 tokens)
-        chinese_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
-        # For English and other text, ~4 characters per token
-        other_chars = len(text) - chinese_chars
-        return chinese_chars * 2 + other_chars // 4
+        return get_token_counter().count_text(text)
+    
+    def _estimate_prompt_tokens(self, messages: list[dict[str, str]] | None) -> int:
+        """Count prompt tokens of chat messages for statistics.
+        
+        Message contents are memoised, so an append-only history only
+        encodes the messages added since the previous request.
+        
+        Args:
+            messages: Prompt messages
+            
+        Returns:
+            Token count including per-message overhead
+        """
+        if not messages:
+            return 0
+        return get_token_counter().count_messages(messages)
     
     async def _wrap_streaming_response(
         self,
@@ -460,16 +794,14 @@ class LLMRouter:
         except Exception as e:
             has_error = True
             error_message = str(e)
+            self._health_monitor.record_failure(provider.name, e)
             raise
         
         finally:
             # Record stats after streaming completes
             try:
                 # Estimate prompt tokens from input messages
-                prompt_tokens = 0
-                if prompt_messages:
-                    for msg in prompt_messages:
-                        prompt_tokens += self._estimate_tokens(msg.get("content", ""))
+                prompt_tokens = self._estimate_prompt_tokens(prompt_messages)
                 
                 # Estimate completion tokens from output
                 completion_tokens = self._estimate_tokens(total_content)
@@ -539,9 +871,7 @@ class LLMRouter:
             # Log prompt interaction after streaming completes
             try:
                 # Estimate tokens for streaming response
-                prompt_tokens = 0
-                for msg in prompt_messages:
-                    prompt_tokens += self._estimate_tokens(msg.get("content", ""))
+                prompt_tokens = self._estimate_prompt_tokens(prompt_messages)
                 completion_tokens = self._estimate_tokens(total_content)
                 
                 prompt_logger.log_interaction(
@@ -569,8 +899,36 @@ class LLMRouter:
                     }
                 )
     
+    def get_health_status(self) -> dict[str, dict[str, Any]]:
+        """Get cached health status of this router's providers.
+        
+        Never performs network I/O; statuses come from background probes
+        and recent request outcomes.
+        
+        Returns:
+            Dict mapping provider name to status details
+        """
+        self._health_monitor.ensure_started()
+        status = self._health_monitor.get_health_status()
+        return {name: status[name] for name in self._providers if name in status}
+    
+    def get_routing_status(self) -> dict[str, Any]:
+        """Get routing policy state, latency stats and cached provider health.
+        
+        Returns:
+            Dict with "policy", "health" and "coalescing" sections
+        """
+        return {
+            "policy": self._policy.get_status(),
+            "health": self.get_health_status(),
+            "coalescing": self._inflight.get_stats(),
+        }
+    
     async def health_check(self) -> dict[str, bool]:
-        """Check health of all providers.
+        """Probe health of all providers now.
+        
+        Results also refresh the cached status. Prefer get_health_status()
+        on request paths; this performs one live call per provider.
         
         Returns:
             Dict mapping provider name to health status
@@ -578,7 +936,7 @@ class LLMRouter:
         results = {}
         for name, provider in self._providers.items():
             try:
-                results[name] = await provider.health_check()
+                results[name] = await self._health_monitor.probe(name, provider)
             except Exception as e:
                 logger.warning(
                     "Health check failed for provider",
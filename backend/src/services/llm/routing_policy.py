@@ -0,0 +1,224 @@
+"""Latency-aware provider selection for the LLM router.
+
+This module provides:
+- LatencyTracker: per-provider EWMA and windowed percentiles of latency
+- RoutingPolicy: provider ordering ("priority" or "fastest") and hedge deadlines
+
+Latency is time to first result: the first chunk of a streamed response,
+or the whole response otherwise. The two are tracked separately because
+they differ by an order of magnitude.
+"""
+
+import math
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import Any, Literal
+
+from .provider import LLMProvider
+
+RoutingStrategy = Literal["priority", "fastest"]
+
+
+def latency_key(provider_name: str, stream: bool) -> str:
+    """Tracker key for a provider and response mode."""
+    return f"{provider_name}:{'first_token' if stream else 'response'}"
+
+
+class LatencyTracker:
+    """Tracks recent latencies per key.
+
+    Keeps an EWMA for ranking and a bounded window of samples for
+    percentiles; both are cheap enough to update on every request.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 200) -> None:
+        """Initialize tracker.
+
+        Args:
+            alpha: EWMA smoothing factor (higher reacts faster)
+            window: Samples kept per key for percentiles
+        """
+        self.alpha = alpha
+        self.window = window
+        self._ewma: dict[str, float] = {}
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency_ms: float) -> None:
+        """Record one latency sample."""
+        with self._lock:
+            previous = self._ewma.get(key)
+            self._ewma[key] = latency_ms if previous is None else (
+                self.alpha * latency_ms + (1 - self.alpha) * previous
+            )
+            samples = self._samples.get(key)
+            if samples is None or samples.maxlen != self.window:
+                samples = self._samples[key] = deque(samples or (), maxlen=self.window)
+            samples.append(latency_ms)
+
+    def ewma(self, key: str) -> float | None:
+        """Smoothed latency in ms, None without samples."""
+        return self._ewma.get(key)
+
+    def count(self, key: str) -> int:
+        """Number of samples in the window."""
+        samples = self._samples.get(key)
+        return len(samples) if samples else 0
+
+    def percentile(self, key: str, q: float) -> float | None:
+        """Latency percentile over the sample window.
+
+        Args:
+            key: Tracker key
+            q: Percentile in [0, 100]
+
+        Returns:
+            Latency in ms (nearest-rank), None without samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key) or ())
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, math.ceil(q / 100 * len(samples)) - 1))
+        return samples[rank]
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        with self._lock:
+            self._ewma.clear()
+            self._samples.clear()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Get latency summary for every key."""
+        return {
+            key: {
+                "samples": self.count(key),
+                "ewma_ms": round(self._ewma[key], 1),
+                "p50_ms": self.percentile(key, 50),
+                "p95_ms": self.percentile(key, 95),
+            }
+            for key in list(self._ewma)
+        }
+
+
+class RoutingPolicy:
+    """Decides provider order and hedge deadlines from observed latency."""
+
+    def __init__(
+        self,
+        strategy: RoutingStrategy = "priority",
+        hedge_enabled: bool = False,
+        hedge_multiplier: float = 1.0,
+        hedge_min_delay_ms: float = 300.0,
+        hedge_max_delay_ms: float = 10000.0,
+        min_samples: int = 5,
+        coalesce_requests: bool = True,
+        tracker: LatencyTracker | None = None,
+    ) -> None:
+        """Initialize routing policy.
+
+        Args:
+            strategy: "priority" keeps configured order, "fastest" ranks
+                healthy providers by EWMA latency
+            hedge_enabled: Start a backup request when the first provider
+                is slower than its hedge deadline
+            hedge_multiplier: Hedge deadline as a multiple of p95 latency
+            hedge_min_delay_ms: Lower bound for the hedge deadline
+            hedge_max_delay_ms: Upper bound for the hedge deadline
+            min_samples: Samples needed before latency influences routing
+            coalesce_requests: Share one provider call between concurrent
+                identical non-streaming requests that are cache-eligible
+                or opt in
+            tracker: Latency tracker (a new one if omitted)
+        """
+        self.strategy = strategy
+        self.hedge_enabled = hedge_enabled
+        self.hedge_multiplier = hedge_multiplier
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self.hedge_max_delay_ms = hedge_max_delay_ms
+        self.min_samples = min_samples
+        self.coalesce_requests = coalesce_requests
+        self.tracker = tracker or LatencyTracker()
+        self.hedges_started = 0
+        self.hedges_won = 0
+
+    def configure(self, **settings: Any) -> None:
+        """Update policy settings; ``latency_window`` resizes the tracker window."""
+        window = settings.pop("latency_window", None)
+        if window:
+            self.tracker.window = window
+        for key, value in settings.items():
+            if value is not None and hasattr(self, key):
+                setattr(self, key, value)
+
+    def record_latency(self, provider_name: str, stream: bool, latency_ms: float) -> None:
+        """Record time to first result for a provider."""
+        self.tracker.record(latency_key(provider_name, stream), latency_ms)
+
+    def order(
+        self,
+        providers: list[LLMProvider],
+        is_healthy: Callable[[str], bool],
+        stream: bool = False,
+    ) -> list[LLMProvider]:
+        """Order providers for a request.
+
+        Healthy providers always come before unhealthy ones. With the
+        "fastest" strategy, healthy providers are ranked by EWMA latency;
+        providers with too few samples rank first so they get measured,
+        and ties keep the configured priority order.
+
+        Args:
+            providers: Providers in configured priority order
+            is_healthy: Cached health lookup
+            stream: Whether the request streams
+
+        Returns:
+            Providers in the order to try
+        """
+        def rank(provider: LLMProvider) -> tuple[bool, float]:
+            unhealthy = not is_healthy(provider.name)
+            if self.strategy != "fastest":
+                return unhealthy, 0.0
+            key = latency_key(provider.name, stream)
+            if self.tracker.count(key) < self.min_samples:
+                return unhealthy, 0.0
+            return unhealthy, self.tracker.ewma(key) or 0.0
+
+        return sorted(providers, key=rank)
+
+    def hedge_delay(self, provider_name: str, stream: bool) -> float | None:
+        """Seconds to wait for a first result before hedging.
+
+        Args:
+            provider_name: Provider tried first
+            stream: Whether the request streams
+
+        Returns:
+            Deadline in seconds, or None when hedging is off or the
+            provider has too few samples for a meaningful p95
+        """
+        if not self.hedge_enabled:
+            return None
+        key = latency_key(provider_name, stream)
+        if self.tracker.count(key) < self.min_samples:
+            return None
+        p95 = self.tracker.percentile(key, 95) or 0.0
+        delay_ms = min(max(p95 * self.hedge_multiplier, self.hedge_min_delay_ms), self.hedge_max_delay_ms)
+        return delay_ms / 1000
+
+    def get_status(self) -> dict[str, Any]:
+        """Get policy settings, hedge counters and latency stats."""
+        return {
+            "strategy": self.strategy,
+            "hedge_enabled": self.hedge_enabled,
+            "coalesce_requests": self.coalesce_requests,
+            "hedges_started": self.hedges_started,
+            "hedges_won": self.hedges_won,
+            "latency": self.tracker.get_stats(),
+        }
+
+
+# Global routing policy shared by all routers
+routing_policy = RoutingPolicy()
@@ -174,7 +174,7 @@ class LogParser:
                         continue
                     
                     try:
-                        data = json.loads(line)
+                        data = self._unwrap_prompt_record(json.loads(line))
                         
                         # Filter by trace_id
                         if data.get('trace_id') == trace_id:
@@ -191,6 +191,23 @@ class LogParser:
         
         return entries
     
+    @staticmethod
+    def _unwrap_prompt_record(data: dict[str, Any]) -> dict[str, Any]:
+        """Return the prompt entry carried in a log record.
+        
+        The prompt logger writes each entry as the JSON-encoded ``message``
+        of a ``llm_prompt`` record; bare entries are returned unchanged.
+        """
+        message = data.get('message')
+        if data.get('module') == 'llm_prompt' and isinstance(message, str):
+            try:
+                inner = json.loads(message)
+            except json.JSONDecodeError:
+                return data
+            if isinstance(inner, dict):
+                return inner
+        return data
+    
     def build_timeline(
         self,
         trace_id: str
@@ -281,7 +281,8 @@ class SmartMemoryService:
             
             response = await self._llm_router.chat(
                 messages=[{"role": "user", "content": prompt}],
-                stream=False
+                stream=False,
+                cache=True,
             )
             
             # Parse JSON response
@@ -0,0 +1,193 @@
+"""In-memory aggregates of LLM request statistics.
+
+This module provides:
+- StatAggregate: count/success/token/latency totals for a group of requests
+- Fixed-bucket latency histograms with p50/p95/p99 estimates
+- RollingStats: per-minute aggregates for a recent time window
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+# Upper bounds (ms) of the latency histogram buckets; one more bucket
+# counts everything above the last bound
+LATENCY_BUCKETS_MS = (
+    50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000,
+    5000, 7500, 10000, 15000, 20000, 30000, 60000, 120000,
+)
+
+
+def _empty_histogram() -> list[int]:
+    return [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+
+@dataclass
+class StatAggregate:
+    """Running totals for a group of LLM requests."""
+
+    total_requests: int = 0
+    successful_requests: int = 0
+    total_prompt_tokens: int = 0
+    total_completion_tokens: int = 0
+    total_tokens: int = 0
+    latency_sum_ms: int = 0
+    min_latency_ms: int | None = None
+    max_latency_ms: int | None = None
+    latency_histogram: list[int] = field(default_factory=_empty_histogram)
+
+    def add(self, success: bool, prompt_tokens: int, completion_tokens: int, latency_ms: int) -> None:
+        """Count one request."""
+        self.total_requests += 1
+        self.successful_requests += 1 if success else 0
+        self.total_prompt_tokens += prompt_tokens
+        self.total_completion_tokens += completion_tokens
+        self.total_tokens += prompt_tokens + completion_tokens
+        self.latency_sum_ms += latency_ms
+        if self.min_latency_ms is None or latency_ms < self.min_latency_ms:
+            self.min_latency_ms = latency_ms
+        if self.max_latency_ms is None or latency_ms > self.max_latency_ms:
+            self.max_latency_ms = latency_ms
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def merge(self, other: "StatAggregate") -> None:
+        """Add another aggregate's totals to this one."""
+        self.total_requests += other.total_requests
+        self.successful_requests += other.successful_requests
+        self.total_prompt_tokens += other.total_prompt_tokens
+        self.total_completion_tokens += other.total_completion_tokens
+        self.total_tokens += other.total_tokens
+        self.latency_sum_ms += other.latency_sum_ms
+        if other.min_latency_ms is not None and (
+            self.min_latency_ms is None or other.min_latency_ms < self.min_latency_ms
+        ):
+            self.min_latency_ms = other.min_latency_ms
+        if other.max_latency_ms is not None and (
+            self.max_latency_ms is None or other.max_latency_ms > self.max_latency_ms
+        ):
+            self.max_latency_ms = other.max_latency_ms
+        for i, count in enumerate(other.latency_histogram[:len(self.latency_histogram)]):
+            self.latency_histogram[i] += count
+
+    def percentile(self, q: float) -> float:
+        """Estimate a latency percentile from the histogram.
+
+        The value is interpolated linearly inside the bucket holding the
+        nearest-rank sample, with the bucket clamped to the observed
+        min/max latency.
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Estimated latency in milliseconds (0 when empty)
+        """
+        count = sum(self.latency_histogram)
+        if count == 0:
+            return 0.0
+        rank = max(1, min(count, -(-q * count // 100)))
+        seen = 0
+        for i, n in enumerate(self.latency_histogram):
+            if n and seen + n >= rank:
+                low = LATENCY_BUCKETS_MS[i - 1] if i > 0 else 0
+                high = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_latency_ms or low
+                low = max(low, self.min_latency_ms or 0)
+                high = min(high, self.max_latency_ms if self.max_latency_ms is not None else high)
+                return round(low + (high - low) * (rank - seen) / n, 2)
+            seen += n
+        return float(self.max_latency_ms or 0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Format like StatService.get_aggregated_stats()."""
+        total = self.total_requests
+        successful = self.successful_requests
+        return {
+            "total_requests": total,
+            "successful_requests": successful,
+            "failed_requests": total - successful,
+            "success_rate": round(successful / total * 100, 2) if total > 0 else 0.0,
+            "total_prompt_tokens": self.total_prompt_tokens,
+            "total_completion_tokens": self.total_completion_tokens,
+            "total_tokens": self.total_tokens,
+            "avg_latency_ms": round(self.latency_sum_ms / total, 2) if total > 0 else 0.0,
+            "max_latency_ms": self.max_latency_ms or 0,
+            "min_latency_ms": self.min_latency_ms or 0,
+            "p50_latency_ms": self.percentile(50),
+            "p95_latency_ms": self.percentile(95),
+            "p99_latency_ms": self.percentile(99),
+        }
+
+
+def _minute(ts: datetime) -> datetime:
+    """Start of the minute containing ``ts``."""
+    return ts.replace(second=0, microsecond=0)
+
+
+class RollingStats:
+    """Per-minute, per-provider/model aggregates of recent requests.
+
+    Only requests recorded by this process are counted, so a window can
+    be answered from memory only if it starts after ``since`` (when the
+    aggregates began) and within the last ``window_minutes``. Window
+    edges are rounded down to the minute.
+    """
+
+    def __init__(self, window_minutes: int = 60) -> None:
+        """Initialize rolling aggregates.
+
+        Args:
+            window_minutes: How far back aggregates are kept
+        """
+        self.window = timedelta(minutes=window_minutes)
+        self.since = datetime.now()
+        self._buckets: dict[tuple[datetime, str, str], StatAggregate] = {}
+
+    def add(
+        self,
+        created_at: datetime,
+        provider_name: str,
+        model_id: str,
+        success: bool,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: int,
+    ) -> None:
+        """Count one request in its minute bucket."""
+        key = (_minute(created_at), provider_name, model_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = StatAggregate()
+            self._prune(created_at)
+        bucket.add(success, prompt_tokens, completion_tokens, latency_ms)
+
+    def _prune(self, now: datetime) -> None:
+        """Drop buckets that left the window."""
+        horizon = _minute(now - self.window)
+        for key in [k for k in self._buckets if k[0] < horizon]:
+            del self._buckets[key]
+
+    def covers(self, start_time: datetime | None, end_time: datetime | None = None) -> bool:
+        """Whether [start_time, now] can be answered from memory."""
+        if start_time is None or end_time is not None:
+            return False
+        return start_time >= max(self.since, datetime.now() - self.window)
+
+    def aggregate(
+        self,
+        start_time: datetime,
+        provider_name: str | None = None,
+        model_id: str | None = None,
+    ) -> StatAggregate:
+        """Totals of the requests since ``start_time`` matching the filters."""
+        first = _minute(start_time)
+        result = StatAggregate()
+        for (minute, provider, model), bucket in self._buckets.items():
+            if minute < first:
+                continue
+            if provider_name and provider != provider_name:
+                continue
+            if model_id and model != model_id:
+                continue
+            result.merge(bucket)
+        return result
@@ -1,19 +1,29 @@
 """LLM request statistics service."""
 
+import asyncio
+import json
 import time
 import uuid
+from collections.abc import Callable
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.stat import LLMRequestStat
+from ..models.stat import LLMRequestStat, LLMStatRollup
 from ..services.storage import StorageService
 from ..utils.logger import get_logger
+from .stat_aggregates import RollingStats, StatAggregate
 
 logger = get_logger(__name__)
 
+# Raw rows folded per step when rollups are built from history
+ROLLUP_BACKFILL_CHUNK = 5000
+
+# Seconds between raw-row retention sweeps
+PRUNE_INTERVAL = 3600.0
+
 
 class StatService:
     """Service for managing LLM request statistics.
@@ -22,15 +32,54 @@ class StatService:
     - Record individual request stats
     - Query aggregated statistics
     - Multi-dimensional analysis (by provider, model, time range)
+    
+    Records are buffered in memory and written in bulk INSERTs once
+    ``flush_size`` records are waiting or ``flush_interval`` seconds
+    after the first one, and on close(). Queries flush first, so they
+    always see every recorded request. Recent windows of
+    get_aggregated_stats are answered from in-memory rolling aggregates.
+    
+    Each bulk write also updates hourly and daily rollups (counts,
+    tokens, latency sum/min/max and a latency histogram), so queries read
+    rollups for closed periods and raw rows only for the open one. Raw
+    rows older than ``raw_retention_days`` are deleted; rollups are kept.
     """
     
-    def __init__(self, storage: StorageService | None = None) -> None:
+    def __init__(
+        self,
+        storage: StorageService | None = None,
+        flush_size: int = 50,
+        flush_interval: float = 2.0,
+        max_buffer: int = 10000,
+        rolling_window_minutes: int = 60,
+        raw_retention_days: int = 90,
+    ) -> None:
         """Initialize stat service.
         
         Args:
             storage: Storage service instance
+            flush_size: Buffered records that trigger a write (1 = write-through)
+            flush_interval: Seconds a record may wait before it is written
+            max_buffer: Records kept when writes fail (oldest dropped beyond)
+            rolling_window_minutes: Recent window kept in memory (0 = disabled)
+            raw_retention_days: Days raw rows are kept (0 = forever)
         """
         self._storage = storage or StorageService()
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.max_buffer = max(self.flush_size, max_buffer)
+        self._rolling = RollingStats(rolling_window_minutes) if rolling_window_minutes > 0 else None
+        self.raw_retention_days = raw_retention_days
+        self._last_prune = time.monotonic()
+        
+        self._buffer: list[dict[str, Any]] = []
+        self._flush_lock: asyncio.Lock | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._timer: asyncio.TimerHandle | None = None
+        
+        self.flushes = 0
+        self.flushed_records = 0
+        self.dropped_records = 0
     
     async def record_request(
         self,
@@ -60,28 +109,111 @@ class StatService:
         Returns:
             Created stat record
         """
-        stat = LLMRequestStat(
-            id=str(uuid.uuid4()),
-            provider_name=provider_name,
-            model_id=model_id,
-            session_id=session_id,
-            request_type=request_type,
-            success=1 if success else 0,
-            error_message=error_message,
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            total_tokens=prompt_tokens + completion_tokens,
-            latency_ms=latency_ms,
-            created_at=datetime.now(),
-        )
+        row = {
+            "id": str(uuid.uuid4()),
+            "provider_name": provider_name,
+            "model_id": model_id,
+            "session_id": session_id,
+            "request_type": request_type,
+            "success": 1 if success else 0,
+            "error_message": error_message,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "latency_ms": latency_ms,
+            "created_at": datetime.now(),
+        }
         
-        async with self._storage.session() as db_session:
-            db_session.add(stat)
-            await db_session.commit()
-            await db_session.refresh(stat)
+        self._buffer.append(row)
+        if self._rolling is not None:
+            self._rolling.add(
+                row["created_at"], provider_name, model_id, success,
+                prompt_tokens, completion_tokens, latency_ms,
+            )
+        
+        if len(self._buffer) >= self.flush_size:
+            if self.flush_size == 1:
+                await self.flush()
+            else:
+                self._schedule_flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._schedule_flush)
         
         logger.debug(f"Recorded stat: {provider_name}/{model_id} success={success}")
-        return stat
+        return LLMRequestStat(**row)
+    
+    def _schedule_flush(self) -> None:
+        """Start a background flush of the buffer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def flush(self) -> int:
+        """Write buffered records in one bulk INSERT.
+        
+        On failure the records stay buffered (up to ``max_buffer``) and
+        are retried by the next flush.
+        
+        Returns:
+            Number of records written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._buffer:
+                return 0
+            
+            rows, self._buffer = self._buffer, []
+            try:
+                async with self._storage.session() as db_session:
+                    await db_session.execute(insert(LLMRequestStat), rows)
+                    await self._update_rollups(db_session, rows)
+            except Exception as e:
+                self._buffer[:0] = rows
+                overflow = len(self._buffer) - self.max_buffer
+                if overflow > 0:
+                    del self._buffer[:overflow]
+                    self.dropped_records += overflow
+                logger.warning(
+                    "Failed to write LLM request stats, keeping them buffered",
+                    extra={"records": len(rows), "buffered": len(self._buffer), "error": str(e)}
+                )
+                return 0
+            
+            self.flushes += 1
+            self.flushed_records += len(rows)
+            logger.debug("Flushed LLM request stats", extra={"records": len(rows)})
+            
+            if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+                try:
+                    await self.prune_raw()
+                except Exception as e:
+                    logger.warning("Failed to prune raw LLM request stats", extra={"error": str(e)})
+            return len(rows)
+    
+    async def close(self) -> None:
+        """Write everything still buffered."""
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+    
+    def get_buffer_stats(self) -> dict[str, Any]:
+        """Get write-behind buffer counters."""
+        return {
+            "buffered": len(self._buffer),
+            "flushes": self.flushes,
+            "flushed_records": self.flushed_records,
+            "dropped_records": self.dropped_records,
+            "flush_size": self.flush_size,
+            "flush_interval": self.flush_interval,
+        }
     
     async def get_aggregated_stats(
         self,
@@ -99,61 +231,18 @@ class StatService:
             end_time: Filter to this time
             
         Returns:
-            Aggregated statistics dict
+            Aggregated statistics dict (latency percentiles are
+            estimated from histograms)
         """
-        async with self._storage.session() as db_session:
-            # Build base query
-            base_query = select(LLMRequestStat)
-            
-            if provider_name:
-                base_query = base_query.where(LLMRequestStat.provider_name == provider_name)
-            if model_id:
-                base_query = base_query.where(LLMRequestStat.model_id == model_id)
-            if start_time:
-                base_query = base_query.where(LLMRequestStat.created_at >= start_time)
-            if end_time:
-                base_query = base_query.where(LLMRequestStat.created_at <= end_time)
-            
-            # Get aggregated stats
-            agg_query = select(
-                func.count(LLMRequestStat.id).label("total_requests"),
-                func.sum(LLMRequestStat.success).label("successful_requests"),
-                func.sum(LLMRequestStat.prompt_tokens).label("total_prompt_tokens"),
-                func.sum(LLMRequestStat.completion_tokens).label("total_completion_tokens"),
-                func.sum(LLMRequestStat.total_tokens).label("total_tokens"),
-                func.avg(LLMRequestStat.latency_ms).label("avg_latency_ms"),
-                func.max(LLMRequestStat.latency_ms).label("max_latency_ms"),
-                func.min(LLMRequestStat.latency_ms).label("min_latency_ms"),
-            ).select_from(LLMRequestStat)
-            
-            if provider_name:
-                agg_query = agg_query.where(LLMRequestStat.provider_name == provider_name)
-            if model_id:
-                agg_query = agg_query.where(LLMRequestStat.model_id == model_id)
-            if start_time:
-                agg_query = agg_query.where(LLMRequestStat.created_at >= start_time)
-            if end_time:
-                agg_query = agg_query.where(LLMRequestStat.created_at <= end_time)
-            
-            result = await db_session.execute(agg_query)
-            row = result.one()
-            
-            total = row.total_requests or 0
-            successful = row.successful_requests or 0
-            failed = total - successful
-            
-            return {
-                "total_requests": total,
-                "successful_requests": successful,
-                "failed_requests": failed,
-                "success_rate": round(successful / total * 100, 2) if total > 0 else 0.0,
-                "total_prompt_tokens": row.total_prompt_tokens or 0,
-                "total_completion_tokens": row.total_completion_tokens or 0,
-                "total_tokens": row.total_tokens or 0,
-                "avg_latency_ms": round(row.avg_latency_ms or 0, 2),
-                "max_latency_ms": row.max_latency_ms or 0,
-                "min_latency_ms": row.min_latency_ms or 0,
-            }
+        # Recent windows are answered from the rolling aggregates
+        if self._rolling is not None and self._rolling.covers(start_time, end_time):
+            return self._rolling.aggregate(start_time, provider_name, model_id).to_dict()
+        
+        groups = await self._collect(
+            lambda provider, model, ts: None,
+            start_time, end_time, provider_name, model_id,
+        )
+        return groups.get(None, StatAggregate()).to_dict()
     
     async def get_stats_by_provider(
         self,
@@ -169,41 +258,26 @@ class StatService:
         Returns:
             List of provider statistics
         """
-        async with self._storage.session() as db_session:
-            query = select(
-                LLMRequestStat.provider_name,
-                LLMRequestStat.model_id,
-                func.count(LLMRequestStat.id).label("total_requests"),
-                func.sum(LLMRequestStat.success).label("successful_requests"),
-                func.avg(LLMRequestStat.latency_ms).label("avg_latency_ms"),
-            ).group_by(
-                LLMRequestStat.provider_name,
-                LLMRequestStat.model_id,
-            )
-            
-            if start_time:
-                query = query.where(LLMRequestStat.created_at >= start_time)
-            if end_time:
-                query = query.where(LLMRequestStat.created_at <= end_time)
-            
-            result = await db_session.execute(query)
-            rows = result.all()
-            
-            stats = []
-            for row in rows:
-                total = row.total_requests or 0
-                successful = row.successful_requests or 0
-                stats.append({
-                    "provider_name": row.provider_name,
-                    "model_id": row.model_id,
-                    "total_requests": total,
-                    "successful_requests": successful,
-                    "failed_requests": total - successful,
-                    "success_rate": round(successful / total * 100, 2) if total > 0 else 0.0,
-                    "avg_latency_ms": round(row.avg_latency_ms or 0, 2),
-                })
-            
-            return stats
+        groups = await self._collect(
+            lambda provider, model, ts: (provider, model),
+            start_time, end_time,
+        )
+        
+        stats = []
+        for (provider, model), agg in sorted(groups.items()):
+            summary = agg.to_dict()
+            stats.append({
+                "provider_name": provider,
+                "model_id": model,
+                "total_requests": summary["total_requests"],
+                "successful_requests": summary["successful_requests"],
+                "failed_requests": summary["failed_requests"],
+                "success_rate": summary["success_rate"],
+                "avg_latency_ms": summary["avg_latency_ms"],
+                "p95_latency_ms": summary["p95_latency_ms"],
+            })
+        
+        return stats
     
     async def get_recent_errors(
         self,
@@ -219,6 +293,7 @@ class StatService:
         Returns:
             List of error records
         """
+        await self.flush()
         async with self._storage.session() as db_session:
             query = select(LLMRequestStat).where(
                 LLMRequestStat.success == 0
@@ -248,41 +323,324 @@ class StatService:
         """
         start_time = datetime.now() - timedelta(days=days)
         
-        async with self._storage.session() as db_session:
-            # SQLite date function
-            query = select(
-                func.date(LLMRequestStat.created_at).label("date"),
-                func.count(LLMRequestStat.id).label("total_requests"),
-                func.sum(LLMRequestStat.success).label("successful_requests"),
-                func.sum(LLMRequestStat.total_tokens).label("total_tokens"),
-            ).where(
-                LLMRequestStat.created_at >= start_time
-            ).group_by(
-                func.date(LLMRequestStat.created_at)
-            ).order_by(
-                func.date(LLMRequestStat.created_at).desc()
-            )
-            
-            if provider_name:
-                query = query.where(LLMRequestStat.provider_name == provider_name)
-            
-            result = await db_session.execute(query)
-            rows = result.all()
+        groups = await self._collect(
+            lambda provider, model, ts: ts.date().isoformat(),
+            start_time, None, provider_name,
+        )
+        
+        stats = []
+        for date, agg in sorted(groups.items(), reverse=True):
+            summary = agg.to_dict()
+            stats.append({
+                "date": date,
+                "total_requests": summary["total_requests"],
+                "successful_requests": summary["successful_requests"],
+                "failed_requests": summary["failed_requests"],
+                "success_rate": summary["success_rate"],
+                "total_tokens": summary["total_tokens"],
+                "p95_latency_ms": summary["p95_latency_ms"],
+            })
+        
+        return stats
+    
+    def _plan(
+        self,
+        start_time: datetime | None,
+        end_time: datetime | None,
+    ) -> list[tuple[str, datetime | None, datetime | None, bool]]:
+        """Split a query range into rollup and raw-row segments.
+        
+        Whole closed hours and days come from rollups; the partial hour
+        at the start and everything from the last closed hour on (the
+        open period) come from raw rows. Partial hours older than the
+        raw retention are widened to the whole hour, whose rows are gone.
+        
+        Returns:
+            (source, start, end, end_inclusive) tuples, source being
+            "raw", "hour" or "day"; None means unbounded
+        """
+        now = datetime.now()
+        cutoff = self._raw_cutoff(now)
+        
+        def expired(ts: datetime) -> bool:
+            return cutoff is not None and ts < cutoff
+        
+        # [first, last) is answered from rollups
+        if start_time is None:
+            first = None
+        else:
+            first = _floor_hour(start_time) if expired(start_time) else _ceil_hour(start_time)
+        last = _floor_hour(now)
+        if end_time is not None and end_time < last:
+            last = _ceil_hour(end_time) if expired(end_time) else _floor_hour(end_time)
+        
+        if first is not None and last <= first:
+            return [("raw", start_time, end_time, True)]
+        
+        segments: list[tuple[str, datetime | None, datetime | None, bool]] = []
+        if start_time is not None and start_time < first:
+            segments.append(("raw", start_time, first, False))
+        
+        last_day = _floor_day(last)
+        if first is None:
+            segments.append(("day", None, last_day, False))
+            segments.append(("hour", last_day, last, False))
+        elif _ceil_day(first) < last_day:
+            segments.append(("hour", first, _ceil_day(first), False))
+            segments.append(("day", _ceil_day(first), last_day, False))
+            segments.append(("hour", last_day, last, False))
+        else:
+            segments.append(("hour", first, last, False))
+        
+        if end_time is None or end_time >= last:
+            segments.append(("raw", last, end_time, True))
+        return segments
+    
+    async def _collect(
+        self,
+        key: Callable[[str, str, datetime], Any],
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        provider_name: str | None = None,
+        model_id: str | None = None,
+    ) -> dict[Any, StatAggregate]:
+        """Aggregate requests in a time range, grouped by ``key``.
+        
+        Args:
+            key: Maps (provider, model, timestamp) to a group key; the
+                timestamp is a row's created_at or a rollup's period start
+            start_time: Range start (inclusive)
+            end_time: Range end (inclusive)
+            provider_name: Filter by provider name
+            model_id: Filter by model ID
             
-            stats = []
-            for row in rows:
-                total = row.total_requests or 0
-                successful = row.successful_requests or 0
-                stats.append({
-                    "date": row.date,
-                    "total_requests": total,
-                    "successful_requests": successful,
-                    "failed_requests": total - successful,
-                    "success_rate": round(successful / total * 100, 2) if total > 0 else 0.0,
-                    "total_tokens": row.total_tokens or 0,
-                })
+        Returns:
+            Aggregates by group key
+        """
+        await self.flush()
+        groups: dict[Any, StatAggregate] = {}
+        
+        def group(provider: str, model: str, ts: datetime) -> StatAggregate:
+            k = key(provider, model, ts)
+            agg = groups.get(k)
+            if agg is None:
+                agg = groups[k] = StatAggregate()
+            return agg
+        
+        async with self._storage.session() as db_session:
+            for source, lo, hi, hi_inclusive in self._plan(start_time, end_time):
+                if source == "raw":
+                    query = select(
+                        LLMRequestStat.provider_name,
+                        LLMRequestStat.model_id,
+                        LLMRequestStat.created_at,
+                        LLMRequestStat.success,
+                        LLMRequestStat.prompt_tokens,
+                        LLMRequestStat.completion_tokens,
+                        LLMRequestStat.latency_ms,
+                    )
+                    column = LLMRequestStat.created_at
+                    model = LLMRequestStat
+                else:
+                    query = select(LLMStatRollup).where(LLMStatRollup.granularity == source)
+                    column = LLMStatRollup.period_start
+                    model = LLMStatRollup
+                
+                if lo is not None:
+                    query = query.where(column >= lo)
+                if hi is not None:
+                    query = query.where(column <= hi if hi_inclusive else column < hi)
+                if provider_name:
+                    query = query.where(model.provider_name == provider_name)
+                if model_id:
+                    query = query.where(model.model_id == model_id)
+                
+                result = await db_session.execute(query)
+                if source == "raw":
+                    for row in result.all():
+                        group(row.provider_name, row.model_id, row.created_at).add(
+                            bool(row.success), row.prompt_tokens or 0,
+                            row.completion_tokens or 0, row.latency_ms or 0,
+                        )
+                else:
+                    for rollup in result.scalars():
+                        group(rollup.provider_name, rollup.model_id, rollup.period_start).merge(
+                            _rollup_aggregate(rollup)
+                        )
+        
+        return groups
+    
+    @staticmethod
+    def _group_rollups(
+        rows: Any,
+        groups: dict[tuple[str, datetime, str, str], StatAggregate],
+    ) -> None:
+        """Add raw stat rows to per-(granularity, period, provider, model) aggregates."""
+        for row in rows:
+            created_at = row["created_at"]
+            for granularity, period_start in (("hour", _floor_hour(created_at)), ("day", _floor_day(created_at))):
+                k = (granularity, period_start, row["provider_name"], row["model_id"])
+                agg = groups.get(k)
+                if agg is None:
+                    agg = groups[k] = StatAggregate()
+                agg.add(
+                    bool(row["success"]), row["prompt_tokens"] or 0,
+                    row["completion_tokens"] or 0, row["latency_ms"] or 0,
+                )
+    
+    async def _update_rollups(
+        self,
+        db_session: AsyncSession,
+        rows: list[dict[str, Any]],
+        groups: dict[tuple[str, datetime, str, str], StatAggregate] | None = None,
+        empty: bool = False,
+    ) -> None:
+        """Fold raw stat rows (or pre-grouped aggregates) into their rollups.
+        
+        ``empty`` skips the lookup of existing rollups when the table is
+        known to have none.
+        """
+        if groups is None:
+            groups = {}
+            self._group_rollups(rows, groups)
+        
+        for (granularity, period_start, provider, model), agg in groups.items():
+            rollup = None
+            if not empty:
+                result = await db_session.execute(
+                    select(LLMStatRollup).where(
+                        LLMStatRollup.granularity == granularity,
+                        LLMStatRollup.period_start == period_start,
+                        LLMStatRollup.provider_name == provider,
+                        LLMStatRollup.model_id == model,
+                    )
+                )
+                rollup = result.scalar_one_or_none()
+            if rollup is None:
+                rollup = LLMStatRollup(
+                    granularity=granularity,
+                    period_start=period_start,
+                    provider_name=provider,
+                    model_id=model,
+                )
+                db_session.add(rollup)
+            else:
+                merged = _rollup_aggregate(rollup)
+                merged.merge(agg)
+                agg = merged
             
-            return stats
+            rollup.total_requests = agg.total_requests
+            rollup.successful_requests = agg.successful_requests
+            rollup.prompt_tokens = agg.total_prompt_tokens
+            rollup.completion_tokens = agg.total_completion_tokens
+            rollup.total_tokens = agg.total_tokens
+            rollup.latency_sum_ms = agg.latency_sum_ms
+            rollup.min_latency_ms = agg.min_latency_ms
+            rollup.max_latency_ms = agg.max_latency_ms
+            rollup.latency_histogram = json.dumps(agg.latency_histogram)
+    
+    async def ensure_rollups(self) -> int:
+        """Build rollups from existing raw rows if there are none yet.
+        
+        Run once at startup so history recorded before rollups existed
+        is queryable; then applies the raw-row retention.
+        
+        Returns:
+            Number of raw rows folded into rollups
+        """
+        folded = 0
+        async with self._storage.session() as db_session:
+            existing = await db_session.execute(select(func.count(LLMStatRollup.id)))
+            if not existing.scalar_one():
+                # Rollup rows are few (one per provider/model/hour), so
+                # group all history in memory and write each rollup once
+                groups: dict[tuple[str, datetime, str, str], StatAggregate] = {}
+                result = await db_session.stream(
+                    select(
+                        LLMRequestStat.provider_name,
+                        LLMRequestStat.model_id,
+                        LLMRequestStat.created_at,
+                        LLMRequestStat.success,
+                        LLMRequestStat.prompt_tokens,
+                        LLMRequestStat.completion_tokens,
+                        LLMRequestStat.latency_ms,
+                    ).execution_options(yield_per=ROLLUP_BACKFILL_CHUNK)
+                )
+                async for chunk in result.mappings().partitions():
+                    self._group_rollups(chunk, groups)
+                    folded += len(chunk)
+                if groups:
+                    await self._update_rollups(db_session, [], groups, empty=True)
+        
+        if folded:
+            logger.info("Built LLM stat rollups from raw rows", extra={"rows": folded})
+        await self.prune_raw()
+        return folded
+    
+    def _raw_cutoff(self, now: datetime) -> datetime | None:
+        """Oldest timestamp whose raw rows are kept (None = keep all)."""
+        if self.raw_retention_days <= 0:
+            return None
+        return now - timedelta(days=self.raw_retention_days)
+    
+    async def prune_raw(self) -> int:
+        """Delete raw rows older than the retention period.
+        
+        Their hourly and daily rollups are kept.
+        
+        Returns:
+            Number of rows deleted
+        """
+        self._last_prune = time.monotonic()
+        cutoff = self._raw_cutoff(datetime.now())
+        if cutoff is None:
+            return 0
+        async with self._storage.session() as db_session:
+            result = await db_session.execute(
+                delete(LLMRequestStat).where(LLMRequestStat.created_at < cutoff)
+            )
+        deleted = result.rowcount or 0
+        if deleted:
+            logger.info(
+                "Pruned raw LLM request stats",
+                extra={"rows": deleted, "retention_days": self.raw_retention_days}
+            )
+        return deleted
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(ts: datetime) -> datetime:
+    floor = _floor_hour(ts)
+    return floor if floor == ts else floor + timedelta(hours=1)
+
+
+def _floor_day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(ts: datetime) -> datetime:
+    floor = _floor_day(ts)
+    return floor if floor == ts else floor + timedelta(days=1)
+
+
+def _rollup_aggregate(rollup: LLMStatRollup) -> StatAggregate:
+    """StatAggregate holding a rollup row's totals."""
+    agg = StatAggregate(
+        total_requests=rollup.total_requests or 0,
+        successful_requests=rollup.successful_requests or 0,
+        total_prompt_tokens=rollup.prompt_tokens or 0,
+        total_completion_tokens=rollup.completion_tokens or 0,
+        total_tokens=rollup.total_tokens or 0,
+        latency_sum_ms=rollup.latency_sum_ms or 0,
+        min_latency_ms=rollup.min_latency_ms,
+        max_latency_ms=rollup.max_latency_ms,
+    )
+    for i, count in enumerate(json.loads(rollup.latency_histogram or "[]")[:len(agg.latency_histogram)]):
+        agg.latency_histogram[i] = count
+    return agg
 
 
 # Context manager for timing requests
@@ -311,3 +669,30 @@ def get_stat_service() -> StatService:
     if _stat_service is None:
         _stat_service = StatService()
     return _stat_service
+
+
+def init_stat_service(
+    flush_size: int = 50,
+    flush_interval: float = 2.0,
+    rolling_window_minutes: int = 60,
+    raw_retention_days: int = 90,
+) -> StatService:
+    """Initialize global stat service.
+    
+    Args:
+        flush_size: Buffered records that trigger a write (1 = write-through)
+        flush_interval: Seconds a record may wait before it is written
+        rolling_window_minutes: Recent window kept in memory (0 = disabled)
+        raw_retention_days: Days raw rows are kept (0 = forever)
+        
+    Returns:
+        StatService instance
+    """
+    global _stat_service
+    _stat_service = StatService(
+        flush_size=flush_size,
+        flush_interval=flush_interval,
+        rolling_window_minutes=rolling_window_minutes,
+        raw_retention_days=raw_retention_days,
+    )
+    return _stat_service
@@ -276,7 +276,7 @@ class TraceAnalyzer:
         try:
             # Call LLM
             messages = [{"role": "user", "content": prompt}]
-            response = await self.llm_router.chat(messages, stream=False)
+            response = await self.llm_router.chat(messages, stream=False, cache=True)
 
             # Parse response
             response_text = response.content
@@ -293,6 +293,27 @@ class BaseTool(ABC):
         """
         return []
     
+    @property
+    def is_idempotent(self) -> bool:
+        """Whether repeated calls with the same parameters are interchangeable.
+        
+        Idempotent tools have no side effects a caller could observe, so
+        concurrent identical calls may share one execution. Defaults to
+        False; override for read-only tools.
+        """
+        return False
+    
+    @property
+    def is_parallel_safe(self) -> bool:
+        """Whether this tool may run concurrently with other parallel-safe calls.
+        
+        When the LLM requests several tools in one response, consecutive
+        parallel-safe calls are executed concurrently. Defaults to
+        is_idempotent, since read-only tools cannot affect each other;
+        override to opt a tool in or out.
+        """
+        return self.is_idempotent
+    
     @abstractmethod
     async def execute(self, **params: Any) -> ToolResult:
         """Execute the tool with the given parameters.
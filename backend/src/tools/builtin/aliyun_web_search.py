@@ -39,6 +39,10 @@ class AliyunWebSearchTool(BaseTool):
     def name(self) -> str:
         return "web_search"
     
+    @property
+    def is_idempotent(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
         return (
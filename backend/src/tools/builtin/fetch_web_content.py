@@ -5,6 +5,7 @@ Provides comprehensive web content fetching with:
 - Image download and local storage
 - Table data extraction
 - Markdown + SQLite hybrid storage (72h TTL)
+- Conditional revalidation (ETag/Last-Modified) and stale-while-revalidate
 - Batch URL processing
 """
 
@@ -14,11 +15,11 @@ from typing import Any, Optional
 import asyncio
 
 from ..base import BaseTool, ToolResult, ToolParameter, ToolParameterType
+from src.config.models import WebFetchConfig
 from .web_fetch.http_client import HTTPClient
-from .web_fetch.html_parser import HTMLParser
-from .web_fetch.content_extractor import ContentExtractor
+from .web_fetch.extraction import ExtractionPool, ExtractionTimeoutError, get_extraction_pool
 from .web_fetch.markdown_storage import MarkdownStorageManager
-from .web_fetch.sqlite_index import SQLiteIndexManager
+from .web_fetch.sqlite_index import get_sqlite_index_manager
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -42,11 +43,18 @@ class FetchWebContentTool(BaseTool):
     - Batch processing multiple URLs
     """
     
-    def __init__(self, workspace_path: Optional[str] = None):
+    def __init__(
+        self,
+        workspace_path: Optional[str] = None,
+        extraction_pool: Optional[ExtractionPool] = None,
+        web_fetch_config: Optional[WebFetchConfig] = None,
+    ):
         """Initialize tool.
         
         Args:
             workspace_path: Path to workspace directory. If None, loads from x-agent.yaml config.
+            extraction_pool: Worker pool for HTML extraction (default: the shared pool)
+            web_fetch_config: Cache settings (default: tools.web_fetch from config)
         """
         if workspace_path is None:
             # Load workspace path from configuration
@@ -85,20 +93,52 @@ class FetchWebContentTool(BaseTool):
         self.workspace_path = workspace_path
         # Enable User-Agent rotation to avoid anti-bot detection
         self._http_client = HTTPClient(rotate_user_agent=True)
-        self._html_parser = HTMLParser()
-        self._extractor = ContentExtractor()
-        self._markdown_storage = MarkdownStorageManager(str(self.workspace_path))
-        self._sqlite_index = SQLiteIndexManager()
+        self._extraction_pool = extraction_pool
+        if web_fetch_config is None:
+            try:
+                from src.config import get_config
+                web_fetch_config = get_config().tools.web_fetch
+            except Exception:
+                web_fetch_config = WebFetchConfig()
+        self._cache_config = web_fetch_config
+        # Downloaded images are reused across pages for as long as a page stays fresh
+        self._markdown_storage = MarkdownStorageManager(
+            str(self.workspace_path),
+            http_client=self._http_client,
+            image_ttl_seconds=web_fetch_config.cache_ttl_hours * 3600,
+        )
+        self._sqlite_index = get_sqlite_index_manager(
+            max_entries=web_fetch_config.cache_max_entries,
+            max_bytes=web_fetch_config.cache_max_mb * 1024 * 1024,
+            stale_retention_hours=web_fetch_config.cache_stale_retention_hours,
+            on_release=self._release_entries,
+        )
+        # URL -> background revalidation of a stale entry
+        self._revalidations: dict[str, asyncio.Task] = {}
         
         logger.info(
             "FetchWebContentTool initialized",
             extra={"workspace_path": str(self.workspace_path)}
         )
     
+    def _release_entries(self, entries: list[dict]) -> None:
+        """Delete the files of entries dropped from the index."""
+        for entry in entries:
+            self._markdown_storage.remove_content(entry["markdown_path"], entry["images_dir"])
+    
+    @property
+    def extraction_pool(self) -> ExtractionPool:
+        """Worker pool used for HTML parsing and extraction."""
+        return self._extraction_pool or get_extraction_pool()
+    
     @property
     def name(self) -> str:
         return "fetch_web_content"
     
+    @property
+    def is_idempotent(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
         return (
@@ -241,33 +281,23 @@ class FetchWebContentTool(BaseTool):
         import time
         start_time = time.time()
         
-        # Step 1: Check cache/index
+        # Step 1: Check cache/index (expired entries can still be revalidated)
+        index_entry = None
         if use_cache:
-            index_entry = await self._sqlite_index.get_index(url)
+            index_entry = await self._sqlite_index.get_index(url, allow_stale=True)
             if index_entry:
-                logger.info(f"Cache hit for {url}")
-                
-                # Read Markdown file using absolute path
-                abs_markdown_path = str(self.workspace_path / index_entry["markdown_path"])
-                post = self._markdown_storage.read_markdown_file(abs_markdown_path)
-                
-                if post:
-                    elapsed_ms = int((time.time() - start_time) * 1000)
-                    return {
-                        "success": True,
-                        "url": url,
-                        "from_cache": True,
-                        "title": post.metadata.get("title", ""),
-                        "body": f"[Markdown content saved to {abs_markdown_path}]",
-                        "word_count": post.metadata.get("word_count", 0),
-                        "metadata": {
-                            "markdown_path": abs_markdown_path,
-                            "images_dir": str(self.workspace_path / index_entry["images_dir"]),
-                            "fetched_at": index_entry["fetched_at"],
-                            "response_time_ms": elapsed_ms,
-                            "cache_hit": True,
-                        },
-                    }
+                post = self._markdown_storage.read_markdown_file(
+                    str(self.workspace_path / index_entry["markdown_path"])
+                )
+                if post is None:
+                    index_entry = None
+                elif not index_entry["expired"]:
+                    logger.info(f"Cache hit for {url}")
+                    return self._cached_result(url, index_entry, post, start_time)
+                elif self._cache_config.stale_while_revalidate:
+                    logger.info(f"Serving stale cache for {url}, revalidating in background")
+                    self._schedule_revalidation(url, index_entry, max_images, extract_tables, timeout)
+                    return self._cached_result(url, index_entry, post, start_time, stale=True)
         
         # Step 2: Validate URL
         if not self._validate_url(url):
@@ -277,10 +307,122 @@ class FetchWebContentTool(BaseTool):
                 "error": "Invalid URL format",
             }
         
-        # Step 3: HTTP request
+        return await self._fetch_and_store(
+            url, max_images, extract_tables, timeout, start_time, index_entry
+        )
+    
+    def _cached_result(
+        self,
+        url: str,
+        index_entry: dict,
+        post: Any,
+        start_time: float,
+        stale: bool = False,
+        revalidated: bool = False,
+    ) -> dict:
+        """Build the result for content served from the cache.
+        
+        Args:
+            url: Requested URL
+            index_entry: SQLite index entry
+            post: Parsed Markdown file
+            start_time: Request start (time.time())
+            stale: Entry is expired and being revalidated in the background
+            revalidated: Entry was just confirmed unchanged (HTTP 304)
+        """
+        import time
+        abs_markdown_path = str(self.workspace_path / index_entry["markdown_path"])
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        return {
+            "success": True,
+            "url": url,
+            "from_cache": True,
+            "title": post.metadata.get("title", ""),
+            "body": f"[Markdown content saved to {abs_markdown_path}]",
+            "word_count": post.metadata.get("word_count", 0),
+            "metadata": {
+                "markdown_path": abs_markdown_path,
+                "images_dir": str(self.workspace_path / index_entry["images_dir"]),
+                "fetched_at": index_entry["fetched_at"],
+                "response_time_ms": elapsed_ms,
+                "cache_hit": True,
+                "stale": stale,
+                "revalidated": revalidated,
+            },
+        }
+    
+    def _schedule_revalidation(
+        self,
+        url: str,
+        index_entry: dict,
+        max_images: int,
+        extract_tables: bool,
+        timeout: int,
+    ) -> None:
+        """Revalidate a stale entry in the background (one task per URL)."""
+        if url in self._revalidations or not self._validate_url(url):
+            return
+        
+        async def revalidate() -> None:
+            import time
+            try:
+                result = await self._fetch_and_store(
+                    url, max_images, extract_tables, timeout, time.time(), index_entry
+                )
+                if not result.get("success"):
+                    logger.warning(f"Background revalidation failed for {url}: {result.get('error')}")
+            except Exception as e:
+                logger.warning(f"Background revalidation failed for {url}: {e}")
+            finally:
+                self._revalidations.pop(url, None)
+        
+        self._revalidations[url] = asyncio.create_task(revalidate())
+    
+    async def _fetch_and_store(
+        self,
+        url: str,
+        max_images: int,
+        extract_tables: bool,
+        timeout: int,
+        start_time: float,
+        index_entry: Optional[dict] = None,
+    ) -> dict:
+        """Fetch, extract and store a URL.
+        
+        With a cached index_entry the request is conditional on its ETag /
+        Last-Modified; a 304 response keeps the stored Markdown and only
+        extends the entry's TTL.
+        
+        Args:
+            url: URL to fetch
+            max_images: Maximum images
+            extract_tables: Extract tables flag
+            timeout: Timeout
+            start_time: Request start (time.time())
+            index_entry: Cached entry to revalidate, if any
+            
+        Returns:
+            Result dictionary
+        """
+        import time
+        ttl_hours = self._cache_config.cache_ttl_hours
+        
+        conditional_headers = {}
+        if index_entry:
+            if index_entry.get("etag"):
+                conditional_headers["If-None-Match"] = index_entry["etag"]
+            if index_entry.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = index_entry["last_modified"]
+        
+        # Step 3: HTTP request (body capped so huge pages cannot starve the server)
+        extraction_pool = self.extraction_pool
         try:
-            response = await self._http_client.fetch(url, timeout=timeout)
-            html_content = response.text
+            response = await self._http_client.fetch(
+                url,
+                timeout=timeout,
+                headers=conditional_headers or None,
+                max_bytes=extraction_pool.max_document_bytes,
+            )
         except Exception as e:
             logger.error(f"HTTP request failed: {e}")
             return {
@@ -289,16 +431,40 @@ class FetchWebContentTool(BaseTool):
                 "error": f"HTTP request failed: {str(e)}",
             }
         
-        # Step 4: Parse HTML
-        soup = self._html_parser.parse(html_content)
-        soup = self._html_parser.remove_unwanted_tags(soup)
+        if response.status_code == 304 and index_entry:
+            post = self._markdown_storage.read_markdown_file(
+                str(self.workspace_path / index_entry["markdown_path"])
+            )
+            if post is not None:
+                await self._sqlite_index.refresh_index(
+                    url,
+                    ttl_hours=ttl_hours,
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                )
+                logger.info(f"Revalidated cached content for {url}")
+                return self._cached_result(url, index_entry, post, start_time, revalidated=True)
+            # Stored file vanished; fetch the full page
+            return await self._fetch_and_store(
+                url, max_images, extract_tables, timeout, start_time
+            )
+        
+        html_content = response.text
         
-        # Step 5: Extract content
-        title = self._html_parser.get_title(soup)
-        body_html = self._extractor.extract_body(soup)
-        images = self._extractor.extract_images(soup, max_images=max_images)
-        tables = self._extractor.extract_tables(soup) if extract_tables else []
-        language = self._html_parser.get_language(soup)
+        # Step 4-5: Parse HTML and extract content in a worker
+        try:
+            page = await extraction_pool.extract(html_content, max_images, extract_tables)
+        except ExtractionTimeoutError as e:
+            return {
+                "success": False,
+                "url": url,
+                "error": str(e),
+            }
+        title = page.title
+        body_html = page.body_html
+        images = page.images
+        tables = page.tables
+        language = page.language
         
         # Step 6: Save to Markdown files
         try:
@@ -309,22 +475,33 @@ class FetchWebContentTool(BaseTool):
                 images=images,
                 tables=tables,
                 metadata={"status_code": response.status_code},
+                markdown_body=page.markdown_body,
+                revalidate_images=index_entry is not None,
             )
             
             # Convert to absolute paths for consistency
             markdown_path = str(self.workspace_path / rel_markdown_path)
             images_dir = str(self.workspace_path / rel_images_dir)
             
-            # Add to SQLite index (72h TTL) with absolute paths
-            await self._sqlite_index.add_index(
+            # Add to SQLite index with validators for later revalidation
+            content_bytes = await asyncio.to_thread(
+                self._markdown_storage.content_size, rel_markdown_path, rel_images_dir
+            )
+            released = await self._sqlite_index.add_index(
                 url=url,
                 markdown_path=rel_markdown_path,  # Store relative path in index
                 images_dir=rel_images_dir,
                 title=title,
                 word_count=len(body_html.split()),
                 language=language,
-                ttl_hours=72,
+                ttl_hours=ttl_hours,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                content_bytes=content_bytes,
             )
+            # Delete files of evicted or replaced entries
+            if released:
+                await asyncio.to_thread(self._release_entries, released)
             
             logger.info(f"Saved to {markdown_path}")
             
@@ -356,6 +533,7 @@ class FetchWebContentTool(BaseTool):
                 "images_count": len(images),
                 "tables_count": len(tables),
                 "cache_hit": False,
+                "truncated": response.extensions.get("truncated", False),
             },
         }
     
@@ -369,6 +547,10 @@ class FetchWebContentTool(BaseTool):
     ) -> dict:
         """Fetch multiple URLs concurrently.
         
+        Requests go through the shared HTTP client pool, so URLs on the
+        same host reuse its keep-alive connections and are limited by the
+        pool's per-host cap.
+        
         Args:
             urls: List of URLs
             max_images: Maximum images per URL
@@ -29,6 +29,10 @@ class ReadFileTool(BaseTool):
     def name(self) -> str:
         return "read_file"
     
+    @property
+    def is_idempotent(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
         return "Read the contents of a file. Use this when you need to see what's in a file. Returns the file content as text."
@@ -188,6 +192,10 @@ class ListDirTool(BaseTool):
     def name(self) -> str:
         return "list_dir"
     
+    @property
+    def is_idempotent(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
         return "List the contents of a directory. Shows files and subdirectories. Use this to explore the file system."
@@ -271,6 +279,10 @@ class SearchFilesTool(BaseTool):
     def name(self) -> str:
         return "search_files"
     
+    @property
+    def is_idempotent(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
         return "Search for files by name or pattern. Supports glob patterns like '*.py' or 'test_*'. Returns matching file paths."
@@ -3,16 +3,36 @@
 This package provides tools for fetching and analyzing web content.
 """
 
-from .http_client import HTTPClient
+from .http_client import (
+    HTTPClient,
+    HTTPClientPool,
+    close_http_client_pool,
+    get_http_client_pool,
+    init_http_client_pool,
+)
 from .html_parser import HTMLParser
 from .content_extractor import ContentExtractor
+from .extraction import ExtractedPage, ExtractionPool, extract_page
 from .markdown_storage import MarkdownStorageManager
-from .sqlite_index import SQLiteIndexManager
+from .sqlite_index import (
+    SQLiteIndexManager,
+    close_sqlite_index_manager,
+    get_sqlite_index_manager,
+)
 
 __all__ = [
     "HTTPClient",
+    "HTTPClientPool",
+    "get_http_client_pool",
+    "init_http_client_pool",
+    "close_http_client_pool",
     "HTMLParser", 
     "ContentExtractor",
+    "ExtractedPage",
+    "ExtractionPool",
+    "extract_page",
     "MarkdownStorageManager",
     "SQLiteIndexManager",
+    "get_sqlite_index_manager",
+    "close_sqlite_index_manager",
 ]
@@ -0,0 +1,281 @@
+"""Off-loop extraction pipeline for fetched web pages.
+
+Provides:
+- extract_page: parse, clean and extract a page in one CPU-bound call
+- ExtractionPool: runs extract_page in a process or thread pool with a
+  per-document time budget and a document size cap
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import multiprocessing
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Literal
+
+from src.utils.logger import get_logger
+
+from .content_extractor import ContentExtractor
+from .html_parser import HTMLParser
+from .markdown_storage import html_to_markdown
+
+logger = get_logger(__name__)
+
+ExtractionMode = Literal["process", "thread"]
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when a document exceeds its extraction time budget."""
+
+
+@dataclass
+class ExtractedPage:
+    """Content extracted from one HTML document."""
+    title: str
+    body_html: str
+    markdown_body: str
+    language: str | None
+    images: list[dict] = field(default_factory=list)
+    tables: list[dict] = field(default_factory=list)
+
+
+@lru_cache(maxsize=1)
+def _components() -> tuple[HTMLParser, ContentExtractor]:
+    """Parser and extractor, created once per worker process."""
+    return HTMLParser(), ContentExtractor()
+
+
+def extract_page(html_content: str, max_images: int, extract_tables: bool) -> ExtractedPage:
+    """Parse a page and extract its content (CPU-bound, runs in a worker).
+
+    Args:
+        html_content: Raw HTML
+        max_images: Maximum images to extract
+        extract_tables: Whether to extract tables
+
+    Returns:
+        Extracted page content
+    """
+    html_parser, extractor = _components()
+    soup = html_parser.parse(html_content)
+    soup = html_parser.remove_unwanted_tags(soup)
+
+    title = html_parser.get_title(soup)
+    body_html = extractor.extract_body(soup)
+    images = extractor.extract_images(soup, max_images=max_images)
+    tables = extractor.extract_tables(soup) if extract_tables else []
+    language = html_parser.get_language(soup)
+
+    return ExtractedPage(
+        title=title,
+        body_html=body_html,
+        markdown_body=html_to_markdown(body_html),
+        language=language,
+        images=images,
+        tables=tables,
+    )
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    """Start method for worker processes.
+
+    Forking the server would copy its threads and held locks into the
+    worker, so use forkserver (spawn where unavailable). The forkserver
+    preloads this module so replacement workers start without
+    re-importing the parser stack.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+class ExtractionPool:
+    """Run page extraction off the event loop.
+
+    Parsing a multi-megabyte page takes hundreds of milliseconds of CPU;
+    running it in a worker keeps other sessions responsive. In "process"
+    mode extraction also escapes the GIL. Documents larger than
+    ``max_document_bytes`` should be truncated before extraction (see
+    HTTPClient.fetch) and each one gets ``time_budget`` seconds.
+
+    At most ``workers`` documents are submitted at once, so the budget
+    starts when a worker picks the document up rather than counting time
+    spent queued behind other documents.
+
+    In process mode a document over budget has its pool's worker
+    processes killed and the pool replaced; documents that were running
+    alongside it are retried once on the new pool. Threads cannot be
+    interrupted, so in thread mode the budget only bounds how long the
+    caller waits: the over-budget parse keeps its thread, and its slot,
+    busy until it finishes.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        mode: ExtractionMode = "process",
+        time_budget: float = 15.0,
+        max_document_bytes: int = 5 * 1024 * 1024,
+    ):
+        """Initialize the pool (workers start on first use).
+
+        Args:
+            workers: Number of worker processes/threads
+            mode: "process" or "thread"
+            time_budget: Seconds allowed per document
+            max_document_bytes: Maximum response body size to extract
+        """
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.time_budget = time_budget
+        self.max_document_bytes = max_document_bytes
+        self._executor: concurrent.futures.Executor | None = None
+        self._slots = asyncio.Semaphore(self.workers)
+
+        self.documents = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=_process_context()
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="web-extract"
+                )
+        return self._executor
+
+    async def extract(self, html_content: str, max_images: int, extract_tables: bool) -> ExtractedPage:
+        """Extract a page in a worker.
+
+        Args:
+            html_content: Raw HTML
+            max_images: Maximum images to extract
+            extract_tables: Whether to extract tables
+
+        Returns:
+            Extracted page content
+
+        Raises:
+            ExtractionTimeoutError: If extraction exceeds the time budget
+        """
+        self.documents += 1
+        try:
+            return await self._extract_once(html_content, max_images, extract_tables)
+        except concurrent.futures.BrokenExecutor:
+            # A worker died or the pool was terminated for another
+            # document's budget; retry once on a fresh pool
+            return await self._extract_once(html_content, max_images, extract_tables)
+
+    async def _extract_once(self, html_content: str, max_images: int, extract_tables: bool) -> ExtractedPage:
+        """Run one extraction attempt under the time budget."""
+        loop = asyncio.get_running_loop()
+        # Wait for a free worker before the budget starts; the slot is
+        # released when the worker is done, not when the caller gives up
+        await self._slots.acquire()
+        executor = self._get_executor()
+        try:
+            try:
+                task = executor.submit(extract_page, html_content, max_images, extract_tables)
+            except BaseException:
+                self._slots.release()
+                raise
+            task.add_done_callback(lambda _: self._release_slot(loop))
+            return await asyncio.wait_for(asyncio.wrap_future(task), timeout=self.time_budget)
+        except TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                "HTML extraction exceeded time budget",
+                extra={"time_budget": self.time_budget, "html_chars": len(html_content)},
+            )
+            if self.mode == "process":
+                self._replace_executor(executor, terminate=True)
+            raise ExtractionTimeoutError(
+                f"HTML extraction exceeded {self.time_budget}s time budget"
+            ) from None
+        except concurrent.futures.BrokenExecutor:
+            self._replace_executor(executor)
+            raise
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Free a worker slot (called from the executor's thread)."""
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(self._slots.release)
+
+    def _replace_executor(
+        self,
+        executor: concurrent.futures.Executor | None = None,
+        terminate: bool = False,
+    ) -> None:
+        """Drop a pool (the current one by default) so the next call starts a new one.
+
+        Args:
+            executor: Pool to drop; ignored if it was already replaced
+            terminate: Kill the pool's worker processes instead of letting
+                busy ones run to completion
+        """
+        if executor is None:
+            executor = self._executor
+        if executor is None:
+            return
+        if executor is self._executor:
+            self._executor = None
+        if terminate and isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            # shutdown() cannot stop a running task; kill the workers first
+            for process in list((executor._processes or {}).values()):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """Shut down the workers."""
+        self._replace_executor(terminate=True)
+
+    def get_stats(self) -> dict:
+        """Get pool counters."""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "documents": self.documents,
+            "timeouts": self.timeouts,
+            "time_budget": self.time_budget,
+            "max_document_bytes": self.max_document_bytes,
+        }
+
+
+# Global extraction pool
+_extraction_pool: ExtractionPool | None = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Get the shared extraction pool (created with defaults if needed)."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool()
+    return _extraction_pool
+
+
+def init_extraction_pool(**kwargs) -> ExtractionPool:
+    """Create the shared extraction pool with the given settings.
+
+    Args:
+        **kwargs: ExtractionPool arguments
+
+    Returns:
+        The new pool
+    """
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.close()
+    _extraction_pool = ExtractionPool(**kwargs)
+    return _extraction_pool
+
+
+def close_extraction_pool() -> None:
+    """Shut down the shared extraction pool."""
+    if _extraction_pool is not None:
+        _extraction_pool.close()
@@ -6,15 +6,184 @@ Provides async HTTP request capabilities with:
 - Auto redirect
 - SSL verification
 - Anti-bot headers (referers, accept, etc.)
+- A shared keep-alive connection pool (optional HTTP/2, per-host caps)
 """
 
+import asyncio
+import hashlib
+import http.cookiejar
 import httpx
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 import random
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Chunk size for streamed downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes returned by download_to_file (enough for magic-number checks)
+DOWNLOAD_HEAD_BYTES = 16
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class _HostSlots:
+    """Concurrency cap for one host, dropped when no request uses it."""
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
+def _no_cookie_jar() -> http.cookiejar.CookieJar:
+    """Cookie jar that refuses to store or send any cookie."""
+    return http.cookiejar.CookieJar(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+
+class HTTPClientPool:
+    """Shared, long-lived httpx clients for web fetching.
+    
+    One AsyncClient per SSL-verification mode is kept open, so repeated
+    requests to a host reuse its keep-alive (or HTTP/2) connection instead
+    of paying DNS, TCP and TLS setup every time. Total connections are
+    capped by httpx's pool limits and concurrent requests per host by a
+    semaphore. The clients store no cookies, so nothing set by one site
+    visit leaks into later fetches of other sessions.
+    
+    The clients are closed by close() (the app does this on shutdown).
+    """
+    
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_per_host: int = 6,
+        http2: bool = False,
+        max_redirects: int = 5,
+    ):
+        """Initialize the pool (clients are created on first use).
+        
+        Args:
+            max_connections: Maximum open connections across all hosts
+            max_keepalive_connections: Maximum idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept
+            max_per_host: Maximum concurrent requests to one host
+            http2: Negotiate HTTP/2 where supported (needs the h2 package)
+            max_redirects: Maximum number of redirects to follow
+        """
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+            http2 = False
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_per_host = max(1, max_per_host)
+        self.http2 = http2
+        self.max_redirects = max_redirects
+        self._clients: dict[bool, httpx.AsyncClient] = {}
+        self._hosts: dict[str, _HostSlots] = {}
+        self.requests = 0
+        self.clients_created = 0
+    
+    def client(self, verify: bool = True) -> httpx.AsyncClient:
+        """Get the shared client for an SSL-verification mode."""
+        client = self._clients.get(verify)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                cookies=_no_cookie_jar(),
+                limits=self.limits,
+                max_redirects=self.max_redirects,
+                verify=verify,
+                http2=self.http2,
+            )
+            self._clients[verify] = client
+            self.clients_created += 1
+        return client
+    
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the per-host request slots for ``url``'s host."""
+        host = urlsplit(url).netloc.lower()
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = _HostSlots(asyncio.Semaphore(self.max_per_host))
+        slots.users += 1
+        try:
+            async with slots.semaphore:
+                self.requests += 1
+                yield
+        finally:
+            slots.users -= 1
+            if slots.users == 0 and self._hosts.get(host) is slots:
+                del self._hosts[host]
+    
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Failed to close pooled HTTP client: {e}")
+    
+    def get_stats(self) -> dict:
+        """Get pool counters."""
+        return {
+            "requests": self.requests,
+            "clients_created": self.clients_created,
+            "open_clients": sum(1 for c in self._clients.values() if not c.is_closed),
+            "active_hosts": len(self._hosts),
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_per_host": self.max_per_host,
+        }
+
+
+# Global client pool
+_client_pool: HTTPClientPool | None = None
+
+
+def get_http_client_pool() -> HTTPClientPool:
+    """Get the shared HTTP client pool (created with defaults if needed)."""
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = HTTPClientPool()
+    return _client_pool
+
+
+def init_http_client_pool(**kwargs) -> HTTPClientPool:
+    """Create the shared HTTP client pool with the given settings.
+    
+    Args:
+        **kwargs: HTTPClientPool arguments
+        
+    Returns:
+        The new pool
+    """
+    global _client_pool
+    _client_pool = HTTPClientPool(**kwargs)
+    return _client_pool
+
+
+async def close_http_client_pool() -> None:
+    """Close the shared HTTP client pool."""
+    if _client_pool is not None:
+        await _client_pool.close()
+
 
 class HTTPClient:
     """Async HTTP client for web fetching with anti-bot capabilities."""
@@ -39,19 +208,23 @@ class HTTPClient:
         max_redirects: int = 5,
         verify_ssl: bool = True,
         rotate_user_agent: bool = True,
+        pool: Optional[HTTPClientPool] = None,
     ):
         """Initialize HTTP client.
         
         Args:
             timeout: Request timeout in seconds
-            max_redirects: Maximum number of redirects to follow
+            max_redirects: Maximum number of redirects to follow (pooled
+                requests use the pool's setting)
             verify_ssl: Whether to verify SSL certificates
             rotate_user_agent: Whether to rotate User-Agent for each request
+            pool: Connection pool to use (default: the shared pool)
         """
         self.timeout = timeout
         self.max_redirects = max_redirects
         self.verify_ssl = verify_ssl
         self.rotate_user_agent = rotate_user_agent
+        self._pool = pool
         
         logger.info(
             "HTTPClient initialized with anti-bot features",
@@ -63,6 +236,11 @@ class HTTPClient:
             }
         )
     
+    @property
+    def pool(self) -> HTTPClientPool:
+        """Connection pool used for requests."""
+        return self._pool or get_http_client_pool()
+    
     def _get_user_agent(self) -> str:
         """Get a random or default User-Agent.
         
@@ -107,6 +285,7 @@ class HTTPClient:
         timeout: Optional[int] = None,
         headers: Optional[dict] = None,
         user_agent: Optional[str] = None,
+        max_bytes: Optional[int] = None,
     ) -> httpx.Response:
         """Fetch URL content.
         
@@ -115,9 +294,11 @@ class HTTPClient:
             timeout: Override default timeout
             headers: Custom headers
             user_agent: Custom User-Agent
+            max_bytes: Stop reading the body after this many (decoded)
+                bytes; a truncated response has ``extensions["truncated"]``
             
         Returns:
-            HTTP response
+            HTTP response (304 Not Modified is returned, not raised)
             
         Raises:
             httpx.HTTPError: On request failure
@@ -132,24 +313,77 @@ class HTTPClient:
             extra={"url": url, "timeout": effective_timeout}
         )
         
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(effective_timeout),
-            max_redirects=self.max_redirects,
-            verify=self.verify_ssl,
-        ) as client:
-            response = await client.get(url, headers=request_headers)
+        pool = self.pool
+        async with pool.host_slot(url):
+            client = pool.client(self.verify_ssl)
+            if max_bytes is None:
+                response = await client.get(
+                    url,
+                    headers=request_headers,
+                    timeout=httpx.Timeout(effective_timeout),
+                )
+            else:
+                response = await self._get_capped(
+                    client, url, request_headers, httpx.Timeout(effective_timeout), max_bytes
+                )
+        # 304 answers a conditional request (If-None-Match / If-Modified-Since)
+        if response.status_code != httpx.codes.NOT_MODIFIED:
             response.raise_for_status()
-            
-            logger.info(
-                "URL fetched successfully",
-                extra={
-                    "url": url,
-                    "status_code": response.status_code,
-                    "content_length": len(response.content),
-                }
+        
+        logger.info(
+            "URL fetched successfully",
+            extra={
+                "url": url,
+                "status_code": response.status_code,
+                "content_length": len(response.content),
+                "http_version": response.http_version,
+            }
+        )
+        
+        return response
+    
+    async def _get_capped(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict,
+        timeout: httpx.Timeout,
+        max_bytes: int,
+    ) -> httpx.Response:
+        """GET a URL, reading at most ``max_bytes`` of the body.
+        
+        Returns:
+            A response holding the (possibly truncated) decoded body
+        """
+        async with client.stream("GET", url, headers=headers, timeout=timeout) as streamed:
+            chunks: list[bytes] = []
+            size = 0
+            truncated = False
+            async for chunk in streamed.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    truncated = size > max_bytes
+                    break
+            body = b"".join(chunks)[:max_bytes]
+        
+        if truncated:
+            logger.warning(
+                "Response body truncated",
+                extra={"url": url, "max_bytes": max_bytes}
             )
-            
-            return response
+        # The body is already decoded, so drop the transfer headers
+        response_headers = [
+            (k, v) for k, v in streamed.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            status_code=streamed.status_code,
+            headers=response_headers,
+            content=body,
+            request=streamed.request,
+            extensions={**streamed.extensions, "truncated": truncated},
+        )
     
     async def download(
         self,
@@ -171,10 +405,11 @@ class HTTPClient:
                 logger.debug(f"Invalid URL format (skipping): {url}")
                 return b""
             
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.content
+            pool = self.pool
+            async with pool.host_slot(url):
+                response = await pool.client().get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.content
         except httpx.RequestError as e:
             # Network error, DNS failure, etc.
             logger.debug(f"Download failed (network error): {url} - {type(e).__name__}")
@@ -183,3 +418,69 @@ class HTTPClient:
             # Other errors
             logger.debug(f"Download failed: {url} - {type(e).__name__}: {str(e)[:100]}")
             return b""
+    
+    async def download_to_file(
+        self,
+        url: str,
+        directory: Path,
+        max_bytes: int,
+        timeout: int = 10,
+    ) -> Optional[tuple[Path, str, bytes]]:
+        """Stream binary content (for images) into a temporary file.
+        
+        The body is hashed while it streams and written in chunks from a
+        worker thread, so large downloads neither sit in memory nor block
+        the event loop. Downloads larger than ``max_bytes`` are abandoned.
+        
+        Args:
+            url: URL to download
+            directory: Directory for the temporary file
+            max_bytes: Maximum body size
+            timeout: Download timeout
+            
+        Returns:
+            (temporary file path, SHA-256 hex digest, leading bytes), or
+            None if the download failed, was empty or was too large
+        """
+        if not url.startswith(('http://', 'https://')):
+            logger.debug(f"Invalid URL format (skipping): {url}")
+            return None
+        
+        pool = self.pool
+        tmp_path: Optional[Path] = None
+        try:
+            async with (
+                pool.host_slot(url),
+                pool.client().stream("GET", url, timeout=timeout) as response,
+            ):
+                response.raise_for_status()
+                length = response.headers.get("content-length", "")
+                if length.isdigit() and int(length) > max_bytes:
+                    logger.debug(f"Download skipped (too large): {url} - {length} bytes")
+                    return None
+                
+                fd, name = await asyncio.to_thread(tempfile.mkstemp, suffix=".part", dir=directory)
+                tmp_path = Path(name)
+                digest = hashlib.sha256()
+                head = b""
+                size = 0
+                with os.fdopen(fd, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_bytes:
+                            logger.debug(f"Download aborted (too large): {url} - over {max_bytes} bytes")
+                            break
+                        if len(head) < DOWNLOAD_HEAD_BYTES:
+                            head += chunk[:DOWNLOAD_HEAD_BYTES - len(head)]
+                        digest.update(chunk)
+                        await asyncio.to_thread(f.write, chunk)
+            
+            if size == 0 or size > max_bytes:
+                await asyncio.to_thread(tmp_path.unlink, True)
+                return None
+            return tmp_path, digest.hexdigest(), head
+        except Exception as e:
+            if tmp_path is not None:
+                await asyncio.to_thread(tmp_path.unlink, True)
+            logger.debug(f"Download failed: {url} - {type(e).__name__}: {str(e)[:100]}")
+            return None
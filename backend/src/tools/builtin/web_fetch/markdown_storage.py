@@ -3,33 +3,104 @@
 Manages Markdown files and images for web content.
 Stores content in workspace/web_content/{date}/{url_hash}.md
 Images stored in workspace/web_content/{date}/images/{url_hash}/
+
+Image bytes live once in a content-addressed store
+(workspace/web_content/image_store/{sha[:2]}/{sha}.{ext}); the per-page
+files are hard links to it (copies where links are not supported).
 """
 
+import asyncio
 import hashlib
-import re
+import os
+import shutil
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import frontmatter
 from src.utils.logger import get_logger
+from .http_client import HTTPClient
 
 logger = get_logger(__name__)
 
+# Concurrent image downloads per page
+IMAGE_DOWNLOAD_CONCURRENCY = 6
+
+# Images larger than this are not downloaded
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+
+# Image URLs remembered for cross-page dedupe
+MAX_KNOWN_IMAGE_URLS = 4096
+
+# Store files younger than this are never pruned
+STORE_PRUNE_GRACE_SECONDS = 3600
+
+# How long a downloaded image URL is reused before it is fetched again
+IMAGE_TTL_SECONDS = 72 * 3600
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert HTML to Markdown.
+    
+    Args:
+        html: HTML string
+        
+    Returns:
+        Markdown string
+    """
+    try:
+        import html2text
+        h = html2text.HTML2Text()
+        h.body_width = 0  # Don't wrap text
+        h.ignore_links = False
+        h.ignore_images = False
+        h.ignore_tables = True  # We handle tables separately
+        return h.handle(html)
+    except ImportError:
+        logger.warning("html2text not installed, using fallback")
+        # Simple fallback: just return HTML
+        return html
+
 
 class MarkdownStorageManager:
     """Manage Markdown files and images for web content."""
     
-    def __init__(self, workspace_path: str):
+    def __init__(
+        self,
+        workspace_path: str,
+        http_client: Optional[HTTPClient] = None,
+        image_concurrency: int = IMAGE_DOWNLOAD_CONCURRENCY,
+        max_image_bytes: int = MAX_IMAGE_BYTES,
+        image_ttl_seconds: float = IMAGE_TTL_SECONDS,
+    ):
         """Initialize storage manager.
         
         Args:
             workspace_path: Path to workspace directory
+            http_client: HTTP client for image downloads
+            image_concurrency: Maximum concurrent image downloads per page
+            max_image_bytes: Maximum size of a downloaded image
+            image_ttl_seconds: How long a downloaded image URL is reused
+                across pages (normally the page cache TTL)
         """
         self.workspace_path = Path(workspace_path)
         self.web_content_dir = self.workspace_path / "web_content"
+        self.image_store_dir = self.web_content_dir / "image_store"
+        self._http_client = http_client or HTTPClient()
+        self.image_concurrency = max(1, image_concurrency)
+        self.max_image_bytes = max_image_bytes
+        self.image_ttl_seconds = image_ttl_seconds
+        
+        # Image URL -> (stored file, reuse deadline), so pages sharing an
+        # image skip the download while it is fresh
+        self._known_images: OrderedDict[str, tuple[Path, float]] = OrderedDict()
+        self.images_downloaded = 0
+        self.images_reused = 0
         
-        # Ensure base directory exists
+        # Ensure base directories exist
         self.web_content_dir.mkdir(parents=True, exist_ok=True)
+        self.image_store_dir.mkdir(parents=True, exist_ok=True)
         
         logger.info(
             "MarkdownStorageManager initialized",
@@ -53,6 +124,8 @@ class MarkdownStorageManager:
         images: list[dict],
         tables: list[dict],
         metadata: dict,
+        markdown_body: Optional[str] = None,
+        revalidate_images: bool = False,
     ) -> tuple[str, str]:
         """Save content to Markdown file and download images.
         
@@ -63,6 +136,10 @@ class MarkdownStorageManager:
             images: List of image info dicts
             tables: List of table data dicts
             metadata: Additional metadata
+            markdown_body: body_html already converted to Markdown
+                (converted here if omitted)
+            revalidate_images: Download every image again instead of
+                reusing known URLs (the page itself was found modified)
             
         Returns:
             Tuple of (markdown_path, images_dir) relative paths
@@ -77,47 +154,15 @@ class MarkdownStorageManager:
         images_dir.mkdir(parents=True, exist_ok=True)
         
         # Download and save images
-        image_mapping = {}  # original_url -> local_path
-        for i, img in enumerate(images):
-            try:
-                img_url = img.get("url")
-                if not img_url:
-                    continue
-                
-                # Download image
-                from .http_client import HTTPClient
-                http_client = HTTPClient()
-                img_data = await http_client.download(img_url)
-                
-                if not img_data:
-                    continue
-                
-                # Determine extension
-                ext = self._guess_image_extension(img_data)
-                filename = f"img{i+1:03d}.{ext}"
-                local_path = images_dir / filename
-                
-                # Save image
-                with open(local_path, "wb") as f:
-                    f.write(img_data)
-                
-                # Map original URL to relative path
-                rel_path = f"./images/{url_hash}/{filename}"
-                image_mapping[img_url] = rel_path
-                
-                logger.debug(f"Downloaded image {i+1}: {filename}")
-                
-            except Exception as e:
-                logger.warning(f"Failed to download image {img.get('url')}: {e}")
+        image_mapping = await self._save_images(images, images_dir, url_hash, revalidate_images)
         
         # Convert HTML to Markdown
-        markdown_body = self._html_to_markdown(body_html)
+        if markdown_body is None:
+            markdown_body = self._html_to_markdown(body_html)
         
         # Replace image URLs with local paths
         for orig_url, local_path in image_mapping.items():
-            # Escape special characters in URLs for regex
-            escaped_url = re.escape(orig_url)
-            markdown_body = re.sub(escaped_url, local_path, markdown_body)
+            markdown_body = markdown_body.replace(orig_url, local_path)
         
         # Add tables as Markdown
         if tables:
@@ -147,8 +192,7 @@ class MarkdownStorageManager:
         
         # Save Markdown file
         md_file_path = date_dir / f"{url_hash}.md"
-        with open(md_file_path, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        await asyncio.to_thread(md_file_path.write_text, frontmatter.dumps(post), encoding="utf-8")
         
         # Return relative paths
         rel_md_path = str(md_file_path.relative_to(self.workspace_path))
@@ -165,27 +209,136 @@ class MarkdownStorageManager:
         
         return rel_md_path, rel_img_dir
     
-    def _html_to_markdown(self, html: str) -> str:
-        """Convert HTML to Markdown.
+    async def _save_images(
+        self,
+        images: list[dict],
+        images_dir: Path,
+        url_hash: str,
+        revalidate: bool = False,
+    ) -> dict[str, str]:
+        """Download a page's images concurrently into its images directory.
+        
+        Args:
+            images: List of image info dicts
+            images_dir: Per-page images directory
+            url_hash: Page URL hash (images_dir name)
+            revalidate: Ignore known image URLs and download again
+            
+        Returns:
+            Mapping of original image URL to path relative to the Markdown file
+        """
+        # First position of each distinct URL keeps the imgNNN numbering
+        positions: dict[str, int] = {}
+        for i, img in enumerate(images):
+            img_url = img.get("url")
+            if img_url and img_url not in positions:
+                positions[img_url] = i
+        
+        semaphore = asyncio.Semaphore(self.image_concurrency)
+        
+        async def save(img_url: str, i: int) -> Optional[tuple[str, str]]:
+            try:
+                async with semaphore:
+                    stored = await self._store_image(img_url, revalidate)
+                if stored is None:
+                    return None
+                filename = f"img{i+1:03d}{stored.suffix}"
+                await asyncio.to_thread(self._link_image, stored, images_dir / filename)
+                logger.debug(f"Saved image {i+1}: {filename}")
+                return img_url, f"./images/{url_hash}/{filename}"
+            except Exception as e:
+                logger.warning(f"Failed to download image {img_url}: {e}")
+                return None
+        
+        results = await asyncio.gather(*(save(img_url, i) for img_url, i in positions.items()))
+        return dict(r for r in results if r)
+    
+    async def _store_image(self, img_url: str, revalidate: bool = False) -> Optional[Path]:
+        """Get an image into the content-addressed store.
+        
+        A URL downloaded within image_ttl_seconds is reused without a
+        request; after that (or with revalidate) it is downloaded again, so
+        an image replaced at the same URL is picked up. Unchanged bytes
+        still map to the same store file.
         
         Args:
-            html: HTML string
+            img_url: Image URL
+            revalidate: Download even if the URL is known and fresh
             
         Returns:
-            Markdown string
+            Path of the stored image, or None if it could not be downloaded
         """
+        known = self._known_images.get(img_url)
+        if known is not None and not revalidate:
+            stored, reuse_until = known
+            if time.monotonic() < reuse_until and stored.exists():
+                self._known_images.move_to_end(img_url)
+                self.images_reused += 1
+                return stored
+        
+        downloaded = await self._http_client.download_to_file(
+            img_url, self.image_store_dir, max_bytes=self.max_image_bytes
+        )
+        if downloaded is None:
+            return None
+        tmp_path, digest, head = downloaded
+        
+        ext = self._guess_image_extension(head)
+        stored = self.image_store_dir / digest[:2] / f"{digest}.{ext}"
+        await asyncio.to_thread(self._commit_image, tmp_path, stored)
+        self.images_downloaded += 1
+        
+        self._known_images[img_url] = (stored, time.monotonic() + self.image_ttl_seconds)
+        self._known_images.move_to_end(img_url)
+        if len(self._known_images) > MAX_KNOWN_IMAGE_URLS:
+            self._known_images.popitem(last=False)
+        return stored
+    
+    @staticmethod
+    def _commit_image(tmp_path: Path, stored: Path) -> None:
+        """Move a downloaded file into the store unless identical bytes exist."""
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        if stored.exists():
+            tmp_path.unlink(missing_ok=True)
+        else:
+            os.replace(tmp_path, stored)
+    
+    @staticmethod
+    def _link_image(stored: Path, target: Path) -> None:
+        """Expose a stored image at a page path (hard link, else copy)."""
+        target.unlink(missing_ok=True)
         try:
-            import html2text
-            h = html2text.HTML2Text()
-            h.body_width = 0  # Don't wrap text
-            h.ignore_links = False
-            h.ignore_images = False
-            h.ignore_tables = True  # We handle tables separately
-            return h.handle(html)
-        except ImportError:
-            logger.warning("html2text not installed, using fallback")
-            # Simple fallback: just return HTML
-            return html
+            os.link(stored, target)
+        except OSError:
+            shutil.copyfile(stored, target)
+    
+    def _prune_image_store(self) -> int:
+        """Delete stored images no page links to and leftover partial downloads.
+        
+        Returns:
+            Number of files deleted
+        """
+        removed = 0
+        # Files touched recently may belong to a download still in progress
+        horizon = time.time() - STORE_PRUNE_GRACE_SECONDS
+        for path in self.image_store_dir.rglob("*"):
+            if not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+                if stat.st_mtime > horizon:
+                    continue
+                # st_nlink == 1: only the store references the file
+                if path.suffix == ".part" or stat.st_nlink <= 1:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+    
+    def _html_to_markdown(self, html: str) -> str:
+        """Convert HTML to Markdown (see html_to_markdown)."""
+        return html_to_markdown(html)
     
     def _guess_image_extension(self, data: bytes) -> str:
         """Guess image file extension from magic bytes.
@@ -243,7 +396,6 @@ class MarkdownStorageManager:
         Args:
             days_old: Delete files older than this many days
         """
-        import shutil
         from datetime import timedelta
         
         cutoff_date = datetime.now() - timedelta(days=days_old)
@@ -272,7 +424,58 @@ class MarkdownStorageManager:
             except Exception as e:
                 logger.warning(f"Failed to cleanup {date_dir}: {e}")
         
-        logger.info(f"Cleaned up {cleaned_count} old directories")
+        # Stored images whose pages were all removed
+        pruned_images = await asyncio.to_thread(self._prune_image_store)
+        
+        logger.info(f"Cleaned up {cleaned_count} old directories, {pruned_images} unused images")
+    
+    def content_size(self, markdown_path: str, images_dir: str) -> int:
+        """Bytes a page adds to the cache: its Markdown file and new images.
+        
+        Each stored image is counted once across all pages: a hard link to
+        a store file that another page already links to (st_nlink > 2)
+        adds nothing, and files linked twice from one page count once.
+        Copies made where links are unsupported count in full.
+        
+        Args:
+            markdown_path: Markdown file path relative to the workspace
+            images_dir: Images directory relative to the workspace
+        """
+        total = 0
+        md_file = self.workspace_path / markdown_path
+        if md_file.is_file():
+            total += md_file.stat().st_size
+        img_dir = self.workspace_path / images_dir
+        if img_dir.is_dir():
+            # (device, inode) -> [links from this page, size, total links]
+            files: dict[tuple[int, int], list[int]] = {}
+            for f in img_dir.iterdir():
+                if not f.is_file():
+                    continue
+                stat = f.stat()
+                entry = files.setdefault((stat.st_dev, stat.st_ino), [0, stat.st_size, stat.st_nlink])
+                entry[0] += 1
+            for page_links, size, nlink in files.values():
+                # Only the store (if any) links it besides this page
+                if nlink <= page_links + 1:
+                    total += size
+        return total
+    
+    def remove_content(self, markdown_path: str, images_dir: str) -> None:
+        """Delete a page's Markdown file and images directory.
+        
+        Stored images shared with other pages stay in the image store;
+        unused ones are pruned by cleanup_old_files().
+        
+        Args:
+            markdown_path: Markdown file path relative to the workspace
+            images_dir: Images directory relative to the workspace
+        """
+        try:
+            (self.workspace_path / markdown_path).unlink(missing_ok=True)
+            shutil.rmtree(self.workspace_path / images_dir, ignore_errors=True)
+        except Exception as e:
+            logger.warning(f"Failed to remove content {markdown_path}: {e}")
     
     def read_markdown_file(self, markdown_path: str) -> Optional[frontmatter.Post]:
         """Read and parse a Markdown file.
@@ -2,27 +2,92 @@
 
 Manages SQLite database index for web content.
 Stores metadata and file paths, not the actual content.
-TTL: 72 hours with LRU management.
+TTL: 72 hours, HTTP validators for revalidation, size-bounded LRU eviction.
 """
 
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
 import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Default freshness lifetime of an entry
+DEFAULT_TTL_HOURS = 72
+
+# Expired entries are kept this long so they can be revalidated
+STALE_RETENTION_HOURS = 7 * 24
+
+# LRU bounds on the cached content
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+# Seconds between retention/eviction sweeps
+SWEEP_INTERVAL_SECONDS = 300
+
+# Buffered cache hits are written after this many URLs or seconds
+ACCESS_FLUSH_BATCH = 64
+ACCESS_FLUSH_SECONDS = 30
+
+# Columns added after the first schema version
+_MIGRATED_COLUMNS = {
+    "etag": "TEXT",
+    "last_modified": "TEXT",
+    "content_bytes": "INTEGER DEFAULT 0",
+}
+
+
+def _sql_timestamp(value: datetime) -> str:
+    """Format a time like SQLite's CURRENT_TIMESTAMP (UTC) so they compare."""
+    return value.astimezone(UTC).strftime("%Y-%m-%d %H:%M:%S")
+
 
 class SQLiteIndexManager:
-    """SQLite-based index manager for web content."""
+    """SQLite-based index manager for web content.
     
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize index manager.
+    All database work runs on one dedicated thread that owns a persistent
+    WAL-mode connection, so the async methods never block the event loop
+    and no connection is opened per call. Cache hits are read-only: their
+    access counts are buffered and written in batches.
+    
+    Expired entries are not dropped right away: they keep their ETag and
+    Last-Modified validators for stale_retention_hours so the page can be
+    revalidated with a conditional GET. A sweep removes entries past that
+    retention and evicts the least recently (then least frequently)
+    accessed entries once the index holds more than max_entries or
+    max_bytes of content. Sweeps run every sweep_interval seconds from a
+    background task started on first use and stopped by close(), and
+    add_index() runs one early if the last is older than that.
+    """
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        stale_retention_hours: int = STALE_RETENTION_HOURS,
+        sweep_interval: float = SWEEP_INTERVAL_SECONDS,
+        on_release: Optional[Callable[[list[dict]], None]] = None,
+    ):
+        """Initialize index manager (the database is opened on first use).
         
         Args:
             db_path: Path to SQLite database. Defaults to backend/data/web_index.db
+            max_entries: Maximum number of entries (0 for no limit)
+            max_bytes: Maximum total content size in bytes (0 for no limit)
+            stale_retention_hours: Hours expired entries are kept for revalidation
+            sweep_interval: Seconds between sweeps (0 sweeps on every add_index()
+                and disables the background task)
+            on_release: Called from a worker thread with the entries
+                (markdown_path, images_dir) removed by background sweeps
         """
         if db_path is None:
             # Default to backend/data directory
@@ -32,54 +97,131 @@ class SQLiteIndexManager:
             db_path = str(data_dir / "web_index.db")
         
         self.db_path = db_path
-        self._init_database()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_retention_hours = stale_retention_hours
+        self.sweep_interval = sweep_interval
+        self.on_release = on_release
+        
+        # Single worker: it owns the connection and serialises all access
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="web-index"
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._last_sweep: float | None = None
+        self._sweep_task: asyncio.Task | None = None
+        
+        # url_hash -> [hits, last accessed], written in batches by _apply_access()
+        self._pending_access: dict[str, list] = {}
+        self._last_access_flush = time.monotonic()
         
         logger.info(
             "SQLiteIndexManager initialized",
             extra={"db_path": db_path}
         )
     
-    def _init_database(self):
+    def _connection(self) -> sqlite3.Connection:
+        """Open the persistent connection (index thread only)."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._init_database(conn)
+            self._conn = conn
+        return self._conn
+    
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(conn, *args) on the index thread."""
+        loop = asyncio.get_running_loop()
+        self._ensure_sweeper(loop)
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, fn, *args)
+        )
+    
+    def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return fn(self._connection(), *args)
+    
+    def _ensure_sweeper(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the background sweep task on the running loop if needed."""
+        if self.sweep_interval <= 0:
+            return
+        task = self._sweep_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._sweep_task = loop.create_task(self._sweep_periodically())
+    
+    async def _sweep_periodically(self) -> None:
+        """Sweep every sweep_interval seconds, including read-only workloads."""
+        while True:
+            last = self._last_sweep if self._last_sweep is not None else time.monotonic()
+            delay = last + self.sweep_interval - time.monotonic()
+            await asyncio.sleep(max(delay, 0.0))
+            if self._last_sweep is not None and \
+                    time.monotonic() - self._last_sweep < self.sweep_interval:
+                continue
+            removed = await self.sweep()
+            if removed and self.on_release is not None:
+                try:
+                    await asyncio.to_thread(self.on_release, removed)
+                except Exception as e:
+                    logger.warning(f"Failed to release swept index entries: {e}")
+    
+    def _init_database(self, conn: sqlite3.Connection):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript("""
-                CREATE TABLE IF NOT EXISTS web_content_index (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url_hash TEXT NOT NULL UNIQUE,
-                    url TEXT NOT NULL,
-                    
-                    -- File paths
-                    markdown_path TEXT NOT NULL,
-                    images_dir TEXT NOT NULL,
-                    
-                    -- Metadata
-                    title TEXT NOT NULL,
-                    word_count INTEGER DEFAULT 0,
-                    language TEXT,
-                    
-                    -- Timestamps
-                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL,
-                    
-                    -- LRU stats
-                    access_count INTEGER DEFAULT 0,
-                    last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS web_content_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url_hash TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
                 
-                CREATE INDEX IF NOT EXISTS idx_url_hash ON web_content_index(url_hash);
-                CREATE INDEX IF NOT EXISTS idx_expires_at ON web_content_index(expires_at);
-                CREATE INDEX IF NOT EXISTS idx_last_accessed ON web_content_index(last_accessed);
+                -- File paths
+                markdown_path TEXT NOT NULL,
+                images_dir TEXT NOT NULL,
                 
-                -- Auto-cleanup trigger for expired entries (72 hours TTL)
-                CREATE TRIGGER IF NOT EXISTS cleanup_expired_index
-                AFTER INSERT ON web_content_index
-                BEGIN
-                    DELETE FROM web_content_index
-                    WHERE expires_at < CURRENT_TIMESTAMP;
-                END;
-            """)
+                -- Metadata
+                title TEXT NOT NULL,
+                word_count INTEGER DEFAULT 0,
+                language TEXT,
+                
+                -- Timestamps
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL,
+                
+                -- LRU stats
+                access_count INTEGER DEFAULT 0,
+                last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                
+                -- HTTP validators for conditional revalidation
+                etag TEXT,
+                last_modified TEXT,
+                
+                -- Size of the stored Markdown and images
+                content_bytes INTEGER DEFAULT 0
+            );
             
-            conn.commit()
+            CREATE INDEX IF NOT EXISTS idx_url_hash ON web_content_index(url_hash);
+            CREATE INDEX IF NOT EXISTS idx_expires_at ON web_content_index(expires_at);
+            CREATE INDEX IF NOT EXISTS idx_last_accessed ON web_content_index(last_accessed);
+            
+            -- Expired entries are kept for revalidation; sweep() prunes them
+            DROP TRIGGER IF EXISTS cleanup_expired_index;
+        """)
+        
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(web_content_index)")}
+        missing = [column for column in _MIGRATED_COLUMNS if column not in existing]
+        for column in missing:
+            conn.execute(f"ALTER TABLE web_content_index ADD COLUMN {column} {_MIGRATED_COLUMNS[column]}")
+        if missing:
+            # The old schema stored expires_at as a local-time isoformat()
+            # string, which does not compare with CURRENT_TIMESTAMP (UTC)
+            conn.execute("""
+                UPDATE web_content_index
+                SET expires_at = datetime(expires_at, 'utc')
+                WHERE expires_at LIKE '%T%' AND datetime(expires_at, 'utc') IS NOT NULL
+            """)
+        
+        conn.commit()
         
         logger.debug("Database schema initialized")
     
@@ -87,44 +229,78 @@ class SQLiteIndexManager:
         """Compute MD5 hash of URL."""
         return hashlib.md5(url.encode()).hexdigest()
     
-    async def get_index(self, url: str) -> Optional[dict]:
+    async def get_index(self, url: str, allow_stale: bool = False) -> Optional[dict]:
         """Get index entry if exists and not expired.
         
+        The lookup is read-only; the hit is recorded for LRU in memory and
+        written later in a batch.
+        
         Args:
             url: The URL to look up
-            
+            allow_stale: Also return expired entries (for revalidation)
+        
         Returns:
-            Index entry as dict, or None if not found/expired
+            Index entry as dict with an ``expired`` flag, or None if not
+            found (or expired and allow_stale is False)
         """
         url_hash = self._compute_url_hash(url)
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("""
-                    SELECT *
-                    FROM web_content_index
-                    WHERE url_hash = ? AND expires_at > CURRENT_TIMESTAMP
-                """, (url_hash,))
-                
-                row = cursor.fetchone()
-                if row:
-                    # Update access count and last_accessed (LRU)
-                    conn.execute("""
-                        UPDATE web_content_index
-                        SET access_count = access_count + 1,
-                            last_accessed = CURRENT_TIMESTAMP
-                        WHERE url_hash = ?
-                    """, (url_hash,))
-                    conn.commit()
-                    
-                    logger.debug(f"Index hit for URL: {url}")
-                    return dict(row)
-                    
+            row = await self._run(self._select_entry, url_hash)
         except Exception as e:
             logger.error(f"Failed to get index: {e}")
+            return None
+        
+        if row is None or not (allow_stale or row["expired"] == 0):
+            return None
+        
+        entry = dict(row)
+        entry["expired"] = bool(entry["expired"])
+        
+        # Record access count and last_accessed (LRU)
+        pending = self._pending_access.setdefault(url_hash, [0, None])
+        pending[0] += 1
+        pending[1] = _sql_timestamp(datetime.now(UTC))
+        entry["access_count"] += pending[0]
+        entry["last_accessed"] = pending[1]
+        
+        if (len(self._pending_access) >= ACCESS_FLUSH_BATCH
+                or time.monotonic() - self._last_access_flush >= ACCESS_FLUSH_SECONDS):
+            # Queued behind other index work; the caller does not wait for it
+            self._executor.submit(self._call, self._apply_access, self._take_pending_access())
         
-        return None
+        logger.debug(f"Index hit for URL: {url}")
+        return entry
+    
+    @staticmethod
+    def _select_entry(conn: sqlite3.Connection, url_hash: str) -> Optional[sqlite3.Row]:
+        return conn.execute("""
+            SELECT *, expires_at <= CURRENT_TIMESTAMP AS expired
+            FROM web_content_index
+            WHERE url_hash = ?
+        """, (url_hash,)).fetchone()
+    
+    def _take_pending_access(self) -> dict[str, list]:
+        """Hand the buffered hits to the index thread."""
+        pending, self._pending_access = self._pending_access, {}
+        self._last_access_flush = time.monotonic()
+        return pending
+    
+    @staticmethod
+    def _apply_access(conn: sqlite3.Connection, pending: dict[str, list]) -> None:
+        """Write buffered hits in one transaction."""
+        if not pending:
+            return
+        try:
+            conn.executemany("""
+                UPDATE web_content_index
+                SET access_count = access_count + ?,
+                    last_accessed = ?
+                WHERE url_hash = ?
+            """, [(hits, accessed, url_hash) for url_hash, (hits, accessed) in pending.items()])
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record index access: {e}")
     
     async def add_index(
         self,
@@ -134,10 +310,15 @@ class SQLiteIndexManager:
         title: str,
         word_count: int,
         language: Optional[str] = None,
-        ttl_hours: int = 72,  # 72 hours TTL
-    ):
+        ttl_hours: int = DEFAULT_TTL_HOURS,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_bytes: int = 0,
+    ) -> list[dict]:
         """Add index entry with TTL.
         
+        Runs a sweep if the last one is older than sweep_interval.
+        
         Args:
             url: The URL
             markdown_path: Relative path to Markdown file
@@ -146,58 +327,199 @@ class SQLiteIndexManager:
             word_count: Word count
             language: Content language
             ttl_hours: Time-to-live in hours (default 72)
+            etag: ETag response header, for revalidation
+            last_modified: Last-Modified response header, for revalidation
+            content_bytes: Size of the stored content
+        
+        Returns:
+            Entries (markdown_path, images_dir) whose files are no longer
+            indexed: swept entries and the replaced files of this URL
         """
         url_hash = self._compute_url_hash(url)
-        expires_at = datetime.now() + timedelta(hours=ttl_hours)
+        expires_at = _sql_timestamp(datetime.now(UTC) + timedelta(hours=ttl_hours))
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO web_content_index
-                    (url_hash, url, markdown_path, images_dir, title, word_count, language, 
-                     fetched_at, expires_at, access_count, last_accessed)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, 0, CURRENT_TIMESTAMP)
-                """, (
-                    url_hash, url, markdown_path, images_dir,
-                    title, word_count, language, expires_at.isoformat()
-                ))
-                conn.commit()
+            released = await self._run(self._insert_entry, (
+                url_hash, url, markdown_path, images_dir,
+                title, word_count, language, expires_at,
+                etag, last_modified, content_bytes,
+            ))
+            
+            if self._last_sweep is None or time.monotonic() - self._last_sweep >= self.sweep_interval:
+                released += await self.sweep(keep_url=url)
             
             logger.info(
                 f"Added index entry",
                 extra={
                     "url": url,
                     "markdown_path": markdown_path,
-                    "expires_at": expires_at.isoformat(),
+                    "expires_at": expires_at,
+                    "released_entries": len(released),
                 }
             )
-            
+            return released
+        
         except Exception as e:
             logger.error(f"Failed to add index: {e}")
             raise
     
+    @staticmethod
+    def _insert_entry(conn: sqlite3.Connection, values: tuple) -> list[dict]:
+        url_hash, markdown_path = values[0], values[2]
+        previous = conn.execute("""
+            SELECT markdown_path, images_dir FROM web_content_index
+            WHERE url_hash = ?
+        """, (url_hash,)).fetchone()
+        
+        conn.execute("""
+            INSERT OR REPLACE INTO web_content_index
+            (url_hash, url, markdown_path, images_dir, title, word_count, language,
+             fetched_at, expires_at, access_count, last_accessed,
+             etag, last_modified, content_bytes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, 0, CURRENT_TIMESTAMP, ?, ?, ?)
+        """, values)
+        conn.commit()
+        
+        if previous and previous["markdown_path"] != markdown_path:
+            return [dict(previous)]
+        return []
+    
+    async def refresh_index(
+        self,
+        url: str,
+        ttl_hours: int = DEFAULT_TTL_HOURS,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """Extend an entry whose content was revalidated (HTTP 304).
+        
+        Args:
+            url: The URL
+            ttl_hours: New time-to-live in hours
+            etag: ETag from the 304 response, if any
+            last_modified: Last-Modified from the 304 response, if any
+        
+        Returns:
+            True if the entry exists and was refreshed
+        """
+        url_hash = self._compute_url_hash(url)
+        expires_at = _sql_timestamp(datetime.now(UTC) + timedelta(hours=ttl_hours))
+        
+        try:
+            return await self._run(self._update_expiry, (expires_at, etag, last_modified, url_hash))
+        except Exception as e:
+            logger.error(f"Failed to refresh index: {e}")
+            return False
+    
+    @staticmethod
+    def _update_expiry(conn: sqlite3.Connection, values: tuple) -> bool:
+        result = conn.execute("""
+            UPDATE web_content_index
+            SET expires_at = ?,
+                etag = COALESCE(?, etag),
+                last_modified = COALESCE(?, last_modified)
+            WHERE url_hash = ?
+        """, values)
+        conn.commit()
+        return result.rowcount > 0
+    
+    async def sweep(self, keep_url: Optional[str] = None) -> list[dict]:
+        """Drop entries past stale retention, then evict LRU entries over the bounds.
+        
+        Eviction prefers expired entries, then the least recently accessed,
+        then the least accessed. Buffered hits are written first.
+        
+        Args:
+            keep_url: Entry that must not be evicted (e.g. just added)
+        
+        Returns:
+            Removed entries (markdown_path, images_dir)
+        """
+        self._last_sweep = time.monotonic()
+        keep_url_hash = self._compute_url_hash(keep_url) if keep_url else ""
+        try:
+            return await self._run(self._sweep, self._take_pending_access(), keep_url_hash)
+        except Exception as e:
+            logger.error(f"Index sweep failed: {e}")
+            return []
+    
+    def _sweep(self, conn: sqlite3.Connection, pending: dict[str, list], keep_url_hash: str) -> list[dict]:
+        self._apply_access(conn, pending)
+        
+        retention = (f"-{self.stale_retention_hours} hours",)
+        removed = [dict(row) for row in conn.execute("""
+            SELECT markdown_path, images_dir FROM web_content_index
+            WHERE expires_at < datetime('now', ?)
+        """, retention)]
+        if removed:
+            conn.execute("DELETE FROM web_content_index WHERE expires_at < datetime('now', ?)", retention)
+        
+        total_entries, total_bytes = conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(content_bytes), 0) FROM web_content_index
+        """).fetchone()
+        over_entries = self.max_entries and total_entries > self.max_entries
+        over_bytes = self.max_bytes and total_bytes > self.max_bytes
+        if not (over_entries or over_bytes):
+            conn.commit()
+            return removed
+        
+        candidates = conn.execute("""
+            SELECT url_hash, markdown_path, images_dir, content_bytes
+            FROM web_content_index
+            WHERE url_hash != ?
+            ORDER BY expires_at <= CURRENT_TIMESTAMP DESC, last_accessed ASC, access_count ASC
+        """, (keep_url_hash,))
+        
+        evicted = []
+        for row in candidates:
+            if (not self.max_entries or total_entries <= self.max_entries) and \
+                    (not self.max_bytes or total_bytes <= self.max_bytes):
+                break
+            evicted.append(row)
+            total_entries -= 1
+            total_bytes -= row["content_bytes"] or 0
+        
+        conn.executemany(
+            "DELETE FROM web_content_index WHERE url_hash = ?",
+            [(row["url_hash"],) for row in evicted],
+        )
+        conn.commit()
+        if evicted:
+            logger.info(
+                "Evicted least recently used index entries",
+                extra={"evicted": len(evicted), "total_entries": total_entries, "total_bytes": total_bytes}
+            )
+        
+        return removed + [
+            {"markdown_path": row["markdown_path"], "images_dir": row["images_dir"]}
+            for row in evicted
+        ]
+    
     async def cleanup_expired(self) -> int:
         """Manually cleanup expired entries.
         
+        Entries are kept stale_retention_hours past expiry for revalidation.
+        
         Returns:
             Number of deleted entries
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                result = conn.execute("""
-                    DELETE FROM web_content_index 
-                    WHERE expires_at < CURRENT_TIMESTAMP
-                """)
-                deleted_count = result.rowcount
-                conn.commit()
-            
+            deleted_count = await self._run(self._delete_expired)
             logger.info(f"Cleaned up {deleted_count} expired index entries")
             return deleted_count
-            
+        
         except Exception as e:
             logger.error(f"Cleanup failed: {e}")
             return 0
     
+    def _delete_expired(self, conn: sqlite3.Connection) -> int:
+        result = conn.execute("""
+            DELETE FROM web_content_index
+            WHERE expires_at < datetime('now', ?)
+        """, (f"-{self.stale_retention_hours} hours",))
+        conn.commit()
+        return result.rowcount
+    
     async def get_stats(self) -> dict:
         """Get index statistics.
         
@@ -205,63 +527,126 @@ class SQLiteIndexManager:
             Statistics dict
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                total = conn.execute("SELECT COUNT(*) FROM web_content_index").fetchone()[0]
-                
-                # Get size breakdown by date
-                date_counts = conn.execute("""
-                    SELECT substr(fetched_at, 1, 10) as date, COUNT(*) as count
-                    FROM web_content_index
-                    GROUP BY substr(fetched_at, 1, 10)
-                    ORDER BY date DESC
-                    LIMIT 7
-                """).fetchall()
-                
-                db_size = Path(self.db_path).stat().st_size
-                
-                return {
-                    "total_entries": total,
-                    "database_size_bytes": db_size,
-                    "database_size_mb": round(db_size / 1024 / 1024, 2),
-                    "entries_by_date": [
-                        {"date": row[0], "count": row[1]} 
-                        for row in date_counts
-                    ],
-                }
-                
+            return await self._run(self._collect_stats, self._take_pending_access())
+        
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
             return {
                 "total_entries": 0,
+                "expired_entries": 0,
+                "content_bytes": 0,
                 "database_size_bytes": 0,
                 "database_size_mb": 0,
                 "entries_by_date": [],
             }
     
+    def _collect_stats(self, conn: sqlite3.Connection, pending: dict[str, list]) -> dict:
+        self._apply_access(conn, pending)
+        
+        total, content_bytes, expired = conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(content_bytes), 0),
+                   COALESCE(SUM(expires_at <= CURRENT_TIMESTAMP), 0)
+            FROM web_content_index
+        """).fetchone()
+        
+        # Get size breakdown by date
+        date_counts = conn.execute("""
+            SELECT substr(fetched_at, 1, 10) as date, COUNT(*) as count
+            FROM web_content_index
+            GROUP BY substr(fetched_at, 1, 10)
+            ORDER BY date DESC
+            LIMIT 7
+        """).fetchall()
+        
+        db_size = Path(self.db_path).stat().st_size
+        
+        return {
+            "total_entries": total,
+            "expired_entries": expired,
+            "content_bytes": content_bytes,
+            "database_size_bytes": db_size,
+            "database_size_mb": round(db_size / 1024 / 1024, 2),
+            "entries_by_date": [
+                {"date": row[0], "count": row[1]}
+                for row in date_counts
+            ],
+        }
+    
     async def remove_index(self, url: str) -> bool:
         """Remove index entry for a URL.
         
         Args:
             url: URL to remove
-            
+        
         Returns:
             True if removed, False if not found
         """
         url_hash = self._compute_url_hash(url)
+        self._pending_access.pop(url_hash, None)
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                result = conn.execute("""
-                    DELETE FROM web_content_index
-                    WHERE url_hash = ?
-                """, (url_hash,))
-                conn.commit()
-                
-                removed = result.rowcount > 0
-                if removed:
-                    logger.info(f"Removed index for URL: {url}")
-                return removed
-                
+            removed = await self._run(self._delete_entry, url_hash)
+            if removed:
+                logger.info(f"Removed index for URL: {url}")
+            return removed
+        
         except Exception as e:
             logger.error(f"Failed to remove index: {e}")
             return False
+    
+    @staticmethod
+    def _delete_entry(conn: sqlite3.Connection, url_hash: str) -> bool:
+        result = conn.execute("""
+            DELETE FROM web_content_index
+            WHERE url_hash = ?
+        """, (url_hash,))
+        conn.commit()
+        return result.rowcount > 0
+    
+    async def close(self) -> None:
+        """Stop background sweeps, write buffered hits and close the connection."""
+        task, self._sweep_task = self._sweep_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        if self._conn is not None or self._pending_access:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._executor,
+                functools.partial(self._call, self._close, self._take_pending_access()),
+            )
+        self._executor.shutdown(wait=False)
+    
+    def _close(self, conn: sqlite3.Connection, pending: dict[str, list]) -> None:
+        self._apply_access(conn, pending)
+        conn.close()
+        self._conn = None
+
+
+# Global index manager shared by the web fetch tool instances
+_index_manager: SQLiteIndexManager | None = None
+
+
+def get_sqlite_index_manager(**kwargs) -> SQLiteIndexManager:
+    """Get the shared index manager (created with the given settings if needed).
+    
+    Args:
+        **kwargs: SQLiteIndexManager arguments, used on first call only
+        
+    Returns:
+        The shared index manager
+    """
+    global _index_manager
+    if _index_manager is None:
+        _index_manager = SQLiteIndexManager(**kwargs)
+    return _index_manager
+
+
+async def close_sqlite_index_manager() -> None:
+    """Close the shared index manager, writing buffered hits."""
+    global _index_manager
+    manager, _index_manager = _index_manager, None
+    if manager is not None:
+        await manager.close()
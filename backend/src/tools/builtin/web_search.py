@@ -27,6 +27,10 @@ class WebSearchTool(BaseTool):
     def name(self) -> str:
         return "web_search"
     
+    @property
+    def is_idempotent(self) -> bool:
+        return True
+    
     @property
     def description(self) -> str:
         return (
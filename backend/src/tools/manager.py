@@ -3,6 +3,7 @@
 This module provides the ToolManager that:
 - Registers and manages available tools
 - Executes tool calls from the LLM
+- Coalesces concurrent identical calls to idempotent tools
 - Provides tools in OpenAI function calling format
 """
 
@@ -10,6 +11,7 @@ from typing import Any
 
 from .base import BaseTool, ToolResult
 from src.utils.logger import get_logger
+from src.utils.single_flight import SingleFlight, canonical_key
 
 logger = get_logger(__name__)
 
@@ -45,6 +47,7 @@ class ToolManager:
     def __init__(self) -> None:
         """Initialize the tool manager."""
         self._tools: dict[str, BaseTool] = {}
+        self._inflight = SingleFlight()
         
         logger.info("ToolManager initialized")
     
@@ -216,6 +219,25 @@ class ToolManager:
         # ✅ FIX: Correct known tool parameter mismatches before execution
         params = self._correct_tool_parameters(name, params)
         
+        if tool.is_idempotent:
+            # Concurrent identical calls share one execution
+            return await self._inflight.do(
+                canonical_key(name, params),
+                lambda: self._run_tool(tool, name, params),
+            )
+        return await self._run_tool(tool, name, params)
+    
+    async def _run_tool(self, tool: BaseTool, name: str, params: dict[str, Any]) -> ToolResult:
+        """Run a validated tool call, converting exceptions to error results.
+        
+        Args:
+            tool: Tool to run
+            name: Tool name
+            params: Corrected parameters
+            
+        Returns:
+            ToolResult with execution result
+        """
         try:
             result = await tool.execute(**params)
             
@@ -261,6 +283,7 @@ class ToolManager:
         return {
             "tools_count": len(self._tools),
             "tool_names": list(self._tools.keys()),
+            "coalescing": self._inflight.get_stats(),
         }
 
 
@@ -0,0 +1,236 @@
+"""Non-blocking, batched log sink.
+
+This module provides:
+- AsyncLogSink: a bounded queue drained by a writer thread
+- orjson serialisation of log lines
+- Batched writes through a rotating file handler
+- Drop / sample policies when the queue backs up
+"""
+
+import atexit
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any, Literal
+
+import orjson
+
+OverflowPolicy = Literal["drop_newest", "drop_oldest", "sample"]
+
+# Queue fill ratio above which the "sample" policy starts thinning entries
+SAMPLE_HIGH_WATERMARK = 0.5
+
+
+class AsyncLogSink:
+    """Writes serialised log lines from a background thread.
+
+    Callers only enqueue a line; the writer thread collects up to
+    ``batch_size`` lines (or whatever arrived within ``flush_interval``)
+    and hands them to ``write_batch`` in one call, so the file is
+    written, rotated and flushed once per batch instead of once per line.
+
+    Under backpressure the configured policy decides what is lost:
+
+    - ``drop_newest``: a full queue rejects the new line
+    - ``drop_oldest``: a full queue discards its oldest line
+    - ``sample``: once the queue is half full only ``sample_rate`` of the
+      lines are kept (``keep`` lines always are); a full queue rejects
+
+    Flush markers share the queue (to keep their place among the lines)
+    but do not count towards ``queue_size`` and are never dropped. All
+    queue state and the submit counters are guarded by one condition.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[str]], None],
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        overflow: OverflowPolicy = "drop_newest",
+        sample_rate: float = 0.1,
+        name: str = "async-log-sink",
+    ) -> None:
+        """Initialize the sink and start its writer thread.
+
+        Args:
+            write_batch: Called on the writer thread with a batch of lines
+            queue_size: Maximum lines waiting to be written
+            batch_size: Maximum lines per write
+            flush_interval: Seconds to wait for a batch to fill
+            overflow: Policy when the queue backs up
+            sample_rate: Fraction of lines kept by the "sample" policy
+            name: Writer thread name
+        """
+        self._write_batch = write_batch
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        # Lines and flush markers in order; _lines counts the lines only
+        self._items: deque[str | threading.Event] = deque()
+        self._lines = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stopped = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @staticmethod
+    def serialize(record: dict[str, Any]) -> str:
+        """Serialise a record as one JSON line (non-ASCII kept as UTF-8)."""
+        return orjson.dumps(record, default=str).decode("utf-8")
+
+    def submit(self, line: str, keep: bool = False) -> bool:
+        """Queue a line without blocking.
+
+        Args:
+            line: Serialised log line (no trailing newline)
+            keep: Exempt the line from sampling (it can still be dropped
+                when the queue is full)
+
+        Returns:
+            True if the line was queued
+        """
+        with self._cond:
+            if self._closed:
+                return False
+
+            if (
+                self.overflow == "sample"
+                and not keep
+                and self._lines >= self.queue_size * SAMPLE_HIGH_WATERMARK
+                and random.random() >= self.sample_rate
+            ):
+                self.sampled_out += 1
+                return False
+
+            if self._lines >= self.queue_size:
+                self.dropped += 1
+                if self.overflow != "drop_oldest":
+                    return False
+                self._evict_oldest_line()
+
+            self._items.append(line)
+            self._lines += 1
+            self.enqueued += 1
+            self._cond.notify()
+        return True
+
+    def _evict_oldest_line(self) -> None:
+        """Remove the oldest queued line, skipping flush markers (lock held)."""
+        for i, item in enumerate(self._items):
+            if isinstance(item, str):
+                del self._items[i]
+                self._lines -= 1
+                return
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until every queued line has been written.
+
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if the queue drained in time
+        """
+        done = threading.Event()
+        with self._cond:
+            if self._stopped or not self._thread.is_alive():
+                return self._lines == 0
+            self._items.append(done)
+            self._cond.notify()
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Write what is queued and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        atexit.unregister(self.close)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Writer loop: gather a batch, write it, repeat until closed and drained."""
+        while True:
+            batch, waiters = self._next_batch()
+            if batch:
+                try:
+                    self._write_batch(batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except Exception:
+                    self.write_errors += 1
+            for waiter in waiters:
+                waiter.set()
+            if not batch and not waiters:
+                return
+
+    def _next_batch(self) -> tuple[list[str], list[threading.Event]]:
+        """Take up to batch_size lines, stopping early at a flush marker.
+
+        Waits up to flush_interval after the first line for the batch to
+        fill. Returns two empty lists once the sink is closed and drained.
+        """
+        batch: list[str] = []
+        waiters: list[threading.Event] = []
+        deadline = None
+        with self._cond:
+            while True:
+                while self._items:
+                    item = self._items.popleft()
+                    if isinstance(item, threading.Event):
+                        # A flush marker: write what we have right away
+                        waiters.append(item)
+                        return batch, waiters
+                    batch.append(item)
+                    self._lines -= 1
+                    if len(batch) >= self.batch_size:
+                        return batch, waiters
+
+                if self._closed:
+                    self._stopped = not batch
+                    return batch, waiters
+                if not batch:
+                    self._cond.wait()
+                    continue
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return batch, waiters
+                self._cond.wait(remaining)
+
+    @property
+    def pending(self) -> int:
+        """Lines waiting to be written."""
+        with self._cond:
+            return self._lines
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get sink counters."""
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "write_errors": self.write_errors,
+            "pending": self.pending,
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+        }
@@ -61,7 +61,6 @@ Example:
 
 import functools
 import inspect
-import json
 import logging
 import os
 import sys
@@ -75,8 +74,10 @@ from pythonjsonlogger import jsonlogger
 
 try:
     from ..config.models import LoggingConfig
+    from .async_log_sink import AsyncLogSink, OverflowPolicy
 except (ImportError, ValueError):
     from config.models import LoggingConfig
+    from utils.async_log_sink import AsyncLogSink, OverflowPolicy
 
 
 class TimedSizeRotatingFileHandler(logging.Handler):
@@ -141,7 +142,7 @@ class TimedSizeRotatingFileHandler(logging.Handler):
         if self.stream is None:
             self.stream = open(self.base_filename, 'a', encoding=self.encoding)
     
-    def should_rollover(self, record: logging.LogRecord) -> bool:
+    def should_rollover(self, record: logging.LogRecord | None) -> bool:
         """Determine if rollover should occur."""
         # Check if time-based rollover is needed
         if time.time() >= self.rollover_time:
@@ -249,6 +250,39 @@ class TimedSizeRotatingFileHandler(logging.Handler):
             self.flush()
         except Exception:
             self.handleError(record)
+    
+    def write_batch(self, lines: list[str]) -> None:
+        """Write pre-formatted lines with one rollover check and one flush.
+        
+        Args:
+            lines: Log lines without trailing newlines
+        """
+        self.acquire()
+        try:
+            if self.should_rollover(None):
+                self.do_rollover()
+            if self.stream is None:
+                self.open()
+            self.stream.write('\n'.join(lines) + '\n')
+            self.flush()
+        finally:
+            self.release()
+    
+    def flush(self):
+        """Flush the current log file."""
+        if self.stream is not None:
+            self.stream.flush()
+    
+    def close(self):
+        """Close the current log file."""
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+        finally:
+            self.release()
+        super().close()
 
 # Type variable for generic function decoration
 F = TypeVar('F', bound=Callable[..., Any])
@@ -454,6 +488,7 @@ class LLMPromptLogger:
     _instance: "LLMPromptLogger | None" = None
     _log_file: Path | None = None
     _file_handler: TimedSizeRotatingFileHandler | None = None
+    _sink: AsyncLogSink | None = None
     _initialized: bool = False
     
     def __new__(cls) -> "LLMPromptLogger":
@@ -467,7 +502,13 @@ class LLMPromptLogger:
         max_size: str = "50MB",
         backup_count: int = 5,
         when: str = "D",
-        interval: int = 1
+        interval: int = 1,
+        async_write: bool = True,
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        overflow: OverflowPolicy = "drop_newest",
+        sample_rate: float = 0.1,
     ) -> None:
         """Initialize the LLM prompt logger with rotation support.
         
@@ -477,6 +518,13 @@ class LLMPromptLogger:
             backup_count: Number of backup files to keep
             when: Time interval for rotation (D=days, H=hours, etc.)
             interval: Rotation interval multiplier
+            async_write: Write from a background thread instead of the caller
+            queue_size: Maximum entries waiting to be written
+            batch_size: Maximum entries per file write
+            flush_interval: Seconds the writer waits for a batch to fill
+            overflow: What to do when the queue backs up
+                (drop_newest, drop_oldest or sample)
+            sample_rate: Fraction of successful entries kept by "sample"
         """
         if self._initialized:
             return
@@ -508,19 +556,18 @@ class LLMPromptLogger:
             encoding='utf-8'
         )
         
-        # Set JSON formatter
-        formatter = jsonlogger.JsonFormatter(
-            "%(timestamp)s %(level)s %(name)s %(message)s %(trace_id)s %(request_id)s %(session_id)s",
-            rename_fields={
-                "timestamp": "timestamp", 
-                "level": "level", 
-                "name": "module",
-                "trace_id": "trace_id",
-                "request_id": "request_id",
-                "session_id": "session_id",
-            },
-        )
-        self._file_handler.setFormatter(formatter)
+        # Entries are serialised here and written in batches by a
+        # background thread, so logging never blocks the event loop
+        if async_write:
+            self._sink = AsyncLogSink(
+                self._file_handler.write_batch,
+                queue_size=queue_size,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                overflow=overflow,
+                sample_rate=sample_rate,
+                name="llm-prompt-log-writer",
+            )
         
         self._initialized = True
     
@@ -575,18 +622,64 @@ class LLMPromptLogger:
         if error:
             entry["error"] = error
         
-        # Write using rotating handler
-        assert self._file_handler is not None
-        log_record = logging.LogRecord(
-            name='llm_prompt',
-            level=logging.INFO,
-            pathname=str(self._log_file),
-            lineno=0,
-            msg=json.dumps(entry, ensure_ascii=False),
-            args=(),
-            exc_info=None
-        )
-        self._file_handler.emit(log_record)
+        # Same envelope the JSON formatter used to produce: the entry is
+        # the "message" string of a python-json-logger style record
+        line = AsyncLogSink.serialize({
+            "timestamp": None,
+            "level": None,
+            "module": "llm_prompt",
+            "message": AsyncLogSink.serialize(entry),
+            "trace_id": None,
+            "request_id": None,
+            "session_id": None,
+        })
+        
+        if self._sink is not None:
+            # Failed calls are exempt from sampling
+            self._sink.submit(line, keep=not success)
+        else:
+            assert self._file_handler is not None
+            self._file_handler.write_batch([line])
+    
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until queued entries are on disk.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if everything was written in time
+        """
+        if self._sink is None:
+            return True
+        return self._sink.flush(timeout)
+    
+    def close(self) -> None:
+        """Write queued entries, stop the writer and close the file.
+        
+        The logger can be initialized again afterwards.
+        """
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        if self._file_handler is not None:
+            self._file_handler.close()
+            self._file_handler = None
+        self._initialized = False
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get writer queue counters.
+        
+        Returns:
+            Dictionary with queued, written and dropped entry counts
+        """
+        stats: dict[str, Any] = {
+            "initialized": self._initialized,
+            "async": self._sink is not None,
+        }
+        if self._sink is not None:
+            stats.update(self._sink.get_stats())
+        return stats
 
 
 # Global instance
@@ -609,7 +702,13 @@ def get_llm_prompt_logger(config: LoggingConfig | None = None) -> LLMPromptLogge
                 max_size=config.prompt_llm_max_size,
                 backup_count=config.prompt_llm_backup_count,
                 when=config.when,
-                interval=config.interval
+                interval=config.interval,
+                async_write=config.prompt_llm_async,
+                queue_size=config.prompt_llm_queue_size,
+                batch_size=config.prompt_llm_batch_size,
+                flush_interval=config.prompt_llm_flush_interval,
+                overflow=config.prompt_llm_overflow,
+                sample_rate=config.prompt_llm_sample_rate,
             )
         else:
             _llm_prompt_logger.initialize()
@@ -0,0 +1,79 @@
+"""Request coalescing for concurrent identical async calls.
+
+This module provides:
+- SingleFlight: concurrent callers with the same key share one execution
+- Canonical keys for JSON-like arguments
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def canonical_key(*parts: Any) -> str:
+    """SHA-256 of the canonical JSON form of ``parts``."""
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key.
+
+    The first caller for a key starts the work as a task; callers that
+    arrive while it is running await the same task. Nothing is cached:
+    once the task finishes the next call starts fresh.
+
+    Each caller awaits the shared task through ``asyncio.shield``, so a
+    cancelled caller does not cancel the work for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._calls: dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` unless a call with the same key is already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine factory doing the work
+
+        Returns:
+            Result of the shared execution (exceptions are shared too)
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished call so later callers start a new one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        return len(self._calls)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get coalescing counters."""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
@@ -0,0 +1,205 @@
+"""Unit tests for the non-blocking prompt log writer.
+
+Tests cover:
+- Lines are written in batches from the writer thread
+- flush() and close() drain the queue
+- drop_newest / drop_oldest / sample policies under backpressure
+- Flush markers are never dropped; counters stay exact across threads
+- LLMPromptLogger output stays readable by LogParser
+"""
+
+import threading
+from pathlib import Path
+
+import orjson
+
+from src.services.log_parser import LogParser
+from src.utils.async_log_sink import AsyncLogSink
+from src.utils.logger import LLMPromptLogger
+
+
+class BlockingWriter:
+    """write_batch target that can hold the writer thread."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, lines: list[str]) -> None:
+        self.gate.wait(5)
+        self.batches.append(list(lines))
+
+    @property
+    def lines(self) -> list[str]:
+        return [line for batch in self.batches for line in batch]
+
+
+def make_backlog(writer: BlockingWriter, **kwargs) -> AsyncLogSink:
+    """Sink whose writer thread is stuck on its first batch."""
+    writer.gate.clear()
+    sink = AsyncLogSink(writer, batch_size=1, flush_interval=0, **kwargs)
+    sink.submit("busy")
+    while sink.pending:
+        pass
+    return sink
+
+
+class TestAsyncLogSink:
+    """Tests for AsyncLogSink."""
+
+    def test_lines_are_batched(self) -> None:
+        """Lines queued together are written in one call."""
+        writer = BlockingWriter()
+        sink = AsyncLogSink(writer, batch_size=50, flush_interval=1.0)
+        for i in range(120):
+            sink.submit(f"line {i}")
+
+        assert sink.flush()
+        assert writer.lines == [f"line {i}" for i in range(120)]
+        assert len(writer.batches) < 120
+        assert all(len(batch) <= 50 for batch in writer.batches)
+        sink.close()
+
+    def test_close_drains_queue(self) -> None:
+        """Queued lines are written before the writer stops."""
+        writer = BlockingWriter()
+        sink = AsyncLogSink(writer, flush_interval=10.0)
+        for i in range(10):
+            sink.submit(str(i))
+        sink.close()
+
+        assert len(writer.lines) == 10
+        assert sink.submit("late") is False
+
+    def test_drop_newest_when_full(self) -> None:
+        """A full queue rejects new lines."""
+        writer = BlockingWriter()
+        sink = make_backlog(writer, queue_size=3, overflow="drop_newest")
+        results = [sink.submit(str(i)) for i in range(5)]
+        writer.gate.set()
+        sink.close()
+
+        assert results == [True, True, True, False, False]
+        assert writer.lines == ["busy", "0", "1", "2"]
+        assert sink.get_stats()["dropped"] == 2
+
+    def test_drop_oldest_when_full(self) -> None:
+        """A full queue discards its oldest lines."""
+        writer = BlockingWriter()
+        sink = make_backlog(writer, queue_size=3, overflow="drop_oldest")
+        for i in range(5):
+            assert sink.submit(str(i))
+        writer.gate.set()
+        sink.close()
+
+        assert writer.lines == ["busy", "2", "3", "4"]
+        assert sink.get_stats()["dropped"] == 2
+
+    def test_drop_oldest_keeps_flush_marker(self) -> None:
+        """Evicting old lines never discards a pending flush()."""
+        writer = BlockingWriter()
+        sink = make_backlog(writer, queue_size=2, overflow="drop_oldest")
+        sink.submit("a")
+        flushed: list[bool] = []
+        flusher = threading.Thread(target=lambda: flushed.append(sink.flush(timeout=5)))
+        flusher.start()
+        while len(sink._items) < 2:
+            pass
+        for i in range(4):
+            assert sink.submit(str(i))
+        writer.gate.set()
+        flusher.join()
+        sink.close()
+
+        assert flushed == [True]
+        assert writer.lines == ["busy", "2", "3"]
+        assert sink.get_stats()["dropped"] == 3
+
+    def test_counters_from_many_threads(self) -> None:
+        """Concurrent submitters account for every line exactly once."""
+        writer = BlockingWriter()
+        sink = make_backlog(writer, queue_size=50, overflow="drop_oldest")
+        threads = [
+            threading.Thread(target=lambda: [sink.submit("x") for _ in range(500)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.gate.set()
+        sink.close()
+
+        stats = sink.get_stats()
+        assert stats["enqueued"] == 4001
+        assert stats["enqueued"] - stats["dropped"] == stats["written"]
+
+    def test_sample_under_backpressure(self) -> None:
+        """Past the high watermark only kept lines get through at rate 0."""
+        writer = BlockingWriter()
+        sink = make_backlog(writer, queue_size=4, overflow="sample", sample_rate=0.0)
+        assert sink.submit("a") and sink.submit("b")
+        assert sink.submit("c") is False
+        assert sink.submit("error", keep=True) is True
+        writer.gate.set()
+        sink.close()
+
+        assert writer.lines == ["busy", "a", "b", "error"]
+        assert sink.get_stats()["sampled_out"] == 1
+
+    def test_serialize_keeps_unicode(self) -> None:
+        """orjson output is UTF-8 JSON."""
+        line = AsyncLogSink.serialize({"content": "你好", "n": 1})
+        assert orjson.loads(line) == {"content": "你好", "n": 1}
+        assert "你好" in line
+
+
+class TestLLMPromptLogger:
+    """Tests for the prompt logger file format."""
+
+    def make_logger(self, tmp_path: Path, **kwargs) -> LLMPromptLogger:
+        # Bypass the singleton so the global logger is untouched
+        prompt_logger = object.__new__(LLMPromptLogger)
+        prompt_logger.initialize(log_dir=str(tmp_path), **kwargs)
+        return prompt_logger
+
+    def log(self, prompt_logger: LLMPromptLogger, trace_id: str, **kwargs) -> None:
+        prompt_logger.log_interaction(
+            session_id="s1",
+            trace_id=trace_id,
+            provider="p",
+            model="m",
+            messages=[{"role": "user", "content": "héllo"}],
+            response="hi",
+            latency_ms=12,
+            **kwargs,
+        )
+
+    def test_entries_readable_by_log_parser(self, tmp_path: Path) -> None:
+        """LogParser finds written entries by trace id."""
+        prompt_logger = self.make_logger(tmp_path)
+        self.log(prompt_logger, "t1", token_usage={"total_tokens": 3})
+        self.log(prompt_logger, "t2", success=False, error="boom")
+        assert prompt_logger.flush()
+        prompt_logger.close()
+
+        entries = LogParser(str(tmp_path)).parse_prompt_llm_logs("t1")
+        assert len(entries) == 1
+        assert entries[0].provider == "p"
+        assert entries[0].request["messages"][0]["content"] == "héllo"
+        assert entries[0].token_usage == {"total_tokens": 3}
+
+        failed = LogParser(str(tmp_path)).parse_prompt_llm_logs("t2")
+        assert failed[0].success is False and failed[0].error == "boom"
+
+    def test_record_envelope_unchanged(self, tmp_path: Path) -> None:
+        """Each line is a llm_prompt record with the entry as its message."""
+        prompt_logger = self.make_logger(tmp_path, async_write=False)
+        self.log(prompt_logger, "t1")
+        prompt_logger.close()
+
+        record = orjson.loads((tmp_path / "prompt-llm.log").read_text(encoding="utf-8"))
+        assert record["module"] == "llm_prompt"
+        assert set(record) == {"timestamp", "level", "module", "message", "trace_id", "request_id", "session_id"}
+        assert orjson.loads(record["message"])["trace_id"] == "t1"
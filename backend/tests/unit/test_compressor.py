@@ -68,17 +68,18 @@ class TestContextCompressor:
         assert compressed[2] == recent[1]
     
     @pytest.mark.asyncio
-    async def test_generate_summary(self):
-        """Test summary generation."""
+    async def test_summary_fallback(self):
+        """A failed summary call falls back to a placeholder."""
+        self.mock_llm.complete.side_effect = RuntimeError("down")
         messages = [
-            {"role": "user", "content": "Hello"},
-            {"role": "assistant", "content": "Hi there!"},
+            {"role": "user", "content": f"Message {i}"}
+            for i in range(10)
         ]
         
-        summary = await self.compressor._generate_summary(messages)
+        result = await self.compressor.compress(messages, retention_count=5)
         
-        assert isinstance(summary, str)
-        assert len(summary) > 0
+        assert result.summary == "[对话历史摘要] 共5轮对话"
+        assert result.rolling_summary is None
     
     @pytest.mark.asyncio
     async def test_extract_key_facts(self):
@@ -93,5 +94,141 @@ class TestContextCompressor:
         assert isinstance(facts, list)
 
 
+
+class LengthTokenCounter:
+    """Token counter stand-in that needs no tiktoken download."""
+    
+    def count_messages(self, messages: list[dict]) -> int:
+        return sum(len(m.get("content", "")) for m in messages)
+    
+    def count_text(self, text: str) -> int:
+        return len(text)
+    
+    def exceeds(self, messages: list[dict], limit: int, extra_text: str = "") -> tuple[bool, int]:
+        total = self.count_messages(messages) + len(extra_text)
+        return total > limit, total
+
+
+def conversation(n: int) -> list[dict]:
+    """System prompt followed by n alternating turns."""
+    return [{"role": "system", "content": "You are helpful."}] + [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i}"}
+        for i in range(n)
+    ]
+
+
+class TestRollingSummary:
+    """Incremental summaries across turns."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_llm = Mock()
+        self.mock_llm.complete = AsyncMock(return_value=Mock(content="Summary content"))
+        self.compressor = ContextCompressor(self.mock_llm, LengthTokenCounter())
+    
+    @pytest.mark.asyncio
+    async def test_reuses_summary_when_nothing_new_archived(self):
+        """No LLM call when the archive did not grow."""
+        first = await self.compressor.compress(conversation(20), retention_count=5)
+        assert first.summary_llm_calls == 1
+        assert first.rolling_summary.summarized_count == 15
+        
+        second = await self.compressor.compress(conversation(20), retention_count=5, previous=first.rolling_summary)
+        assert second.summary_llm_calls == 0
+        assert second.summary == "Summary content"
+        assert second.rolling_summary is first.rolling_summary
+        assert self.mock_llm.complete.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_folds_only_new_messages(self):
+        """Newly archived messages are folded into the previous summary."""
+        first = await self.compressor.compress(conversation(20), retention_count=5)
+        self.mock_llm.complete.return_value = Mock(content="Updated summary")
+        
+        second = await self.compressor.compress(conversation(22), retention_count=5, previous=first.rolling_summary)
+        
+        prompt = self.mock_llm.complete.await_args.args[0]
+        assert "Summary content" in prompt
+        assert "Message 15" in prompt and "Message 16" in prompt
+        assert "Message 14" not in prompt
+        assert second.summary == "Updated summary"
+        assert second.rolling_summary.summarized_count == 17
+    
+    @pytest.mark.asyncio
+    async def test_changed_history_resummarizes(self):
+        """A summary of different messages is not reused."""
+        first = await self.compressor.compress(conversation(20), retention_count=5)
+        edited = conversation(20)
+        edited[3]["content"] = "Edited"
+        
+        second = await self.compressor.compress(edited, retention_count=5, previous=first.rolling_summary)
+        
+        assert second.summary_llm_calls == 1
+        assert "已有摘要" not in self.mock_llm.complete.await_args.args[0]
+        assert second.rolling_summary.archive_hash != first.rolling_summary.archive_hash
+    
+    @pytest.mark.asyncio
+    async def test_failed_fold_keeps_previous(self):
+        """An LLM failure while folding keeps the older summary and watermark."""
+        first = await self.compressor.compress(conversation(20), retention_count=5)
+        self.mock_llm.complete.side_effect = RuntimeError("down")
+        
+        second = await self.compressor.compress(conversation(22), retention_count=5, previous=first.rolling_summary)
+        
+        assert second.summary == "Summary content"
+        assert second.rolling_summary is first.rolling_summary
+    
+    @pytest.mark.asyncio
+    async def test_failed_fold_keeps_new_messages(self):
+        """Messages the failed fold would have summarised stay in the window."""
+        history = conversation(22)
+        first = await self.compressor.compress(conversation(20), retention_count=5)
+        self.mock_llm.complete.side_effect = RuntimeError("down")
+        
+        second = await self.compressor.compress(history, retention_count=5, previous=first.rolling_summary)
+        
+        assert second.recent_messages == history[16:]
+        assert second.compressed_messages[2:] == history[16:]
+        assert len(second.archived_messages) == 15
+
+
+class TestCompressionManagerSummaries:
+    """Rolling summaries persisted by ContextCompressionManager."""
+    
+    @pytest.fixture
+    async def manager(self, tmp_path, monkeypatch):
+        from src.config.models import CompressionConfig
+        from src.services.compression import manager as manager_module
+        from src.services.storage import StorageService
+        
+        storage = StorageService(f"sqlite+aiosqlite:///{tmp_path / 'x.db'}")
+        await storage.initialize()
+        monkeypatch.setattr(manager_module, "get_storage_service", lambda: storage)
+        monkeypatch.setattr(manager_module, "get_token_counter", LengthTokenCounter)
+        config = CompressionConfig(threshold_rounds=10, retention_count=5)
+        monkeypatch.setattr(manager_module.ContextCompressionManager, "config", property(lambda self: config))
+        
+        llm = Mock()
+        llm.complete = AsyncMock(return_value=Mock(content="Summary content"))
+        yield manager_module.ContextCompressionManager(config, str(tmp_path), llm_service=llm)
+        await storage.close()
+    
+    @pytest.mark.asyncio
+    async def test_one_llm_call_per_archived_batch(self, manager):
+        """Turns that archive nothing reuse the summary; a new manager reloads it."""
+        await manager.prepare_context("s1", conversation(20))
+        await manager.prepare_context("s1", conversation(20))
+        assert manager.llm_service.complete.await_count == 1
+        
+        manager._summaries.clear()
+        prepared = await manager.prepare_context("s1", conversation(20))
+        assert manager.llm_service.complete.await_count == 1
+        assert prepared.summary == "Summary content"
+        
+        await manager.prepare_context("s1", conversation(22))
+        assert manager.llm_service.complete.await_count == 2
+        assert "已有摘要" in manager.llm_service.complete.await_args.args[0]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
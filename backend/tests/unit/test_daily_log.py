@@ -195,6 +195,110 @@ class TestDailyLogManager:
         assert "Test entry for format check" in content
 
 
+class TestEntryIndex:
+    """Tests for the incremental entry index behind MarkdownSync."""
+
+    def _write_log(self, temp_workspace, date, body):
+        log_file = Path(temp_workspace) / "memory" / f"{date}.md"
+        log_file.write_text(f"# {date} 日志\n\n## 记录条目\n{body}", encoding="utf-8")
+        return log_file
+
+    def test_unchanged_logs_are_not_reparsed(self, md_sync, temp_workspace):
+        """Test that repeated listing reuses parsed entries."""
+        self._write_log(temp_workspace, "2026-02-13", "\n### 10:00:00 - conversation\nOld entry\n")
+        self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nNew entry\n")
+        
+        first = md_sync.list_all_entries(limit=100)
+        parses = md_sync.entry_index.parse_count
+        second = md_sync.list_all_entries(limit=100)
+        
+        assert [e.content for e in first] == ["New entry", "Old entry"]
+        assert [e.id for e in second] == [e.id for e in first]
+        assert md_sync.entry_index.parse_count == parses
+
+    def test_only_changed_log_is_reparsed(self, md_sync, temp_workspace):
+        """Test that appending to one log re-parses only that log."""
+        self._write_log(temp_workspace, "2026-02-13", "\n### 10:00:00 - conversation\nOld entry\n")
+        log_file = self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nFirst\n")
+        md_sync.list_all_entries(limit=100)
+        parses = md_sync.entry_index.parse_count
+        
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("\n### 12:00:00 - conversation\nSecond\n")
+        entries = md_sync.list_all_entries(limit=100)
+        
+        assert md_sync.entry_index.parse_count == parses + 1
+        assert [e.content for e in entries] == ["First", "Second", "Old entry"]
+
+    def test_get_entry_by_id_uses_index(self, md_sync, temp_workspace):
+        """Test entry lookup by ID after indexing."""
+        self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nPick SQLite\n")
+        
+        entry = md_sync.get_entry_by_id("2026-02-14-11:00:00-1")
+        
+        assert entry is not None
+        assert entry.content == "Pick SQLite"
+        assert md_sync.get_entry_by_id("2026-02-14-11:00:00-2") is None
+
+    def test_deleted_log_is_dropped(self, md_sync, temp_workspace):
+        """Test that removed log files disappear from the index."""
+        self._write_log(temp_workspace, "2026-02-13", "\n### 10:00:00 - conversation\nOld entry\n")
+        log_file = self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nNew\n")
+        assert md_sync.list_available_dates() == ["2026-02-14", "2026-02-13"]
+        
+        log_file.unlink()
+        
+        assert md_sync.list_available_dates() == ["2026-02-13"]
+        assert md_sync.get_entry_by_id("2026-02-14-11:00:00-1") is None
+
+    def test_invalidate_forces_reparse(self, md_sync, temp_workspace):
+        """Test that watcher invalidation forces a re-parse."""
+        log_file = self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nNew\n")
+        md_sync.load_entries_from_log("2026-02-14")
+        parses = md_sync.entry_index.parse_count
+        
+        md_sync.entry_index.invalidate(log_file)
+        md_sync.load_entries_from_log("2026-02-14")
+        
+        assert md_sync.entry_index.parse_count == parses + 1
+
+    def test_lookups_return_copies(self, md_sync, temp_workspace):
+        """Test that callers modifying entries leave the index untouched."""
+        self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nPick SQLite\n")
+        
+        md_sync.get_entry_by_id("2026-02-14-11:00:00-1").content = "changed"
+        md_sync.load_entries_from_log("2026-02-14")[0].metadata["x"] = 1
+        md_sync.list_all_entries(limit=10)[0].content = "changed"
+        
+        entry = md_sync.get_entry_by_id("2026-02-14-11:00:00-1")
+        assert entry.content == "Pick SQLite"
+        assert entry.metadata == {}
+    
+    def test_invalidate_during_parse_is_kept(self, temp_workspace):
+        """Test that an invalidation racing a parse forces another parse."""
+        import threading
+        from src.memory.entry_index import EntryIndex
+        
+        memory_path = Path(temp_workspace) / "memory"
+        log_file = self._write_log(temp_workspace, "2026-02-14", "\n### 11:00:00 - decision\nNew\n")
+        watcher: list[threading.Thread] = []
+        
+        def parse(date, file_path):
+            if not watcher:
+                # The file watcher reports a change while this parse runs
+                watcher.append(threading.Thread(target=index.invalidate, args=(log_file,)))
+                watcher[0].start()
+                watcher[0].join(0.1)
+            return [MemoryEntry(id=f"{date}-11:00:00-1", content="New")]
+        
+        index = EntryIndex(memory_path, parse)
+        index.get_entries("2026-02-14")
+        watcher[0].join()
+        index.get_entries("2026-02-14")
+        
+        assert index.parse_count == 2
+
+
 class TestMemoryEntryValidation:
     """Tests for memory entry validation."""
 
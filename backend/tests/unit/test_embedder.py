@@ -0,0 +1,229 @@
+"""Unit tests for embedder functionality.
+
+Tests cover:
+- Batched ONNX inference (one session run per batch)
+- Length bucketing preserves input order
+- Attention-masked mean pooling
+- Mock fallback when a batch fails
+- Content-hash embedding cache (LRU, SQLite tier, facade integration)
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.memory.embedder import Embedder, MockEmbedder, ONNXEmbedder
+from src.memory.embedding_cache import EmbeddingCache
+
+
+class FakeSession:
+    """Stand-in for onnxruntime.InferenceSession.
+
+    Returns token embeddings whose first component is the token id, so
+    pooled outputs can be checked against the input ids.
+    """
+
+    def __init__(self, dim: int = 384, fail: bool = False) -> None:
+        self.dim = dim
+        self.fail = fail
+        self.calls: list[dict[str, np.ndarray]] = []
+
+    def get_inputs(self) -> list[SimpleNamespace]:
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, inputs):
+        if self.fail:
+            raise RuntimeError("inference failed")
+        self.calls.append(inputs)
+        ids = inputs["input_ids"].astype(np.float32)
+        output = np.zeros(ids.shape + (self.dim,), dtype=np.float32)
+        output[..., 0] = ids
+        output[..., 1] = 1.0
+        return [output]
+
+
+@pytest.fixture
+def embedder() -> ONNXEmbedder:
+    """ONNX embedder with a fake session and fallback tokenization."""
+    emb = ONNXEmbedder(batch_size=4)
+    emb._session = FakeSession()
+    emb._tokenizer_unavailable = True
+    return emb
+
+
+class TestONNXBatching:
+    """Tests for batched ONNX inference."""
+
+    def test_one_run_per_batch(self, embedder: ONNXEmbedder) -> None:
+        """Ten texts with batch size 4 take three session runs."""
+        texts = [f"memory {i}" for i in range(10)]
+        embeddings = embedder.embed_batch(texts)
+
+        assert len(embeddings) == 10
+        assert len(embedder._session.calls) == 3
+        assert all(len(e) == ONNXEmbedder.EMBEDDING_DIM for e in embeddings)
+
+    def test_only_declared_inputs_are_fed(self, embedder: ONNXEmbedder) -> None:
+        """Inputs the model does not declare are dropped."""
+        embedder.embed_batch(["hello"])
+        assert set(embedder._session.calls[0]) == {"input_ids", "attention_mask"}
+
+    def test_bucketing_preserves_order(self, embedder: ONNXEmbedder) -> None:
+        """Results come back in input order despite length bucketing."""
+        texts = ["a" * 50, "b", "c" * 10, "d" * 3, "e" * 30]
+        batched = embedder.embed_batch(texts)
+        single = [embedder.embed(t) for t in texts]
+
+        np.testing.assert_allclose(batched, single, rtol=1e-5, atol=1e-6)
+
+    def test_bucketing_groups_similar_lengths(self, embedder: ONNXEmbedder) -> None:
+        """Short texts are batched together, not padded to long ones."""
+        texts = ["x" * 200, "a", "b", "y" * 180, "c", "d"]
+        embedder.embed_batch(texts)
+
+        first_batch = embedder._session.calls[0]["attention_mask"]
+        assert first_batch.shape[0] == 4
+        # Short bucket is padded to the fallback minimum, not to 200 tokens
+        assert first_batch.shape[1] < 180
+
+    def test_mean_pooling_ignores_padding(self, embedder: ONNXEmbedder) -> None:
+        """Padding tokens do not contribute to the pooled vector."""
+        vec = np.array(embedder.embed_batch(["ab", "a" * 40])[0])
+
+        ids = [ord("a"), ord("b")]
+        expected = np.zeros(ONNXEmbedder.EMBEDDING_DIM)
+        expected[0] = sum(ids) / len(ids)
+        expected[1] = 1.0
+        expected /= np.linalg.norm(expected)
+        np.testing.assert_allclose(vec, expected, rtol=1e-5)
+
+    def test_empty_input(self, embedder: ONNXEmbedder) -> None:
+        """No texts means no session runs."""
+        assert embedder.embed_batch([]) == []
+        assert embedder._session.calls == []
+
+    def test_failed_batch_falls_back_to_mock(self, embedder: ONNXEmbedder) -> None:
+        """A failing session run yields mock embeddings for that batch."""
+        embedder._session = FakeSession(fail=True)
+        embeddings = embedder.embed_batch(["hello", "world"])
+
+        mock = MockEmbedder(ONNXEmbedder.EMBEDDING_DIM)
+        assert embeddings == [mock.embed("hello"), mock.embed("world")]
+
+    def test_session_options_threads(self) -> None:
+        """intra_op_num_threads is applied to the session options."""
+        created = {}
+
+        class FakeOrt:
+            class SessionOptions:
+                intra_op_num_threads = 0
+
+            @staticmethod
+            def InferenceSession(path, sess_options=None, providers=None):  # noqa: N802  (mirrors onnxruntime)
+                created["options"] = sess_options
+                return FakeSession()
+
+        emb = ONNXEmbedder(intra_op_num_threads=3)
+        emb._create_session(FakeOrt, "model.onnx", ["CPUExecutionProvider"])
+        assert created["options"].intra_op_num_threads == 3
+
+
+class CountingEmbedder(MockEmbedder):
+    """Mock embedder recording the texts it was asked to embed."""
+
+    def __init__(self) -> None:
+        super().__init__(384)
+        self.requests: list[list[str]] = []
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.requests.append(list(texts))
+        return super().embed_batch(texts)
+
+
+class TestEmbeddingCache:
+    """Tests for the content-hash embedding cache."""
+
+    def test_key_normalises_whitespace(self) -> None:
+        """Whitespace differences map to the same key."""
+        cache = EmbeddingCache("m")
+        assert cache.key("hello   world\n") == cache.key(" hello world")
+        assert cache.key("hello") != EmbeddingCache("other").key("hello")
+
+    def test_lru_eviction(self) -> None:
+        """Least recently used entries are evicted first."""
+        cache = EmbeddingCache("m", max_entries=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+
+        assert cache.get("a") == [1.0]
+        assert cache.get("b") is None
+        assert cache.get("c") == [3.0]
+
+    def test_disk_tier_survives_restart(self, tmp_path) -> None:
+        """Embeddings persisted to SQLite are found by a new cache."""
+        db_path = str(tmp_path / "cache.db")
+        cache = EmbeddingCache("m", db_path=db_path)
+        cache.put("hello", [0.5, 0.25])
+        cache.close()
+
+        reopened = EmbeddingCache("m", db_path=db_path)
+        assert reopened.get("hello") == [0.5, 0.25]
+        assert reopened.stats()["disk_hits"] == 1
+        assert EmbeddingCache("other", db_path=db_path).get("hello") is None
+
+    def test_callers_cannot_mutate_cached_embeddings(self, tmp_path) -> None:
+        """Returned and stored embeddings are copies of the cached ones."""
+        cache = EmbeddingCache("m", db_path=str(tmp_path / "cache.db"))
+        stored = [1.0, 2.0]
+        cache.put("a", stored)
+        stored[0] = 9.0
+
+        first = cache.get("a")
+        first[1] = 9.0
+        assert cache.get("a") == [1.0, 2.0]
+        assert cache.get_many(["a", "a"])[0] is not cache.get_many(["a"])[0]
+
+    def test_disk_tier_indexes_model_id(self, tmp_path) -> None:
+        """Per-model stats and clear() use an index on model_id."""
+        cache = EmbeddingCache("m", db_path=str(tmp_path / "cache.db"))
+        plan = cache._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM embedding_cache WHERE model_id = ?", ("m",)
+        ).fetchall()
+        assert any("idx_embedding_cache_model_id" in row[-1] for row in plan)
+        cache.close()
+
+    def test_embedder_only_embeds_misses(self) -> None:
+        """The facade sends only uncached, deduplicated texts to the backend."""
+        embedder = Embedder(backend="mock")
+        backend = CountingEmbedder()
+        embedder._impl = backend
+
+        first = embedder.embed_batch(["a", "b", "a"])
+        second = embedder.embed_batch(["b", "c"])
+
+        assert backend.requests == [["a", "b"], ["c"]]
+        assert first[0] == first[2] == backend.embed("a")
+        assert second[0] == first[1]
+
+        stats = embedder.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 4
+
+    def test_fallback_vectors_not_cached(self, embedder: ONNXEmbedder) -> None:
+        """Mock vectors from a failed ONNX run are not cached."""
+        facade = Embedder(backend="mock")
+        facade._impl = embedder
+        embedder._session = FakeSession(fail=True)
+        facade.embed("hello")
+
+        embedder._session = FakeSession()
+        facade.embed("hello")
+        assert len(embedder._session.calls) == 1
+
+    def test_cache_disabled(self) -> None:
+        """cache_size=0 without a path turns caching off."""
+        embedder = Embedder(backend="mock", cache_size=0)
+        assert embedder.get_cache_stats() == {"enabled": False, "model_id": "mock:384"}
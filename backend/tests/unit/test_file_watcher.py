@@ -4,6 +4,7 @@ Tests cover:
 - File event detection
 - Callback triggering
 - Memory file sync integration
+- Incremental vector re-sync
 """
 
 import pytest
@@ -357,3 +358,212 @@ class TestMemoryFileSync:
         assert count == len(entries)
         
         vector_store.close()
+
+
+class TestIncrementalVectorSync:
+    """Tests for content-hash driven vector re-sync."""
+
+    @pytest.fixture
+    def setup(self):
+        """Workspace with one daily log, a vector store and a counting embedder."""
+        from src.memory.embedder import MockEmbedder
+        from src.memory.md_sync import MarkdownSync
+        from src.memory.vector_store import VectorStore
+
+        class CountingEmbedder(MockEmbedder):
+            model_id = "counting"
+
+            def __init__(self) -> None:
+                super().__init__(384)
+                self.embedded: list[str] = []
+
+            def embed_batch(self, texts):
+                self.embedded.extend(texts)
+                return super().embed_batch(texts)
+
+        with tempfile.TemporaryDirectory() as d:
+            workspace = Path(d)
+            (workspace / "memory").mkdir()
+            log_file = workspace / "memory" / "2026-03-01.md"
+            log_file.write_text(
+                "# 2026-03-01\n\n"
+                "### 09:00 - conversation\nfirst entry\n\n"
+                "### 10:00 - decision\nsecond entry\n\n",
+                encoding="utf-8",
+            )
+            store = VectorStore(str(workspace / "test.db"))
+            store.initialize()
+            yield MarkdownSync(str(workspace)), store, CountingEmbedder(), log_file
+            store.close()
+
+    def test_initial_sync_adds_all(self, setup) -> None:
+        """First sync embeds every entry and stores hashes."""
+        md_sync, store, embedder, _ = setup
+        report = md_sync.resync_vector_store(store, embedder)
+
+        assert sorted(report.added) == ["2026-03-01-09:00-1", "2026-03-01-10:00-1"]
+        assert store.count() == 2
+        assert all(store.get_content_hashes().values())
+
+    def test_append_only_embeds_new_entry(self, setup) -> None:
+        """Appending one entry re-embeds only that entry."""
+        md_sync, store, embedder, log_file = setup
+        md_sync.resync_vector_store(store, embedder)
+        embedder.embedded.clear()
+
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("### 11:00 - conversation\nthird entry\n\n")
+        md_sync.sync_on_file_change(str(log_file), store, embedder)
+
+        assert embedder.embedded == ["third entry"]
+        assert store.count() == 3
+
+    def test_modified_and_removed_entries(self, setup) -> None:
+        """Edits are re-embedded and vanished entries deleted."""
+        md_sync, store, embedder, log_file = setup
+        md_sync.resync_vector_store(store, embedder)
+        embedder.embedded.clear()
+
+        log_file.write_text(
+            "# 2026-03-01\n\n### 09:00 - conversation\nfirst entry, edited\n\n",
+            encoding="utf-8",
+        )
+        md_sync.sync_on_file_change(str(log_file), store, embedder)
+
+        assert embedder.embedded == ["first entry, edited"]
+        assert store.get_entry("2026-03-01-10:00-1") is None
+        assert store.get_entry("2026-03-01-09:00-1")["content"] == "first entry, edited"
+
+    def test_dry_run_reports_without_writing(self, setup) -> None:
+        """Dry runs report changes but embed and write nothing."""
+        md_sync, store, embedder, _ = setup
+        report = md_sync.resync_vector_store(store, embedder, dry_run=True)
+
+        assert len(report.added) == 2
+        assert report.dry_run is True
+        assert embedder.embedded == []
+        assert store.count() == 0
+
+    def test_unchanged_resync_is_noop(self, setup) -> None:
+        """A second sync with no changes embeds nothing."""
+        md_sync, store, embedder, _ = setup
+        md_sync.resync_vector_store(store, embedder)
+        embedder.embedded.clear()
+
+        report = md_sync.resync_vector_store(store, embedder)
+        assert report.changed == 0
+        assert report.unchanged == 2
+        assert embedder.embedded == []
+
+    def test_deleted_log_keeps_vectors(self, setup) -> None:
+        """Removing a log file does not delete its vectors."""
+        md_sync, store, embedder, log_file = setup
+        md_sync.resync_vector_store(store, embedder)
+
+        log_file.unlink()
+        md_sync.sync_on_file_change(str(log_file), store, embedder)
+        assert store.count() == 2
+
+    def test_fallback_vectors_reembedded_after_recovery(self, setup) -> None:
+        """Mock vectors from a failed model run are replaced on the next sync."""
+        md_sync, store, embedder, _ = setup
+        embedder.fallback_count = 0
+        real_embed_batch = embedder.embed_batch
+
+        def failing_embed_batch(texts):
+            embedder.fallback_count += len(texts)
+            return real_embed_batch(texts)
+
+        embedder.embed_batch = failing_embed_batch
+        md_sync.resync_vector_store(store, embedder)
+        assert store.count() == 2
+        assert not any(store.get_content_hashes().values())
+
+        embedder.embed_batch = real_embed_batch
+        embedder.embedded.clear()
+        report = md_sync.resync_vector_store(store, embedder)
+
+        assert sorted(report.modified) == ["2026-03-01-09:00-1", "2026-03-01-10:00-1"]
+        assert sorted(embedder.embedded) == ["first entry", "second entry"]
+        assert all(store.get_content_hashes().values())
+
+
+class TestEventDebouncer:
+    """Tests for debounced, coalescing event dispatch."""
+
+    def test_burst_is_coalesced_per_path(self) -> None:
+        """A burst of events for one path runs the callback once."""
+        from src.memory.file_watcher import EventDebouncer
+
+        calls: list[str] = []
+        debouncer = EventDebouncer(window=0.05)
+        for _ in range(5):
+            debouncer.submit("/w/memory/a.md", calls.append, "a")
+        debouncer.submit("/w/memory/b.md", calls.append, "b")
+        debouncer.flush()
+
+        assert sorted(calls) == ["a", "b"]
+        stats = debouncer.get_stats()
+        assert stats["events"] == 6
+        assert stats["coalesced"] == 4
+        assert stats["dispatched"] == 2
+        debouncer.stop()
+
+    def test_callbacks_run_off_caller_thread(self) -> None:
+        """Callbacks run on the worker thread, not the watchdog thread."""
+        import threading
+        from src.memory.file_watcher import EventDebouncer
+
+        threads: list[str] = []
+        debouncer = EventDebouncer(window=0.01)
+        debouncer.submit("k", lambda: threads.append(threading.current_thread().name))
+        debouncer.flush()
+
+        assert threads == ["file-event-debouncer"]
+        debouncer.stop()
+
+    def test_stop_runs_pending(self) -> None:
+        """Pending callbacks still run on shutdown."""
+        from src.memory.file_watcher import EventDebouncer
+
+        calls: list[int] = []
+        debouncer = EventDebouncer(window=10.0)
+        debouncer.submit("k", calls.append, 1)
+        debouncer.stop()
+
+        assert calls == [1]
+
+    def test_handler_uses_debouncer(self) -> None:
+        """Handler events are coalesced when a debouncer is configured."""
+        from watchdog.events import FileModifiedEvent
+        from src.memory.file_watcher import EventDebouncer
+
+        on_memory = MagicMock()
+        debouncer = EventDebouncer(window=0.05)
+        handler = MemoryFileHandler(on_memory_changed=on_memory, debouncer=debouncer)
+        for _ in range(3):
+            handler.on_modified(FileModifiedEvent("/workspace/memory/2026-02-14.md"))
+        debouncer.flush()
+
+        on_memory.assert_called_once_with("/workspace/memory/2026-02-14.md")
+        debouncer.stop()
+
+    def test_self_writes_are_ignored(self, tmp_path: Path) -> None:
+        """Events for files this process just wrote are skipped."""
+        from watchdog.events import FileModifiedEvent
+        from src.memory.file_watcher import mark_self_write
+
+        on_owner = MagicMock()
+        handler = MemoryFileHandler(on_owner_changed=on_owner)
+        owner = tmp_path / "OWNER.md"
+        owner.write_text("written by us", encoding="utf-8")
+        mark_self_write(owner)
+
+        handler.on_modified(FileModifiedEvent(str(owner)))
+        on_owner.assert_not_called()
+        assert handler.ignored_self_writes == 1
+
+        # An external edit afterwards is handled again
+        owner.write_text("edited by the user", encoding="utf-8")
+        handler.on_modified(FileModifiedEvent(str(owner)))
+        on_owner.assert_called_once()
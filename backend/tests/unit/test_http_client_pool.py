@@ -0,0 +1,124 @@
+"""Unit tests for the shared web fetch HTTP client pool.
+
+Tests cover:
+- Repeated requests to a host reuse one keep-alive connection
+- Concurrent requests per host are capped
+- close() releases the pooled clients
+- Cookies set by one response are not sent with later requests
+"""
+
+import asyncio
+
+import pytest
+
+from src.tools.builtin.web_fetch.http_client import HTTPClient, HTTPClientPool
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 server that counts connections and concurrency."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.requests: list[bytes] = []
+        self.response_headers = b""
+        self.server: asyncio.base_events.Server | None = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                self.requests.append(request)
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(self.delay)
+                self.active -= 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 2\r\n"
+                    + self.response_headers
+                    + b"\r\nok"
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @property
+    def url(self) -> str:
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/page"
+
+
+@pytest.fixture
+async def server():
+    instance = KeepAliveServer()
+    instance.server = await asyncio.start_server(instance.handle, "127.0.0.1", 0)
+    yield instance
+    instance.server.close()
+    await instance.server.wait_closed()
+
+
+class TestHTTPClientPool:
+    """Tests for HTTPClientPool."""
+
+    async def test_requests_reuse_connection(self, server: KeepAliveServer) -> None:
+        """Sequential fetches and downloads share one connection."""
+        pool = HTTPClientPool()
+        client = HTTPClient(pool=pool)
+        for _ in range(5):
+            response = await client.fetch(server.url)
+            assert response.text == "ok"
+        assert await client.download(server.url) == b"ok"
+
+        assert server.connections == 1
+        assert pool.get_stats()["requests"] == 6
+        await pool.close()
+
+    async def test_per_host_cap(self, server: KeepAliveServer) -> None:
+        """No more than max_per_host requests to a host run at once."""
+        server.delay = 0.05
+        pool = HTTPClientPool(max_per_host=2)
+        client = HTTPClient(pool=pool)
+        await asyncio.gather(*(client.fetch(server.url) for _ in range(6)))
+
+        assert server.peak == 2
+        assert server.connections <= 2
+        assert pool.get_stats()["active_hosts"] == 0
+        await pool.close()
+
+    async def test_close_releases_clients(self, server: KeepAliveServer) -> None:
+        """Closed pools hold no clients; the next request opens a new one."""
+        pool = HTTPClientPool()
+        client = HTTPClient(pool=pool)
+        await client.fetch(server.url)
+        await pool.close()
+        assert pool.get_stats()["open_clients"] == 0
+
+        await client.fetch(server.url)
+        assert pool.get_stats()["clients_created"] == 2
+        await pool.close()
+
+    async def test_cookies_not_kept(self, server: KeepAliveServer) -> None:
+        """Cookies set by a response are not sent with later requests."""
+        server.response_headers = b"Set-Cookie: session=abc; Path=/\r\n"
+        pool = HTTPClientPool()
+        client = HTTPClient(pool=pool)
+        await client.fetch(server.url)
+        await client.fetch(server.url)
+        await pool.close()
+
+        assert len(server.requests) == 2
+        assert b"cookie:" not in server.requests[1].lower()
+
+    def test_http2_needs_h2(self, monkeypatch) -> None:
+        """HTTP/2 is only enabled when h2 is importable."""
+        from src.tools.builtin.web_fetch import http_client
+
+        monkeypatch.setattr(http_client, "HTTP2_AVAILABLE", False)
+        assert HTTPClientPool(http2=True).http2 is False
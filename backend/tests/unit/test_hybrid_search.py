@@ -98,6 +98,138 @@ class TestTextSimilaritySearch:
         assert results == []
 
 
+class TestInvertedIndex:
+    """Tests for the BM25 inverted index behind text search."""
+
+    @pytest.fixture
+    def text_search(self) -> TextSimilaritySearch:
+        """Create text search instance."""
+        return TextSimilaritySearch()
+
+    def test_rare_terms_weigh_more(self, text_search: TextSimilaritySearch) -> None:
+        """Test that document frequency drives IDF."""
+        index = text_search.index
+        index.sync([
+            ("a", "react hooks"),
+            ("b", "react router"),
+            ("c", "sqlite storage"),
+        ])
+        
+        assert index.document_frequency("react") == 2
+        assert index.idf("sqlite") > index.idf("react")
+        assert index.idf("unknown") == 0.0
+
+    def test_cjk_character_tokens_indexed(self, text_search: TextSimilaritySearch) -> None:
+        """Test that per-character CJK tokens are searchable."""
+        entries = [
+            MemoryEntry(id="zh", content="选择 SQLite 作为本地存储"),
+            MemoryEntry(id="en", content="prefers dark mode"),
+        ]
+        
+        results = text_search.search("存", entries)
+        
+        assert [r.entry.id for r in results] == ["zh"]
+
+    def test_sync_only_retokenizes_changed_entries(self, text_search: TextSimilaritySearch) -> None:
+        """Test incremental updates on append, edit and delete."""
+        entries = [
+            MemoryEntry(id="a", content="react frontend"),
+            MemoryEntry(id="b", content="sqlite storage"),
+        ]
+        assert text_search.index.sync((e.id, e.content) for e in entries) == (2, 0)
+        assert text_search.index.sync((e.id, e.content) for e in entries) == (0, 0)
+        
+        entries.append(MemoryEntry(id="c", content="react native"))
+        entries[1] = MemoryEntry(id="b", content="postgres storage")
+        assert text_search.index.sync((e.id, e.content) for e in entries) == (2, 0)
+        
+        del entries[0]
+        assert text_search.index.sync((e.id, e.content) for e in entries) == (0, 1)
+        assert text_search.index.document_frequency("react") == 1
+        assert text_search.index.document_frequency("sqlite") == 0
+
+    def test_non_matching_entries_excluded(self, text_search: TextSimilaritySearch) -> None:
+        """Test that entries sharing no terms with the query are not returned."""
+        entries = [
+            MemoryEntry(id="a", content="react frontend"),
+            MemoryEntry(id="b", content="sqlite storage"),
+        ]
+        
+        results = text_search.search("react", entries)
+        
+        assert [r.entry.id for r in results] == ["a"]
+        assert 0.0 < results[0].text_score < 1.0
+
+    def test_weak_single_term_match_stays_below_dedup_threshold(
+        self,
+        text_search: TextSimilaritySearch,
+    ) -> None:
+        """Test that scores are absolute, not relative to the best candidate."""
+        entries = [
+            MemoryEntry(id="a", content="ValueError raised by web_fetch while parsing the page"),
+            MemoryEntry(id="b", content="user prefers dark mode in the editor"),
+            MemoryEntry(id="c", content="sqlite storage chosen for local data"),
+        ]
+        
+        results = text_search.search("TimeoutError read_file ValueError", entries)
+        
+        assert [r.entry.id for r in results] == ["a"]
+        assert results[0].text_score < 0.85
+
+    def test_scoring_does_not_mutate_index(self, text_search: TextSimilaritySearch) -> None:
+        """Test that candidate sets are scored without re-syncing the index."""
+        text_search.index.sync([("a", "react frontend"), ("b", "sqlite storage")])
+        
+        scores = text_search.score("react native", {
+            "a": MemoryEntry(id="a", content="react frontend"),
+            "x": MemoryEntry(id="x", content="react native app"),
+        })
+        
+        assert set(scores) == {"a", "x"}
+        assert scores["x"] > scores["a"]
+        assert "b" in text_search.index
+        assert "x" not in text_search.index
+
+    def test_attach_follows_entry_index_changes(
+        self,
+        text_search: TextSimilaritySearch,
+        tmp_path,
+    ) -> None:
+        """Test that the index is maintained from EntryIndex events."""
+        from src.memory.entry_index import EntryIndex
+        
+        def parse(date, file_path):
+            lines = file_path.read_text().splitlines()
+            return [
+                MemoryEntry(id=f"{date}-{i}", content=line)
+                for i, line in enumerate(lines)
+            ]
+        
+        log = tmp_path / "2026-02-14.md"
+        log.write_text("react frontend\nsqlite storage\n")
+        entry_index = EntryIndex(tmp_path, parse)
+        entry_index.refresh()
+        
+        text_search.attach(entry_index)
+        text_search.attach(entry_index)
+        assert len(text_search.index) == 2
+        
+        log.write_text("react frontend\n")
+        entry_index.invalidate(log)
+        entry_index.refresh()
+        assert "2026-02-14-1" not in text_search.index
+        assert text_search.index.document_frequency("sqlite") == 0
+        
+        log.unlink()
+        entry_index.refresh()
+        assert len(text_search.index) == 0
+        
+        text_search.detach()
+        log.write_text("sqlite storage\n")
+        entry_index.refresh()
+        assert len(text_search.index) == 0
+
+
 class TestHybridSearch:
     """Tests for hybrid search functionality."""
 
@@ -260,6 +392,78 @@ class TestHybridSearch:
         assert results == []
 
 
+class TestHybridFusion:
+    """Tests for score fusion modes in hybrid search."""
+
+    class _Embedder:
+        """Minimal non-mock embedder stub."""
+
+        def embed(self, text: str) -> list[float]:
+            return [0.1] * 4
+
+    @pytest.fixture
+    def entries(self) -> list[MemoryEntry]:
+        """Create entries where vector and text rankings disagree."""
+        return [
+            MemoryEntry(id="v-top", content="unrelated content"),
+            MemoryEntry(id="both", content="react frontend"),
+            MemoryEntry(id="t-top", content="react react hooks"),
+        ]
+
+    @pytest.fixture
+    def vector_store(self) -> MagicMock:
+        """Vector store returning a fixed ranking, including an unknown ID."""
+        mock = MagicMock()
+        mock.search.return_value = [
+            {"id": "v-top", "score": 0.9},
+            {"id": "missing", "score": 0.8},
+            {"id": "both", "score": 0.5},
+        ]
+        return mock
+
+    def test_weighted_fusion_uses_id_map(self, vector_store: MagicMock, entries: list[MemoryEntry]) -> None:
+        """Test weighted fusion joins vector hits to entries by ID."""
+        search = HybridSearch(vector_store=vector_store, embedder=self._Embedder())
+        
+        results = search.search("react", entries)
+        by_id = {r.entry.id: r for r in results}
+        
+        assert "missing" not in by_id
+        assert by_id["v-top"].vector_score == 0.9
+        assert by_id["both"].text_score > 0
+        for result in results:
+            assert result.score == pytest.approx(0.7 * result.vector_score + 0.3 * result.text_score)
+
+    def test_rrf_fusion(self, vector_store: MagicMock, entries: list[MemoryEntry]) -> None:
+        """Test reciprocal-rank fusion favours entries ranked by both lists."""
+        search = HybridSearch(
+            vector_store=vector_store,
+            embedder=self._Embedder(),
+            vector_weight=0.5,
+            text_weight=0.5,
+            fusion="rrf",
+        )
+        
+        results = search.search("react", entries)
+        
+        assert results[0].entry.id == "both"
+        assert all(0 < r.score <= 1 for r in results)
+
+    def test_unknown_fusion_rejected(self) -> None:
+        """Test that an invalid fusion mode fails fast."""
+        with pytest.raises(ValueError):
+            HybridSearch(fusion="max")
+
+    def test_top_k_and_offset(self, vector_store: MagicMock, entries: list[MemoryEntry]) -> None:
+        """Test pagination over the heap-selected window."""
+        search = HybridSearch(vector_store=vector_store, embedder=self._Embedder())
+        
+        full = search.search("react", entries, limit=3)
+        page = search.search("react", entries, limit=1, offset=1)
+        
+        assert [r.entry.id for r in page] == [full[1].entry.id]
+
+
 class TestSearchResult:
     """Tests for SearchResult model."""
 
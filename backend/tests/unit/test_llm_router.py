@@ -0,0 +1,602 @@
+"""Unit tests for LLM router provider health handling.
+
+Tests cover:
+- Chat requests never wait on a provider health check
+- Passive health feed from request outcomes
+- Unhealthy providers are deprioritised, not skipped
+- TTL expiry and exponential probe backoff
+- Background probing and cached status reporting
+- Latency tracking, "fastest" ordering and hedged requests
+- Response cache (keys, TTL, SQLite tier, opt-in, streaming replay)
+- Coalescing of concurrent identical requests
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any
+
+import pytest
+
+from src.services.llm import response_cache as response_cache_module
+from src.services.llm import router as router_module
+from src.services.llm.health_monitor import ProviderHealthMonitor
+from src.services.llm.provider import LLMProvider, LLMResponse, StreamingLLMResponse
+from src.services.llm.router import LLMRouter
+from src.services.llm.response_cache import ResponseCache, request_key
+from src.services.llm.routing_policy import LatencyTracker, RoutingPolicy, latency_key
+
+
+class FakeProvider(LLMProvider):
+    """Provider with scripted chat and health check results."""
+
+    def __init__(self, name: str, fail: bool = False, healthy: bool = True, delay: float = 0.0) -> None:
+        super().__init__({"name": name, "model_id": f"{name}-model"})
+        self.fail = fail
+        self.healthy = healthy
+        self.delay = delay
+        self.chat_calls = 0
+        self.health_calls = 0
+        self.cancelled = 0
+
+    async def chat(self, messages: list[dict[str, str]], stream: bool = False, **kwargs: Any) -> Any:
+        self.chat_calls += 1
+        if stream:
+            return self._stream()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return LLMResponse(content=f"reply from {self.name}", model=self.model_id)
+
+    async def _stream(self):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        for word in ("reply", "from", self.name):
+            yield StreamingLLMResponse(content=word + " ", model=self.model_id)
+
+    async def health_check(self) -> bool:
+        self.health_calls += 1
+        return self.healthy
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+
+def unique(prefix: str) -> str:
+    """Provider name not shared with the global circuit breakers of other tests."""
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+class NullStatService:
+    """Stat service that records nothing."""
+
+    async def record_request(self, **kwargs: Any) -> None:
+        pass
+
+
+class NullPromptLogger:
+    """Prompt logger that writes nothing."""
+
+    def log_interaction(self, **kwargs: Any) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch) -> None:
+    """Keep router tests off the stats database and the prompt log."""
+    monkeypatch.setattr("src.services.stat_service.get_stat_service", lambda: NullStatService())
+    monkeypatch.setattr("src.utils.logger.get_llm_prompt_logger", lambda: NullPromptLogger())
+
+
+@pytest.fixture
+def monitor(monkeypatch) -> ProviderHealthMonitor:
+    """Fresh health monitor used by routers created in the test."""
+    mon = ProviderHealthMonitor(interval=30.0, ttl=60.0, max_backoff=300.0, jitter=0.0)
+    monkeypatch.setattr(router_module, "provider_health_monitor", mon)
+    return mon
+
+
+@pytest.fixture
+def policy(monkeypatch) -> RoutingPolicy:
+    """Fresh routing policy used by routers created in the test."""
+    pol = RoutingPolicy(min_samples=3, hedge_min_delay_ms=0.0)
+    monkeypatch.setattr(router_module, "routing_policy", pol)
+    return pol
+
+
+def warm_up(policy: RoutingPolicy, name: str, latency_ms: float, stream: bool = False) -> None:
+    """Give a provider enough latency samples to be ranked and hedged."""
+    for _ in range(policy.min_samples):
+        policy.record_latency(name, stream, latency_ms)
+
+
+def make_router(monkeypatch, primary: FakeProvider, *backups: FakeProvider) -> LLMRouter:
+    """Build a router over fake providers without reading configuration."""
+    def load(self: LLMRouter) -> None:
+        self._primary = primary
+        self._backups = list(backups)
+        self._providers = {p.name: p for p in (primary, *backups)}
+
+    monkeypatch.setattr(LLMRouter, "_load_providers", load)
+    return LLMRouter()
+
+
+class TestChatHealthHandling:
+    """Tests for health handling on the chat path."""
+
+    async def test_chat_does_not_probe(self, monkeypatch, monitor) -> None:
+        """A chat request goes straight to the provider."""
+        primary = FakeProvider(unique("primary"))
+        router = make_router(monkeypatch, primary)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {primary.name}"
+        assert primary.health_calls == 0
+        await monitor.stop()
+
+    async def test_request_failure_marks_unhealthy(self, monkeypatch, monitor) -> None:
+        """A failed request feeds the cached status and the backup answers."""
+        primary = FakeProvider(unique("primary"), fail=True)
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {backup.name}"
+        status = router.get_health_status()
+        assert status[primary.name]["is_healthy"] is False
+        assert status[primary.name]["source"] == "request"
+        assert status[backup.name]["is_healthy"] is True
+        await monitor.stop()
+
+    async def test_unhealthy_primary_is_tried_last(self, monkeypatch, monitor) -> None:
+        """A known-unhealthy primary is deprioritised behind healthy backups."""
+        primary = FakeProvider(unique("primary"))
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        monitor.record_failure(primary.name, "timeout")
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {backup.name}"
+        assert primary.chat_calls == 0
+        await monitor.stop()
+
+    async def test_unhealthy_provider_still_used_as_last_resort(self, monkeypatch, monitor) -> None:
+        """With every provider marked unhealthy the router still tries them."""
+        primary = FakeProvider(unique("primary"))
+        router = make_router(monkeypatch, primary)
+        monitor.record_failure(primary.name, "timeout")
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {primary.name}"
+        assert monitor.is_healthy(primary.name)
+        await monitor.stop()
+
+
+class TestProviderHealthMonitor:
+    """Tests for cached provider health."""
+
+    def test_unknown_provider_is_healthy(self, monitor) -> None:
+        """Providers without observations are assumed healthy."""
+        assert monitor.is_healthy("never-seen")
+
+    def test_status_expires_after_ttl(self, monitor) -> None:
+        """An unhealthy status older than the TTL counts as unknown."""
+        monitor.register(FakeProvider("p"))
+        monitor.record_failure("p", "boom")
+        assert not monitor.is_healthy("p")
+
+        monitor._states["p"].checked_at = time.monotonic() - monitor.ttl - 1
+        assert monitor.is_healthy("p")
+        assert monitor.get_health_status()["p"]["stale"] is True
+        # Expiry schedules an immediate probe
+        assert monitor._states["p"].next_probe_at <= time.monotonic()
+
+    def test_failures_back_off_exponentially(self, monitor) -> None:
+        """Each consecutive failure doubles the probe delay up to the cap."""
+        delays = []
+        for _ in range(6):
+            monitor.record_failure("p", "boom")
+            delays.append(monitor._states["p"].next_probe_at - time.monotonic())
+
+        assert [round(d) for d in delays] == [30, 60, 120, 240, 300, 300]
+
+    def test_success_resets_backoff(self, monitor) -> None:
+        """A success clears the failure count."""
+        monitor.record_failure("p", "boom")
+        monitor.record_failure("p", "boom")
+        monitor.record_success("p")
+
+        status = monitor.get_health_status()["p"]
+        assert status["is_healthy"] is True
+        assert status["consecutive_failures"] == 0
+        assert status["last_error"] is None
+
+    async def test_probe_timeout_counts_as_failure(self, monitor) -> None:
+        """A hanging health check fails once the probe timeout passes."""
+        class HangingProvider(FakeProvider):
+            async def health_check(self) -> bool:
+                await asyncio.sleep(10)
+                return True
+
+        monitor.probe_timeout = 0.01
+        monitor.register(HangingProvider("slow"))
+
+        assert await monitor.probe("slow") is False
+        assert not monitor.is_healthy("slow")
+
+    async def test_background_loop_probes_due_providers(self, monitor) -> None:
+        """The background task probes registered providers without any request."""
+        provider = FakeProvider("bg", healthy=False)
+        monitor.register(provider)
+        monitor._states["bg"].next_probe_at = 0.0
+        monitor.ensure_started()
+
+        for _ in range(50):
+            if provider.health_calls:
+                break
+            await asyncio.sleep(0.01)
+        await monitor.stop()
+
+        assert provider.health_calls == 1
+        assert monitor.get_health_status()["bg"]["source"] == "probe"
+        assert not monitor.is_healthy("bg")
+
+    async def test_router_health_check_refreshes_cache(self, monkeypatch, monitor) -> None:
+        """An explicit live health check updates the cached status."""
+        primary = FakeProvider(unique("primary"), healthy=False)
+        router = make_router(monkeypatch, primary)
+
+        assert await router.health_check() == {primary.name: False}
+        assert router.get_health_status()[primary.name]["is_healthy"] is False
+        await monitor.stop()
+
+
+class TestLatencyTracker:
+    """Tests for latency statistics."""
+
+    def test_percentiles(self) -> None:
+        """Nearest-rank percentiles over the sample window."""
+        tracker = LatencyTracker(window=100)
+        for ms in range(1, 101):
+            tracker.record("p", float(ms))
+
+        assert tracker.percentile("p", 50) == 50
+        assert tracker.percentile("p", 95) == 95
+        assert tracker.percentile("missing", 95) is None
+
+    def test_window_bounds_samples(self) -> None:
+        """Old samples fall out of the window."""
+        tracker = LatencyTracker(window=10)
+        for ms in [1000.0] * 10 + [10.0] * 10:
+            tracker.record("p", ms)
+
+        assert tracker.count("p") == 10
+        assert tracker.percentile("p", 95) == 10.0
+
+    def test_ewma_tracks_recent_latency(self) -> None:
+        """EWMA moves toward new samples."""
+        tracker = LatencyTracker(alpha=0.5)
+        tracker.record("p", 100.0)
+        tracker.record("p", 200.0)
+        assert tracker.ewma("p") == 150.0
+
+
+class TestRoutingPolicy:
+    """Tests for latency-aware provider selection."""
+
+    async def test_fastest_strategy_prefers_low_latency(self, monkeypatch, monitor, policy) -> None:
+        """With "fastest", a faster backup is tried before a slow primary."""
+        primary = FakeProvider(unique("primary"))
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        policy.strategy = "fastest"
+        warm_up(policy, primary.name, 900.0)
+        warm_up(policy, backup.name, 100.0)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {backup.name}"
+        assert primary.chat_calls == 0
+        await monitor.stop()
+
+    async def test_priority_strategy_keeps_order(self, monkeypatch, monitor, policy) -> None:
+        """The default strategy ignores latency."""
+        primary = FakeProvider(unique("primary"))
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        warm_up(policy, primary.name, 900.0)
+        warm_up(policy, backup.name, 100.0)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {primary.name}"
+        await monitor.stop()
+
+    def test_unsampled_providers_rank_first(self, policy) -> None:
+        """Providers without enough samples are explored before ranked ones."""
+        policy.strategy = "fastest"
+        fast, new = FakeProvider("fast"), FakeProvider("new")
+        warm_up(policy, "fast", 50.0)
+
+        assert policy.order([fast, new], lambda name: True) == [new, fast]
+        assert policy.order([fast, new], lambda name: name != "new") == [fast, new]
+
+    def test_hedge_delay_from_p95(self, policy) -> None:
+        """The hedge deadline is the clamped p95 and needs enough samples."""
+        policy.hedge_enabled = True
+        policy.hedge_max_delay_ms = 500.0
+        assert policy.hedge_delay("p", stream=False) is None
+
+        warm_up(policy, "p", 200.0)
+        assert policy.hedge_delay("p", stream=False) == pytest.approx(0.2)
+        assert policy.hedge_delay("p", stream=True) is None
+
+        warm_up(policy, "p", 2000.0)
+        assert policy.hedge_delay("p", stream=False) == pytest.approx(0.5)
+
+
+class TestHedgedRequests:
+    """Tests for hedged requests."""
+
+    async def test_slow_primary_is_hedged(self, monkeypatch, monitor, policy) -> None:
+        """The backup answers when the primary misses its deadline; the primary is cancelled."""
+        primary = FakeProvider(unique("primary"), delay=5.0)
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        policy.hedge_enabled = True
+        warm_up(policy, primary.name, 20.0)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {backup.name}"
+        assert primary.cancelled == 1
+        assert policy.hedges_started == policy.hedges_won == 1
+        # The cancelled attempt is recorded as a lower bound on its latency
+        assert policy.tracker.count(latency_key(primary.name, False)) == policy.min_samples + 1
+        await monitor.stop()
+
+    async def test_fast_primary_is_not_hedged(self, monkeypatch, monitor, policy) -> None:
+        """No backup request is made when the primary meets its deadline."""
+        primary = FakeProvider(unique("primary"))
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        policy.hedge_enabled = True
+        warm_up(policy, primary.name, 500.0)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {primary.name}"
+        assert backup.chat_calls == 0
+        assert policy.hedges_started == 0
+        await monitor.stop()
+
+    async def test_hedge_failure_keeps_primary(self, monkeypatch, monitor, policy) -> None:
+        """A failing hedge does not abort the slower primary."""
+        primary = FakeProvider(unique("primary"), delay=0.1)
+        backup = FakeProvider(unique("backup"), fail=True)
+        router = make_router(monkeypatch, primary, backup)
+        policy.hedge_enabled = True
+        warm_up(policy, primary.name, 10.0)
+
+        result = await router.chat([{"role": "user", "content": "hi"}])
+
+        assert result.content == f"reply from {primary.name}"
+        assert not monitor.is_healthy(backup.name)
+        await monitor.stop()
+
+    async def test_streaming_hedge_on_first_token(self, monkeypatch, monitor, policy) -> None:
+        """Streams are hedged on time to first chunk and the winner's chunks are returned."""
+        primary = FakeProvider(unique("primary"), delay=5.0)
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        policy.hedge_enabled = True
+        warm_up(policy, primary.name, 20.0, stream=True)
+
+        stream = await router.chat([{"role": "user", "content": "hi"}], stream=True)
+        content = "".join([chunk.content async for chunk in stream])
+
+        assert content.strip() == f"reply from {backup.name}"
+        assert primary.cancelled == 1
+        await monitor.stop()
+
+    async def test_stream_error_before_first_token_fails_over(self, monkeypatch, monitor, policy) -> None:
+        """A stream that fails before its first chunk falls over to the backup."""
+        primary = FakeProvider(unique("primary"), fail=True)
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+
+        stream = await router.chat([{"role": "user", "content": "hi"}], stream=True)
+        content = "".join([chunk.content async for chunk in stream])
+
+        assert content.strip() == f"reply from {backup.name}"
+        assert not monitor.is_healthy(primary.name)
+        await monitor.stop()
+
+
+@pytest.fixture
+def response_cache(monkeypatch) -> ResponseCache:
+    """Fresh global response cache."""
+    cache = ResponseCache(max_entries=10, ttl=60.0)
+    monkeypatch.setattr(response_cache_module, "_response_cache", cache)
+    return cache
+
+
+class TestResponseCache:
+    """Tests for the LLM response cache."""
+
+    def test_key_is_canonical(self) -> None:
+        """Dict ordering and None parameters do not change the key."""
+        messages = [{"role": "user", "content": "hi"}]
+        tools = [{"type": "function", "function": {"name": "f", "parameters": {"a": 1, "b": 2}}}]
+        reordered = [{"function": {"parameters": {"b": 2, "a": 1}, "name": "f"}, "type": "function"}]
+
+        assert request_key("m", messages, tools=tools) == request_key("m", messages, tools=reordered, temperature=None)
+        assert request_key("m", messages) != request_key("m", messages, temperature=0.7)
+        assert request_key("m", messages) != request_key("other", messages)
+
+    def test_entries_expire(self, response_cache) -> None:
+        """Entries are dropped once their TTL has passed."""
+        response_cache.put("k", LLMResponse(content="hello", model="m"), ttl=-1)
+        assert response_cache.get("k") is None
+        assert response_cache.stats()["expired"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path) -> None:
+        """Responses persisted to SQLite are found by a new cache."""
+        db_path = str(tmp_path / "responses.db")
+        cache = ResponseCache(db_path=db_path)
+        cache.put("k", LLMResponse(content="hello", model="m", usage={"total_tokens": 3}))
+        cache.close()
+
+        reopened = ResponseCache(db_path=db_path)
+        cached = reopened.get("k")
+        assert cached.content == "hello"
+        assert cached.usage == {"total_tokens": 3}
+        assert cached.metadata == {"cached": True}
+        assert reopened.stats()["disk_hits"] == 1
+
+    async def test_opted_in_calls_are_cached(self, monkeypatch, monitor, response_cache) -> None:
+        """A repeated opted-in call is answered from the cache."""
+        primary = FakeProvider(unique("primary"))
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "classify this"}]
+
+        first = await router.chat(messages, cache=True)
+        second = await router.chat(messages, cache=True)
+
+        assert primary.chat_calls == 1
+        assert second.content == first.content
+        assert second.metadata == {"cached": True}
+        assert response_cache.stats()["hit_rate"] == 0.5
+        await monitor.stop()
+
+    async def test_backup_response_is_not_cached(self, monkeypatch, monitor, response_cache) -> None:
+        """A response from a backup model is not stored under the primary's key."""
+        primary = FakeProvider(unique("primary"), fail=True)
+        backup = FakeProvider(unique("backup"))
+        router = make_router(monkeypatch, primary, backup)
+        messages = [{"role": "user", "content": "classify this"}]
+
+        response = await router.chat(messages, cache=True)
+
+        assert response.content == f"reply from {backup.name}"
+        assert response_cache.stats()["stores"] == 0
+        await monitor.stop()
+
+    async def test_calls_are_uncached_by_default(self, monkeypatch, monitor, response_cache) -> None:
+        """Calls that do not opt in always reach the provider."""
+        primary = FakeProvider(unique("primary"))
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "hello"}]
+
+        await router.chat(messages)
+        await router.chat(messages)
+        response_cache.default_enabled = True
+        await router.chat(messages, cache=False)
+
+        assert primary.chat_calls == 3
+        assert response_cache.stats()["stores"] == 0
+        await monitor.stop()
+
+    async def test_streaming_is_recorded_and_replayed(self, monkeypatch, monitor, response_cache) -> None:
+        """A completed stream is cached and replayed as a stream."""
+        primary = FakeProvider(unique("primary"))
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "stream please"}]
+
+        stream = await router.chat(messages, stream=True, cache=True)
+        first = "".join([chunk.content async for chunk in stream])
+        replay = await router.chat(messages, stream=True, cache=True)
+        chunks = [chunk async for chunk in replay]
+
+        assert primary.chat_calls == 1
+        assert "".join(chunk.content for chunk in chunks) == first
+        assert chunks[-1].is_finished
+        await monitor.stop()
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight LLM requests."""
+
+    async def test_identical_requests_share_one_call(self, monkeypatch, monitor, policy) -> None:
+        """Concurrent identical non-streaming requests reach the provider once."""
+        primary = FakeProvider(unique("primary"), delay=0.02)
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "which skill?"}]
+
+        results = await asyncio.gather(*(router.chat(messages, coalesce=True) for _ in range(4)))
+
+        assert primary.chat_calls == 1
+        assert {r.content for r in results} == {f"reply from {primary.name}"}
+        await monitor.stop()
+
+    async def test_only_cache_eligible_calls_coalesce_by_default(
+        self, monkeypatch, monitor, policy, response_cache
+    ) -> None:
+        """Sampled calls are not shared unless they opt in or are cache-eligible."""
+        primary = FakeProvider(unique("primary"), delay=0.02)
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "tell me a story"}]
+
+        await asyncio.gather(*(router.chat(messages, temperature=0.9) for _ in range(3)))
+        assert primary.chat_calls == 3
+
+        await asyncio.gather(*(router.chat(messages, cache=True) for _ in range(3)))
+        assert primary.chat_calls == 4
+        await monitor.stop()
+
+    async def test_each_caller_is_recorded(self, monkeypatch, monitor, policy) -> None:
+        """Coalesced callers get their own stats and prompt log entries."""
+        recorded: list[dict] = []
+        logged: list[dict] = []
+
+        class RecordingStats:
+            async def record_request(self, **kwargs: Any) -> None:
+                recorded.append(kwargs)
+
+        class RecordingPromptLogger:
+            def log_interaction(self, **kwargs: Any) -> None:
+                logged.append(kwargs)
+
+        monkeypatch.setattr("src.services.stat_service.get_stat_service", lambda: RecordingStats())
+        monkeypatch.setattr("src.utils.logger.get_llm_prompt_logger", lambda: RecordingPromptLogger())
+        primary = FakeProvider(unique("primary"), delay=0.02)
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "which skill?"}]
+
+        await asyncio.gather(*(
+            router.chat(messages, session_id=f"s{i}", coalesce=True) for i in range(3)
+        ))
+
+        assert primary.chat_calls == 1
+        assert sorted(r["session_id"] for r in recorded) == ["s0", "s1", "s2"]
+        assert sorted(entry["session_id"] for entry in logged) == ["s0", "s1", "s2"]
+        await monitor.stop()
+
+    async def test_streaming_and_disabled_are_not_coalesced(self, monkeypatch, monitor, policy) -> None:
+        """Streams and calls with coalescing turned off each reach the provider."""
+        primary = FakeProvider(unique("primary"), delay=0.02)
+        router = make_router(monkeypatch, primary)
+        messages = [{"role": "user", "content": "hello"}]
+
+        streams = await asyncio.gather(*(router.chat(messages, stream=True) for _ in range(2)))
+        for stream in streams:
+            [chunk async for chunk in stream]
+        policy.coalesce_requests = False
+        await asyncio.gather(*(router.chat(messages, coalesce=True) for _ in range(2)))
+
+        assert primary.chat_calls == 4
+        await monitor.stop()
@@ -0,0 +1,188 @@
+"""Unit tests for web content Markdown storage.
+
+Tests cover:
+- Page images are downloaded concurrently, bounded per page
+- Oversized images are skipped
+- Identical images are stored once and linked into each page
+- Known image URLs are downloaded again once stale or on page revalidation
+- Content size counts each stored image once across pages
+- Cleanup prunes stored images no page uses
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from src.tools.builtin.web_fetch.http_client import HTTPClient, HTTPClientPool
+from src.tools.builtin.web_fetch.markdown_storage import MarkdownStorageManager
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+GIF = b"GIF89a" + b"\x01" * 100
+
+
+class ImageServer:
+    """HTTP server returning fixed bodies by path and counting requests."""
+
+    def __init__(self, bodies: dict[str, bytes], delay: float = 0.05) -> None:
+        self.bodies = bodies
+        self.delay = delay
+        self.requests: list[str] = []
+        self.active = 0
+        self.peak = 0
+        self.server: asyncio.base_events.Server | None = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                path = request.split(b" ", 2)[1].decode()
+                self.requests.append(path)
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(self.delay)
+                self.active -= 1
+                body = self.bodies.get(path, b"")
+                status = b"200 OK" if path in self.bodies else b"404 Not Found"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: "
+                             + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def url(self, path: str) -> str:
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}{path}"
+
+
+@pytest.fixture
+async def server():
+    bodies = {f"/img{i}.png": PNG + bytes([i]) for i in range(8)}
+    bodies["/logo.gif"] = GIF
+    bodies["/copy-of-logo.gif"] = GIF
+    bodies["/huge.png"] = PNG + b"\x00" * 5000
+    instance = ImageServer(bodies)
+    instance.server = await asyncio.start_server(instance.handle, "127.0.0.1", 0)
+    yield instance
+    instance.server.close()
+    await instance.server.wait_closed()
+
+
+@pytest.fixture
+async def storage(tmp_path: Path):
+    pool = HTTPClientPool(max_per_host=16)
+    manager = MarkdownStorageManager(
+        str(tmp_path), http_client=HTTPClient(pool=pool), image_concurrency=4, max_image_bytes=1024
+    )
+    yield manager
+    await pool.close()
+
+
+async def save_page(
+    storage: MarkdownStorageManager,
+    server: ImageServer,
+    page: str,
+    paths: list[str],
+    revalidate_images: bool = False,
+) -> Path:
+    images = [{"url": server.url(p)} for p in paths]
+    body = "".join(f'<p><img src="{server.url(p)}"></p>' for p in paths)
+    md_path, _ = await storage.save_content(
+        page, "Title", body, images, [], {}, revalidate_images=revalidate_images
+    )
+    return storage.workspace_path / md_path
+
+
+class TestImageDownloads:
+    """Tests for MarkdownStorageManager image handling."""
+
+    async def test_concurrent_bounded_downloads(self, storage, server) -> None:
+        """Images download in parallel, at most image_concurrency at once."""
+        md_file = await save_page(storage, server, "https://a.example/1", [f"/img{i}.png" for i in range(8)])
+
+        assert server.peak == 4
+        images_dir = md_file.parent / "images" / md_file.stem
+        assert sorted(p.name for p in images_dir.iterdir()) == [f"img{i:03d}.png" for i in range(1, 9)]
+        assert (images_dir / "img003.png").read_bytes() == PNG + bytes([2])
+        assert f"./images/{md_file.stem}/img001.png" in md_file.read_text(encoding="utf-8")
+
+    async def test_oversized_image_skipped(self, storage, server) -> None:
+        """Images over max_image_bytes are not saved or referenced."""
+        md_file = await save_page(storage, server, "https://a.example/2", ["/huge.png", "/img0.png"])
+
+        images_dir = md_file.parent / "images" / md_file.stem
+        assert [p.name for p in images_dir.iterdir()] == ["img002.png"]
+        assert not list(storage.image_store_dir.rglob("*.part"))
+
+    async def test_shared_images_stored_once(self, storage, server) -> None:
+        """Repeated URLs skip the download; identical bytes share one file."""
+        first = await save_page(storage, server, "https://a.example/3", ["/logo.gif", "/img1.png"])
+        second = await save_page(storage, server, "https://b.example/4", ["/logo.gif", "/copy-of-logo.gif"])
+
+        assert server.requests.count("/logo.gif") == 1
+        assert storage.images_reused == 1
+        stored = list(storage.image_store_dir.rglob("*.gif"))
+        assert len(stored) == 1
+
+        linked = first.parent / "images" / first.stem / "img001.gif"
+        assert linked.read_bytes() == GIF
+        assert os.path.samefile(linked, stored[0]) or linked.read_bytes() == stored[0].read_bytes()
+        assert (second.parent / "images" / second.stem / "img002.gif").read_bytes() == GIF
+
+    async def test_cleanup_prunes_unused_images(self, storage, server, monkeypatch) -> None:
+        """Stored images whose pages are gone are deleted by cleanup."""
+        from src.tools.builtin.web_fetch import markdown_storage
+
+        md_file = await save_page(storage, server, "https://a.example/5", ["/img5.png"])
+        monkeypatch.setattr(markdown_storage, "STORE_PRUNE_GRACE_SECONDS", -60)
+
+        await storage.cleanup_old_files(days_old=3)
+        assert len(list(storage.image_store_dir.rglob("*.png"))) == 1
+
+        os.unlink(md_file.parent / "images" / md_file.stem / "img001.png")
+        await storage.cleanup_old_files(days_old=3)
+        assert not list(storage.image_store_dir.rglob("*.png"))
+
+    async def test_stale_image_url_is_downloaded_again(self, storage, server) -> None:
+        """An image replaced at the same URL is picked up once the URL is stale."""
+        storage.image_ttl_seconds = 0
+        await save_page(storage, server, "https://a.example/6", ["/logo.gif"])
+        server.bodies["/logo.gif"] = PNG
+
+        md_file = await save_page(storage, server, "https://b.example/7", ["/logo.gif"])
+
+        assert server.requests.count("/logo.gif") == 2
+        assert (md_file.parent / "images" / md_file.stem / "img001.png").read_bytes() == PNG
+
+    async def test_revalidated_page_downloads_images_again(self, storage, server) -> None:
+        """A modified page re-downloads its images even while they are fresh."""
+        await save_page(storage, server, "https://a.example/8", ["/logo.gif"])
+        server.bodies["/logo.gif"] = PNG
+
+        md_file = await save_page(storage, server, "https://a.example/8", ["/logo.gif"], revalidate_images=True)
+
+        assert server.requests.count("/logo.gif") == 2
+        assert storage.images_reused == 0
+        assert (md_file.parent / "images" / md_file.stem / "img001.png").read_bytes() == PNG
+
+    async def test_content_size_counts_shared_images_once(self, storage, server) -> None:
+        """Only the first page linking a stored image is charged for it."""
+        def size(md_file: Path) -> int:
+            return storage.content_size(
+                str(md_file.relative_to(storage.workspace_path)),
+                str((md_file.parent / "images" / md_file.stem).relative_to(storage.workspace_path)),
+            )
+
+        # Sizes are taken right after each save, as the fetch tool does
+        first = await save_page(storage, server, "https://a.example/9", ["/logo.gif", "/copy-of-logo.gif"])
+        first_size = size(first)
+        second = await save_page(storage, server, "https://b.example/10", ["/logo.gif"])
+        linked = first.parent / "images" / first.stem / "img001.gif"
+        if not os.path.samefile(linked, next(storage.image_store_dir.rglob("*.gif"))):
+            pytest.skip("hard links not supported")
+
+        assert first_size == first.stat().st_size + len(GIF)
+        assert size(second) == second.stat().st_size
@@ -0,0 +1,123 @@
+"""Unit tests for concurrent tool execution in the ReAct loop.
+
+Tests cover:
+- Consecutive parallel-safe calls overlap, bounded by max_parallel_tools
+- Results and events keep the original call order and tool_call ids
+- Calls that are not parallel-safe are never overlapped
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from src.orchestrator.react_loop import REACT_EVENT_TOOL_CALL, REACT_EVENT_TOOL_RESULT, ReActLoop
+from src.tools.base import BaseTool, ToolParameter, ToolParameterType, ToolResult
+from src.tools.manager import ToolManager
+
+
+class RecordingTool(BaseTool):
+    """Tool that sleeps and records how many calls overlap."""
+
+    def __init__(self, name: str, idempotent: bool, log: dict) -> None:
+        self._name = name
+        self._idempotent = idempotent
+        self.log = log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def parameters(self) -> list[ToolParameter]:
+        return [ToolParameter(name="key", type=ToolParameterType.STRING, description="key")]
+
+    @property
+    def is_idempotent(self) -> bool:
+        return self._idempotent
+
+    async def execute(self, key: str = "", **params) -> ToolResult:
+        self.log["active"] += 1
+        self.log["peak"] = max(self.log["peak"], self.log["active"])
+        self.log["order"].append(f"start {key}")
+        # Later keys finish first
+        await asyncio.sleep(0.05 / (1 + int(key)))
+        self.log["active"] -= 1
+        self.log["order"].append(f"end {key}")
+        return ToolResult.ok(f"{self._name}:{key}")
+
+
+def tool_call(index: int, name: str) -> dict:
+    return {
+        "id": f"call_{index}",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps({"key": str(index)})},
+    }
+
+
+async def run_loop(names: list[str], max_parallel_tools: int = 4) -> tuple[list[dict], list[dict], dict]:
+    """Run one tool round and a final answer; return events, messages sent and the log."""
+    log = {"active": 0, "peak": 0, "order": []}
+    manager = ToolManager()
+    manager.register(RecordingTool("read", True, log))
+    manager.register(RecordingTool("write", False, log))
+
+    router = Mock()
+    router.chat = AsyncMock(side_effect=[
+        SimpleNamespace(tool_calls=[tool_call(i, name) for i, name in enumerate(names)], content=""),
+        SimpleNamespace(tool_calls=None, content="done"),
+    ])
+    loop = ReActLoop(router, manager, enable_reflection=False, max_parallel_tools=max_parallel_tools)
+
+    events = [event async for event in loop.run_streaming([{"role": "user", "content": "look things up"}])]
+    final_messages = router.chat.call_args_list[-1].args[0]
+    return events, final_messages, log
+
+
+class TestParallelToolCalls:
+    """Tests for concurrent execution of parallel-safe tool calls."""
+
+    async def test_safe_calls_overlap_and_keep_order(self) -> None:
+        """Read-only calls run together; results stay in call order."""
+        events, messages, log = await run_loop(["read", "read", "read"])
+
+        assert log["peak"] == 3
+        results = [e for e in events if e["type"] == REACT_EVENT_TOOL_RESULT]
+        assert [(e["tool_call_id"], e["output"]) for e in results] == [
+            ("call_0", "read:0"), ("call_1", "read:1"), ("call_2", "read:2"),
+        ]
+        tool_messages = [m for m in messages if m["role"] == "tool"]
+        assert [(m["tool_call_id"], m["content"]) for m in tool_messages] == [
+            ("call_0", "read:0"), ("call_1", "read:1"), ("call_2", "read:2"),
+        ]
+
+    async def test_events_attributed_to_their_calls(self) -> None:
+        """Each tool_result follows the tool_call with the same id."""
+        events, _, _ = await run_loop(["read", "read"])
+
+        ids = [(e["type"], e["tool_call_id"]) for e in events
+               if e["type"] in (REACT_EVENT_TOOL_CALL, REACT_EVENT_TOOL_RESULT)]
+        assert ids == [
+            (REACT_EVENT_TOOL_CALL, "call_0"), (REACT_EVENT_TOOL_RESULT, "call_0"),
+            (REACT_EVENT_TOOL_CALL, "call_1"), (REACT_EVENT_TOOL_RESULT, "call_1"),
+        ]
+
+    async def test_concurrency_is_bounded(self) -> None:
+        """No more than max_parallel_tools calls run at once."""
+        _, _, log = await run_loop(["read"] * 5, max_parallel_tools=2)
+        assert log["peak"] == 2
+
+    async def test_unsafe_call_is_a_barrier(self) -> None:
+        """A write runs alone; reads after it start only once it finished."""
+        _, _, log = await run_loop(["read", "read", "write", "read", "read"])
+
+        order = log["order"]
+        assert order.index("end 2") < order.index("start 3")
+        assert order.index("end 0") < order.index("start 2")
+        assert order.index("end 1") < order.index("start 2")
+        assert log["peak"] == 2
+
+    async def test_sequential_when_disabled(self) -> None:
+        """max_parallel_tools=1 keeps strictly sequential execution."""
+        _, _, log = await run_loop(["read", "read", "read"], max_parallel_tools=1)
+        assert log["peak"] == 1
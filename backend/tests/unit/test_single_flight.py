@@ -0,0 +1,136 @@
+"""Unit tests for request coalescing.
+
+Tests cover:
+- Concurrent identical calls share one execution
+- Results and exceptions are shared; finished calls are not cached
+- A cancelled caller does not cancel the shared work
+- ToolManager coalesces idempotent tools only
+"""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.tools.base import BaseTool, ToolParameter, ToolResult
+from src.tools.manager import ToolManager
+from src.utils.single_flight import SingleFlight, canonical_key
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    async def test_concurrent_calls_share_execution(self) -> None:
+        """Callers arriving while a call runs get its result."""
+        flight = SingleFlight()
+        runs = 0
+
+        async def work() -> str:
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return "done"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["done"] * 5
+        assert runs == 1
+        assert flight.get_stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+    async def test_finished_calls_are_not_cached(self) -> None:
+        """A call after the previous one finished runs again."""
+        flight = SingleFlight()
+        runs = 0
+
+        async def work() -> int:
+            nonlocal runs
+            runs += 1
+            return runs
+
+        assert await flight.do("k", work) == 1
+        assert await flight.do("k", work) == 2
+
+    async def test_exceptions_are_shared(self) -> None:
+        """Every waiting caller sees the shared failure."""
+        flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_cancelled_caller_does_not_cancel_others(self) -> None:
+        """The shared work keeps running when the first caller is cancelled."""
+        flight = SingleFlight()
+
+        async def work() -> str:
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
+
+    def test_canonical_key_ignores_dict_order(self) -> None:
+        """Keys do not depend on parameter ordering."""
+        assert canonical_key("t", {"a": 1, "b": [1, 2]}) == canonical_key("t", {"b": [1, 2], "a": 1})
+        assert canonical_key("t", {"a": 1}) != canonical_key("u", {"a": 1})
+
+
+class SlowTool(BaseTool):
+    """Tool counting its executions."""
+
+    def __init__(self, name: str, idempotent: bool) -> None:
+        self._name = name
+        self._idempotent = idempotent
+        self.runs = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def is_idempotent(self) -> bool:
+        return self._idempotent
+
+    @property
+    def parameters(self) -> list[ToolParameter]:
+        return [ToolParameter(name="query", description="Query")]
+
+    async def execute(self, **params: Any) -> ToolResult:
+        self.runs += 1
+        await asyncio.sleep(0.01)
+        return ToolResult.ok(f"result for {params['query']}")
+
+
+class TestToolManagerCoalescing:
+    """Tests for coalesced tool execution."""
+
+    @pytest.mark.parametrize("idempotent,expected_runs", [(True, 1), (False, 3)])
+    async def test_identical_calls(self, idempotent: bool, expected_runs: int) -> None:
+        """Only idempotent tools share concurrent identical executions."""
+        manager = ToolManager()
+        tool = SlowTool("lookup", idempotent)
+        manager.register(tool)
+
+        results = await asyncio.gather(*(manager.execute("lookup", {"query": "x"}) for _ in range(3)))
+
+        assert [r.output for r in results] == ["result for x"] * 3
+        assert tool.runs == expected_runs
+
+    async def test_different_params_run_separately(self) -> None:
+        """Calls with different parameters are not coalesced."""
+        manager = ToolManager()
+        tool = SlowTool("lookup", idempotent=True)
+        manager.register(tool)
+
+        await asyncio.gather(manager.execute("lookup", {"query": "x"}), manager.execute("lookup", {"query": "y"}))
+
+        assert tool.runs == 2
+        assert manager.get_stats()["coalescing"]["coalesced"] == 0
@@ -0,0 +1,281 @@
+"""Unit tests for LLM request statistics.
+
+Tests cover:
+- Records are buffered and written in bulk on size/time thresholds
+- Queries and close() flush the buffer first
+- Failed writes keep records buffered for the next flush
+- Recent windows are answered from rolling aggregates
+- Hourly/daily rollups give the same answers as raw rows
+- Raw-row retention keeps rollups intact
+"""
+
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from src.models.stat import LLMRequestStat, LLMStatRollup
+from src.services.stat_aggregates import RollingStats, StatAggregate
+from src.services.stat_service import StatService
+from src.services.storage import StorageService
+
+
+@pytest.fixture
+async def storage(tmp_path: Path):
+    """Storage on a temporary SQLite file."""
+    service = StorageService(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    await service.initialize()
+    yield service
+    await service.close()
+
+
+async def count_rows(storage: StorageService) -> int:
+    async with storage.session() as db:
+        return (await db.execute(select(func.count(LLMRequestStat.id)))).scalar_one()
+
+
+async def record(service: StatService, n: int, **kwargs) -> None:
+    for i in range(n):
+        await service.record_request(
+            provider_name=kwargs.get("provider_name", "primary"),
+            model_id="m",
+            success=kwargs.get("success", True),
+            prompt_tokens=10,
+            completion_tokens=5,
+            latency_ms=100 + i,
+        )
+
+
+class TestWriteBehind:
+    """Tests for the write-behind buffer."""
+
+    async def test_flushes_on_size(self, storage: StorageService) -> None:
+        """A full buffer is written in one bulk insert."""
+        service = StatService(storage, flush_size=5, flush_interval=60)
+        await record(service, 4)
+        assert await count_rows(storage) == 0
+
+        await record(service, 1)
+        await asyncio.sleep(0.05)
+        assert await count_rows(storage) == 5
+        assert service.get_buffer_stats()["flushes"] == 1
+
+    async def test_flushes_on_interval(self, storage: StorageService) -> None:
+        """A partly filled buffer is written after flush_interval."""
+        service = StatService(storage, flush_size=100, flush_interval=0.05)
+        await record(service, 3)
+        await asyncio.sleep(0.2)
+        assert await count_rows(storage) == 3
+
+    async def test_queries_and_close_flush(self, storage: StorageService) -> None:
+        """Buffered records are visible to queries and written on close."""
+        service = StatService(storage, flush_size=100, flush_interval=60)
+        await record(service, 2, success=False)
+        errors = await service.get_recent_errors()
+        assert len(errors) == 2
+
+        await record(service, 3)
+        await service.close()
+        assert await count_rows(storage) == 5
+
+    async def test_failed_write_keeps_records(self, storage: StorageService, monkeypatch) -> None:
+        """Records survive a failed flush and are written by the next one."""
+        service = StatService(storage, flush_size=100, flush_interval=60)
+        await record(service, 3)
+
+        real_session = storage.session
+        monkeypatch.setattr(storage, "session", lambda: (_ for _ in ()).throw(RuntimeError("db down")))
+        assert await service.flush() == 0
+        assert service.get_buffer_stats()["buffered"] == 3
+
+        monkeypatch.setattr(storage, "session", real_session)
+        assert await service.flush() == 3
+        assert await count_rows(storage) == 3
+
+
+class TestRollingAggregates:
+    """Tests for in-memory recent-window aggregates."""
+
+    async def test_recent_window_matches_database(self, storage: StorageService) -> None:
+        """The in-memory answer equals the SQL answer."""
+        service = StatService(storage, flush_size=100, flush_interval=60)
+        await record(service, 4)
+        await record(service, 2, provider_name="backup", success=False)
+
+        since = service._rolling.since
+        memory = await service.get_aggregated_stats(start_time=since)
+        await service.flush()
+        service._rolling = None
+        database = await service.get_aggregated_stats(start_time=since)
+
+        assert memory == database
+        assert memory["total_requests"] == 6
+        assert memory["failed_requests"] == 2
+
+    async def test_filters(self, storage: StorageService) -> None:
+        """Provider filters apply to the rolling aggregates."""
+        service = StatService(storage, flush_size=100, flush_interval=60)
+        await record(service, 4)
+        await record(service, 2, provider_name="backup")
+
+        stats = await service.get_aggregated_stats(provider_name="backup", start_time=service._rolling.since)
+        assert stats["total_requests"] == 2
+        assert service.get_buffer_stats()["buffered"] == 6
+
+    def test_covers_only_recent_windows(self) -> None:
+        """Windows older than the process or the window go to the database."""
+        rolling = RollingStats(window_minutes=60)
+        now = datetime.now()
+        assert rolling.covers(now)
+        assert not rolling.covers(None)
+        assert not rolling.covers(rolling.since - timedelta(seconds=1))
+        assert not rolling.covers(now, end_time=now)
+
+    def test_old_buckets_are_pruned(self) -> None:
+        """Buckets outside the window are dropped."""
+        rolling = RollingStats(window_minutes=5)
+        now = datetime.now()
+        rolling.add(now - timedelta(minutes=30), "p", "m", True, 1, 1, 10)
+        rolling.add(now, "p", "m", True, 1, 1, 20)
+        assert len(rolling._buckets) == 1
+
+    def test_aggregate_merge(self) -> None:
+        """Merged aggregates keep totals and extremes."""
+        a, b = StatAggregate(), StatAggregate()
+        a.add(True, 1, 2, 50)
+        b.add(False, 3, 4, 10)
+        b.add(True, 0, 0, 90)
+        a.merge(b)
+        stats = a.to_dict()
+        assert stats["total_requests"] == 3
+        assert stats["total_tokens"] == 10
+        assert (stats["min_latency_ms"], stats["max_latency_ms"]) == (10, 90)
+        assert stats["avg_latency_ms"] == 50.0
+
+
+def make_row(created_at: datetime, provider: str = "primary", latency_ms: int = 100, success: bool = True) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "provider_name": provider,
+        "model_id": "m",
+        "session_id": None,
+        "request_type": "chat",
+        "success": 1 if success else 0,
+        "error_message": None,
+        "prompt_tokens": 10,
+        "completion_tokens": 5,
+        "total_tokens": 15,
+        "latency_ms": latency_ms,
+        "created_at": created_at,
+    }
+
+
+def history(days: int = 3, n: int = 300) -> list[dict]:
+    """Rows spread over the last few days, including the open hour."""
+    rng = random.Random(7)
+    now = datetime.now()
+    rows = [
+        make_row(
+            now - timedelta(seconds=rng.uniform(0, days * 86400)),
+            provider=rng.choice(["primary", "backup"]),
+            latency_ms=rng.randint(10, 5000),
+            success=rng.random() > 0.1,
+        )
+        for _ in range(n)
+    ]
+    rows.append(make_row(now - timedelta(seconds=1)))
+    return rows
+
+
+async def raw_totals(storage: StorageService, start: datetime | None, end: datetime | None = None) -> tuple:
+    async with storage.session() as db:
+        query = select(func.count(LLMRequestStat.id), func.sum(LLMRequestStat.success),
+                       func.sum(LLMRequestStat.total_tokens), func.max(LLMRequestStat.latency_ms))
+        if start:
+            query = query.where(LLMRequestStat.created_at >= start)
+        if end:
+            query = query.where(LLMRequestStat.created_at <= end)
+        return tuple((await db.execute(query)).one())
+
+
+class TestRollups:
+    """Tests for hourly/daily rollups."""
+
+    @pytest.fixture
+    async def service(self, storage: StorageService) -> StatService:
+        service = StatService(storage, flush_size=1000, rolling_window_minutes=0, raw_retention_days=0)
+        service._buffer.extend(history())
+        await service.flush()
+        return service
+
+    async def test_flush_maintains_rollups(self, service: StatService, storage: StorageService) -> None:
+        """Hourly and daily rollups each account for every raw row."""
+        async with storage.session() as db:
+            for granularity in ("hour", "day"):
+                total = await db.execute(
+                    select(func.sum(LLMStatRollup.total_requests)).where(LLMStatRollup.granularity == granularity)
+                )
+                assert total.scalar_one() == 301
+
+    @pytest.mark.parametrize("start_offset,end_offset", [
+        (None, None),
+        (timedelta(hours=1, minutes=17), None),
+        (timedelta(days=2, hours=5, minutes=3), None),
+        (timedelta(days=2, hours=5, minutes=3), timedelta(hours=7, minutes=41)),
+        (timedelta(minutes=20), timedelta(minutes=5)),
+    ])
+    async def test_matches_raw_rows(self, service: StatService, storage: StorageService,
+                                    start_offset, end_offset) -> None:
+        """Rollup-backed answers equal a scan of the raw rows."""
+        now = datetime.now()
+        start = now - start_offset if start_offset else None
+        end = now - end_offset if end_offset else None
+
+        stats = await service.get_aggregated_stats(start_time=start, end_time=end)
+        count, successful, tokens, max_latency = await raw_totals(storage, start, end)
+
+        assert stats["total_requests"] == count
+        assert stats["successful_requests"] == (successful or 0)
+        assert stats["total_tokens"] == (tokens or 0)
+        assert stats["max_latency_ms"] == (max_latency or 0)
+
+    async def test_percentiles(self, service: StatService) -> None:
+        """Latency percentiles are ordered and within the observed range."""
+        stats = await service.get_aggregated_stats()
+        assert stats["min_latency_ms"] <= stats["p50_latency_ms"] <= stats["p95_latency_ms"]
+        assert stats["p95_latency_ms"] <= stats["p99_latency_ms"] <= stats["max_latency_ms"]
+
+    async def test_by_provider_and_daily(self, service: StatService) -> None:
+        """Grouped queries add up to the total."""
+        by_provider = await service.get_stats_by_provider()
+        assert {s["provider_name"] for s in by_provider} == {"primary", "backup"}
+        assert sum(s["total_requests"] for s in by_provider) == 301
+
+        daily = await service.get_daily_stats(days=7)
+        assert [d["date"] for d in daily] == sorted((d["date"] for d in daily), reverse=True)
+        assert sum(d["total_requests"] for d in daily) == 301
+
+    async def test_retention_keeps_rollups(self, storage: StorageService) -> None:
+        """Pruned raw rows still count through their rollups."""
+        service = StatService(storage, flush_size=1000, rolling_window_minutes=0, raw_retention_days=1)
+        service._buffer.extend(history())
+        await service.flush()
+
+        deleted = await service.prune_raw()
+        assert deleted > 0
+        assert (await raw_totals(storage, None))[0] == 301 - deleted
+        assert (await service.get_aggregated_stats())["total_requests"] == 301
+
+    async def test_backfill_from_raw_rows(self, storage: StorageService) -> None:
+        """Existing history without rollups is rolled up once."""
+        async with storage.session() as db:
+            await db.execute(insert(LLMRequestStat), history())
+
+        service = StatService(storage, rolling_window_minutes=0, raw_retention_days=0)
+        assert await service.ensure_rollups() == 301
+        assert await service.ensure_rollups() == 0
+        assert (await service.get_aggregated_stats())["total_requests"] == 301
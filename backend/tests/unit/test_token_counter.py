@@ -1,7 +1,7 @@
 """Unit tests for TokenCounter."""
 
 import pytest
-from src.services.compression.token_counter import TokenCounter
+from src.services.compression.token_counter import TokenCounter, estimate_text_tokens
 
 
 class TestTokenCounter:
@@ -58,5 +58,126 @@ class TestTokenCounter:
         assert count > 0
 
 
+class WordEncoding:
+    """Encoding stand-in: one token per whitespace-separated word."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def encode(self, text: str) -> list[str]:
+        self.calls += 1
+        return text.split()
+
+
+def make_counter(cache_size: int = 4096) -> TokenCounter:
+    """Counter with a call-counting encoding (no tiktoken download)."""
+    counter = TokenCounter(cache_size=cache_size)
+    counter.encoding = WordEncoding()
+    return counter
+
+
+class TestTokenCounterCache:
+    """Memoisation and approximate threshold checks."""
+    
+    def test_repeated_texts_encoded_once(self):
+        """Identical contents hit the cache, even in new message dicts."""
+        counter = make_counter()
+        words = 50
+        first = counter.count_messages([{"role": "user", "content": "word " * words}])
+        calls = counter.encoding.calls
+        second = counter.count_messages([{"role": "user", "content": "word " * words}])
+        
+        assert first == second == 2 + 4 + 50 + 1
+        assert counter.encoding.calls == calls
+        assert counter.get_stats()["hits"] >= 2
+    
+    def test_append_only_history_counts_new_messages(self):
+        """Extending a history only encodes the new message."""
+        counter = make_counter()
+        history = [{"role": "user", "content": f"message {i}"} for i in range(10)]
+        full = counter.count_messages(history)
+        calls = counter.encoding.calls
+        
+        history.append({"role": "assistant", "content": "one more reply"})
+        assert counter.count_messages(history) == full + 4 + 3 + 1
+        assert counter.encoding.calls == calls + 2
+    
+    def test_interleaved_histories_stay_memoised(self):
+        """Concurrent sessions sharing the counter do not evict each other."""
+        counter = make_counter()
+        a = [{"role": "user", "content": f"session a {i}"} for i in range(5)]
+        b = [{"role": "user", "content": f"session b {i}"} for i in range(5)]
+        counter.count_messages(a)
+        counter.count_messages(b)
+        calls = counter.encoding.calls
+        
+        counter.count_messages(a)
+        counter.count_messages(b)
+        assert counter.encoding.calls == calls
+    
+    def test_mutated_multimodal_content_is_recounted(self):
+        """In-place edits of list content are not served a stale count."""
+        counter = make_counter()
+        content = [{"type": "text", "text": "short"}]
+        messages = [{"role": "user", "content": content}]
+        before = counter.count_messages(messages)
+        
+        content.append({"type": "text", "text": "a much longer second part"})
+        assert counter.count_messages(messages) > before
+    
+    def test_lru_is_bounded(self):
+        """The least recently used text is evicted first."""
+        counter = make_counter(cache_size=2)
+        counter.count_text("a b")
+        counter.count_text("c d")
+        counter.count_text("a b")
+        counter.count_text("e f")
+        calls = counter.encoding.calls
+        
+        counter.count_text("a b")
+        assert counter.encoding.calls == calls
+        counter.count_text("c d")
+        assert counter.encoding.calls == calls + 1
+        assert counter.get_stats()["cached_texts"] == 2
+    
+    def test_exceeds_far_from_limit_skips_encoding(self):
+        """Clearly small or large inputs are decided from the estimate."""
+        counter = make_counter()
+        small = [{"role": "user", "content": "hello there"}]
+        large = [{"role": "user", "content": "lorem ipsum " * 2000}]
+        
+        assert counter.exceeds(small, 1000)[0] is False
+        assert counter.exceeds(large, 1000)[0] is True
+        assert counter.encoding.calls == 0
+    
+    def test_exceeds_near_limit_counts_exactly(self):
+        """Near the limit the exact count decides."""
+        counter = make_counter()
+        # 100 words of 9 characters: estimated ~259 tokens, exactly 109
+        messages = [{"role": "user", "content": " ".join(["abcdefghi"] * 100)}]
+        exceeded, count = counter.exceeds(messages, 240, extra_text="one two")
+        
+        assert counter.encoding.calls > 0
+        assert count == 2 + 4 + 100 + 1 + 2
+        assert exceeded is False
+    
+    def test_exceeds_dense_text_below_estimate_counts_exactly(self):
+        """Text with few characters per token is not waved through by the estimate."""
+        counter = make_counter()
+        # 400 one-character words: estimated ~207 tokens, exactly 407
+        messages = [{"role": "user", "content": " ".join(["f"] * 400)}]
+        exceeded, count = counter.exceeds(messages, 300)
+        
+        assert exceeded is True
+        assert count == 2 + 4 + 400 + 1
+    
+    def test_falls_back_to_estimate_without_encoding(self):
+        """A missing encoding gives heuristic counts instead of failing."""
+        counter = TokenCounter(cache_size=16)
+        counter.encoding = None
+        assert counter.count_text("你好世界 hello") == estimate_text_tokens("你好世界 hello")
+        assert counter.is_exact is False
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
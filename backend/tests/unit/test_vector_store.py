@@ -357,6 +357,177 @@ class TestVectorStoreGlobal:
         vs_module._vector_store = None
 
 
+class TestMatrixSearch:
+    """Tests for the NumPy matrix fallback search."""
+
+    @pytest.fixture
+    def vector_store(self, tmp_path: Path) -> VectorStore:
+        """Create vector store instance."""
+        store = VectorStore(str(tmp_path / "vectors.db"), embedding_dim=4)
+        store.initialize()
+        yield store
+        store.close()
+
+    def test_search_ranks_by_cosine(self, vector_store: VectorStore) -> None:
+        """Test that results are ordered by cosine similarity."""
+        vector_store.insert("a", [1.0, 0.0, 0.0, 0.0], "a", "conversation")
+        vector_store.insert("b", [1.0, 1.0, 0.0, 0.0], "b", "conversation")
+        vector_store.insert("c", [0.0, 0.0, 1.0, 0.0], "c", "conversation")
+        
+        results = vector_store.search([1.0, 0.1, 0.0, 0.0], limit=10)
+        
+        assert [r["id"] for r in results] == ["a", "b"]
+        assert results[0]["score"] == pytest.approx(0.995, abs=1e-3)
+
+    def test_matrix_tracks_insert_and_delete(self, vector_store: VectorStore) -> None:
+        """Test that the loaded matrix stays in sync with writes."""
+        vector_store.insert("a", [1.0, 0.0, 0.0, 0.0], "a", "conversation")
+        assert [r["id"] for r in vector_store.search([1.0, 0.0, 0.0, 0.0])] == ["a"]
+        
+        vector_store.insert("b", [0.0, 1.0, 0.0, 0.0], "b", "conversation")
+        vector_store.insert("a", [0.0, 0.0, 1.0, 0.0], "a2", "conversation")
+        vector_store.delete("b")
+        
+        results = vector_store.search([0.0, 0.0, 1.0, 0.0])
+        assert [(r["id"], r["content"]) for r in results] == [("a", "a2")]
+        assert vector_store.search([0.0, 1.0, 0.0, 0.0]) == []
+
+    def test_matrix_loaded_from_existing_rows(self, tmp_path: Path) -> None:
+        """Test that a fresh store builds its matrix from the table."""
+        db_path = str(tmp_path / "vectors.db")
+        store = VectorStore(db_path, embedding_dim=4)
+        store.insert("a", [0.0, 1.0, 0.0, 0.0], "a", "conversation")
+        store.close()
+        
+        reopened = VectorStore(db_path, embedding_dim=4)
+        results = reopened.search([0.0, 1.0, 0.0, 0.0], limit=5)
+        reopened.close()
+        
+        assert [r["id"] for r in results] == ["a"]
+
+    def test_top_k_limit(self, vector_store: VectorStore) -> None:
+        """Test argpartition top-k returns the best entries in order."""
+        for i in range(20):
+            vector_store.insert(f"e{i}", [1.0, i / 10, 0.0, 0.0], f"e{i}", "conversation")
+        
+        results = vector_store.search([1.0, 0.0, 0.0, 0.0], limit=3)
+        
+        assert [r["id"] for r in results] == ["e0", "e1", "e2"]
+
+
+class TestBinaryEmbeddingStorage:
+    """Tests for BLOB embedding storage and legacy JSON migration."""
+
+    def test_embedding_stored_as_float32_blob(self, tmp_path: Path) -> None:
+        """Test that new embeddings are written as raw float32 bytes."""
+        store = VectorStore(str(tmp_path / "vectors.db"), embedding_dim=4)
+        store.insert("a", [0.5, 0.25, 0.0, 1.0], "a", "conversation")
+        
+        row = store._get_connection().execute(
+            "SELECT typeof(embedding) AS kind, length(embedding) AS size "
+            "FROM memory_embeddings WHERE entry_id = 'a'"
+        ).fetchone()
+        
+        assert (row["kind"], row["size"]) == ("blob", 16)
+        assert store.get_embedding("a") == [0.5, 0.25, 0.0, 1.0]
+        store.close()
+
+    def test_float16_format(self, tmp_path: Path) -> None:
+        """Test optional float16 storage."""
+        store = VectorStore(str(tmp_path / "vectors.db"), embedding_dim=4, embedding_format="float16")
+        store.insert("a", [0.5, 0.25, 0.0, 1.0], "a", "conversation")
+        
+        size = store._get_connection().execute(
+            "SELECT length(embedding) FROM memory_embeddings WHERE entry_id = 'a'"
+        ).fetchone()[0]
+        
+        assert size == 8
+        assert store.get_embedding("a") == [0.5, 0.25, 0.0, 1.0]
+        assert [r["id"] for r in store.search([0.5, 0.25, 0.0, 1.0])] == ["a"]
+        store.close()
+
+    def test_format_recorded_and_converted(self, tmp_path: Path) -> None:
+        """Test that rows follow the recorded format when it changes."""
+        db_path = str(tmp_path / "vectors.db")
+        store = VectorStore(db_path, embedding_dim=4)
+        # A 4-dim float32 row has the byte length of an 8-dim float16 row
+        store.insert("a", [0.5, 0.25, 0.0, 1.0], "a", "conversation")
+        store.close()
+        
+        store = VectorStore(db_path, embedding_dim=8, embedding_format="float32")
+        assert store.get_embedding("a") == [0.5, 0.25, 0.0, 1.0]
+        store.close()
+        
+        store = VectorStore(db_path, embedding_dim=4, embedding_format="float16")
+        store.initialize()
+        conn = store._get_connection()
+        size = conn.execute(
+            "SELECT length(embedding) FROM memory_embeddings WHERE entry_id = 'a'"
+        ).fetchone()[0]
+        stored_format = conn.execute(
+            "SELECT value FROM memory_meta WHERE key = 'embedding_format'"
+        ).fetchone()[0]
+        
+        assert (size, stored_format) == (8, "float16")
+        assert store.get_embedding("a") == [0.5, 0.25, 0.0, 1.0]
+        store.close()
+
+    def test_unknown_format_rejected(self, tmp_path: Path) -> None:
+        """Test that unsupported formats fail fast."""
+        with pytest.raises(ValueError):
+            VectorStore(str(tmp_path / "vectors.db"), embedding_format="int8")
+
+    def test_legacy_json_rows_migrated(self, tmp_path: Path) -> None:
+        """Test one-time conversion of JSON text rows on initialize."""
+        import json
+        import sqlite3
+        
+        db_path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE memory_entries (id TEXT PRIMARY KEY, content TEXT NOT NULL, "
+            "content_type TEXT NOT NULL, source_file TEXT, created_at TEXT NOT NULL, "
+            "updated_at TEXT NOT NULL, metadata TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE memory_embeddings (entry_id TEXT PRIMARY KEY, embedding TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO memory_entries VALUES ('old', 'legacy', 'conversation', '', "
+            "datetime('now'), datetime('now'), NULL)"
+        )
+        conn.execute(
+            "INSERT INTO memory_embeddings VALUES ('old', ?)", (json.dumps([0.0, 1.0, 0.0, 0.0]),)
+        )
+        conn.commit()
+        conn.close()
+        
+        store = VectorStore(db_path, embedding_dim=4)
+        store.initialize()
+        
+        kind = store._get_connection().execute(
+            "SELECT typeof(embedding) FROM memory_embeddings WHERE entry_id = 'old'"
+        ).fetchone()[0]
+        assert kind == "blob"
+        assert store.get_embedding("old") == [0.0, 1.0, 0.0, 0.0]
+        assert [r["id"] for r in store.search([0.0, 1.0, 0.0, 0.0])] == ["old"]
+        store.close()
+
+    def test_legacy_json_rows_still_readable(self, tmp_path: Path) -> None:
+        """Test that JSON rows written after migration are still decoded."""
+        import json
+        
+        store = VectorStore(str(tmp_path / "vectors.db"), embedding_dim=4)
+        store.insert("a", [1.0, 0.0, 0.0, 0.0], "a", "conversation")
+        store._get_connection().execute(
+            "UPDATE memory_embeddings SET embedding = ? WHERE entry_id = 'a'",
+            (json.dumps([0.0, 0.0, 1.0, 0.0]),),
+        )
+        
+        assert store.get_embedding("a") == [0.0, 0.0, 1.0, 0.0]
+        store.close()
+
+
 class TestVectorStoreWithEmbedder:
     """Tests for vector store integration with embedder."""
 
@@ -419,3 +590,161 @@ class TestVectorStoreWithEmbedder:
         assert len(results) >= 0  # May have results depending on vss availability
         
         store.close()
+
+
+class TestContentHashes:
+    """Tests for per-entry content hashes used by incremental sync."""
+
+    def test_legacy_table_gains_hash_column(self, tmp_path: Path) -> None:
+        """Test that older databases get content_hash and a source_file backfill."""
+        import json
+        import sqlite3
+        
+        db_path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE memory_entries (id TEXT PRIMARY KEY, content TEXT NOT NULL, "
+            "content_type TEXT NOT NULL, source_file TEXT, created_at TEXT NOT NULL, "
+            "updated_at TEXT NOT NULL, metadata TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO memory_entries VALUES ('a', 'x', 'conversation', '', 'now', 'now', ?)",
+            (json.dumps({"source_file": "memory/2026-01-01.md"}),),
+        )
+        conn.commit()
+        conn.close()
+        
+        store = VectorStore(db_path, embedding_dim=4)
+        store.initialize()
+        
+        assert store.get_content_hashes("memory/2026-01-01.md") == {"a": None}
+        store.close()
+
+    def test_apply_changes_single_transaction(self, tmp_path: Path) -> None:
+        """Test upserts and deletes are applied together and reach search."""
+        store = VectorStore(str(tmp_path / "vectors.db"), embedding_dim=4)
+        store.insert("old", [1.0, 0.0, 0.0, 0.0], "old", "conversation", source_file="f.md")
+        store.search([1.0, 0.0, 0.0, 0.0])  # load the matrix
+        
+        store.apply_changes(
+            [{
+                "entry_id": "new",
+                "embedding": [0.0, 1.0, 0.0, 0.0],
+                "content": "new",
+                "content_type": "conversation",
+                "source_file": "f.md",
+                "content_hash": "h1",
+            }],
+            ["old"],
+        )
+        
+        assert store.get_content_hashes("f.md") == {"new": "h1"}
+        assert [r["id"] for r in store.search([1.0, 1.0, 0.0, 0.0])] == ["new"]
+        store.close()
+
+
+class TestIVFIndex:
+    """Tests for the IVF approximate index."""
+
+    @staticmethod
+    def _clustered(n: int, dim: int = 16, clusters: int = 20, seed: int = 0):
+        """Random vectors drawn around a few cluster centres."""
+        import numpy as np
+        
+        rng = np.random.default_rng(seed)
+        centres = rng.standard_normal((clusters, dim))
+        labels = rng.integers(0, clusters, n)
+        return centres[labels] + 0.3 * rng.standard_normal((n, dim))
+
+    def test_recall_against_exact(self) -> None:
+        """Test IVF top-10 mostly matches exact search."""
+        from src.memory.vector_index import IVFIndex, MatrixIndex
+        
+        data = self._clustered(3000)
+        items = [(f"e{i}", v) for i, v in enumerate(data)]
+        exact = MatrixIndex(16)
+        exact.build(items)
+        ivf = IVFIndex(16, nlist=40, nprobe=8, min_train_size=500)
+        ivf.build(items)
+        assert ivf.is_trained
+        
+        queries = self._clustered(50, seed=1)
+        hits = 0
+        for q in queries:
+            truth = {i for i, _ in exact.search(q, 10)}
+            hits += len(truth & {i for i, _ in ivf.search(q, 10)})
+        assert hits / (10 * len(queries)) >= 0.9
+
+    def test_small_index_is_exact(self) -> None:
+        """Test that below the training threshold results are exact."""
+        from src.memory.vector_index import IVFIndex, MatrixIndex
+        
+        items = [(f"e{i}", v) for i, v in enumerate(self._clustered(200))]
+        exact = MatrixIndex(16)
+        exact.build(items)
+        ivf = IVFIndex(16, min_train_size=1000)
+        ivf.build(items)
+        
+        q = self._clustered(1, seed=2)[0]
+        assert not ivf.is_trained
+        assert ivf.search(q, 5) == exact.search(q, 5)
+
+    def test_upsert_and_remove_after_training(self) -> None:
+        """Test incremental updates keep list assignments aligned."""
+        from src.memory.vector_index import IVFIndex
+        
+        data = self._clustered(1000)
+        ivf = IVFIndex(16, nlist=10, nprobe=10, min_train_size=100)
+        ivf.build((f"e{i}", v) for i, v in enumerate(data))
+        
+        ivf.upsert("new", data[5])
+        ivf.remove("e5")
+        ids = [i for i, _ in ivf.search(data[5], 1)]
+        assert ids == ["new"]
+        assert "e5" not in ivf
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test snapshots restore rows only for the matching generation."""
+        from src.memory.vector_index import IVFIndex
+        
+        data = self._clustered(600)
+        ivf = IVFIndex(16, nlist=8, min_train_size=100)
+        ivf.build((f"e{i}", v) for i, v in enumerate(data))
+        ivf.save(tmp_path / "index.npz", generation=3)
+        
+        loaded = IVFIndex(16, nlist=8, min_train_size=100)
+        assert loaded.load(tmp_path / "index.npz", generation=3)
+        assert len(loaded) == 600
+        assert loaded.search(data[0], 3) == ivf.search(data[0], 3)
+        
+        stale = IVFIndex(16, nlist=8, min_train_size=100)
+        assert not stale.load(tmp_path / "index.npz", generation=4)
+        assert stale.is_trained and len(stale) == 0
+
+    def test_vector_store_persists_ivf_snapshot(self, tmp_path: Path) -> None:
+        """Test VectorStore writes the snapshot next to the DB and reuses it."""
+        data = self._clustered(300)
+        db_path = str(tmp_path / "vectors.db")
+        store = VectorStore(db_path, embedding_dim=16, index_type="ivf", ivf_min_train_size=100)
+        for i, v in enumerate(data):
+            store.insert(f"e{i}", v.tolist(), f"entry {i}", "conversation")
+        
+        assert store.rebuild_ann_index() == 300
+        assert store.index_path.exists()
+        expected = [r["id"] for r in store.search(data[7].tolist(), limit=3)]
+        store.close()
+        
+        reopened = VectorStore(db_path, embedding_dim=16, index_type="ivf", ivf_min_train_size=100)
+        assert [r["id"] for r in reopened.search(data[7].tolist(), limit=3)] == expected
+        
+        # A write after the snapshot makes it stale; rows are reloaded from the table
+        reopened.delete("e7")
+        reopened.close()
+        again = VectorStore(db_path, embedding_dim=16, index_type="ivf", ivf_min_train_size=100)
+        assert "e7" not in [r["id"] for r in again.search(data[7].tolist(), limit=3)]
+        again.close()
+
+    def test_unknown_index_type_rejected(self, tmp_path: Path) -> None:
+        """Test that unsupported index types fail fast."""
+        with pytest.raises(ValueError):
+            VectorStore(str(tmp_path / "vectors.db"), index_type="hnsw")
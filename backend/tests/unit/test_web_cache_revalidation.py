@@ -0,0 +1,224 @@
+"""Unit tests for web content cache revalidation and eviction.
+
+Tests cover:
+- Validators are stored and expired entries stay available for revalidation
+- A 304 response reuses the stored Markdown and extends the TTL
+- Stale-while-revalidate serves the cache and refreshes in the background
+- Size-bounded LRU eviction removes the least recently used entries
+- Databases from the previous schema are migrated
+"""
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from src.config.models import WebFetchConfig
+from src.tools.builtin.fetch_web_content import FetchWebContentTool
+from src.tools.builtin.web_fetch.extraction import ExtractionPool
+from src.tools.builtin.web_fetch.sqlite_index import SQLiteIndexManager
+
+URL = "https://example.com/article"
+
+PAGE = "<html><head><title>Fresh</title></head><body><article><p>New text of the article.</p></article></body></html>"
+
+
+def expire(index: SQLiteIndexManager, url: str, hours: int = 1) -> None:
+    """Move an entry's expiry into the past."""
+    with sqlite3.connect(index.db_path) as conn:
+        conn.execute(
+            "UPDATE web_content_index SET expires_at = datetime('now', ?) WHERE url = ?",
+            (f"-{hours} hours", url),
+        )
+
+
+def response(status_code: int, content: bytes = b"", headers: dict | None = None) -> httpx.Response:
+    return httpx.Response(
+        status_code, content=content, headers=headers, request=httpx.Request("GET", URL)
+    )
+
+
+async def add(index: SQLiteIndexManager, url: str, content_bytes: int = 0, **kwargs) -> list[dict]:
+    return await index.add_index(
+        url=url,
+        markdown_path=f"web_content/{url[-1]}.md",
+        images_dir=f"web_content/images/{url[-1]}",
+        title="Title",
+        word_count=3,
+        content_bytes=content_bytes,
+        **kwargs,
+    )
+
+
+class TestSQLiteIndexManager:
+    """Tests for validators, stale entries and eviction."""
+
+    async def test_expired_entry_kept_for_revalidation(self, tmp_path) -> None:
+        index = SQLiteIndexManager(str(tmp_path / "index.db"))
+        await add(index, URL, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+        fresh = await index.get_index(URL)
+        assert fresh["expired"] is False
+        assert fresh["etag"] == '"v1"'
+
+        expire(index, URL)
+        assert await index.get_index(URL) is None
+        stale = await index.get_index(URL, allow_stale=True)
+        assert stale["expired"] is True
+        assert stale["last_modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+        assert await index.refresh_index(URL, etag='"v2"')
+        refreshed = await index.get_index(URL)
+        assert refreshed["expired"] is False
+        assert refreshed["etag"] == '"v2"'
+        assert refreshed["last_modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    async def test_entries_past_retention_are_pruned(self, tmp_path) -> None:
+        index = SQLiteIndexManager(str(tmp_path / "index.db"), stale_retention_hours=24)
+        await add(index, "https://example.com/a")
+        expire(index, "https://example.com/a", hours=48)
+
+        await add(index, "https://example.com/b")
+        released = await index.sweep()
+
+        assert released == [{"markdown_path": "web_content/a.md", "images_dir": "web_content/images/a"}]
+        assert await index.get_index("https://example.com/a", allow_stale=True) is None
+
+    async def test_lru_eviction_by_size(self, tmp_path) -> None:
+        index = SQLiteIndexManager(str(tmp_path / "index.db"), max_bytes=250)
+        await add(index, "https://example.com/a", content_bytes=100)
+        await add(index, "https://example.com/b", content_bytes=100)
+        with sqlite3.connect(index.db_path) as conn:
+            conn.execute("UPDATE web_content_index SET last_accessed = datetime('now', '-1 hours')")
+        await index.get_index("https://example.com/a")
+
+        await add(index, "https://example.com/c", content_bytes=100)
+        released = await index.sweep(keep_url="https://example.com/c")
+
+        assert [entry["markdown_path"] for entry in released] == ["web_content/b.md"]
+        assert await index.get_index("https://example.com/a") is not None
+        assert await index.get_index("https://example.com/b") is None
+        stats = await index.get_stats()
+        assert stats["total_entries"] == 2
+        assert stats["content_bytes"] == 200
+
+    async def test_migrates_old_schema(self, tmp_path) -> None:
+        db_path = tmp_path / "index.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE web_content_index (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url_hash TEXT NOT NULL UNIQUE,
+                    url TEXT NOT NULL,
+                    markdown_path TEXT NOT NULL,
+                    images_dir TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    word_count INTEGER DEFAULT 0,
+                    language TEXT,
+                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at TIMESTAMP NOT NULL,
+                    access_count INTEGER DEFAULT 0,
+                    last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TRIGGER cleanup_expired_index AFTER INSERT ON web_content_index
+                BEGIN DELETE FROM web_content_index WHERE expires_at < CURRENT_TIMESTAMP; END;
+            """)
+
+        # Rows written by the old code: local time in isoformat()
+        with sqlite3.connect(db_path) as conn:
+            conn.executemany(
+                "INSERT INTO web_content_index (url_hash, url, markdown_path, images_dir, title, expires_at)"
+                " VALUES (?, ?, 'a.md', 'a', 'Old', ?)",
+                [
+                    ("fresh", "https://example.com/fresh", (datetime.now() + timedelta(hours=2)).isoformat()),
+                    ("stale", "https://example.com/stale", (datetime.now() - timedelta(hours=2)).isoformat()),
+                ],
+            )
+
+        index = SQLiteIndexManager(str(db_path))
+        await add(index, URL, etag='"v1"')
+
+        assert (await index.get_index(URL))["etag"] == '"v1"'
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] == 0
+            expiries = dict(conn.execute("SELECT url_hash, expires_at FROM web_content_index"))
+        for url_hash in ("fresh", "stale"):
+            assert datetime.strptime(expiries[url_hash], "%Y-%m-%d %H:%M:%S")
+        fresh = await index._run(lambda conn: conn.execute(
+            "SELECT url_hash FROM web_content_index WHERE expires_at > CURRENT_TIMESTAMP"
+        ).fetchall())
+        assert {row[0] for row in fresh} == {"fresh", index._compute_url_hash(URL)}
+        await index.close()
+
+
+@pytest.fixture
+def make_tool(tmp_path):
+    pools = []
+
+    def make(stale_while_revalidate: bool) -> FetchWebContentTool:
+        pool = ExtractionPool(workers=1, mode="thread")
+        pools.append(pool)
+        tool = FetchWebContentTool(
+            workspace_path=str(tmp_path),
+            extraction_pool=pool,
+            web_fetch_config=WebFetchConfig(stale_while_revalidate=stale_while_revalidate),
+        )
+        tool._sqlite_index = SQLiteIndexManager(str(tmp_path / "index.db"))
+        tool._http_client.fetch = AsyncMock(return_value=response(
+            200, PAGE.encode(), {"ETag": '"v1"', "Content-Type": "text/html"}
+        ))
+        return tool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+class TestRevalidation:
+    """Tests for conditional requests in FetchWebContentTool."""
+
+    async def test_not_modified_reuses_markdown(self, make_tool) -> None:
+        tool = make_tool(stale_while_revalidate=False)
+        first = await tool._fetch_single_url(URL, 5, True, True, 10)
+        assert first["metadata"]["cache_hit"] is False
+
+        expire(tool._sqlite_index, URL)
+        tool._http_client.fetch.return_value = response(304)
+        second = await tool._fetch_single_url(URL, 5, True, True, 10)
+
+        headers = tool._http_client.fetch.await_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"v1"'}
+        assert second["metadata"]["revalidated"] is True
+        assert second["metadata"]["markdown_path"] == first["metadata"]["markdown_path"]
+        assert second["title"] == "Fresh"
+        assert (await tool._sqlite_index.get_index(URL))["expired"] is False
+
+    async def test_modified_page_is_refetched(self, make_tool) -> None:
+        tool = make_tool(stale_while_revalidate=False)
+        await tool._fetch_single_url(URL, 5, True, True, 10)
+
+        expire(tool._sqlite_index, URL)
+        tool._http_client.fetch.return_value = response(200, PAGE.encode(), {"ETag": '"v2"'})
+        result = await tool._fetch_single_url(URL, 5, True, True, 10)
+
+        assert result["metadata"]["cache_hit"] is False
+        assert (await tool._sqlite_index.get_index(URL))["etag"] == '"v2"'
+
+    async def test_stale_while_revalidate(self, make_tool) -> None:
+        tool = make_tool(stale_while_revalidate=True)
+        await tool._fetch_single_url(URL, 5, True, True, 10)
+
+        expire(tool._sqlite_index, URL)
+        tool._http_client.fetch.reset_mock()
+        tool._http_client.fetch.return_value = response(304)
+        result = await tool._fetch_single_url(URL, 5, True, True, 10)
+
+        assert result["from_cache"] is True
+        assert result["metadata"]["stale"] is True
+        await asyncio.gather(*tool._revalidations.values())
+        assert tool._http_client.fetch.await_count == 1
+        assert (await tool._sqlite_index.get_index(URL))["expired"] is False
+        assert tool._revalidations == {}
@@ -0,0 +1,167 @@
+"""Unit tests for off-loop web page extraction.
+
+Tests cover:
+- extract_page returns title, body, markdown, images and tables
+- ExtractionPool runs extraction in threads and processes
+- Documents over the time budget raise ExtractionTimeoutError
+- Time spent queued for a worker does not count against the budget
+- HTTPClient.fetch truncates bodies over max_bytes
+"""
+
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+from src.tools.builtin.web_fetch import extraction
+from src.tools.builtin.web_fetch.extraction import (
+    ExtractionPool,
+    ExtractionTimeoutError,
+    extract_page,
+)
+from src.tools.builtin.web_fetch.http_client import HTTPClient, HTTPClientPool
+
+PAGE = """<html lang="en"><head><title>Test Page</title><script>var x = 1;</script></head>
+<body><article><h1>Heading</h1><p>First paragraph of the article.</p>
+<img src="https://example.com/a.png" alt="A">
+<table><tr><th>Name</th></tr><tr><td>Value</td></tr></table></article></body></html>"""
+
+
+def slow_extract(html_content: str, max_images: int, extract_tables: bool):
+    time.sleep(0.5)
+    return extract_page(html_content, max_images, extract_tables)
+
+
+def sleep_extract(html_content: str, max_images: int, extract_tables: bool) -> str:
+    """Sleep for the number of seconds given as the document."""
+    time.sleep(float(html_content))
+    return html_content
+
+
+class TestExtractPage:
+    """Tests for extract_page."""
+
+    def test_extracts_content(self) -> None:
+        page = extract_page(PAGE, max_images=5, extract_tables=True)
+
+        assert page.title == "Test Page"
+        assert "First paragraph" in page.body_html
+        assert "var x" not in page.body_html
+        assert "First paragraph" in page.markdown_body
+        assert page.language == "en"
+        assert [image["url"] for image in page.images] == ["https://example.com/a.png"]
+        assert len(page.tables) == 1
+
+    def test_tables_optional(self) -> None:
+        page = extract_page(PAGE, max_images=5, extract_tables=False)
+        assert page.tables == []
+
+
+class TestExtractionPool:
+    """Tests for ExtractionPool."""
+
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    async def test_extract(self, mode: str) -> None:
+        pool = ExtractionPool(workers=1, mode=mode)
+        try:
+            page = await pool.extract(PAGE, 5, True)
+        finally:
+            pool.close()
+
+        assert page.title == "Test Page"
+        assert pool.get_stats()["documents"] == 1
+
+    async def test_time_budget(self, monkeypatch) -> None:
+        monkeypatch.setattr(extraction, "extract_page", slow_extract)
+        pool = ExtractionPool(workers=1, mode="thread", time_budget=0.05)
+        try:
+            with pytest.raises(ExtractionTimeoutError):
+                await pool.extract(PAGE, 5, True)
+        finally:
+            pool.close()
+
+        assert pool.get_stats()["timeouts"] == 1
+
+    async def test_time_budget_kills_worker_process(self, monkeypatch) -> None:
+        monkeypatch.setattr(extraction, "extract_page", slow_extract)
+        pool = ExtractionPool(workers=1, mode="process", time_budget=0.05)
+        try:
+            # Warm up so the worker exists before the budget starts
+            pool.time_budget = 10.0
+            await pool.extract(PAGE, 5, True)
+            workers = list(pool._executor._processes.values())
+
+            pool.time_budget = 0.05
+            with pytest.raises(ExtractionTimeoutError):
+                await pool.extract(PAGE, 5, True)
+
+            for process in workers:
+                process.join(timeout=5)
+                assert not process.is_alive()
+            assert pool._executor is None
+        finally:
+            pool.close()
+
+    async def test_queued_documents_not_timed_out(self, monkeypatch) -> None:
+        """An over-budget document does not fail the documents queued behind it."""
+        monkeypatch.setattr(extraction, "extract_page", sleep_extract)
+        pool = ExtractionPool(workers=2, mode="process", time_budget=1.0)
+        try:
+            # Warm up so worker start-up is not part of the first budgets
+            await asyncio.gather(pool.extract("0", 5, True), pool.extract("0", 5, True))
+            results = await asyncio.gather(
+                *(pool.extract(doc, 5, True) for doc in ["5", "0.4", "0.4", "0.4", "0.4"]),
+                return_exceptions=True,
+            )
+        finally:
+            pool.close()
+
+        assert isinstance(results[0], ExtractionTimeoutError)
+        assert results[1:] == ["0.4"] * 4
+        assert pool.get_stats()["timeouts"] == 1
+
+
+class TestFetchSizeCap:
+    """Tests for HTTPClient.fetch(max_bytes=...)."""
+
+    @pytest.fixture
+    async def url(self):
+        body = b"x" * 100_000
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        yield f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/big"
+        server.close()
+        await server.wait_closed()
+
+    async def test_truncates_large_body(self, url: str) -> None:
+        pool = HTTPClientPool()
+        try:
+            response = await HTTPClient(pool=pool).fetch(url, max_bytes=10_000)
+        finally:
+            await pool.close()
+
+        assert len(response.content) == 10_000
+        assert response.extensions["truncated"] is True
+        assert response.status_code == 200
+
+    async def test_small_body_not_truncated(self, url: str) -> None:
+        pool = HTTPClientPool()
+        try:
+            response = await HTTPClient(pool=pool).fetch(url, max_bytes=1_000_000)
+        finally:
+            await pool.close()
+
+        assert len(response.content) == 100_000
+        assert response.extensions["truncated"] is False
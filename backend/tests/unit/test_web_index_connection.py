@@ -0,0 +1,122 @@
+"""Unit tests for SQLiteIndexManager connection handling.
+
+Tests cover:
+- One persistent WAL connection owned by the index thread
+- Cache hits are read-only; access counts are written in batches
+- Retention sweeps run at most every sweep_interval
+- Background sweeps for read-only workloads, stopped by close()
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+from src.tools.builtin.web_fetch import sqlite_index
+from src.tools.builtin.web_fetch.sqlite_index import SQLiteIndexManager
+
+URL = "https://example.com/article"
+
+
+async def add(index: SQLiteIndexManager, url: str = URL) -> list[dict]:
+    return await index.add_index(
+        url=url,
+        markdown_path=f"web_content/{url[-1]}.md",
+        images_dir=f"web_content/images/{url[-1]}",
+        title="Title",
+        word_count=3,
+    )
+
+
+def stored_access_count(index: SQLiteIndexManager, url: str = URL) -> int:
+    with sqlite3.connect(index.db_path) as conn:
+        return conn.execute(
+            "SELECT access_count FROM web_content_index WHERE url = ?", (url,)
+        ).fetchone()[0]
+
+
+class TestIndexConnection:
+    """Tests for the persistent connection and batched writes."""
+
+    async def test_persistent_wal_connection(self, tmp_path) -> None:
+        index = SQLiteIndexManager(str(tmp_path / "index.db"))
+        await add(index)
+        conn = index._conn
+        await index.get_index(URL)
+        await index.get_stats()
+
+        assert index._conn is conn
+        threads = await index._run(lambda conn: threading.current_thread().name)
+        assert threads.startswith("web-index")
+        mode = await index._run(lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0])
+        assert mode == "wal"
+        await index.close()
+
+    async def test_hits_are_buffered(self, tmp_path) -> None:
+        index = SQLiteIndexManager(str(tmp_path / "index.db"))
+        await add(index)
+
+        for _ in range(3):
+            entry = await index.get_index(URL)
+        assert entry["access_count"] == 3
+        assert stored_access_count(index) == 0
+
+        await index.close()
+        assert stored_access_count(index) == 3
+
+    async def test_full_batch_is_flushed(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(sqlite_index, "ACCESS_FLUSH_BATCH", 2)
+        index = SQLiteIndexManager(str(tmp_path / "index.db"))
+        await add(index, "https://example.com/a")
+        await add(index, "https://example.com/b")
+
+        await index.get_index("https://example.com/a")
+        await index.get_index("https://example.com/b")
+        # Any later call runs after the queued flush
+        await index.get_index("https://example.com/a")
+
+        assert stored_access_count(index, "https://example.com/a") == 1
+        assert stored_access_count(index, "https://example.com/b") == 1
+        await index.close()
+
+    async def test_sweep_interval(self, tmp_path) -> None:
+        index = SQLiteIndexManager(
+            str(tmp_path / "index.db"), stale_retention_hours=0, sweep_interval=3600
+        )
+        await add(index, "https://example.com/a")
+        with sqlite3.connect(index.db_path) as conn:
+            conn.execute("UPDATE web_content_index SET expires_at = datetime('now', '-1 hours')")
+
+        # Swept on the first insert only
+        assert await add(index, "https://example.com/b") == []
+        assert await index.get_index("https://example.com/a", allow_stale=True) is not None
+
+        index.sweep_interval = 0
+        released = await add(index, "https://example.com/c")
+        assert [entry["markdown_path"] for entry in released] == ["web_content/a.md"]
+        await index.close()
+
+    async def test_background_sweep_without_writes(self, tmp_path) -> None:
+        released = []
+        index = SQLiteIndexManager(
+            str(tmp_path / "index.db"),
+            stale_retention_hours=0,
+            sweep_interval=0.05,
+            on_release=released.extend,
+        )
+        await add(index, "https://example.com/a")
+        with sqlite3.connect(index.db_path) as conn:
+            conn.execute("UPDATE web_content_index SET expires_at = datetime('now', '-1 hours')")
+
+        # Only reads from here on; the timed task does the sweep
+        for _ in range(100):
+            await index.get_index("https://example.com/a", allow_stale=True)
+            if released:
+                break
+            await asyncio.sleep(0.02)
+
+        assert [entry["markdown_path"] for entry in released] == ["web_content/a.md"]
+        assert await index.get_index("https://example.com/a", allow_stale=True) is None
+
+        task = index._sweep_task
+        await index.close()
+        assert task.done()